@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Compares wall-clock latency of aria commands run as a fresh process (the old behaviour)
+against the same commands sent to a resident `aria daemon` through the thin client.
+
+Browser commands such as `page list` also skip reconnecting to the WebDriver session when
+run through the daemon; the default commands here need no browser so the benchmark runs anywhere.
+
+Usage:
+    python benchmarks/bench_daemon.py [--runs 10] [--command "script list"]
+"""
+import os
+import sys
+import time
+import shlex
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+ARIA = os.path.join(SRC, "aria.py")
+
+def run(argv, env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, ARIA] + argv, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    return time.perf_counter() - start
+
+def summarize(label, samples):
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.95))]
+    print(f"{label:<22} mean={statistics.mean(samples_ms):8.1f}ms  p50={statistics.median(samples_ms):8.1f}ms  p95={p95:8.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--command", action="append", help="aria command to time (repeatable).")
+    args = parser.parse_args()
+    commands = args.command or ["version", "script list"]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env = dict(os.environ, ARIA_DAEMON_SOCKET=os.path.join(temp_dir, "daemon.sock"), ARIA_AI_WARM="false")
+        cold_env = dict(env, ARIA_NO_DAEMON="true")
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, ARIA, "daemon", "start"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        print(f"daemon start: {(time.perf_counter() - start) * 1000:.0f}ms (paid once)")
+        try:
+            for command in commands:
+                argv = shlex.split(command)
+                run(argv, env)  # first command through the daemon warms its caches
+                summarize(f"{command} (fresh)", [run(argv, cold_env) for _ in range(args.runs)])
+                summarize(f"{command} (daemon)", [run(argv, env) for _ in range(args.runs)])
+        finally:
+            subprocess.run([sys.executable, ARIA, "daemon", "stop"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+
+if __name__ == "__main__":
+    main()
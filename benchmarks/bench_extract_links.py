@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Compares per-element link extraction with the single injected script used by
+AriaNavigator.extract_links on a large local fixture page, counting WebDriver round trips.
+
+Needs a local Chrome or Firefox; Selenium Manager resolves the driver.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_extract_links.py [--anchors 2000] [--browser chrome] [--repeat 3]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from selenium import webdriver
+from navigator import AriaNavigator
+
+def write_fixture(path, anchors):
+    """A page with many anchors; every fifth one is hidden so visibility checks matter."""
+    rows = []
+    for i in range(anchors):
+        style = ' style="display:none"' if i % 5 == 0 else ""
+        label = f' aria-label="Icon link {i}"' if i % 7 == 0 else ""
+        text = "" if i % 7 == 0 else f"Link number {i}"
+        rows.append(f'<li><a href="/item/{i}?ref=bench"{style}{label}>{text}</a></li>')
+    with open(path, "w") as f:
+        f.write(f"<!doctype html><html><head><title>Links</title></head><body><ul>{''.join(rows)}</ul></body></html>")
+
+def start_driver(browser):
+    if browser == "firefox":
+        options = webdriver.FirefoxOptions()
+        options.add_argument("-headless")
+        return webdriver.Firefox(options=options)
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    return webdriver.Chrome(options=options)
+
+def count_round_trips(driver):
+    """Wraps driver.execute so every command sent to the driver is counted."""
+    calls = {"count": 0}
+    original = driver.execute
+
+    def counting_execute(*args, **kwargs):
+        calls["count"] += 1
+        return original(*args, **kwargs)
+
+    driver.execute = counting_execute
+    return calls
+
+def measure(label, fn, calls, repeat):
+    times, trips = [], []
+    for _ in range(repeat):
+        calls["count"] = 0
+        start = time.perf_counter()
+        links = fn()
+        times.append((time.perf_counter() - start) * 1000)
+        trips.append(calls["count"])
+    print(f"{label:<12} round_trips={trips[0]:6d}  mean={statistics.mean(times):9.1f}ms  links={len(links)}")
+    return links
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark link extraction round trips.")
+    parser.add_argument("--anchors", type=int, default=2000)
+    parser.add_argument("--browser", choices=["chrome", "firefox"], default="chrome")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fixture = os.path.join(tmpdir, "links.html")
+        write_fixture(fixture, args.anchors)
+
+        driver = start_driver(args.browser)
+        try:
+            driver.get(f"file://{fixture}")
+            navigator = AriaNavigator()
+            navigator.driver = driver
+            calls = count_round_trips(driver)
+
+            print(f"{args.anchors} anchors, {args.browser}")
+            slow = measure("per-element", navigator._extract_links_by_element, calls, args.repeat)
+            fast = measure("script", navigator.extract_links, calls, args.repeat)
+            if [l["url"] for l in slow] != [l["url"] for l in fast]:
+                print("warning: the two methods returned different links")
+        finally:
+            driver.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Compares cold-spawn and pooled Gemini CLI latency against the local stand-in CLI.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_gemini_cli_pool.py [--requests 10] [--startup-ms 800] [--latency-ms 200]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from gemini_cli_pool import GeminiCliPool
+
+FAKE_CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_gemini_cli.py")
+
+def summarize(label, samples):
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.95))]
+    print(f"{label:<8} mean={statistics.mean(samples_ms):8.1f}ms  p50={statistics.median(samples_ms):8.1f}ms  p95={p95:8.1f}ms")
+
+def bench_cold(command, requests):
+    samples = []
+    for i in range(requests):
+        start = time.perf_counter()
+        subprocess.run(command, input=f"prompt {i}", capture_output=True, text=True, check=True)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def bench_pooled(command, requests, size):
+    pool = GeminiCliPool(command, size=size)
+    # Let the initial workers boot, as they would while the CLI parses arguments and loads plugins
+    time.sleep(float(os.environ["FAKE_GEMINI_STARTUP_MS"]) / 1000.0)
+    samples = []
+    try:
+        for i in range(requests):
+            start = time.perf_counter()
+            returncode, _, _ = pool.run(f"prompt {i}")
+            assert returncode == 0
+            samples.append(time.perf_counter() - start)
+    finally:
+        pool.shutdown()
+    return samples, pool.stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--startup-ms", type=int, default=800)
+    parser.add_argument("--latency-ms", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ["FAKE_GEMINI_STARTUP_MS"] = str(args.startup_ms)
+    os.environ["FAKE_GEMINI_LATENCY_MS"] = str(args.latency_ms)
+    command = [sys.executable, FAKE_CLI]
+
+    print(f"{args.requests} sequential requests, simulated startup {args.startup_ms}ms, model latency {args.latency_ms}ms")
+    summarize("cold", bench_cold(command, args.requests))
+    samples, stats = bench_pooled(command, args.requests, args.pool_size)
+    summarize("pooled", samples)
+    print(f"pool stats: {stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Compares per-call Gemini SDK latency with a fresh client per call (the old behaviour)
+against the shared client registry, using a local stand-in for the Gemini API.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_genai_clients.py [--requests 20] [--latency-ms 20]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import statistics
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from google import genai
+from google.genai import types
+import genai_clients
+
+MODEL = "gemini-3-flash-preview"
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    connections = set()
+
+    def do_POST(self):
+        FakeGeminiHandler.connections.add(self.client_address)
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.latency)
+        body = json.dumps({"candidates": [{"content": {"role": "model", "parts": [{"text": "ok"}]}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def summarize(label, samples, connections):
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.95))]
+    print(f"{label:<8} mean={statistics.mean(samples_ms):8.1f}ms  p50={statistics.median(samples_ms):8.1f}ms  p95={p95:8.1f}ms  connections={connections}")
+
+def bench(get_client, requests):
+    FakeGeminiHandler.connections = set()
+    samples = []
+    for i in range(requests):
+        start = time.perf_counter()
+        client = get_client()
+        client.models.generate_content(model=MODEL, contents=f"prompt {i}")
+        samples.append(time.perf_counter() - start)
+    return samples, len(FakeGeminiHandler.connections)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Gemini SDK client reuse.")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated server-side generation time.")
+    args = parser.parse_args()
+
+    FakeGeminiHandler.latency = args.latency_ms / 1000.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGeminiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    http_options = types.HttpOptions(base_url=f"http://127.0.0.1:{server.server_port}")
+
+    print(f"{args.requests} sequential requests, {args.latency_ms:.0f}ms simulated generation time")
+    fresh = lambda: genai.Client(api_key="bench", http_options=http_options)
+    summarize("fresh", *bench(fresh, args.requests))
+
+    genai_clients.reset_clients()
+    original = genai.Client
+    # Route the registry's client at the stand-in server
+    genai_clients.genai.Client = lambda **kwargs: original(api_key="bench", http_options=http_options)
+    try:
+        summarize("shared", *bench(lambda: genai_clients.get_client(MODEL, api_key="bench"), args.requests))
+    finally:
+        genai_clients.genai.Client = original
+        genai_clients.reset_clients()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Measures how many static pages per second HttpNavigator reads from a local server,
+one at a time and concurrently (resolve_prompt-style), and optionally compares it with
+AriaNavigator driving a real browser over the same pages.
+
+The browser comparison needs a local Chrome or Firefox and a registered driver.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_http_navigator.py [--pages 200] [--browser chrome]
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from http_navigator import HttpNavigator
+
+PAGE = "<!doctype html><html><head><title>Page {n}</title></head><body><h1>Page {n}</h1>{body}</body></html>"
+BODY = "".join(f"<p>Paragraph {i} of a static article with a <a href='/page/{i}'>link</a>.</p>" for i in range(60))
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = PAGE.format(n=self.path.rsplit("/", 1)[-1], body=BODY).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def report(label, count, elapsed):
+    print(f"{label:<28} {count / elapsed:10.1f} pages/s  ({elapsed * 1000 / count:.2f} ms/page)")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--browser", choices=["chrome", "firefox"], help="Also drive this browser over the same pages.")
+    args = parser.parse_args()
+
+    os.environ["ARIA_HTTP_IMPORT_COOKIES"] = "false"
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/page/{n}" for n in range(args.pages)]
+
+    navigator = HttpNavigator()
+    start = time.perf_counter()
+    for url in urls:
+        navigator.page = navigator.fetch(url)
+        navigator.get_page_content()
+    report("http, sequential", len(urls), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pages = navigator.fetch_many(urls)
+    for page in pages.values():
+        _ = page.text
+    report("http, concurrent", len(urls), time.perf_counter() - start)
+
+    if args.browser:
+        from navigator import AriaNavigator
+        browser = AriaNavigator()
+        if browser.start_session(browser_name=args.browser, headless=True, force=True):
+            sample = urls[:min(len(urls), 20)]
+            start = time.perf_counter()
+            for url in sample:
+                browser.driver.get(url)
+                browser.get_page_content()
+            report(f"{args.browser} via WebDriver", len(sample), time.perf_counter() - start)
+            browser.close_session(args.browser)
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
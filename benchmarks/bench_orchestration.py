@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Measures Aria's own AI orchestration overhead and fan-out throughput with the offline stub
+provider, so results do not depend on a live model.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_orchestration.py [--requests 200] [--latency-ms 50] [--jitter-ms 20] [--distribution lognormal]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+os.environ.setdefault("ARIA_NO_CACHE", "true")
+
+from plugin_manager import PluginManager
+from stub_provider import StubProvider
+from aria import generate_ai_response, generate_ai_responses
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AI orchestration with the stub provider.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--distribution", default="lognormal")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    pm = PluginManager(context={})
+
+    # Overhead: zero model latency, so everything measured is Aria's own work
+    pm.ai_providers["stub"] = StubProvider({}, latency_ms=0)
+    samples = []
+    for i in range(args.requests):
+        start = time.perf_counter()
+        generate_ai_response(f"Summarize item {i}:", "Some text. More text.", plugin_manager=pm, provider_name="stub")
+        samples.append((time.perf_counter() - start) * 1000)
+    print(f"overhead     mean={statistics.mean(samples):7.3f}ms  p50={statistics.median(samples):7.3f}ms per generate_ai_response call")
+
+    # Throughput: simulated model latency, fanned out at several concurrency limits
+    pm.ai_providers["stub"] = StubProvider({}, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, distribution=args.distribution, seed=1)
+    requests = [{"prompt": f"Summarize item {i}:", "context": "Some text."} for i in range(args.requests)]
+    for concurrency in args.concurrency:
+        start = time.perf_counter()
+        generate_ai_responses(requests, plugin_manager=pm, provider_name="stub", use_cache=False, concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+        print(f"fan-out x{concurrency:<3} {args.requests / elapsed:8.1f} req/s  ({elapsed:.2f}s for {args.requests} requests, {args.distribution} {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Breaks the start-up time of `aria open` into phases:
+
+  resolve_driver   webdriver_manager's install() on every launch (the old behaviour)
+                   against a lookup in the local driver registry
+  driver_ready     the old fixed two-second sleep against the port-readiness probe
+  browser_session  creating the WebDriver session (only with --full and a real browser)
+
+Without a real driver binary (--driver), readiness is measured against a stand-in
+process that starts listening on --port=N after a short delay, like a driver does.
+
+Usage:
+    python benchmarks/bench_session_start.py [--runs 5] [--browser chrome] [--driver PATH] [--full]
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from driver_registry import DriverRegistry, _download_driver, wait_for_port
+
+# Listens on the --port=N it is given after ~150ms, roughly what chromedriver takes
+FAKE_DRIVER = """
+import sys, time, socket
+port = int([a for a in sys.argv if a.startswith('--port=')][0].split('=')[1])
+time.sleep(0.15)
+server = socket.socket()
+server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+server.bind(('127.0.0.1', port))
+server.listen()
+time.sleep(30)
+"""
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def summarize(label, samples):
+    if not samples:
+        print(f"{label:<42} n/a")
+        return
+    samples_ms = sorted(s * 1000 for s in samples)
+    print(f"{label:<42} mean={statistics.mean(samples_ms):8.1f}ms  p50={statistics.median(samples_ms):8.1f}ms")
+
+def time_call(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def bench_resolve(browser, runs, registry_path):
+    manager, registry = [], []
+    try:
+        for _ in range(runs):
+            manager.append(time_call(lambda: _download_driver(browser)))
+    except Exception as e:
+        print(f"webdriver_manager could not resolve a {browser} driver ({type(e).__name__}); offline machines fail here.")
+    registry_obj = DriverRegistry(path=registry_path)
+    try:
+        registry_obj.resolve(browser)  # first resolution is paid once
+        for _ in range(runs):
+            registry.append(time_call(lambda: registry_obj.resolve(browser)))
+    except Exception as e:
+        print(f"Driver registry could not resolve a {browser} driver either ({type(e).__name__}).")
+    summarize("resolve_driver (webdriver_manager)", manager)
+    summarize("resolve_driver (registry)", registry)
+
+def bench_ready(driver, runs):
+    command = [driver] if driver else [sys.executable, "-c", FAKE_DRIVER]
+    sleep, probe = [], []
+    for _ in range(runs):
+        for samples, wait in ((sleep, lambda port, proc: time.sleep(2)), (probe, lambda port, proc: wait_for_port(port, process=proc))):
+            port = free_port()
+            start = time.perf_counter()
+            proc = subprocess.Popen(command + [f"--port={port}"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            wait(port, proc)
+            samples.append(time.perf_counter() - start)
+            proc.kill()
+            proc.wait()
+    label = "real driver" if driver else "stand-in driver"
+    summarize(f"driver_ready (sleep 2s, {label})", sleep)
+    summarize(f"driver_ready (port probe, {label})", probe)
+
+def bench_full(browser, runs):
+    from logger import get_performance_metrics, clear_performance_metrics
+    from navigator import AriaNavigator
+    phases = {}
+    for _ in range(runs):
+        clear_performance_metrics()
+        navigator = AriaNavigator()
+        if not navigator.start_session(browser_name=browser, headless=True, force=True):
+            print("Could not start a browser; skipping the full start-up measurement.")
+            return
+        navigator.close_session(browser)
+        for metric in get_performance_metrics():
+            if metric["operation"] == "session_start_phase":
+                phases.setdefault(metric["phase"], []).append(metric["duration_ms"] / 1000)
+    for phase, samples in phases.items():
+        summarize(f"aria open: {phase}", samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--browser", default="chrome", choices=["chrome", "firefox", "edge"])
+    parser.add_argument("--driver", help="Path to a real driver binary for the readiness comparison.")
+    parser.add_argument("--full", action="store_true", help="Also start real headless browsers through AriaNavigator.start_session.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bench_resolve(args.browser, args.runs, os.path.join(temp_dir, "drivers.json"))
+    bench_ready(args.driver, args.runs)
+    if args.full:
+        bench_full(args.browser, args.runs)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Gemini CLI used by the benchmarks.
+
+Mimics `gemini -y -o stream-json -`: it pays a simulated startup cost, reads the prompt
+from stdin until EOF, waits a simulated model latency and prints NDJSON events.
+
+Environment:
+    FAKE_GEMINI_STARTUP_MS  Simulated Node.js boot + auth handshake (default: 800).
+    FAKE_GEMINI_LATENCY_MS  Simulated model latency (default: 200).
+"""
+import os
+import sys
+import json
+import time
+
+def main():
+    time.sleep(float(os.environ.get("FAKE_GEMINI_STARTUP_MS", 800)) / 1000.0)
+    prompt = sys.stdin.read()
+    time.sleep(float(os.environ.get("FAKE_GEMINI_LATENCY_MS", 200)) / 1000.0)
+
+    print(json.dumps({"type": "init", "model": "fake"}))
+    words = f"Echo: {prompt.strip()[:80]}".split(" ")
+    for i, word in enumerate(words):
+        chunk = word if i == 0 else f" {word}"
+        print(json.dumps({"type": "message", "role": "assistant", "content": chunk, "delta": True}), flush=True)
+    print(json.dumps({"type": "result", "status": "success"}))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from typing import Optional
+from logger import get_logger, record_metric
+
+logger = get_logger("ai_cache")
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_MB = 50
+# Running estimate of the cache's size, kept beside the entries so one-shot runs share it
+USAGE_FILE = "usage"
+# Writes after which the estimate is replaced by a full scan (other writers, deleted entries)
+RESCAN_EVERY = 500
+
+class AIResponseCache:
+    """
+    Content-addressed on-disk cache for AI responses.
+
+    Entries are keyed by a SHA-256 of provider, model, output format, prompt and context,
+    expire after a per-entry TTL, and are evicted least-recently-used first (by file mtime)
+    once the cache directory exceeds its size budget. Writes update a running size estimate
+    instead of scanning the directory; the scan runs only when the estimate passes the
+    budget or every RESCAN_EVERY writes. Hits and misses are recorded as `<metric_prefix>_hit`
+    and `<metric_prefix>_miss` metrics; caches that report their own pass None.
+    """
+    def __init__(self, cache_dir: str = None, ttl: float = None, max_bytes: int = None, metric_prefix: Optional[str] = "ai_cache"):
+        if cache_dir is None:
+            cache_dir = os.environ.get("ARIA_AI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".aria", "cache", "ai"))
+        self.cache_dir = cache_dir
+        self.ttl = ttl if ttl is not None else float(os.environ.get("ARIA_AI_CACHE_TTL", DEFAULT_TTL))
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("ARIA_AI_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.metric_prefix = metric_prefix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(provider_name: str, model: str, output_format: str, prompt: str, context: str) -> str:
+        """Builds the content address for a request."""
+        digest = hashlib.sha256()
+        for part in (provider_name, model, output_format, prompt, context):
+            digest.update((part or "").encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _record(self, hit: bool, start: float):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            hits, misses = self.hits, self.misses
+        if not self.metric_prefix:
+            return
+        record_metric(
+            f"{self.metric_prefix}_hit" if hit else f"{self.metric_prefix}_miss",
+            (time.perf_counter() - start) * 1000,
+            cache_hits=hits,
+            cache_misses=misses
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached response for a key, or None on a miss or expired entry."""
+        start = time.perf_counter()
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (IOError, json.JSONDecodeError):
+            self._record(False, start)
+            return None
+
+        if entry.get("expires_at", 0) < time.time():
+            self._remove(path)
+            self._record(False, start)
+            return None
+
+        # Touch the entry so LRU eviction sees it as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self._record(True, start)
+        return entry.get("response")
+
+    def set(self, key: str, response: str, ttl: float = None):
+        """Stores a response atomically and enforces the size budget."""
+        now = time.time()
+        entry = {
+            "created_at": now,
+            "expires_at": now + (ttl if ttl is not None else self.ttl),
+            "response": response
+        }
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+                new_size = f.tell()
+            os.replace(tmp_path, path)
+        except (IOError, OSError) as e:
+            logger.error(f"Failed to write AI cache entry {key[:12]}: {e}")
+            return
+        if self._track_write(new_size - old_size):
+            self.evict()
+
+    def _usage_path(self) -> str:
+        return os.path.join(self.cache_dir, USAGE_FILE)
+
+    def _save_usage(self, total: int, writes: int):
+        try:
+            with open(self._usage_path(), "w", encoding="utf-8") as f:
+                json.dump({"bytes": total, "writes": writes}, f)
+        except OSError:
+            pass
+
+    def _track_write(self, delta: int) -> bool:
+        """Adds a write to the size estimate; True when a full scan (and maybe eviction) is due."""
+        with self._lock:
+            try:
+                with open(self._usage_path(), "r", encoding="utf-8") as f:
+                    usage = json.load(f)
+                total, writes = int(usage["bytes"]) + delta, int(usage["writes"]) + 1
+            except (OSError, ValueError, KeyError, TypeError):
+                # No estimate yet, or one cut short by a concurrent writer
+                return True
+            if total > self.max_bytes or writes >= RESCAN_EVERY:
+                return True
+            self._save_usage(total, writes)
+            return False
+
+    def delete(self, key: str) -> bool:
+        """Removes a single entry, e.g. when it is known to be stale."""
+        return self._remove(self._path(key))
+
+    def evict(self) -> int:
+        """Drops least-recently-used entries until the cache is under its size budget."""
+        entries = []
+        total = 0
+        removed = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            with self._lock:
+                self._save_usage(total, 0)
+            return 0
+
+        for mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                total -= size
+                removed += 1
+
+        with self._lock:
+            self._save_usage(total, 0)
+        logger.info(f"Evicted {removed} AI cache entries.", extra={"evicted": removed, "cache_bytes": total})
+        return removed
+
+    def clear(self) -> int:
+        """Removes every cache entry."""
+        removed = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json") and self._remove(os.path.join(root, name)):
+                    removed += 1
+        with self._lock:
+            self._save_usage(0, 0)
+        return removed
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+_default_cache = None
+_default_cache_settings = None
+_default_cache_lock = threading.Lock()
+
+def is_cache_enabled() -> bool:
+    """The cache is on unless disabled with --no-cache / ARIA_NO_CACHE=true."""
+    return os.environ.get("ARIA_NO_CACHE", "false").lower() != "true"
+
+def get_ai_cache() -> AIResponseCache:
+    """Returns the process-wide AI response cache, rebuilt when its ARIA_AI_CACHE_* settings change."""
+    global _default_cache, _default_cache_settings
+    settings = tuple(os.environ.get(name) for name in ("ARIA_AI_CACHE_DIR", "ARIA_AI_CACHE_TTL", "ARIA_AI_CACHE_MAX_MB"))
+    with _default_cache_lock:
+        if _default_cache is None or settings != _default_cache_settings:
+            _default_cache = AIResponseCache()
+            _default_cache_settings = settings
+        return _default_cache
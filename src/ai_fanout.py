@@ -0,0 +1,60 @@
+import os
+import time
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+from logger import get_logger, record_metric
+
+logger = get_logger("ai_fanout")
+
+DEFAULT_CONCURRENCY = 4
+
+def get_default_concurrency() -> int:
+    """Returns the configured number of concurrent AI requests."""
+    try:
+        return max(1, int(os.environ.get("ARIA_AI_CONCURRENCY", DEFAULT_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_CONCURRENCY
+
+async def fan_out(provider, requests: List[Dict[str, Any]], concurrency: int = None,
+                  on_result: Optional[Callable[[int, str], None]] = None) -> List[str]:
+    """
+    Runs provider.agenerate() for every request concurrently, with at most `concurrency` in flight.
+
+    Each request is a dict with 'prompt' and optional 'context' and 'output_format'.
+    Results are returned in request order. A failing request yields an error string
+    instead of cancelling its siblings. `on_result(index, text)` is called as each one finishes.
+    """
+    concurrency = concurrency or get_default_concurrency()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(index, request):
+        async with semaphore:
+            try:
+                text = await provider.agenerate(
+                    request["prompt"],
+                    request.get("context", ""),
+                    request.get("output_format", "text")
+                )
+            except Exception as e:
+                logger.error(f"AI request {index} failed during fan-out: {e}", exc_info=True)
+                text = f"Error during AI generation: {e}"
+        if on_result:
+            on_result(index, text)
+        return text
+
+    start_time = time.perf_counter()
+    results = await asyncio.gather(*(run_one(i, r) for i, r in enumerate(requests)))
+    record_metric(
+        "ai_fan_out",
+        (time.perf_counter() - start_time) * 1000,
+        requests=len(requests),
+        concurrency=concurrency
+    )
+    return list(results)
+
+def run_fan_out(provider, requests: List[Dict[str, Any]], concurrency: int = None,
+                on_result: Optional[Callable[[int, str], None]] = None) -> List[str]:
+    """Synchronous entry point for fan_out()."""
+    if not requests:
+        return []
+    return asyncio.run(fan_out(provider, requests, concurrency=concurrency, on_result=on_result))
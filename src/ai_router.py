@@ -0,0 +1,290 @@
+import os
+import json
+import time
+import atexit
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Iterator, List, Optional, Tuple
+from plugin_manager import BaseAIProvider
+from logger import get_logger, record_metric
+
+logger = get_logger("ai_router")
+
+DEFAULT_WINDOW = 50
+DEFAULT_MAX_ERROR_RATE = 0.5
+DEFAULT_COOLDOWN = 60.0
+DEFAULT_HEDGE_DELAY = 2.0
+MIN_SAMPLES = 5
+DEFAULT_STATS_FILE = os.path.join(os.path.expanduser("~"), ".aria", "cache", "router_stats.json")
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+def _is_error(text: str) -> bool:
+    # Providers report failures as 'Error...' strings rather than raising
+    return not text or text.startswith("Error")
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+class ProviderStats:
+    """Rolling latency and error statistics for one provider over its last `window` calls."""
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.last_failure_at = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool):
+        with self._lock:
+            self.outcomes.append(ok)
+            if ok:
+                self.latencies.append(latency)
+            else:
+                # Wall-clock time, so a cooldown carries over to the next process
+                self.last_failure_at = time.time()
+
+    @property
+    def samples(self) -> int:
+        return len(self.outcomes)
+
+    @property
+    def p50(self) -> Optional[float]:
+        with self._lock:
+            return _percentile(list(self.latencies), 0.5) if self.latencies else None
+
+    @property
+    def p95(self) -> Optional[float]:
+        with self._lock:
+            return _percentile(list(self.latencies), 0.95) if self.latencies else None
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            return (self.outcomes.count(False) / len(self.outcomes)) if self.outcomes else 0.0
+
+    def is_healthy(self, max_error_rate: float, cooldown: float) -> bool:
+        """Unhealthy providers get another chance once `cooldown` seconds pass without a failure."""
+        if self.samples < MIN_SAMPLES or self.error_rate <= max_error_rate:
+            return True
+        return time.time() - self.last_failure_at >= cooldown
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "samples": self.samples,
+            "p50_ms": round(self.p50 * 1000, 2) if self.p50 is not None else None,
+            "p95_ms": round(self.p95 * 1000, 2) if self.p95 is not None else None,
+            "error_rate": round(self.error_rate, 3)
+        }
+
+    def to_state(self) -> Dict[str, list]:
+        """Returns the raw samples, for persisting across processes."""
+        with self._lock:
+            return {"latencies": list(self.latencies), "outcomes": list(self.outcomes), "last_failure_at": self.last_failure_at}
+
+    def load_state(self, state: Dict[str, list]):
+        with self._lock:
+            self.latencies.extend(float(v) for v in state.get("latencies", []))
+            self.outcomes.extend(bool(v) for v in state.get("outcomes", []))
+            self.last_failure_at = float(state.get("last_failure_at", 0.0))
+
+class RoutingProvider(BaseAIProvider):
+    """
+    Sends each request to the fastest healthy registered provider.
+
+    Providers are ranked by rolling p50 latency; ones whose error rate exceeds
+    `max_error_rate` are skipped until `cooldown` seconds pass without a failure.
+    A failed response falls over to the next provider. With hedging enabled, a second
+    provider is also asked once the first has been silent for longer than its p95,
+    and whichever answers successfully first wins.
+
+    Statistics are saved to `stats_path` (ARIA_ROUTER_STATS_FILE, next to the AI cache by
+    default) after every call, so one-shot runs rank providers on what earlier runs measured
+    rather than starting cold. Concurrent processes overwrite each other's file; the last
+    writer's window wins.
+    """
+    model = "router"
+
+    def __init__(self, context, providers: Dict[str, BaseAIProvider] = None, hedge: bool = None,
+                 max_error_rate: float = None, cooldown: float = None, stats_path: str = None):
+        super().__init__(context)
+        # May be the plugin manager's live registry, so providers added later are picked up
+        self.providers = providers if providers is not None else {}
+        if hedge is None:
+            hedge = os.environ.get("ARIA_ROUTER_HEDGE", "false").lower() == "true"
+        self.hedge = hedge
+        self.max_error_rate = max_error_rate if max_error_rate is not None else _env_float("ARIA_ROUTER_MAX_ERROR_RATE", DEFAULT_MAX_ERROR_RATE)
+        self.cooldown = cooldown if cooldown is not None else _env_float("ARIA_ROUTER_COOLDOWN", DEFAULT_COOLDOWN)
+        self.default_hedge_delay = _env_float("ARIA_ROUTER_HEDGE_DELAY", DEFAULT_HEDGE_DELAY)
+        # An empty path keeps statistics in memory only
+        self.stats_path = stats_path if stats_path is not None else os.environ.get("ARIA_ROUTER_STATS_FILE", DEFAULT_STATS_FILE)
+        self.stats: Dict[str, ProviderStats] = {}
+        self._saved_state = self._load_stats()
+        self._executor = None
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+    def _load_stats(self) -> Dict[str, Dict[str, list]]:
+        if not self.stats_path:
+            return {}
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable router statistics {self.stats_path}: {e}")
+            return {}
+
+    def _save_stats(self):
+        if not self.stats_path:
+            return
+        with self._lock:
+            # Providers not used by this process keep the samples loaded from disk
+            state = dict(self._saved_state)
+            state.update({name: stats.to_state() for name, stats in self.stats.items()})
+        tmp_path = f"{self.stats_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._save_lock:
+            try:
+                os.makedirs(os.path.dirname(self.stats_path) or ".", exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, self.stats_path)
+            except OSError as e:
+                logger.warning(f"Could not save router statistics to {self.stats_path}: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def _stats_for(self, name: str) -> ProviderStats:
+        with self._lock:
+            if name not in self.stats:
+                stats = ProviderStats(int(_env_float("ARIA_ROUTER_WINDOW", DEFAULT_WINDOW)))
+                if isinstance(self._saved_state.get(name), dict):
+                    stats.load_state(self._saved_state[name])
+                self.stats[name] = stats
+            return self.stats[name]
+
+    def candidates(self) -> List[Tuple[str, BaseAIProvider]]:
+        """Returns providers in the order they should be tried: healthy by p50, then unhealthy ones."""
+        healthy, unhealthy = [], []
+        for name, provider in list(self.providers.items()):
+            if provider is self or isinstance(provider, RoutingProvider) or not getattr(provider, "routable", True):
+                continue
+            stats = self._stats_for(name)
+            # Providers without measurements sort first so they get measured
+            entry = (stats.p50 if stats.p50 is not None else 0.0, name, provider)
+            (healthy if stats.is_healthy(self.max_error_rate, self.cooldown) else unhealthy).append(entry)
+        return [(name, provider) for _, name, provider in sorted(healthy) + sorted(unhealthy)]
+
+    def _hedge_delay(self, name: str) -> float:
+        stats = self._stats_for(name)
+        if stats.samples >= MIN_SAMPLES and stats.p95 is not None:
+            return stats.p95
+        return self.default_hedge_delay
+
+    def _call(self, name: str, provider: BaseAIProvider, prompt: str, context: str, output_format: str) -> str:
+        start_time = time.perf_counter()
+        try:
+            text = provider.generate(prompt, context, output_format)
+        except Exception as e:
+            logger.error(f"Provider '{name}' raised during routed generation: {e}", exc_info=True)
+            text = f"Error from provider '{name}': {e}"
+        self._stats_for(name).record(time.perf_counter() - start_time, not _is_error(text))
+        self._save_stats()
+        return text
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="aria-router")
+                atexit.register(self._executor.shutdown, wait=False)
+            return self._executor
+
+    def generate(self, prompt: str, context: str = "", output_format: str = "text") -> str:
+        candidates = self.candidates()
+        if not candidates:
+            return "Error: No AI providers available for routing."
+
+        start_time = time.perf_counter()
+        if self.hedge and len(candidates) > 1:
+            name, text, hedged = self._generate_hedged(candidates, prompt, context, output_format)
+        else:
+            name, text, hedged = self._generate_with_failover(candidates, prompt, context, output_format)
+
+        record_metric("ai_router", (time.perf_counter() - start_time) * 1000, provider=name, hedged=hedged)
+        return text
+
+    def _generate_with_failover(self, candidates, prompt, context, output_format):
+        text = None
+        for name, provider in candidates:
+            text = self._call(name, provider, prompt, context, output_format)
+            if not _is_error(text):
+                return name, text, False
+            logger.warning(f"Provider '{name}' failed; trying the next one.")
+        return name, text, False
+
+    def _generate_hedged(self, candidates, prompt, context, output_format):
+        executor = self._get_executor()
+        (primary_name, primary), remaining = candidates[0], list(candidates[1:])
+        futures = {executor.submit(self._call, primary_name, primary, prompt, context, output_format): primary_name}
+
+        done, _ = wait(futures, timeout=self._hedge_delay(primary_name))
+        hedged = not done
+        if hedged:
+            name, provider = remaining.pop(0)
+            logger.info(f"Provider '{primary_name}' slower than its p95; hedging with '{name}'.")
+            futures[executor.submit(self._call, name, provider, prompt, context, output_format)] = name
+
+        pending = set(futures)
+        text = None
+        name = primary_name
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, text = futures[future], future.result()
+                if not _is_error(text):
+                    # The slower request keeps running in the background and still updates its stats
+                    return name, text, hedged
+            if not pending and remaining:
+                name, provider = remaining.pop(0)
+                logger.warning(f"Hedged providers failed; trying '{name}'.")
+                future = executor.submit(self._call, name, provider, prompt, context, output_format)
+                futures[future] = name
+                pending = {future}
+        return name, text, hedged
+
+    def generate_stream(self, prompt: str, context: str = "", output_format: str = "text") -> Iterator[str]:
+        """Streams from the fastest healthy provider. Streams are not hedged, since chunks cannot be un-printed."""
+        candidates = self.candidates()
+        if not candidates:
+            yield "Error: No AI providers available for routing."
+            return
+
+        name, provider = candidates[0]
+        start_time = time.perf_counter()
+        chunks = []
+        try:
+            for chunk in provider.generate_stream(prompt, context, output_format):
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            self._stats_for(name).record(time.perf_counter() - start_time, bool(chunks) and not _is_error("".join(chunks)))
+            self._save_stats()
+
+    def close(self):
+        """Stops the hedging threads; requests still running finish in the background."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+            atexit.unregister(executor.shutdown)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Returns the rolling statistics for every provider that has been considered."""
+        return {name: stats.to_dict() for name, stats in list(self.stats.items())}
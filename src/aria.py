@@ -1,5 +1,15 @@
 import argparse
 import os
+import sys
+import time
+
+if __name__ == "__main__":
+    # Thin client: hand the command to a running `aria daemon` before the heavy imports below
+    import aria_daemon
+    _daemon_exit_code = aria_daemon.forward_command(sys.argv[1:])
+    if _daemon_exit_code is not None:
+        sys.exit(_daemon_exit_code)
+
 from google import genai
 import re
 import logging
@@ -7,7 +17,7 @@ from navigator import AriaNavigator
 from script_manager import ScriptManager
 from safety_manager import SafetyManager
 from plugin_manager import PluginManager, BaseAIProvider
-from logger import setup_logging, get_logger, set_trace_id, time_it, get_performance_metrics
+from logger import setup_logging, get_logger, set_trace_id, time_it, get_performance_metrics, clear_performance_metrics, record_metric
 from report_manager import ReportManager
 from credential_manager import CredentialManager
 from site_manager import SiteManager
@@ -17,121 +27,207 @@ from sites.discord import DiscordScraper
 from sites.threads import ThreadsScraper
 from sites.calendar import CalendarScraper
 from sites.youtube_studio import YouTubeStudioScraper
-from exceptions import AriaError
+from exceptions import AriaError, AIServiceError
+from gemini_cli_pool import get_pool as get_cli_pool, get_request_timeout, keep_warm as keep_cli_pool_warm, stream_process_lines
+from ai_cache import AIResponseCache, get_ai_cache, is_cache_enabled
+from ai_fanout import run_fan_out
+from navigation_cache import NavigationDecisionCache
+from ai_router import RoutingProvider
+from stub_provider import StubProvider
+from genai_clients import get_client as get_genai_client, warm_client_in_background
+import aria_daemon
+from browser_pool import BrowserPool
+from resource_blocking import ScrapeProfile
+from driver_registry import get_driver_registry
+from warm_standby import create_standby_pool
+from http_navigator import HttpNavigatorPlugin
+from chunking import split_text, group_texts, estimate_tokens, needs_chunking, get_chunk_tokens, get_summary_parallelism, CHARS_PER_TOKEN
 
 logger = get_logger("aria")
 
 VERSION = "0.1.0"
 
 class GeminiProvider(BaseAIProvider):
+    model = "gemini-3-flash-preview"
+
+    def _cli_path(self):
+        return os.path.expanduser(os.environ.get("ARIA_GEMINI_CLI", "~/node_modules/.bin/gemini"))
+
     def generate(self, prompt: str, context: str = "", output_format: str = "text") -> str:
-        cli_path = os.path.expanduser("~/node_modules/.bin/gemini")
+        cli_path = self._cli_path()
         if os.path.exists(cli_path):
             return self._generate_via_cli(cli_path, prompt, context, output_format)
         
         return self._generate_via_sdk(prompt, context, output_format)
 
-    def _generate_via_cli(self, cli_path, prompt, context, output_format):
-        try:
-            full_prompt = prompt
-            if context:
-                full_prompt = f"Context:\n{context}\n\nUser Request: {prompt}"
-            
-            if output_format == "json":
-                full_prompt += "\n\nIMPORTANT: Return ONLY valid JSON. Do not include markdown code blocks or any other text."
-            elif output_format == "markdown":
-                full_prompt += "\n\nIMPORTANT: Use Markdown formatting."
+    def generate_stream(self, prompt: str, context: str = "", output_format: str = "text"):
+        cli_path = self._cli_path()
+        if os.path.exists(cli_path):
+            return self._stream_via_cli(cli_path, prompt, context, output_format)
 
-            import subprocess
-            import json
-            
-            # The user suggested: echo prompt | gemini -y -o stream-json -
-            # Added --model gemini-3-flash-preview
-            cmd = [cli_path, "-y", "--model", "gemini-3-flash-preview", "-o", "stream-json", "-"]
-            
+        return self._stream_via_sdk(prompt, context, output_format)
+
+    def _build_prompt(self, prompt, context, output_format):
+        full_prompt = prompt
+        if context:
+            full_prompt = f"Context:\n{context}\n\nUser Request: {prompt}"
+        
+        if output_format == "json":
+            full_prompt += "\n\nIMPORTANT: Return ONLY valid JSON. Do not include markdown code blocks or any other text."
+        elif output_format == "markdown":
+            full_prompt += "\n\nIMPORTANT: Use Markdown formatting."
+        return full_prompt
+
+    def _clean_output(self, text, output_format):
+        # Simple cleanup if AI includes markdown code blocks
+        if output_format == "json" and text.startswith("```json"):
+            text = text.replace("```json", "", 1).replace("```", "", 1).strip()
+        elif output_format == "json" and text.startswith("```"):
+            text = text.replace("```", "", 1).replace("```", "", 1).strip()
+        return text
+
+    async def agenerate(self, prompt: str, context: str = "", output_format: str = "text") -> str:
+        cli_path = self._cli_path()
+        if os.path.exists(cli_path):
+            return await self._agenerate_via_cli(cli_path, prompt, context, output_format)
+
+        return await self._agenerate_via_sdk(prompt, context, output_format)
+
+    def _cli_command(self, cli_path):
+        # The user suggested: echo prompt | gemini -y -o stream-json -
+        # Added --model gemini-3-flash-preview
+        return [cli_path, "-y", "--model", self.model, "-o", "stream-json", "-"]
+
+    def _parse_cli_line(self, line):
+        """Returns the assistant text carried by one NDJSON line, or None."""
+        import json
+        if not line.strip():
+            return None
+        try:
+            data = json.loads(line)
+            if data.get("type") == "message" and data.get("role") == "assistant":
+                return data.get("content", "") or None
+        except json.JSONDecodeError:
+            pass
+        return None
+
+    def _iter_cli_text(self, cli_path, full_prompt, queue=True):
+        """
+        Yields assistant text from the CLI's NDJSON output as each line arrives.
+        With queue=False a cold process is started instead of waiting for a busy pool.
+        """
+        import subprocess
+        
+        cmd = self._cli_command(cli_path)
+        
+        # Prefer a warm worker from the pool so Node.js startup is not paid per prompt
+        pool = get_cli_pool(cmd)
+        lines = None
+        if pool:
+            lines = pool.stream(full_prompt) if queue else pool.try_stream(full_prompt)
+        if lines is None:
             process = subprocess.Popen(
                 cmd, 
                 stdin=subprocess.PIPE, 
                 stdout=subprocess.PIPE, 
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                env=dict(os.environ)
             )
-            
-            stdout, stderr = process.communicate(input=full_prompt)
-            
-            if process.returncode != 0:
-                logger.error(f"Gemini CLI error: {stderr}")
-                return f"Error from Gemini CLI: {stderr}"
-
-            # Parse NDJSON output
-            response_text = ""
-            for line in stdout.splitlines():
-                if not line.strip():
-                    continue
-                try:
-                    data = json.loads(line)
-                    if data.get("type") == "message" and data.get("role") == "assistant":
-                        content = data.get("content", "")
-                        response_text += content
-                except json.JSONDecodeError:
-                    pass
-
-            text = response_text.strip()
-            
-            # Cleanup
-            if output_format == "json" and text.startswith("```json"):
-                text = text.replace("```json", "", 1).replace("```", "", 1).strip()
-            elif output_format == "json" and text.startswith("```"):
-                text = text.replace("```", "", 1).replace("```", "", 1).strip()
+            lines = stream_process_lines(process, full_prompt, timeout=get_request_timeout())
 
-            return text
+        for line in lines:
+            content = self._parse_cli_line(line)
+            if content:
+                yield content
 
+    def _generate_via_cli(self, cli_path, prompt, context, output_format, queue=True):
+        try:
+            full_prompt = self._build_prompt(prompt, context, output_format)
+            text = "".join(self._iter_cli_text(cli_path, full_prompt, queue=queue)).strip()
+            return self._clean_output(text, output_format)
+        except AIServiceError as e:
+            logger.error(f"Gemini CLI error: {e}")
+            return f"Error from Gemini CLI: {e}"
         except Exception as e:
             logger.error(f"Error during Gemini CLI generation: {e}", exc_info=True)
             return f"Error during Gemini CLI generation: {e}"
 
+    def _stream_via_cli(self, cli_path, prompt, context, output_format):
+        if output_format == "json":
+            # JSON has to be cleaned up as a whole before anyone can parse it
+            yield self._generate_via_cli(cli_path, prompt, context, output_format)
+            return
+        try:
+            full_prompt = self._build_prompt(prompt, context, output_format)
+            yield from self._iter_cli_text(cli_path, full_prompt)
+        except AIServiceError as e:
+            logger.error(f"Gemini CLI error: {e}")
+            yield f"Error from Gemini CLI: {e}"
+        except Exception as e:
+            logger.error(f"Error during Gemini CLI generation: {e}", exc_info=True)
+            yield f"Error during Gemini CLI generation: {e}"
+
+    async def _agenerate_via_cli(self, cli_path, prompt, context, output_format):
+        import asyncio
+        # Runs on a thread through the warm pool and its request timeout; concurrent fan-out
+        # requests that find every warm worker busy start a cold process rather than queueing
+        return await asyncio.to_thread(self._generate_via_cli, cli_path, prompt, context, output_format, False)
+
+    def _get_sdk_client(self):
+        # Shared per (API key, model) so connections and auth setup are reused across calls.
+        # If no API key, the SDK detects the environment (e.g. gcloud auth) itself.
+        return get_genai_client(self.model)
+
     def _generate_via_sdk(self, prompt: str, context: str = "", output_format: str = "text") -> str:
         try:
-            api_key = os.environ.get("GEMINI_API_KEY")
-            if api_key:
-                genai.configure(api_key=api_key)
-            
-            # If no API key, we assume the environment is already configured (e.g. gcloud auth)
-            # or the user has a local setup that google-generativeai can detect.
-            
-            model = genai.GenerativeModel('gemini-3-flash-preview')
-            
-            full_prompt = prompt
-            if context:
-                full_prompt = f"Context:\n{context}\n\nUser Request: {prompt}"
-            
-            if output_format == "json":
-                full_prompt += "\n\nIMPORTANT: Return ONLY valid JSON. Do not include markdown code blocks or any other text."
-            elif output_format == "markdown":
-                full_prompt += "\n\nIMPORTANT: Use Markdown formatting."
-            
-            response = model.generate_content(full_prompt)
-            text = response.text
-            
-            # Simple cleanup if AI includes markdown code blocks
-            if output_format == "json" and text.startswith("```json"):
-                text = text.replace("```json", "", 1).replace("```", "", 1).strip()
-            elif output_format == "json" and text.startswith("```"):
-                text = text.replace("```", "", 1).replace("```", "", 1).strip()
-                
-            return text
+            client = self._get_sdk_client()
+            response = client.models.generate_content(model=self.model, contents=self._build_prompt(prompt, context, output_format))
+            return self._clean_output(response.text, output_format)
         except Exception as e:
             logger.error(f"Error during Gemini generation: {e}", exc_info=True)
             return f"Error during Gemini generation: {e}. (Hint: Check your GEMINI_API_KEY or local authentication)"
 
-@time_it(logger)
-def generate_ai_response(prompt: str, context: str = "", output_format: str = "text", plugin_manager: PluginManager = None, provider_name: str = None) -> str:
-    """Generates a response from the AI given a prompt and optional context."""
-    if plugin_manager:
-        plugin_manager.trigger_hook("pre_ai_generation", prompt=prompt)
+    async def _agenerate_via_sdk(self, prompt: str, context: str = "", output_format: str = "text") -> str:
+        import asyncio
+        # The shared sync client is thread-safe and keeps its connections alive, whereas an
+        # async client would be tied to the event loop of a single fan-out run.
+        return await asyncio.to_thread(self._generate_via_sdk, prompt, context, output_format)
 
-    logger.info(f"Generating AI response. Provider: {provider_name}, Format: {output_format}", extra={"prompt_length": len(prompt), "context_length": len(context)})
-    
+    def _stream_via_sdk(self, prompt: str, context: str = "", output_format: str = "text"):
+        if output_format == "json":
+            yield self._generate_via_sdk(prompt, context, output_format)
+            return
+        try:
+            client = self._get_sdk_client()
+            for chunk in client.models.generate_content_stream(model=self.model, contents=self._build_prompt(prompt, context, output_format)):
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            logger.error(f"Error during Gemini generation: {e}", exc_info=True)
+            yield f"Error during Gemini generation: {e}. (Hint: Check your GEMINI_API_KEY or local authentication)"
+
+def _uses_ai(args) -> bool:
+    """True for commands that will call the AI provider."""
+    if args.command == 'page':
+        return args.page_command == 'summarize' or (args.page_command in ['new', 'goto'] and bool(getattr(args, 'prompt', None)))
+    return (args.command, getattr(args, f"{args.command}_command", None)) in [('report', 'generate'), ('site', 'synthesize')]
+
+def _warm_ai_client(args):
+    """Opens the Gemini SDK connection in the background while the browser is being prepared."""
+    if os.environ.get("ARIA_AI_WARM", "true").lower() == "false" or not _uses_ai(args):
+        return
+    provider_name = getattr(args, 'provider', None) or os.environ.get("ARIA_DEFAULT_AI_PROVIDER", "gemini")
+    provider = GeminiProvider(context={})
+    if provider_name == "gemini" and os.environ.get("GEMINI_API_KEY") and not os.path.exists(provider._cli_path()):
+        warm_client_in_background(provider.model)
+
+def _is_error_response(text: str) -> bool:
+    """Providers report failures as 'Error...' strings; these must never be cached."""
+    return not text or text.startswith("Error")
+
+def _resolve_provider(plugin_manager: PluginManager = None, provider_name: str = None):
+    """Returns (provider_name, provider) for a request; provider is None if it cannot be found."""
     if not provider_name:
         provider_name = os.environ.get("ARIA_DEFAULT_AI_PROVIDER", "gemini")
 
@@ -139,30 +235,332 @@ def generate_ai_response(prompt: str, context: str = "", output_format: str = "t
     if plugin_manager:
         provider = plugin_manager.get_ai_provider(provider_name)
     
-    # Fallback to built-in Gemini if no provider found or no plugin manager
+    # Fallback to built-in providers if no provider found or no plugin manager
     if not provider and provider_name == "gemini":
         provider = GeminiProvider({"version": VERSION}) # Minimal context
+    elif not provider and provider_name == "stub":
+        provider = StubProvider({"version": VERSION})
+
+    return provider_name, provider
 
+def _cache_key(provider_name, provider, output_format, prompt, context):
+    return AIResponseCache.make_key(provider_name, getattr(provider, "model", ""), output_format, prompt, context)
+
+@time_it(logger)
+def generate_ai_response(prompt: str, context: str = "", output_format: str = "text", plugin_manager: PluginManager = None, provider_name: str = None, use_cache: bool = True) -> str:
+    """Generates a response from the AI given a prompt and optional context."""
+    if plugin_manager:
+        plugin_manager.trigger_hook("pre_ai_generation", prompt=prompt)
+
+    logger.info(f"Generating AI response. Provider: {provider_name}, Format: {output_format}", extra={"prompt_length": len(prompt), "context_length": len(context)})
+    
+    provider_name, provider = _resolve_provider(plugin_manager, provider_name)
     if not provider:
         error_msg = f"Error: AI provider '{provider_name}' not found."
         logger.error(error_msg)
         return error_msg
 
-    text = provider.generate(prompt, context, output_format)
-    
-    logger.info("AI response generated successfully.", extra={"response_length": len(text)})
+    cache = get_ai_cache() if use_cache and is_cache_enabled() else None
+    cache_key = None
+    text = None
+    if cache:
+        cache_key = _cache_key(provider_name, provider, output_format, prompt, context)
+        text = cache.get(cache_key)
+        if text is not None:
+            logger.info("AI response served from cache.", extra={"response_length": len(text)})
+
+    if text is None:
+        text = provider.generate(prompt, context, output_format)
+        if cache and not _is_error_response(text):
+            cache.set(cache_key, text)
+        logger.info("AI response generated successfully.", extra={"response_length": len(text)})
     
     if plugin_manager:
         plugin_manager.trigger_hook("post_ai_generation", prompt=prompt, response=text)
 
     return text
 
-def summarize_text(text: str, output_format: str = "text", plugin_manager: PluginManager = None, provider_name: str = None) -> str:
-    """Summarizes the given text using the Gemini API."""
-    prompt = "Summarize the following text:"
+def generate_ai_responses(requests, plugin_manager: PluginManager = None, provider_name: str = None, use_cache: bool = True, concurrency: int = None, on_result=None) -> list:
+    """
+    Generates responses for many independent requests concurrently.
+
+    Each request is a dict with 'prompt' and optional 'context' and 'output_format'.
+    Cached responses are served directly; the rest are fanned out through the
+    provider's agenerate() with at most `concurrency` calls in flight.
+    Results are returned in request order.
+    """
+    provider_name, provider = _resolve_provider(plugin_manager, provider_name)
+    if not provider:
+        error_msg = f"Error: AI provider '{provider_name}' not found."
+        logger.error(error_msg)
+        return [error_msg for _ in requests]
+
+    cache = get_ai_cache() if use_cache and is_cache_enabled() else None
+    results = [None] * len(requests)
+    pending = []
+    for i, request in enumerate(requests):
+        if plugin_manager:
+            plugin_manager.trigger_hook("pre_ai_generation", prompt=request["prompt"])
+        if cache:
+            key = _cache_key(provider_name, provider, request.get("output_format", "text"), request["prompt"], request.get("context", ""))
+            results[i] = cache.get(key)
+            if results[i] is not None and on_result:
+                on_result(i, results[i])
+        if results[i] is None:
+            pending.append(i)
+
+    logger.info(f"Fanning out {len(pending)} AI request(s). Provider: {provider_name}", extra={"requests": len(requests), "cached": len(requests) - len(pending)})
+
+    def _on_pending_result(index, text):
+        if on_result:
+            on_result(pending[index], text)
+
+    texts = run_fan_out(provider, [requests[i] for i in pending], concurrency=concurrency, on_result=_on_pending_result)
+    for i, text in zip(pending, texts):
+        results[i] = text
+        request = requests[i]
+        if cache and not _is_error_response(text):
+            cache.set(_cache_key(provider_name, provider, request.get("output_format", "text"), request["prompt"], request.get("context", "")), text)
+
+    if plugin_manager:
+        for request, text in zip(requests, results):
+            plugin_manager.trigger_hook("post_ai_generation", prompt=request["prompt"], response=text)
+
+    return results
+
+def generate_ai_response_stream(prompt: str, context: str = "", output_format: str = "text", plugin_manager: PluginManager = None, provider_name: str = None, use_cache: bool = True):
+    """Like generate_ai_response, but yields text chunks as soon as the provider produces them."""
+    start_time = time.perf_counter()
+    if plugin_manager:
+        plugin_manager.trigger_hook("pre_ai_generation", prompt=prompt)
+
+    logger.info(f"Streaming AI response. Provider: {provider_name}, Format: {output_format}", extra={"prompt_length": len(prompt), "context_length": len(context)})
+
+    provider_name, provider = _resolve_provider(plugin_manager, provider_name)
+    if not provider:
+        error_msg = f"Error: AI provider '{provider_name}' not found."
+        logger.error(error_msg)
+        yield error_msg
+        return
+
+    cache = get_ai_cache() if use_cache and is_cache_enabled() else None
+    cache_key = None
+    text = None
+    first_chunk_ms = None
+    if cache:
+        cache_key = _cache_key(provider_name, provider, output_format, prompt, context)
+        text = cache.get(cache_key)
+        if text is not None:
+            logger.info("AI response served from cache.", extra={"response_length": len(text)})
+            first_chunk_ms = (time.perf_counter() - start_time) * 1000
+            yield text
+
+    if text is None:
+        chunks = []
+        # A provider can fail after streaming part of an answer, so failure is tracked per chunk
+        failed = False
+        try:
+            for chunk in provider.generate_stream(prompt, context, output_format):
+                if first_chunk_ms is None:
+                    first_chunk_ms = (time.perf_counter() - start_time) * 1000
+                if chunk.startswith("Error"):
+                    failed = True
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            failed = True
+            error_msg = f"Error during AI streaming: {e}"
+            logger.error(error_msg, exc_info=True)
+            chunks.append(error_msg)
+            yield error_msg
+        text = "".join(chunks)
+        if cache and not failed and not _is_error_response(text):
+            cache.set(cache_key, text)
+        logger.info("AI response streamed successfully.", extra={"response_length": len(text)})
+
+    record_metric(
+        "generate_ai_response_stream",
+        (time.perf_counter() - start_time) * 1000,
+        time_to_first_chunk_ms=round(first_chunk_ms or 0.0, 2)
+    )
+
+    if plugin_manager:
+        plugin_manager.trigger_hook("post_ai_generation", prompt=prompt, response=text)
+
+def print_stream(chunks) -> str:
+    """Prints text chunks as they arrive and returns the full text."""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        print(chunk, end="", flush=True)
+    print()
+    return "".join(parts)
+
+def stream_ai_response(prompt: str, context: str = "", output_format: str = "text", plugin_manager: PluginManager = None, provider_name: str = None) -> str:
+    """Prints an AI response to the terminal as it is generated and returns the full text."""
     if output_format == "json":
-        prompt = "Summarize the following text and return it as valid JSON with keys 'summary', 'key_points' (list), and 'overall_sentiment':"
-    return generate_ai_response(prompt, text, output_format=output_format, plugin_manager=plugin_manager, provider_name=provider_name)
+        # JSON is only useful once complete and cleaned up, so print it in one piece
+        text = generate_ai_response(prompt, context, output_format=output_format, plugin_manager=plugin_manager, provider_name=provider_name)
+        print(text)
+        return text
+    return print_stream(generate_ai_response_stream(prompt, context, output_format=output_format, plugin_manager=plugin_manager, provider_name=provider_name))
+
+def _summary_prompt(output_format: str) -> str:
+    if output_format == "json":
+        return "Summarize the following text and return it as valid JSON with keys 'summary', 'key_points' (list), and 'overall_sentiment':"
+    return "Summarize the following text:"
+
+def summarize_text(text: str, output_format: str = "text", plugin_manager: PluginManager = None, provider_name: str = None, stream: bool = False, prompt: str = None) -> str:
+    """
+    Summarizes the given text using the Gemini API. With stream=True the summary is printed as it is generated.
+    Text above the chunking threshold is first condensed with map-reduce (see condense_text).
+    """
+    if needs_chunking(text):
+        text = condense_text(text, prompt, plugin_manager=plugin_manager, provider_name=provider_name)
+        if _is_error_response(text):
+            if stream:
+                print(text)
+            return text
+    if prompt:
+        text = f"{prompt}\n\n{text}"
+    summary_prompt = _summary_prompt(output_format)
+    if stream:
+        return stream_ai_response(summary_prompt, text, output_format=output_format, plugin_manager=plugin_manager, provider_name=provider_name)
+    return generate_ai_response(summary_prompt, text, output_format=output_format, plugin_manager=plugin_manager, provider_name=provider_name)
+
+def _chunk_prompt(instructions: str, index: int, total: int) -> str:
+    focus = f" Focus on what is relevant to: {instructions}" if instructions else ""
+    return f"The following is part {index} of {total} of a longer document. Summarize it, keeping key facts, names, numbers and decisions.{focus}"
+
+def _merge_prompt(instructions: str) -> str:
+    focus = f" Focus on what is relevant to: {instructions}" if instructions else ""
+    return f"The following are summaries of consecutive parts of a longer document. Merge them into one summary without losing key facts, names, numbers or decisions.{focus}"
+
+def _condense_or_keep(context: str, instructions: str, plugin_manager: PluginManager, provider_name: str) -> str:
+    """Condenses oversized context, keeping the original if condensing fails."""
+    condensed = condense_text(context, instructions, plugin_manager=plugin_manager, provider_name=provider_name)
+    return context if _is_error_response(condensed) else condensed
+
+def _source_excerpt(text: str, max_tokens: int) -> str:
+    """Stands in for a failed summary: the start of its source text, marked as such."""
+    limit = max(1, max_tokens) * CHARS_PER_TOKEN
+    excerpt = text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + " ..."
+    return f"[Summary unavailable; excerpt of the original text]\n{excerpt}"
+
+def condense_text(text: str, instructions: str = None, plugin_manager: PluginManager = None, provider_name: str = None,
+                  chunk_tokens: int = None, parallelism: int = None) -> str:
+    """
+    Condenses text that is too large for a single prompt with map-reduce.
+
+    The text is split on structural boundaries into chunks of about `chunk_tokens`,
+    every chunk is summarized concurrently (map), and the partial summaries are merged
+    level by level until they fit in one chunk (reduce). A summary that fails is replaced
+    by a marked excerpt of its source text, so no part of the input silently disappears.
+    Progress is written to stderr.
+    """
+    chunk_tokens = chunk_tokens or get_chunk_tokens()
+    parallelism = parallelism or get_summary_parallelism()
+    start_time = time.perf_counter()
+
+    chunks = split_text(text, chunk_tokens)
+    total = len(chunks)
+    done = []
+
+    def _progress(_index, _text):
+        done.append(_index)
+        print(f"\rSummarizing large content: {len(done)}/{total} chunks", end="", file=sys.stderr, flush=True)
+
+    logger.info("Condensing content with map-reduce.", extra={"estimated_tokens": estimate_tokens(text), "chunks": total})
+    requests = [{"prompt": _chunk_prompt(instructions, i + 1, total), "context": chunk} for i, chunk in enumerate(chunks)]
+    partials = generate_ai_responses(requests, plugin_manager=plugin_manager, provider_name=provider_name, concurrency=parallelism, on_result=_progress)
+
+    levels = 0
+    inputs = chunks
+    while True:
+        failed = [i for i, p in enumerate(partials) if _is_error_response(p)]
+        if len(failed) == len(partials):
+            print(file=sys.stderr)
+            return partials[0] if partials else "Error: No content to summarize."
+        if failed:
+            logger.warning(f"{len(failed)} of {len(partials)} summaries failed; using excerpts of their source text instead.",
+                           extra={"failed_chunks": failed, "reduce_level": levels})
+            for i in failed:
+                # A quarter chunk, so every reduce level still shrinks the text
+                partials[i] = _source_excerpt(inputs[i], chunk_tokens // 4)
+        if len(partials) == 1 or estimate_tokens("\n\n".join(partials)) <= chunk_tokens:
+            break
+
+        groups = group_texts(partials, chunk_tokens)
+        levels += 1
+        done.clear()
+        total = len(groups)
+        print(file=sys.stderr)
+        inputs = ["\n\n".join(group) for group in groups]
+        requests = [{"prompt": _merge_prompt(instructions), "context": context} for context in inputs]
+        partials = generate_ai_responses(requests, plugin_manager=plugin_manager, provider_name=provider_name, concurrency=parallelism, on_result=_progress)
+
+    print(file=sys.stderr)
+    record_metric(
+        "condense_text",
+        (time.perf_counter() - start_time) * 1000,
+        chunks=len(chunks),
+        reduce_levels=levels
+    )
+    return "\n\n".join(partials)
+
+def _run_site_scraper(site_name, scraper_class, navigator, sm, deep=False, backfill=0, unread_only=False):
+    """Runs one site's scraper and reports the time its readiness waits saved over fixed sleeps."""
+    if hasattr(navigator, "reset_readiness_stats"):
+        navigator.reset_readiness_stats()
+    # Options only some scrapers take are passed to those that declare them
+    options = {}
+    if backfill and getattr(scraper_class, "SUPPORTS_BACKFILL", False):
+        options["backfill"] = backfill
+    if unread_only and getattr(scraper_class, "SUPPORTS_UNREAD_ONLY", False):
+        options["unread_only"] = True
+    ok = scraper_class(navigator, sm).refresh(deep=deep, **options)
+    stats = getattr(navigator, "readiness_stats", None)
+    if isinstance(stats, dict) and stats.get("waits"):
+        record_metric("site_refresh_readiness", stats["waited_ms"], site=site_name, waits=stats["waits"],
+                      budget_ms=round(stats["budget_ms"], 2), saved_ms=round(stats["saved_ms"], 2))
+        print(f"Waited {stats['waited_ms'] / 1000:.1f}s for {site_name} to settle instead of {stats['budget_ms'] / 1000:.1f}s of fixed sleeps.")
+    return ok
+
+def _refresh_sites_in_pool(sites, site_urls, scrapers_map, sm, args, size, plugin_manager=None):
+    """Refreshes independent sites concurrently, each in its own pooled browser session."""
+    deep = getattr(args, 'deep', False)
+    backfill = getattr(args, 'backfill', 0)
+    unread_only = getattr(args, 'unread_only', False)
+    browser_name = getattr(args, 'browser', 'firefox')
+
+    def make_task(site_name):
+        def task(navigator):
+            navigator.apply_scrape_profile(ScrapeProfile.from_env(site_name), browser_name)
+            navigator.navigate(site_urls[site_name])
+            return _run_site_scraper(site_name, scrapers_map[site_name], navigator, sm, deep, backfill, unread_only)
+        return task
+
+    tasks = {sn: make_task(sn) for sn in sites if sn in scrapers_map}
+    size = min(size, len(tasks))
+    print(f"Refreshing {len(tasks)} sites with up to {size} browsers in parallel...")
+    start_time = time.perf_counter()
+    # Launch-time blocking has to suit every site a pooled browser may be handed
+    scrape_profile = ScrapeProfile.common(ScrapeProfile.from_env(sn) for sn in tasks)
+    with BrowserPool(size=size, browser_name=browser_name, profile=getattr(args, 'profile', None),
+                     plugin_manager=plugin_manager, scrape_profile=scrape_profile) as pool:
+        results = pool.run(tasks)
+
+    for sn in sites:
+        outcome = results.get(sn)
+        if outcome is None:
+            print(f"Scraper for '{sn}' is not yet fully implemented.")
+        elif outcome["ok"]:
+            print(f"Successfully refreshed data for {sn} ({outcome['duration_ms'] / 1000:.1f}s).")
+        else:
+            reason = f": {outcome['error']}" if outcome.get("error") else ""
+            print(f"Failed to refresh data for {sn}{reason}")
+    print(f"Refreshed {sum(1 for o in results.values() if o['ok'])}/{len(tasks)} sites in {time.perf_counter() - start_time:.1f}s.")
+    return results
 
 def safe_navigate(url, navigator, safety_manager, force=False):
     """Navigates to a URL only if it passes the safety check."""
@@ -177,19 +575,20 @@ def safe_new_tab(url, navigator, safety_manager, force=False):
         return navigator.new_tab(url)
     return False
 
-def site_synthesize(prompt, sm):
-    """Aggregates all site data and uses AI to answer a prompt."""
-    print("Synthesizing data from all sites...")
-    sites = sm.list_sites()
-    all_context = []
-    
-    for site in sites:
+def _collect_site_context(sm):
+    """Returns {site: [context lines]} for every site that has stored data."""
+    site_context = {}
+    for site in sm.list_sites():
         site_dir = sm.get_site_dir(site)
-        files = [f for f in os.listdir(site_dir) if f.endswith(".json") and f != "registry.json"]
+        files = [f for f in os.listdir(site_dir) if (f.endswith(".json") and f != "registry.json") or f.endswith(".jsonl")]
         
         site_data_summary = []
         for f in files:
-            data = sm.load_data(site, f)
+            if f.endswith(".jsonl"):
+                # Append-only message logs: only their tail is read
+                data = {"name": f[:-len(".jsonl")], "messages": sm.load_items(site, f, limit=10)}
+            else:
+                data = sm.load_data(site, f)
             if not data: continue
             
             if site == "calendar":
@@ -205,8 +604,44 @@ def site_synthesize(prompt, sm):
                     site_data_summary.append(f"  [{m.get('timestamp')}] {m.get('user')}: {m.get('text')}")
         
         if site_data_summary:
-            all_context.append(f"--- Data from {site} ---")
-            all_context.extend(site_data_summary)
+            site_context[site] = site_data_summary
+    return site_context
+
+def _summarize_sites(site_context):
+    """Condenses each site's data with one concurrent AI call per site."""
+    sites = list(site_context)
+    requests = [{
+        "prompt": f"Summarize the key people, plans, open questions and upcoming events in this {site} data. Be concise and keep names, dates and times.",
+        "context": "\n".join(site_context[site])
+    } for site in sites]
+
+    def _progress(index, _text):
+        print(f"  Summarized {sites[index]}", file=sys.stderr)
+
+    summaries = generate_ai_responses(requests, on_result=_progress)
+    condensed = {}
+    for site, summary in zip(sites, summaries):
+        if _is_error_response(summary):
+            # Keep the site's raw data rather than silently dropping it from the synthesis
+            logger.warning(f"Summarizing {site} failed; using its raw data instead: {summary}")
+            print(f"  Could not summarize {site}; using its raw data.", file=sys.stderr)
+            condensed[site] = site_context[site]
+        else:
+            condensed[site] = [summary]
+    return condensed
+
+def site_synthesize(prompt, sm, per_site=False):
+    """Aggregates all site data and uses AI to answer a prompt."""
+    print("Synthesizing data from all sites...")
+    site_context = _collect_site_context(sm)
+    if per_site and len(site_context) > 1:
+        print(f"Summarizing {len(site_context)} sites concurrently...")
+        site_context = _summarize_sites(site_context)
+
+    all_context = []
+    for site, site_data_summary in site_context.items():
+        all_context.append(f"--- Data from {site} ---")
+        all_context.extend(site_data_summary)
 
     full_context = "\n".join(all_context)
     
@@ -226,13 +661,12 @@ def site_synthesize(prompt, sm):
     print("Generating AI response...")
     # Combine system instructions and data into the context
     context = f"{system_prompt}\n\nSite Data:\n{full_context}"
-    response = generate_ai_response(prompt, context=context)
     print("\n--- Aria Synthesis ---")
-    print(response)
+    return stream_ai_response(prompt, context=context)
 
-def main():
+def main(argv=None, runtime=None):
     try:
-        _run_cli()
+        _run_cli(argv, runtime)
     except AriaError as e:
         print(f"Error: {e}")
         logger.error(f"AriaError: {e}")
@@ -240,10 +674,8 @@ def main():
         print(f"An unexpected error occurred: {e}")
         logger.error(f"Unexpected error: {e}", exc_info=True)
 
-def _run_cli():
-    # Pre-process sys.argv for 'page' command to support 'aria page <id> <cmd>'
-    import sys
-    
+def _create_runtime():
+    """Creates the managers, plugins and AI providers shared by every command in this process."""
     # Initialize core managers (without navigator yet)
     script_manager = ScriptManager()
     safety_manager = SafetyManager()
@@ -267,27 +699,130 @@ def _run_cli():
         plugin_manager.ai_providers["gemini"] = GeminiProvider({"version": VERSION})
         logger.info("Registered default GeminiProvider as 'gemini'.")
 
-    if len(sys.argv) > 2 and sys.argv[1] == 'page':
-        if sys.argv[2] not in ['new', 'list', 'goto', 'interact', 'summarize', 'tag', 'export', '-h', '--help']:
-            # Assume sys.argv[2] is an identifier
-            # If sys.argv[3] is 'goto', 'interact', 'summarize', 'tag', 'export', swap them
-            if len(sys.argv) > 3 and sys.argv[3] in ['goto', 'interact', 'summarize', 'tag', 'export']:
-                ident = sys.argv.pop(2)
-                sys.argv.insert(3, ident)
-
-    # Pre-process sys.argv for 'script' command to support 'aria script <id> <cmd>'
-    if len(sys.argv) > 2 and sys.argv[1] == 'script':
-        if sys.argv[2] not in ['new', 'list', 'edit', 'remove', 'run', '-h', '--help']:
-            # Assume sys.argv[2] is an identifier
-            if len(sys.argv) > 3 and sys.argv[3] in ['edit', 'remove', 'run']:
-                ident = sys.argv.pop(2)
-                sys.argv.insert(3, ident)
+    # Offline provider for benchmarks and CI (use --provider stub)
+    if "stub" not in plugin_manager.list_ai_providers():
+        plugin_manager.ai_providers["stub"] = StubProvider({"version": VERSION})
+
+    # The router picks the fastest healthy provider among all the others (use --provider router)
+    if "router" not in plugin_manager.list_ai_providers():
+        plugin_manager.ai_providers["router"] = RoutingProvider({"version": VERSION}, providers=plugin_manager.ai_providers)
+
+    # Built-in HTTP fast-path navigators ('http', 'auto'); plugins may replace either name
+    for name, nav_class in HttpNavigatorPlugin(context).get_navigators().items():
+        if name not in plugin_manager.list_navigators():
+            plugin_manager.navigators[name] = nav_class
+
+    return {
+        "script_manager": script_manager,
+        "safety_manager": safety_manager,
+        "report_manager": report_manager,
+        "plugin_manager": plugin_manager,
+        # Navigators by name; the daemon keeps them (and their live drivers) between commands
+        "navigators": {},
+        # Spare browsers for start_session; only the daemon lives long enough to keep them
+        "standby_pool": None
+    }
+
+def _drop_stale_driver(navigator):
+    """Forgets a kept driver whose session was closed or replaced by another aria process."""
+    if not getattr(navigator, "driver", None) or not hasattr(navigator, "_get_current_browser"):
+        return
+    browser_name = navigator._get_current_browser()
+    session_data = navigator._load_session_data(browser_name) if browser_name else None
+    if not session_data or session_data.get("session_id") != getattr(navigator.driver, "session_id", None):
+        navigator.driver = None
+
+def _run_daemon_command(args, runtime):
+    """Handles `aria daemon start|stop|status`."""
+    socket_path = aria_daemon.get_socket_path()
+    if not aria_daemon.is_supported():
+        print("Error: The aria daemon needs Unix domain socket support, which this platform lacks.")
+        return
+
+    if args.daemon_command == 'status':
+        status = aria_daemon.ping(socket_path)
+        if status:
+            state = "busy" if status.get("busy") else "idle"
+            print(f"Aria daemon running (PID {status['pid']}, up {status['uptime']}s, {status['commands']} commands served, {state}) on {socket_path}")
+            for key, counts in sorted(status.get("standby", {}).items()):
+                print(f"  Standby {key}: {counts['ready']} ready, {counts['starting']} starting")
+        else:
+            print("Aria daemon is not running.")
+    elif args.daemon_command == 'stop':
+        if aria_daemon.request({"type": "shutdown"}, socket_path):
+            print("Aria daemon stopped.")
+        else:
+            print("Aria daemon is not running.")
+    elif args.daemon_command == 'start':
+        status = aria_daemon.ping(socket_path)
+        if status:
+            print(f"Aria daemon already running (PID {status['pid']}) on {socket_path}")
+            return
+        if args.foreground:
+            def serve_command(argv):
+                # Metrics are reported per command, as in a one-shot process
+                clear_performance_metrics()
+                main(argv, runtime)
+
+            # The daemon outlives its commands, so warm CLI workers get used rather than killed at exit
+            keep_cli_pool_warm()
+            runtime["standby_pool"] = create_standby_pool(args.prewarm)
+            standby_status = (lambda: {"standby": runtime["standby_pool"].status()}) if runtime["standby_pool"] else None
+            server = aria_daemon.DaemonServer(serve_command, socket_path=socket_path, status_extra=standby_status)
+            print(f"Aria daemon listening on {socket_path}")
+            sys.stdout.flush()
+            try:
+                server.serve_forever()
+            finally:
+                if runtime["standby_pool"]:
+                    runtime["standby_pool"].close()
+            return
+
+        import subprocess
+        prewarm = ["--prewarm", args.prewarm] if args.prewarm else []
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "daemon", "start", "--foreground"] + prewarm,
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True, close_fds=True, env=dict(os.environ)
+        )
+        status = aria_daemon.wait_until_ready(socket_path)
+        if status:
+            print(f"Aria daemon started (PID {status['pid']}) on {socket_path}")
+        else:
+            print("Error: The aria daemon did not start. See ~/.aria/aria.log for details.")
+
+def _run_cli(argv=None, runtime=None):
+    # Commands from the daemon bring their own argv and share its runtime
+    argv = ["aria"] + list(argv) if argv is not None else list(sys.argv)
+    if runtime is None:
+        runtime = _create_runtime()
+    script_manager = runtime["script_manager"]
+    safety_manager = runtime["safety_manager"]
+    report_manager = runtime["report_manager"]
+    plugin_manager = runtime["plugin_manager"]
+
+    # Pre-process argv for 'page' command to support 'aria page <id> <cmd>'
+    if len(argv) > 2 and argv[1] == 'page':
+        if argv[2] not in ['new', 'list', 'goto', 'interact', 'summarize', 'tag', 'export', '-h', '--help']:
+            # Assume argv[2] is an identifier
+            # If argv[3] is 'goto', 'interact', 'summarize', 'tag', 'export', swap them
+            if len(argv) > 3 and argv[3] in ['goto', 'interact', 'summarize', 'tag', 'export']:
+                ident = argv.pop(2)
+                argv.insert(3, ident)
+
+    # Pre-process argv for 'script' command to support 'aria script <id> <cmd>'
+    if len(argv) > 2 and argv[1] == 'script':
+        if argv[2] not in ['new', 'list', 'edit', 'remove', 'run', '-h', '--help']:
+            # Assume argv[2] is an identifier
+            if len(argv) > 3 and argv[3] in ['edit', 'remove', 'run']:
+                ident = argv.pop(2)
+                argv.insert(3, ident)
             else:
                 # 'aria script <id>' - just viewing
                 # We'll treat this as 'aria script view <id>' internally
-                ident = sys.argv.pop(2)
-                sys.argv.insert(2, 'view')
-                sys.argv.insert(3, ident)
+                ident = argv.pop(2)
+                argv.insert(2, 'view')
+                argv.insert(3, ident)
 
     parser = argparse.ArgumentParser(description="Aria CLI - Your web automation assistant.")
     parser.add_argument('--log-level', type=str, default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'], help='Set the logging level.')
@@ -296,7 +831,8 @@ def _run_cli():
     parser.add_argument('--force', action='store_true', help='Force actions and bypass safety warnings.')
     parser.add_argument('--slow-mo', type=float, default=0.0, help='Add a delay in seconds between browser actions.')
     parser.add_argument('--provider', type=str, help='The AI provider to use for generation.')
-    parser.add_argument('--navigator', type=str, default='aria', help='The navigator engine to use.')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the local AI response cache.')
+    parser.add_argument('--navigator', type=str, default='aria', help="The navigator engine to use: 'aria' (browser), 'http' (static pages over HTTP) or 'auto' (HTTP, escalating to the browser).")
     parser.add_argument('-v', '--version', action='store_true', help='Show version information.')
     
     subparsers = parser.add_subparsers(dest="command", required=False)
@@ -405,6 +941,12 @@ def _run_cli():
     parser_site_refresh = site_subparsers.add_parser('refresh', help='Refresh data for a specific site.')
     parser_site_refresh.add_argument('site_name', type=str, help='The name of the site (e.g., google-messages) or "all".')
     parser_site_refresh.add_argument('--deep', action='store_true', help='Perform a deep crawl (follows all thread links, etc). Default is False.')
+    parser_site_refresh.add_argument('--backfill', type=int, nargs='?', const=20, default=0, metavar='PAGES', help='Also scroll up to this many screens (default 20) into each channel\'s history to close gaps since its last sync (Discord).')
+    parser_site_refresh.add_argument('--unread-only', action='store_true', help='Only open conversations with unread messages instead of every conversation that changed since the last refresh (WhatsApp).')
+    parser_site_refresh.add_argument('--parallel', type=int, help='Refresh up to this many sites at once, each in its own headless browser on a copy of your profile.')
+    parser_site_refresh.add_argument('--browser', type=str, default='firefox', choices=['chrome', 'firefox', 'edge'], help='The browser to use.')
+    parser_site_refresh.add_argument('--headless', action='store_true', help='Start a headless scrape-only browser that skips images, fonts and media (see ARIA_BLOCK_RESOURCES).')
+    parser_site_refresh.add_argument('--profile', type=str, help='The browser profile whose logins to use.')
     
     parser_site_cleanup = site_subparsers.add_parser('cleanup', help='Remove old data files for a site.')
     parser_site_cleanup.add_argument('site_name', type=str, help='The name of the site.')
@@ -412,6 +954,7 @@ def _run_cli():
 
     parser_site_synthesize = site_subparsers.add_parser('synthesize', help='Synthesize data across all sites to answer a prompt or suggest goals.')
     parser_site_synthesize.add_argument('prompt', type=str, nargs='?', help='The question or goal to achieve (e.g. "Suggest someone for coffee tomorrow").')
+    parser_site_synthesize.add_argument('--per-site', action='store_true', help='Summarize each site concurrently before synthesizing (faster for large histories).')
 
     parser_site_show = site_subparsers.add_parser('show', help='Show local data for a site.')
     parser_site_show.add_argument('site_name', choices=['google-messages', 'whatsapp', 'discord', 'calendar', 'threads', 'youtube-studio'], help='The name of the site.')
@@ -419,6 +962,15 @@ def _run_cli():
     parser_site_show.add_argument('sub_action', nargs='?', help='Secondary action (e.g., "show" or "people" when an ID is provided).')
     parser_site_show.add_argument('extra_action', type=str, nargs='?', help='Tertiary action (used for Discord channels).')
 
+    # Define the 'daemon' command
+    parser_daemon = subparsers.add_parser('daemon', help='Run a resident aria process that keeps browsers and AI clients warm.')
+    daemon_subparsers = parser_daemon.add_subparsers(dest="daemon_command", required=True)
+    parser_daemon_start = daemon_subparsers.add_parser('start', help='Start the daemon; later aria commands are sent to it.')
+    parser_daemon_start.add_argument('--foreground', action='store_true', help='Serve in this process instead of detaching.')
+    parser_daemon_start.add_argument('--prewarm', type=str, help='Keep spare browsers started for `aria open`, e.g. "chrome,firefox@work" (default: ARIA_STANDBY).')
+    daemon_subparsers.add_parser('stop', help='Stop the daemon.')
+    daemon_subparsers.add_parser('status', help='Show whether the daemon is running.')
+
     # Define the 'diag' command
     subparsers.add_parser('diag', help='Show diagnostic information.')
 
@@ -440,6 +992,11 @@ def _run_cli():
 
     settings_subparsers.add_parser('cleanup', help='Clean up stale session files and orphaned driver processes.')
 
+    settings_subparsers.add_parser('clear-cache', help='Remove all cached AI responses and navigation decisions.')
+
+    parser_settings_drivers = settings_subparsers.add_parser('drivers', help='Show the registered WebDriver binaries used to start browsers offline.')
+    parser_settings_drivers.add_argument('--update', choices=['chrome', 'firefox', 'edge'], action='append', help='Download and register the current driver for a browser (needs network; repeatable).')
+
     parser_settings_archive = settings_subparsers.add_parser('archive-site', help='Create a ZIP archive of all data for a specific site.')
     parser_settings_archive.add_argument('site_name', type=str, help='The name of the site to archive.')
     parser_settings_archive.add_argument('--path', type=str, help='Optional output path for the ZIP file.')
@@ -469,7 +1026,7 @@ def _run_cli():
             p.add_argument(name, **arg_copy)
         p.set_defaults(func=cmd_def['callback'])
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv[1:])
 
     if args.version:
         print(f"aria CLI version {VERSION}")
@@ -482,6 +1039,9 @@ def _run_cli():
     if args.force:
         os.environ["ARIA_NON_INTERACTIVE"] = "true"
 
+    if args.no_cache:
+        os.environ["ARIA_NO_CACHE"] = "true"
+
     # Instantiate the selected navigator
     nav_name = args.navigator
     nav_class = plugin_manager.get_navigator(nav_name)
@@ -492,9 +1052,16 @@ def _run_cli():
         else:
             print(f"Error: Navigator '{nav_name}' not found. Falling back to 'aria'.")
             nav_class = AriaNavigator
-            
-    navigator = nav_class()
+
+    navigator = runtime["navigators"].get(nav_class)
+    if navigator is None:
+        navigator = nav_class()
+        runtime["navigators"][nav_class] = navigator
+    else:
+        _drop_stale_driver(navigator)
     navigator.plugin_manager = plugin_manager
+    if hasattr(navigator, "standby_pool"):
+        navigator.standby_pool = runtime.get("standby_pool")
     
     # Update plugin context with the final navigator
     plugin_manager.context["navigator"] = navigator
@@ -508,6 +1075,12 @@ def _run_cli():
     
     logger.info(f"Command received: {args.command}", extra={"command": args.command, "arguments": vars(args)})
 
+    _warm_ai_client(args)
+
+    if args.command == 'daemon':
+        _run_daemon_command(args, runtime)
+        return
+
     # Dispatch to plugin command if applicable
     if hasattr(args, 'func'):
         args.func(args)
@@ -524,6 +1097,9 @@ def _run_cli():
 
     if args.slow_mo > 0:
         navigator.throttle_delay = args.slow_mo
+    elif hasattr(navigator, "throttle_delay"):
+        # A kept navigator must not carry --slow-mo over from an earlier command
+        navigator.throttle_delay = 0.0
         
     if args.command == 'open':
         safety_manager.ensure_disclaimer_accepted()
@@ -577,7 +1153,7 @@ def _run_cli():
                     import subprocess
                     try:
                         print(f"Running command: {command}")
-                        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=10)
+                        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=10, env=dict(os.environ))
                         content = f"<h2>Local Command Results</h2><p>Command: <code>{command}</code></p><pre>{result.stdout}\n{result.stderr}</pre>"
                     except Exception as e:
                         content = f"<h2>Error Running Local Command</h2><pre>{str(e)}</pre>"
@@ -827,8 +1403,9 @@ def _run_cli():
                 refined_prompt, context = navigator.resolve_prompt(args.prompt)
                 if context:
                     print("Synthesizing information across tabs for summary...")
-                    result = generate_ai_response(refined_prompt, context, output_format=args.format, plugin_manager=plugin_manager, provider_name=args.provider)
-                    print(result)
+                    if needs_chunking(context):
+                        context = _condense_or_keep(context, refined_prompt, plugin_manager, args.provider)
+                    result = stream_ai_response(refined_prompt, context, output_format=args.format, plugin_manager=plugin_manager, provider_name=args.provider)
                     if args.report:
                         metrics = get_performance_metrics()
                         if args.report_format == 'html':
@@ -851,8 +1428,7 @@ def _run_cli():
             content = navigator.get_page_content()
             if content:
                 prompt = args.prompt or "Summarize the following text:"
-                summary = summarize_text(f"{prompt}\n\n{content}", output_format=args.format, plugin_manager=plugin_manager, provider_name=args.provider)
-                print(summary)
+                summary = summarize_text(content, output_format=args.format, plugin_manager=plugin_manager, provider_name=args.provider, stream=True, prompt=prompt)
                 if args.report:
                     metrics = get_performance_metrics()
                     if args.report_format == 'html':
@@ -931,7 +1507,9 @@ def _run_cli():
         if args.report_command == 'generate':
             refined_prompt, context = navigator.resolve_prompt(args.prompt)
             print("Generating report content...")
-            result = generate_ai_response(refined_prompt, context, plugin_manager=plugin_manager, provider_name=args.provider)
+            if context and needs_chunking(context):
+                context = _condense_or_keep(context, refined_prompt, plugin_manager, args.provider)
+            result = stream_ai_response(refined_prompt, context, plugin_manager=plugin_manager, provider_name=args.provider)
             title = args.title or "General Report"
             metrics = get_performance_metrics()
             if args.format == 'html':
@@ -992,7 +1570,16 @@ def _run_cli():
                 sites_to_refresh = [site_name]
 
             browser_name = getattr(args, 'browser', 'firefox')
-            
+
+            parallel = args.parallel if args.parallel is not None else int(os.environ.get("ARIA_SITE_REFRESH_PARALLEL", 1))
+            if parallel > 1 and len(sites_to_refresh) > 1:
+                _refresh_sites_in_pool(sites_to_refresh, site_urls, scrapers_map, sm, args, parallel, plugin_manager)
+                return
+
+            headless = getattr(args, 'headless', False)
+            # Only headless sessions are scrape-only; a browser the user works in keeps loading everything
+            scrape_profile = ScrapeProfile.common(ScrapeProfile.from_env(sn) for sn in sites_to_refresh) if headless else None
+
             for sn in sites_to_refresh:
                 print(f"\n--- Refreshing data for {sn} ---")
                 target_url = site_urls[sn]
@@ -1005,21 +1592,27 @@ def _run_cli():
                         found = True
                 
                 if not found:
-                    headless = getattr(args, 'headless', False)
                     profile = getattr(args, 'profile', None)
-                    if not navigator.start_session(browser_name=browser_name, headless=headless, profile=profile):
+                    if not navigator.start_session(browser_name=browser_name, headless=headless, profile=profile, scrape_profile=scrape_profile):
                         print(f"Failed to start session for {sn}.")
                         continue
                     # Check again in the new session just in case
-                    if not navigator.find_tab_by_url(target_url):
-                        print(f"Navigating to {target_url}...")
-                        navigator.navigate(target_url)
+                    found = bool(navigator.find_tab_by_url(target_url))
+
+                # Each site's blocking rules replace the previous site's, in a reused tab as much as a new one;
+                # a site with blocking switched off gets an empty profile so the previous rules are cleared
+                if navigator.scrape_profile:
+                    navigator.apply_scrape_profile(ScrapeProfile.from_env(sn) or ScrapeProfile(block_types=[]), browser_name)
+
+                if not found:
+                    print(f"Navigating to {target_url}...")
+                    navigator.navigate(target_url)
 
                 # Dispatch to scraper
                 if sn in scrapers_map:
-                    scraper = scrapers_map[sn](navigator, sm)
-                    # Pass the deep flag to the refresh method
-                    if scraper.refresh(deep=getattr(args, 'deep', False)):
+                    # Pass the deep, backfill and unread-only flags to the refresh method
+                    if _run_site_scraper(sn, scrapers_map[sn], navigator, sm, deep=getattr(args, 'deep', False),
+                                         backfill=getattr(args, 'backfill', 0), unread_only=getattr(args, 'unread_only', False)):
                         print(f"Successfully refreshed data for {sn}.")
                     else:
                         print(f"Failed to refresh data for {sn}.")
@@ -1030,7 +1623,7 @@ def _run_cli():
             count = sm.cleanup_old_data(args.site_name, days=args.days)
             print(f"Cleaned up {count} old data file(s) for {args.site_name}.")
         elif args.site_command == 'synthesize':
-            site_synthesize(args.prompt, sm)
+            site_synthesize(args.prompt, sm, per_site=args.per_site)
         elif args.site_command == 'show':
             site_name = args.site_name
             sm = SiteManager()
@@ -1075,16 +1668,16 @@ def _run_cli():
             
             # 2. Action: <id> list (Specific to Discord for listing channels)
             elif site_name == "discord" and item_name and args.sub_action == 'list':
-                # Find all chat_ServerName_*.json files
+                # Find all chat_ServerName_*.jsonl message logs (and not yet migrated .json snapshots)
                 safe_server = "".join([c if c.isalnum() else "_" for c in item_name])
                 site_dir = sm.get_site_dir(site_name)
-                files = [f for f in os.listdir(site_dir) if f.startswith(f"chat_{safe_server}_") and f.endswith(".json")]
+                files = [f for f in os.listdir(site_dir) if f.startswith(f"chat_{safe_server}_") and f.endswith((".json", ".jsonl"))]
                 
                 if files:
                     print(f"Channels in {item_name}:")
-                    for f in files:
-                        # Extract channel name from filename: chat_Server_Channel.json
-                        chan_name = f.replace(f"chat_{safe_server}_", "").replace(".json", "")
+                    # Extract channel name from filename: chat_Server_Channel.jsonl
+                    channels = {os.path.splitext(f)[0].replace(f"chat_{safe_server}_", "") for f in files}
+                    for chan_name in sorted(channels):
                         print(f"- {chan_name}")
                 else:
                     print(f"No channels found for server {item_name}.")
@@ -1249,7 +1842,6 @@ def _run_cli():
             else:
                 parser_site_show.print_help()
     elif args.command == 'diag':
-        import sys
         import platform
         print(f"Aria Version: {VERSION}")
         print(f"Python Version: {sys.version}")
@@ -1305,6 +1897,23 @@ def _run_cli():
         elif args.settings_command == 'cleanup':
             count = navigator.cleanup_orphaned_sessions()
             print(f"Cleanup complete. Removed {count} stale session(s).")
+        elif args.settings_command == 'clear-cache':
+            count = get_ai_cache().clear()
+            nav_count = NavigationDecisionCache().cache.clear()
+            print(f"Removed {count} cached AI response(s) and {nav_count} cached navigation decision(s).")
+        elif args.settings_command == 'drivers':
+            registry = get_driver_registry()
+            for browser in args.update or []:
+                try:
+                    registry.resolve(browser, refresh=True)
+                except Exception as e:
+                    print(f"Error: Could not download a driver for {browser}: {e}")
+            entries = registry.load()
+            if not entries:
+                print(f"No drivers registered yet ({registry.path}). They are recorded the first time a browser starts.")
+            for browser, entry in sorted(entries.items()):
+                status = " (stale)" if entry.get("stale") else ""
+                print(f"{browser}: {entry.get('version') or 'unknown version'} at {entry.get('path')} [{entry.get('source')}]{status}")
         elif args.settings_command == 'archive-site':
             sm = SiteManager()
             path = sm.archive_site(args.site_name, output_path=args.path)
@@ -1358,6 +1967,7 @@ def _run_cli():
             print(f"  Scripts Directory: {os.path.join(aria_dir, 'scripts')}")
             print(f"  Plugins Directory: {os.path.join(aria_dir, 'plugins')}")
             print(f"  Default Provider:  {os.environ.get('ARIA_DEFAULT_AI_PROVIDER', 'gemini')}")
+            print(f"  AI Cache:          {get_ai_cache().cache_dir if is_cache_enabled() else 'disabled'}")
             print(f"  Log Level:         {logging.getLevelName(logger.getEffectiveLevel())}")
             print(f"  Current Browser:   {navigator._get_current_browser()}")
             print(f"  Active Browsers:   {', '.join(navigator.list_active_browsers())}")
@@ -1375,8 +1985,9 @@ def _run_cli():
         print("\nGLOBAL OPTIONS")
         print("    --force          Bypass safety warnings and run in non-interactive mode.")
         print("    --slow-mo SEC    Add a delay (in seconds) between browser actions.")
-        print("    --navigator NAV  Select navigator engine (default: 'aria').")
+        print("    --navigator NAV  Select navigator engine: 'aria', 'http' or 'auto' (default: 'aria').")
         print("    --provider PROV  Select AI provider (default: 'gemini').")
+        print("    --no-cache       Bypass the local AI response cache.")
         print("    --log-level LVL  Set logging verbosity (DEBUG, INFO, WARNING, ERROR).")
         print("\nCOMMANDS")
         print("    open [URL] [--browser B] [--headless]")
@@ -1410,6 +2021,7 @@ def _run_cli():
         print("\nFILES")
         print(f"    ~/.aria/         Home directory for configuration, scripts, and logs.")
         print(f"    ~/.aria/aria.log Application logs.")
+        print(f"    ~/.aria/cache/ai Cached AI responses (see --no-cache).")
         print("\nSEE ALSO")
         print("    For full documentation and recipes, see the 'docs/' directory in the source.")
 
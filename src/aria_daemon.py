@@ -0,0 +1,462 @@
+import os
+import sys
+import json
+import time
+import socket
+import select
+import builtins
+import getpass
+import threading
+import contextlib
+import contextvars
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, List, Optional
+
+# Only the standard library is imported here: the client side runs before aria.py loads
+# selenium, google-genai and the scrapers, which is the startup cost the daemon avoids.
+
+DEFAULT_CONNECT_TIMEOUT = 0.5
+DEFAULT_START_TIMEOUT = 30.0
+# How often a running command checks whether its client hung up
+DISCONNECT_POLL = 0.5
+
+# The command whose context a thread runs in: its environment, output streams and client.
+# Threads outside any command (standby launches, pool refills) see the daemon's own.
+_command_env = contextvars.ContextVar("aria_command_env", default=None)
+_command_io = contextvars.ContextVar("aria_command_io", default=None)
+# Set once the command's client hangs up; long-running work checks it with raise_if_cancelled()
+_command_cancelled = contextvars.ContextVar("aria_command_cancelled", default=None)
+
+def get_socket_path() -> str:
+    return os.environ.get("ARIA_DAEMON_SOCKET") or os.path.join(os.path.expanduser("~"), ".aria", "daemon.sock")
+
+def is_supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+def is_disabled() -> bool:
+    return os.environ.get("ARIA_NO_DAEMON", "false").lower() == "true"
+
+def raise_if_cancelled():
+    """
+    Raises KeyboardInterrupt if the daemon command this thread runs for has lost its client.
+    Long-running loops call it between steps, so a hung-up command stops itself at a point
+    where no lock is held; outside the daemon it does nothing.
+    """
+    cancelled = _command_cancelled.get()
+    if cancelled is not None and cancelled.is_set():
+        raise KeyboardInterrupt("The aria client disconnected.")
+
+def _send(sock: socket.socket, message: Dict[str, Any]):
+    sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+def _connect(socket_path: str = None, timeout: float = DEFAULT_CONNECT_TIMEOUT) -> Optional[socket.socket]:
+    """Connects to the daemon socket, or returns None when no daemon is listening."""
+    if not is_supported():
+        return None
+    socket_path = socket_path or get_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+def request(message: Dict[str, Any], socket_path: str = None) -> Optional[Dict[str, Any]]:
+    """Sends a control message (ping, shutdown) and returns the daemon's reply."""
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+    with sock, sock.makefile("r", encoding="utf-8") as reader:
+        _send(sock, message)
+        line = reader.readline()
+    return json.loads(line) if line else None
+
+def ping(socket_path: str = None) -> Optional[Dict[str, Any]]:
+    return request({"type": "ping"}, socket_path)
+
+def run_command(argv: List[str], socket_path: str = None, stdin=None, stdout=None, stderr=None) -> Optional[int]:
+    """
+    Runs an aria command inside the daemon, relaying its output and any prompts.
+    Returns the command's exit code, or None if no daemon is running.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+
+    with sock, sock.makefile("r", encoding="utf-8") as reader:
+        _send(sock, {
+            "type": "run",
+            "argv": list(argv),
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+            "isatty": stdout.isatty() if hasattr(stdout, "isatty") else False
+        })
+        for line in reader:
+            message = json.loads(line)
+            kind = message.get("type")
+            if kind == "output":
+                stream = stderr if message.get("stream") == "stderr" else stdout
+                stream.write(message["data"])
+                stream.flush()
+            elif kind == "input":
+                _send(sock, _answer_prompt(message, stdin, stdout))
+            elif kind == "exit":
+                return message.get("code", 0)
+    # The daemon went away mid-command
+    stderr.write("Error: Lost connection to the aria daemon.\n")
+    return 1
+
+def _answer_prompt(message: Dict[str, Any], stdin, stdout) -> Dict[str, Any]:
+    try:
+        if message.get("secret"):
+            value = getpass.getpass(message.get("prompt", ""))
+        else:
+            stdout.write(message.get("prompt", ""))
+            stdout.flush()
+            value = stdin.readline()
+            if not value:
+                raise EOFError
+            value = value.rstrip("\n")
+    except (EOFError, KeyboardInterrupt):
+        return {"type": "eof"}
+    return {"type": "input", "value": value}
+
+def forward_command(argv: List[str]) -> Optional[int]:
+    """Entry point used by aria.py before its heavy imports; None means run the command locally."""
+    if is_disabled() or (argv and argv[0] == "daemon"):
+        return None
+    try:
+        return run_command(argv)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # Output piped into something like `head` that stopped reading
+        return 1
+
+class _ClientStream:
+    """File-like object that relays writes to the client as output messages."""
+    encoding = "utf-8"
+
+    def __init__(self, connection: "_Connection", name: str, tty: bool = False):
+        self.connection = connection
+        self.name = name
+        self.tty = tty
+
+    def write(self, data: str) -> int:
+        if self.connection.closed:
+            # The client hung up (e.g. Ctrl-C): stop the command like a local Ctrl-C would
+            raise KeyboardInterrupt("The aria client disconnected.")
+        if data:
+            self.connection.send({"type": "output", "stream": self.name, "data": data})
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return self.tty
+
+class _Connection:
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.reader = sock.makefile("r", encoding="utf-8")
+        self.closed = False
+        self.prompting = False
+
+    def send(self, message: Dict[str, Any]):
+        # Sending to a client that hung up marks the connection closed; the command's next write stops it
+        if self.closed:
+            return
+        try:
+            _send(self.sock, message)
+        except OSError:
+            self.closed = True
+
+    def receive(self) -> Optional[Dict[str, Any]]:
+        line = self.reader.readline()
+        return json.loads(line) if line else None
+
+    def prompt(self, text: str = "", secret: bool = False) -> str:
+        if self.closed:
+            raise KeyboardInterrupt("The aria client disconnected.")
+        self.prompting = True
+        try:
+            self.send({"type": "input", "prompt": str(text), "secret": secret})
+            reply = None if self.closed else self.receive()
+        finally:
+            self.prompting = False
+        if not reply or reply.get("type") != "input":
+            raise EOFError("No input available from the aria client.")
+        return reply.get("value", "")
+
+    def hung_up(self) -> bool:
+        """True once the client closed its end; only checked while no prompt reply is awaited."""
+        if self.closed:
+            return True
+        if self.prompting:
+            return False
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+            if readable and not self.sock.recv(1, socket.MSG_PEEK):
+                self.closed = True
+        except (OSError, ValueError):
+            self.closed = True
+        return self.closed
+
+    def close(self):
+        self.closed = True
+        with contextlib.suppress(OSError):
+            self.reader.close()
+            self.sock.close()
+
+class _CommandEnviron(MutableMapping):
+    """
+    Stands in for os.environ while the daemon runs: inside a command it reads and writes
+    that command's copy of the client environment, elsewhere the daemon's own. Child
+    processes would inherit the daemon's process environment, so code that starts one
+    passes `env=dict(os.environ)`.
+    """
+    def __init__(self, base):
+        self.base = base
+
+    def _current(self):
+        env = _command_env.get()
+        return self.base if env is None else env
+
+    def __getitem__(self, key):
+        return self._current()[key]
+
+    def __setitem__(self, key, value):
+        self._current()[key] = value
+
+    def __delitem__(self, key):
+        del self._current()[key]
+
+    def __iter__(self):
+        return iter(list(self._current()))
+
+    def __len__(self):
+        return len(self._current())
+
+    def copy(self):
+        return dict(self._current())
+
+    def __repr__(self):
+        return f"environ({self.copy()!r})"
+
+class _CommandStream:
+    """Stands in for sys.stdout/sys.stderr: writes go to the current command's client, or to `base`."""
+    def __init__(self, base, index: int):
+        self.base = base
+        self.index = index
+
+    def _current(self):
+        streams = _command_io.get()
+        return self.base if streams is None else streams[self.index]
+
+    def write(self, data):
+        return self._current().write(data)
+
+    def flush(self):
+        return self._current().flush()
+
+    def isatty(self):
+        return self._current().isatty()
+
+    def __getattr__(self, name):
+        return getattr(self._current(), name)
+
+def _command_input(original):
+    def prompt(text=""):
+        streams = _command_io.get()
+        return original(text) if streams is None else streams[2].prompt(text)
+    return prompt
+
+def _command_getpass(original):
+    def prompt(text="Password: ", stream=None):
+        streams = _command_io.get()
+        return original(text, stream) if streams is None else streams[2].prompt(text, secret=True)
+    return prompt
+
+@contextlib.contextmanager
+def _command_context_hooks():
+    """Routes os.environ, stdout/stderr and prompts through the per-command context while serving."""
+    saved = (os.environ, sys.stdout, sys.stderr, builtins.input, getpass.getpass)
+    os.environ = _CommandEnviron(saved[0])
+    sys.stdout, sys.stderr = _CommandStream(saved[1], 0), _CommandStream(saved[2], 1)
+    builtins.input, getpass.getpass = _command_input(saved[3]), _command_getpass(saved[4])
+    try:
+        yield
+    finally:
+        os.environ, sys.stdout, sys.stderr, builtins.input, getpass.getpass = saved
+
+class DaemonServer:
+    """
+    Resident process that runs aria commands on behalf of thin clients.
+
+    Commands arrive as argv lists over a Unix domain socket and are handed to `handler`,
+    which keeps its browser drivers, plugin manager and AI clients between commands.
+    Commands run one at a time, each with the client's working directory and environment,
+    and with stdout, stderr and interactive prompts relayed back to the client. The
+    environment, output and prompts are bound to the command's context rather than swapped
+    process-wide, so background threads keep the daemon's own; threads that should act for
+    the command have to run in a copy of its context. A command whose client hangs up is
+    cancelled: its next write or prompt raises KeyboardInterrupt, as does its next
+    raise_if_cancelled() checkpoint (navigation, readiness waits, AI output).
+    """
+    def __init__(self, handler: Callable[[List[str]], Optional[int]], socket_path: str = None, idle_timeout: float = None,
+                 status_extra: Callable[[], Dict[str, Any]] = None):
+        self.handler = handler
+        # Adds fields (e.g. warm standby browsers) to the status reply
+        self.status_extra = status_extra
+        self.socket_path = socket_path or get_socket_path()
+        if idle_timeout is None:
+            idle_timeout = float(os.environ.get("ARIA_DAEMON_IDLE_TIMEOUT", 0))
+        self.idle_timeout = idle_timeout
+        self.started_at = time.time()
+        self.last_activity = time.monotonic()
+        self.commands_served = 0
+        self._command_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._listener = None
+
+    def _bind(self):
+        if ping(self.socket_path) is not None:
+            raise RuntimeError(f"An aria daemon is already listening on {self.socket_path}")
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        # Commands run with the owner's browser sessions and credentials
+        os.chmod(self.socket_path, 0o600)
+        listener.listen(8)
+        listener.settimeout(1.0)
+        self._listener = listener
+
+    def serve_forever(self):
+        self._bind()
+        hooks = _command_context_hooks()
+        hooks.__enter__()
+        try:
+            while not self._stopping.is_set():
+                try:
+                    sock, _ = self._listener.accept()
+                except socket.timeout:
+                    if self.idle_timeout and time.monotonic() - self.last_activity > self.idle_timeout:
+                        break
+                    continue
+                sock.settimeout(None)
+                threading.Thread(target=self._handle, args=(sock,), daemon=True).start()
+        finally:
+            hooks.__exit__(None, None, None)
+            self._listener.close()
+            with contextlib.suppress(OSError):
+                os.remove(self.socket_path)
+
+    def stop(self):
+        self._stopping.set()
+
+    def status(self) -> Dict[str, Any]:
+        status = {
+            "type": "pong",
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started_at, 1),
+            "commands": self.commands_served,
+            "busy": self._command_lock.locked()
+        }
+        if self.status_extra:
+            status.update(self.status_extra())
+        return status
+
+    def _handle(self, sock: socket.socket):
+        connection = _Connection(sock)
+        try:
+            message = connection.receive()
+            if not message:
+                return
+            kind = message.get("type")
+            if kind == "ping":
+                connection.send(self.status())
+            elif kind == "shutdown":
+                connection.send({"type": "bye", "pid": os.getpid()})
+                self.stop()
+            elif kind == "run":
+                with self._command_lock:
+                    self.last_activity = time.monotonic()
+                    code = self._run(connection, message)
+                    self.commands_served += 1
+                    self.last_activity = time.monotonic()
+                connection.send({"type": "exit", "code": code})
+            else:
+                connection.send({"type": "error", "message": f"Error: Unknown daemon request '{kind}'."})
+        except (OSError, ValueError):
+            pass
+        finally:
+            connection.close()
+
+    def _run(self, connection: _Connection, message: Dict[str, Any]) -> int:
+        stdout = _ClientStream(connection, "stdout", bool(message.get("isatty")))
+        stderr = _ClientStream(connection, "stderr")
+        saved_cwd = os.getcwd()
+        # A fresh context per command, so trace ids and log secrets do not leak between them
+        context = contextvars.Context()
+        context.run(_command_env.set, dict(message.get("env") or os.environ.copy()))
+        context.run(_command_io.set, (stdout, stderr, connection))
+        cancelled = threading.Event()
+        context.run(_command_cancelled.set, cancelled)
+
+        finished = threading.Event()
+
+        def watch_client():
+            while not finished.wait(DISCONNECT_POLL):
+                if connection.hung_up():
+                    # Commands that print notice on their next write; silent ones at their next checkpoint
+                    cancelled.set()
+                    return
+        watcher = threading.Thread(target=watch_client, name="aria-daemon-client-watch", daemon=True)
+        try:
+            # The working directory is process-wide; commands run one at a time, so it is safe to switch
+            with contextlib.suppress(OSError):
+                os.chdir(message.get("cwd") or saved_cwd)
+            watcher.start()
+            return context.run(self._exit_code, self.handler, list(message.get("argv") or []))
+        finally:
+            finished.set()
+            with contextlib.suppress(OSError):
+                os.chdir(saved_cwd)
+
+    def _exit_code(self, handler, argv) -> int:
+        try:
+            code = handler(argv)
+        except KeyboardInterrupt:
+            return 130
+        except SystemExit as e:
+            code = e.code
+            if isinstance(code, str):
+                print(code, file=sys.stderr)
+                return 1
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+            return 1
+        if code is None:
+            return 0
+        return code if isinstance(code, int) else 1
+
+def wait_until_ready(socket_path: str = None, timeout: float = DEFAULT_START_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """Polls the socket until a freshly started daemon answers, or `timeout` seconds pass."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = ping(socket_path)
+        if status is not None:
+            return status
+        time.sleep(0.1)
+    return None
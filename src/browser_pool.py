@@ -0,0 +1,206 @@
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from navigator import AriaNavigator, get_binary_path, get_firefox_profile_path, get_default_firefox_profile_path
+from logger import get_logger, record_metric
+from resource_blocking import ScrapeProfile
+
+logger = get_logger("browser_pool")
+
+DEFAULT_POOL_SIZE = 3
+
+# Lock files would make the copy look "in use"; caches are large and rebuilt on demand
+PROFILE_COPY_IGNORE = shutil.ignore_patterns(
+    "lock", ".parentlock", "parent.lock", "SingletonLock", "SingletonCookie", "SingletonSocket",
+    "cache2", "startupCache", "Cache", "Code Cache", "GPUCache", "crashes", "minidumps"
+)
+
+def get_pool_size() -> int:
+    try:
+        return max(1, int(os.environ.get("ARIA_BROWSER_POOL_SIZE", DEFAULT_POOL_SIZE)))
+    except ValueError:
+        return DEFAULT_POOL_SIZE
+
+def resolve_profile_source(browser_name: str, profile: Optional[str] = None) -> Optional[str]:
+    """Finds the profile whose logins pool sessions should start from."""
+    if browser_name == "firefox":
+        return get_firefox_profile_path(profile) if profile else get_default_firefox_profile_path()
+    # Chromium profiles are passed as a --user-data-dir path
+    if profile and os.path.isdir(os.path.expanduser(profile)):
+        return os.path.expanduser(profile)
+    return None
+
+def copy_profile(source: Optional[str]) -> str:
+    """Copies a browser profile into a fresh temporary directory (an empty one without a source)."""
+    target = tempfile.mkdtemp(prefix="aria-pool-profile-")
+    if source and os.path.isdir(source):
+        start_time = time.perf_counter()
+        shutil.copytree(source, target, ignore=PROFILE_COPY_IGNORE, dirs_exist_ok=True, ignore_dangling_symlinks=True)
+        record_metric("browser_pool_profile_copy", (time.perf_counter() - start_time) * 1000)
+    return target
+
+def create_pooled_driver(browser_name: str, headless: bool, profile_dir: str, scrape_profile: Optional[ScrapeProfile] = None):
+    """Starts a standalone local browser on its own profile copy, without touching Aria's session files."""
+    if browser_name == "firefox":
+        options = FirefoxOptions()
+        binary = get_binary_path("firefox") if os.name == 'posix' else None
+        if binary:
+            options.binary_location = binary
+        if headless:
+            options.add_argument("-headless")
+        options.add_argument("-profile")
+        options.add_argument(profile_dir)
+        if scrape_profile:
+            scrape_profile.apply_to_options(browser_name, options)
+            # URL patterns need BiDi network interception, which must be requested at launch
+            options.enable_bidi = bool(scrape_profile.url_patterns())
+        return webdriver.Firefox(options=options)
+    if browser_name in ("chrome", "edge"):
+        options = ChromeOptions() if browser_name == "chrome" else webdriver.EdgeOptions()
+        binary = get_binary_path("chrome") if browser_name == "chrome" and os.name == 'posix' else None
+        if binary:
+            options.binary_location = binary
+        if headless:
+            options.add_argument("--headless=new")
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        if scrape_profile:
+            scrape_profile.apply_to_options(browser_name, options)
+        return webdriver.Chrome(options=options) if browser_name == "chrome" else webdriver.Edge(options=options)
+    raise ValueError(f"Browser '{browser_name}' is not supported by the browser pool.")
+
+class PooledSession:
+    """One pooled browser: a navigator bound to its own driver and profile copy."""
+    def __init__(self, navigator: AriaNavigator, profile_dir: Optional[str] = None):
+        self.navigator = navigator
+        self.profile_dir = profile_dir
+        self.uses = 0
+
+    def close(self):
+        try:
+            if self.navigator.driver:
+                self.navigator.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting pooled browser: {e}")
+        self.navigator.driver = None
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+class BrowserPool:
+    """
+    A bounded pool of independent browser sessions for running site scrapers side by side.
+
+    Each session is a separate (by default headless) browser started on its own copy of the
+    user's profile, so logins carry over while sessions cannot disturb each other or the
+    user's interactive `aria open` session. At most `size` sessions exist at once, which is
+    also the global concurrency limit. A session whose task raised is discarded rather than
+    handed to the next task. With a `scrape_profile`, sessions skip the resources it blocks;
+    tasks may apply a stricter per-site profile to their navigator.
+    """
+    def __init__(self, size: int = None, browser_name: str = "firefox", headless: bool = True, profile: str = None,
+                 driver_factory: Callable[..., Any] = None, plugin_manager=None, scrape_profile: Optional[ScrapeProfile] = None):
+        self.size = size or get_pool_size()
+        self.browser_name = browser_name
+        self.headless = headless
+        self.profile_source = resolve_profile_source(browser_name, profile)
+        self.driver_factory = driver_factory or create_pooled_driver
+        self.plugin_manager = plugin_manager
+        self.scrape_profile = scrape_profile
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle: "queue.Queue[PooledSession]" = queue.Queue()
+        self._sessions: List[PooledSession] = []
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> PooledSession:
+        start_time = time.perf_counter()
+        profile_dir = copy_profile(self.profile_source)
+        try:
+            driver = self.driver_factory(self.browser_name, self.headless, profile_dir, scrape_profile=self.scrape_profile)
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+        navigator = AriaNavigator()
+        navigator.driver = driver
+        navigator.plugin_manager = self.plugin_manager
+        navigator.apply_scrape_profile(self.scrape_profile, self.browser_name)
+        session = PooledSession(navigator, profile_dir)
+        with self._lock:
+            self._sessions.append(session)
+        record_metric("browser_pool_start", (time.perf_counter() - start_time) * 1000, browser=self.browser_name)
+        return session
+
+    def _discard(self, session: PooledSession):
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        session.close()
+
+    @contextmanager
+    def session(self):
+        """Borrows a session's navigator, starting a new browser if none is idle."""
+        self._slots.acquire()
+        session = None
+        try:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                session = self._create_session()
+            session.uses += 1
+            yield session.navigator
+        except BaseException:
+            if session:
+                self._discard(session)
+                session = None
+            raise
+        finally:
+            if session:
+                self._idle.put(session)
+            self._slots.release()
+
+    def run(self, tasks: Dict[str, Callable[[AriaNavigator], Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Runs independent tasks concurrently, each with its own pooled navigator.
+        Returns {name: {"ok", "result" or "error", "duration_ms"}}; one failure does not affect the rest.
+        """
+        def run_task(name, task):
+            start_time = time.perf_counter()
+            try:
+                with self.session() as navigator:
+                    result = task(navigator)
+                outcome = {"ok": bool(result), "result": result}
+            except Exception as e:
+                logger.error(f"Pooled task '{name}' failed: {e}", exc_info=True)
+                outcome = {"ok": False, "error": str(e)}
+            outcome["duration_ms"] = round((time.perf_counter() - start_time) * 1000, 2)
+            record_metric("browser_pool_task", outcome["duration_ms"], task=name, ok=outcome["ok"])
+            return name, outcome
+
+        with ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="aria-browser-pool") as executor:
+            # Each task runs in a copy of the caller's context, so in the daemon its output still reaches the client
+            futures = [executor.submit(contextvars.copy_context().run, run_task, name, task) for name, task in tasks.items()]
+            return dict(future.result() for future in futures)
+
+    def close(self):
+        """Quits every browser in the pool and removes the profile copies."""
+        with self._lock:
+            sessions = list(self._sessions)
+            self._sessions.clear()
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for session in sessions:
+            session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
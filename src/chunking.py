@@ -0,0 +1,95 @@
+import os
+from typing import List
+from ai_fanout import get_default_concurrency
+
+DEFAULT_CHUNK_TOKENS = 6000
+DEFAULT_THRESHOLD_TOKENS = 12000
+CHARS_PER_TOKEN = 4
+
+# Boundaries tried in order when a piece of text is too large: sections, lines, sentences, words
+SEPARATORS = ["\n\n", "\n", ". ", " "]
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+def get_chunk_tokens() -> int:
+    """Returns the target size of a single chunk in estimated tokens."""
+    return _env_int("ARIA_SUMMARY_CHUNK_TOKENS", DEFAULT_CHUNK_TOKENS)
+
+def get_threshold_tokens() -> int:
+    """Returns the size above which text is summarized with map-reduce instead of a single call."""
+    return _env_int("ARIA_SUMMARY_THRESHOLD_TOKENS", DEFAULT_THRESHOLD_TOKENS)
+
+def get_summary_parallelism() -> int:
+    """Returns how many chunk summaries may be generated at once."""
+    return _env_int("ARIA_SUMMARY_PARALLELISM", get_default_concurrency())
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) that avoids a tokenizer dependency."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def needs_chunking(text: str, threshold: int = None) -> bool:
+    return estimate_tokens(text) > (threshold or get_threshold_tokens())
+
+def split_text(text: str, max_tokens: int = None) -> List[str]:
+    """
+    Splits text into chunks of at most `max_tokens` estimated tokens.
+
+    Splits prefer structural boundaries: blank lines first, then line breaks,
+    sentences and finally words. Only text without any of these is cut mid-run.
+    """
+    max_chars = (max_tokens or get_chunk_tokens()) * CHARS_PER_TOKEN
+    return [c for c in _split(text, max_chars, 0) if c.strip()]
+
+def _split(text: str, max_chars: int, level: int) -> List[str]:
+    if len(text) <= max_chars:
+        return [text]
+    if level >= len(SEPARATORS):
+        return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+    separator = SEPARATORS[level]
+    pieces = text.split(separator)
+    if len(pieces) == 1:
+        return _split(text, max_chars, level + 1)
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current}{separator}{piece}" if current else piece
+        if len(candidate) <= max_chars:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+        if len(piece) > max_chars:
+            chunks.extend(_split(piece, max_chars, level + 1))
+            current = ""
+        else:
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def group_texts(texts: List[str], max_tokens: int = None, separator: str = "\n\n") -> List[List[str]]:
+    """Packs consecutive texts into groups that fit within `max_tokens`, keeping at least two per group."""
+    max_chars = (max_tokens or get_chunk_tokens()) * CHARS_PER_TOKEN
+    groups = []
+    current = []
+    size = 0
+    for text in texts:
+        added = len(text) + (len(separator) if current else 0)
+        if len(current) >= 2 and size + added > max_chars:
+            groups.append(current)
+            current, size = [], 0
+            added = len(text)
+        current.append(text)
+        size += added
+    if current:
+        if len(current) == 1 and groups:
+            groups[-1].extend(current)
+        else:
+            groups.append(current)
+    return groups
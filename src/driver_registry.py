@@ -0,0 +1,189 @@
+import os
+import re
+import json
+import time
+import shutil
+import socket
+import datetime
+import threading
+import subprocess
+from typing import Any, Dict, Optional
+from logger import get_logger, record_metric
+
+logger = get_logger("driver_registry")
+
+DRIVER_EXECUTABLES = {
+    "chrome": "chromedriver",
+    "firefox": "geckodriver",
+    "edge": "msedgedriver"
+}
+# Explicit driver paths, for machines where nothing may be downloaded
+DRIVER_PATH_ENV = {
+    "chrome": "ARIA_CHROMEDRIVER",
+    "firefox": "ARIA_GECKODRIVER",
+    "edge": "ARIA_EDGEDRIVER"
+}
+DEFAULT_PORT_TIMEOUT = 10.0
+
+def get_registry_path() -> str:
+    return os.environ.get("ARIA_DRIVER_REGISTRY") or os.path.join(os.path.expanduser("~"), ".aria", "drivers.json")
+
+def _is_executable(path: Optional[str]) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+def _browser_stamp(browser_name: str) -> Optional[float]:
+    """Modification time of the installed browser; changes when the browser is upgraded."""
+    # Imported here: navigator imports this module
+    from navigator import get_binary_path
+    binary = get_binary_path(browser_name) if os.name == 'posix' else None
+    try:
+        return os.path.getmtime(os.path.realpath(binary)) if binary else None
+    except OSError:
+        return None
+
+def get_driver_version(path: str) -> Optional[str]:
+    """Runs `<driver> --version` (no network) and returns e.g. '120.0.6099.109' or '0.34.0'."""
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"(\d+(?:\.\d+)+)", output or "")
+    return match.group(1) if match else None
+
+def _download_driver(browser_name: str) -> str:
+    # webdriver_manager is only imported when a download is actually needed
+    if browser_name == "chrome":
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    if browser_name == "firefox":
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+    if browser_name == "edge":
+        from webdriver_manager.microsoft import EdgeChromiumDriverManager
+        return EdgeChromiumDriverManager().install()
+    raise ValueError(f"No driver is known for browser '{browser_name}'.")
+
+class DriverRegistry:
+    """
+    Resolves each browser's WebDriver binary once and reuses it offline afterwards.
+
+    Lookup order: the ARIA_<DRIVER> path override, the recorded entry (while the file
+    still exists and the browser has not been upgraded since), a driver on PATH, and
+    only then webdriver_manager, which may need the network. Every resolution is
+    recorded in ~/.aria/drivers.json with its version. An entry whose driver fails to
+    start is marked stale so the next launch resolves a fresh one, falling back to it
+    when nothing can be downloaded.
+    """
+    def __init__(self, path: str = None, downloader=None):
+        self.path = path or get_registry_path()
+        self.downloader = downloader or _download_driver
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(entries, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def record(self, browser_name: str, path: str, source: str) -> Dict[str, Any]:
+        entry = {
+            "path": path,
+            "version": get_driver_version(path),
+            "source": source,
+            "browser_stamp": _browser_stamp(browser_name),
+            "resolved_at": datetime.datetime.now().isoformat()
+        }
+        with self._lock:
+            entries = self.load()
+            entries[browser_name] = entry
+            self._save(entries)
+        logger.info(f"Registered {browser_name} driver {entry['version'] or '(unknown version)'} at {path}", extra={"browser": browser_name, "source": source})
+        return entry
+
+    def invalidate(self, browser_name: str):
+        """Marks a driver stale, e.g. one that no longer starts after a browser upgrade."""
+        with self._lock:
+            entries = self.load()
+            if browser_name in entries:
+                entries[browser_name]["stale"] = True
+                self._save(entries)
+                logger.info(f"Marked the registered {browser_name} driver as stale.")
+
+    def _cached(self, browser_name: str) -> Optional[str]:
+        entry = self.load().get(browser_name)
+        if not entry or entry.get("stale") or not _is_executable(entry.get("path")):
+            return None
+        stamp = _browser_stamp(browser_name)
+        if stamp is not None and entry.get("browser_stamp") not in (None, stamp):
+            logger.info(f"{browser_name} was upgraded since its driver was registered; resolving again.")
+            return None
+        return entry["path"]
+
+    def resolve(self, browser_name: str, refresh: bool = False) -> str:
+        """Returns the driver path for a browser, downloading it only when nothing local will do."""
+        start_time = time.perf_counter()
+        entry = self.load().get(browser_name, {})
+        source = "registry"
+        path = os.environ.get(DRIVER_PATH_ENV.get(browser_name, ""), "") or None
+        if path:
+            source = "env"
+        elif not refresh:
+            path = self._cached(browser_name)
+
+        if not path and not refresh:
+            on_path = shutil.which(DRIVER_EXECUTABLES.get(browser_name, ""))
+            # The driver on PATH may be the very one that just failed to start
+            if on_path and not (entry.get("stale") and os.path.realpath(on_path) == os.path.realpath(entry.get("path", ""))):
+                path, source = on_path, "path"
+                self.record(browser_name, path, source)
+
+        if not path:
+            source = "download"
+            try:
+                path = self.downloader(browser_name)
+            except Exception:
+                # Offline: a recorded driver, even a stale one, beats none at all
+                if not _is_executable(entry.get("path")):
+                    raise
+                path, source = entry["path"], "registry"
+                logger.warning(f"Could not download a {browser_name} driver; using the registered one at {path}.")
+            else:
+                self.record(browser_name, path, source)
+
+        record_metric("driver_resolve", (time.perf_counter() - start_time) * 1000, browser=browser_name, source=source)
+        return path
+
+def wait_for_port(port: int, host: str = "127.0.0.1", timeout: float = DEFAULT_PORT_TIMEOUT, process: subprocess.Popen = None, interval: float = 0.05) -> bool:
+    """
+    Polls until something accepts connections on host:port. Returns False on timeout,
+    or as soon as `process` exits, instead of waiting out the whole timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((host, port), timeout=interval * 4):
+                return True
+        except OSError:
+            pass
+        if process is not None and process.poll() is not None:
+            return False
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+_default_registry = None
+
+def get_driver_registry() -> DriverRegistry:
+    global _default_registry
+    if _default_registry is None or _default_registry.path != get_registry_path():
+        _default_registry = DriverRegistry()
+    return _default_registry
@@ -0,0 +1,284 @@
+import os
+import time
+import atexit
+import threading
+import subprocess
+from typing import Dict, Iterator, List, Optional
+from logger import get_logger
+from exceptions import AIServiceError
+from aria_daemon import raise_if_cancelled
+
+logger = get_logger("gemini_cli_pool")
+
+DEFAULT_POOL_SIZE = 1
+DEFAULT_MAX_IDLE = 300.0
+DEFAULT_ACQUIRE_TIMEOUT = 120.0
+DEFAULT_REQUEST_TIMEOUT = 300.0
+# Shell bookkeeping that differs between terminals without changing what the CLI does
+VOLATILE_ENV = {"PWD", "OLDPWD", "SHLVL", "_"}
+
+class CliWorker:
+    """A pre-spawned CLI process that has booted and is blocked reading its prompt from stdin."""
+    def __init__(self, command: List[str], env: Dict[str, str] = None):
+        self.command = command
+        self.created_at = time.monotonic()
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=env
+        )
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    def is_healthy(self, max_idle: float) -> bool:
+        """A worker is usable while its process is alive and it has not been idle too long."""
+        return self.process.poll() is None and self.age < max_idle
+
+    def kill(self):
+        if self.process.poll() is None:
+            try:
+                self.process.kill()
+                self.process.wait(timeout=5)
+            except Exception:
+                pass
+
+class GeminiCliPool:
+    """
+    Keeps warm Gemini CLI processes ready so callers do not pay Node.js startup per prompt.
+
+    The CLI reads one prompt until EOF and exits, so each worker serves a single request.
+    With `prewarm` (set in a long-lived process such as the daemon) `size` workers are
+    spawned up front and a replacement as soon as a worker is handed out, letting it boot
+    while the current request waits on the model. Without it, as in a one-shot run, a
+    worker is only spawned when a request needs one, so no process is started just to be
+    killed at exit. Idle workers are recycled after `max_idle` seconds, and callers queue
+    for up to `acquire_timeout` seconds once `size` requests are in flight.
+    Workers are started with `env` (the caller's environment) rather than the process's own.
+    """
+    def __init__(self, command: List[str], size: int = DEFAULT_POOL_SIZE, max_idle: float = DEFAULT_MAX_IDLE,
+                 acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT, request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                 env: Dict[str, str] = None, prewarm: bool = False):
+        self.command = list(command)
+        self.env = env
+        self.prewarm = prewarm
+        self.size = max(1, int(size))
+        self.max_idle = max_idle
+        self.acquire_timeout = acquire_timeout
+        self.request_timeout = request_timeout
+
+        self._idle: List[CliWorker] = []
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"spawned": 0, "served": 0, "warm_hits": 0, "cold_starts": 0, "recycled": 0, "queued": 0}
+
+        if self.prewarm:
+            self._replenish()
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _spawn(self) -> CliWorker:
+        return CliWorker(self.command, self.env)
+
+    def _replenish(self):
+        """Tops up the idle list so that `size` warm workers are waiting."""
+        with self._lock:
+            while not self._closed and len(self._idle) < self.size:
+                try:
+                    self._idle.append(self._spawn())
+                except OSError as e:
+                    logger.error(f"Failed to spawn Gemini CLI worker: {e}")
+                    break
+                self.stats["spawned"] += 1
+
+    def _acquire(self) -> CliWorker:
+        if not self._slots.acquire(blocking=False):
+            self._count("queued")
+            logger.info("Gemini CLI pool saturated; waiting for a free worker.", extra={"pool_size": self.size})
+            if not self._slots.acquire(timeout=self.acquire_timeout):
+                raise AIServiceError(f"Timed out after {self.acquire_timeout}s waiting for a free Gemini CLI worker.")
+        return self._take_worker()
+
+    def _take_worker(self) -> CliWorker:
+        """Hands out a healthy warm worker (or a cold one) for a slot the caller already holds."""
+        try:
+            worker = None
+            with self._lock:
+                if self._closed:
+                    raise AIServiceError("Gemini CLI pool has been shut down.")
+                while self._idle:
+                    candidate = self._idle.pop(0)
+                    if candidate.is_healthy(self.max_idle):
+                        worker = candidate
+                        break
+                    # Health check failed: the process died or sat idle past its lifetime
+                    self.stats["recycled"] += 1
+                    candidate.kill()
+
+                self.stats["warm_hits" if worker else "cold_starts"] += 1
+
+            if worker is None:
+                worker = self._spawn()
+                self._count("spawned")
+            if self.prewarm:
+                # Boot the next worker while this request is in flight
+                self._replenish()
+            return worker
+        except Exception:
+            self._slots.release()
+            raise
+
+    def run(self, input_text: str) -> str:
+        """Sends a prompt to a warm worker and returns its whole stdout."""
+        return "".join(self.stream(input_text))
+
+    def stream(self, input_text: str) -> Iterator[str]:
+        """
+        Sends a prompt to a warm worker and yields stdout lines as they are produced.
+        The worker is killed and AIServiceError raised if it has not finished within `request_timeout`.
+        """
+        yield from self._serve(self._acquire(), input_text)
+
+    def try_stream(self, input_text: str) -> Optional[Iterator[str]]:
+        """Like stream(), but returns None instead of queueing when every worker is busy."""
+        if not self._slots.acquire(blocking=False):
+            return None
+        return self._serve(self._take_worker(), input_text)
+
+    def _serve(self, worker: CliWorker, input_text: str) -> Iterator[str]:
+        try:
+            yield from stream_process_lines(worker.process, input_text, timeout=self.request_timeout)
+            self._count("served")
+        finally:
+            # The caller may stop iterating early; never leave a half-read worker behind
+            worker.kill()
+            self._slots.release()
+
+    def shutdown(self):
+        """Kills all idle workers. In-flight requests are allowed to finish."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
+
+def stream_process_lines(process: subprocess.Popen, input_text: str, timeout: float = None) -> Iterator[str]:
+    """
+    Writes the prompt to a CLI process, closes stdin and yields stdout lines as they arrive.
+    Raises AIServiceError with the captured stderr if the process exits with an error, or
+    kills it and raises AIServiceError if it has not finished within `timeout` seconds.
+    """
+    stderr_chunks = []
+    reader = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+    reader.start()
+
+    # A hung CLI never closes stdout, so a watchdog kills it to end the read loop
+    timed_out = threading.Event()
+    def expire():
+        timed_out.set()
+        try:
+            process.kill()
+        except OSError:
+            pass
+    watchdog = threading.Timer(timeout, expire) if timeout else None
+    if watchdog:
+        watchdog.daemon = True
+        watchdog.start()
+    try:
+        try:
+            process.stdin.write(input_text)
+            process.stdin.close()
+        except (BrokenPipeError, OSError):
+            # The process died before reading its prompt; its exit status says why
+            pass
+
+        for line in process.stdout:
+            try:
+                raise_if_cancelled()
+            except KeyboardInterrupt:
+                process.kill()
+                raise
+            yield line
+
+        process.wait()
+    finally:
+        if watchdog:
+            watchdog.cancel()
+    reader.join(timeout=5)
+    if timed_out.is_set():
+        raise AIServiceError(f"Gemini CLI did not respond within {timeout}s.")
+    if process.returncode != 0:
+        raise AIServiceError("".join(stderr_chunks).strip() or f"exit code {process.returncode}")
+
+# command line -> (settings the pool was built with, pool)
+_pools: Dict[tuple, tuple] = {}
+_pools_lock = threading.Lock()
+_keep_warm = False
+
+def keep_warm(enabled: bool = True):
+    """Lets pools created from now on pre-spawn workers; only worth it in a long-lived process such as the daemon."""
+    global _keep_warm
+    _keep_warm = enabled
+
+def get_pool_size() -> int:
+    """Returns the configured pool size. 0 disables pooling."""
+    try:
+        return int(os.environ.get("ARIA_GEMINI_POOL_SIZE", DEFAULT_POOL_SIZE))
+    except ValueError:
+        return DEFAULT_POOL_SIZE
+
+def get_request_timeout() -> float:
+    """Returns how long one Gemini CLI request may run before it is killed."""
+    try:
+        return float(os.environ.get("ARIA_GEMINI_TIMEOUT", DEFAULT_REQUEST_TIMEOUT))
+    except ValueError:
+        return DEFAULT_REQUEST_TIMEOUT
+
+def get_pool(command: List[str]) -> Optional[GeminiCliPool]:
+    """
+    Returns the process-wide pool for a CLI command line, creating it on first use.
+    The pool is rebuilt when the environment changes (e.g. a daemon command from a client
+    with another API key or ARIA_GEMINI_* setting), since its workers inherit it.
+    """
+    size = get_pool_size()
+    if size <= 0:
+        return None
+
+    env = dict(os.environ)
+    settings = frozenset((name, value) for name, value in env.items() if name not in VOLATILE_ENV)
+    key = tuple(command)
+    with _pools_lock:
+        entry = _pools.get(key)
+        if entry is not None and entry[0] == settings:
+            return entry[1]
+        stale = entry[1] if entry else None
+        pool = GeminiCliPool(
+            command,
+            size=size,
+            max_idle=float(os.environ.get("ARIA_GEMINI_POOL_MAX_IDLE", DEFAULT_MAX_IDLE)),
+            request_timeout=get_request_timeout(),
+            env=env,
+            prewarm=_keep_warm
+        )
+        _pools[key] = (settings, pool)
+        logger.info(f"Started Gemini CLI worker pool with {size} worker(s).", extra={"pool_size": size})
+    if stale:
+        stale.shutdown()
+    return pool
+
+def shutdown_pools():
+    """Shuts down every pool created in this process."""
+    with _pools_lock:
+        pools = [pool for _, pool in _pools.values()]
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+atexit.register(shutdown_pools)
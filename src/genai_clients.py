@@ -0,0 +1,82 @@
+import os
+import time
+import threading
+from typing import Dict, Optional, Tuple
+from google import genai
+from google.genai import types
+from logger import get_logger, record_metric
+
+logger = get_logger("genai_clients")
+
+DEFAULT_TIMEOUT = 120.0
+
+_clients: Dict[Tuple[Optional[str], str], "genai.Client"] = {}
+_clients_lock = threading.Lock()
+
+def get_timeout() -> float:
+    """Returns the per-request timeout for Gemini SDK calls in seconds."""
+    try:
+        return float(os.environ.get("ARIA_AI_TIMEOUT", DEFAULT_TIMEOUT))
+    except ValueError:
+        return DEFAULT_TIMEOUT
+
+def get_client(model: str, api_key: Optional[str] = None) -> "genai.Client":
+    """
+    Returns the process-wide SDK client for an API key and model, creating it on first use.
+
+    The client owns an HTTP connection pool, so sharing it keeps connections alive
+    between calls instead of repeating auth setup and TLS handshakes every time.
+    Without an API key the SDK falls back to its own environment detection.
+    """
+    if api_key is None:
+        api_key = os.environ.get("GEMINI_API_KEY")
+
+    key = (api_key, model)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            start_time = time.perf_counter()
+            http_options = types.HttpOptions(timeout=int(get_timeout() * 1000))
+            if api_key:
+                client = genai.Client(api_key=api_key, http_options=http_options)
+            else:
+                client = genai.Client(http_options=http_options)
+            _clients[key] = client
+            record_metric("genai_client_create", (time.perf_counter() - start_time) * 1000, model=model)
+            logger.debug(f"Created Gemini SDK client for model {model}.")
+        return client
+
+def warm_client(model: str, api_key: Optional[str] = None) -> bool:
+    """
+    Creates the client and opens its connection with a cheap metadata request,
+    so the first real generation call does not pay for setup. Returns True on success.
+    """
+    start_time = time.perf_counter()
+    try:
+        get_client(model, api_key).models.get(model=model)
+    except Exception as e:
+        logger.debug(f"Warming Gemini SDK client failed: {e}")
+        return False
+    record_metric("genai_client_warm", (time.perf_counter() - start_time) * 1000, model=model)
+    return True
+
+def warm_client_in_background(model: str, api_key: Optional[str] = None) -> threading.Thread:
+    """Warms the client on a daemon thread while the caller gets on with startup."""
+    thread = threading.Thread(target=warm_client, args=(model, api_key), daemon=True)
+    thread.start()
+    return thread
+
+def reset_clients():
+    """Closes and forgets every cached client (used by tests and after credential changes)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
@@ -0,0 +1,427 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import create_cookie
+from logger import get_logger, record_metric
+from exceptions import NavigationError, SessionError
+from navigator import BaseNavigator, AriaNavigator, MAX_EXTRACTED_LINKS
+from plugin_manager import BasePlugin
+from rate_limiter import get_rate_limiter
+
+logger = get_logger("http_navigator")
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_TIMEOUT = 15
+# Pages with less visible text than this that still ship scripts are treated as JS-rendered shells
+DEFAULT_MIN_TEXT = 200
+DEFAULT_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+URL_PATTERN = re.compile(r"https?://[^\s\"'<>]+")
+NON_CONTENT_TAGS = ["script", "style", "noscript", "template", "svg"]
+
+class HttpPage:
+    """A fetched document; the parsed tree, text and title are computed on first use."""
+    def __init__(self, url: str, status: int, content_type: str, html: str):
+        self.url = url
+        self.status = status
+        self.content_type = content_type
+        self.html = html
+        self._soup = None
+        self._text = None
+
+    @property
+    def is_html(self) -> bool:
+        return "html" in self.content_type or (not self.content_type and "<html" in self.html[:1000].lower())
+
+    @property
+    def soup(self):
+        if self._soup is None:
+            from bs4 import BeautifulSoup
+            self._soup = BeautifulSoup(self.html, "html.parser")
+        return self._soup
+
+    @property
+    def title(self) -> str:
+        if not self.is_html:
+            return self.url
+        title = self.soup.title
+        return title.get_text(strip=True) if title else ""
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            if not self.is_html:
+                self._text = self.html
+            else:
+                lines = (line.strip() for line in _visible_strings(self.soup.body or self.soup))
+                self._text = "\n".join(line for line in lines if line)
+        return self._text
+
+def _visible_strings(node):
+    """Text nodes under `node` in document order, skipping scripts, styles and comments in one pass."""
+    from bs4.element import NavigableString, Tag, Comment, Doctype
+    stack = list(reversed(node.contents))
+    while stack:
+        child = stack.pop()
+        if isinstance(child, Tag):
+            if child.name not in NON_CONTENT_TAGS:
+                stack.extend(reversed(child.contents))
+        elif isinstance(child, NavigableString) and not isinstance(child, (Comment, Doctype)):
+            yield str(child)
+
+def is_js_shell(page: HttpPage, min_text: int = None) -> bool:
+    """
+    True when a page looks like it needs JavaScript to show its content: little visible
+    text next to script tags, or a <noscript> asking for JavaScript on an otherwise bare page.
+    """
+    if not page.is_html:
+        return False
+    min_text = min_text if min_text is not None else int(os.environ.get("ARIA_HTTP_MIN_TEXT", DEFAULT_MIN_TEXT))
+    text_length = len(page.text)
+    if text_length >= min_text * 5:
+        return False
+    if text_length < min_text and page.soup.find("script"):
+        return True
+    for noscript in page.soup.find_all("noscript"):
+        if "javascript" in noscript.get_text().lower():
+            return True
+    return False
+
+def browser_cookies(driver) -> List[Dict[str, Any]]:
+    """
+    Every cookie of a live browser session. Chromium returns all domains through CDP;
+    other browsers only expose the current page's cookies over WebDriver.
+    """
+    for command in ("Storage.getCookies", "Network.getAllCookies"):
+        try:
+            result = driver.execute("executeCdpCommand", {"cmd": command, "params": {}})["value"]
+            if isinstance(result, dict) and isinstance(result.get("cookies"), list):
+                return result["cookies"]
+        except Exception as e:
+            logger.debug(f"CDP {command} unavailable: {e}")
+    return driver.get_cookies()
+
+def create_http_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """A requests session keeping up to `pool_size` connections per host alive."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": os.environ.get("ARIA_HTTP_USER_AGENT", DEFAULT_USER_AGENT),
+                            "Accept": "text/html,application/xhtml+xml,*/*;q=0.8"})
+    return session
+
+def seed_session_from_browser(session: requests.Session, driver) -> int:
+    """Copies a browser's cookies (and user agent, unless ARIA_HTTP_USER_AGENT is set) into `session`."""
+    cookies = browser_cookies(driver)
+    user_agent = driver.execute_script("return navigator.userAgent;")
+    if isinstance(user_agent, str) and user_agent and "ARIA_HTTP_USER_AGENT" not in os.environ:
+        session.headers["User-Agent"] = user_agent
+    for cookie in cookies:
+        expires = cookie.get("expiry", cookie.get("expires"))
+        session.cookies.set_cookie(create_cookie(
+            cookie["name"], cookie["value"], domain=cookie.get("domain", ""), path=cookie.get("path", "/"),
+            secure=bool(cookie.get("secure")), expires=int(expires) if expires and expires > 0 else None,
+            rest={"HttpOnly": None} if cookie.get("httpOnly") else {}
+        ))
+    return len(cookies)
+
+class HttpNavigator(BaseNavigator):
+    """
+    Reads pages over plain HTTP instead of driving a browser.
+
+    Meant for static HTML: a keep-alive, connection-pooled requests session fetches the
+    page and BeautifulSoup extracts its text and links, with no browser start, render or
+    WebDriver round trips. Requests go through the shared per-domain rate limiter. If a
+    browser session is open, its cookies and user agent are copied on first use so pages
+    behind a login read the same as in the browser.
+
+    There is one "tab": the last page fetched. Tab identifiers that name a tab of the live
+    browser session are looked up there and fetched by URL.
+    """
+    def __init__(self, browser: AriaNavigator = None, pool_size: int = None, timeout: float = None):
+        super().__init__()
+        self.driver = None
+        self.throttle_delay = 0.0
+        self.pool_size = pool_size or int(os.environ.get("ARIA_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE))
+        self.timeout = timeout or float(os.environ.get("ARIA_HTTP_TIMEOUT", DEFAULT_TIMEOUT))
+        self._browser = browser
+        self._session = None
+        self._cookies_imported = False
+        self.page: Optional[HttpPage] = None
+
+    @property
+    def browser(self) -> AriaNavigator:
+        """The browser navigator used for cookies, tab lookups and (in auto mode) escalation."""
+        if self._browser is None:
+            self._browser = AriaNavigator()
+        self._browser.plugin_manager = self.plugin_manager
+        return self._browser
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            self._session = create_http_session(self.pool_size)
+        return self._session
+
+    def import_browser_cookies(self) -> int:
+        """Copies the live browser session's cookies and user agent into the HTTP session; returns how many cookies."""
+        self._cookies_imported = True
+        browser = self.browser
+        driver = browser.driver or browser.connect_to_session()
+        if not driver:
+            return 0
+        try:
+            count = seed_session_from_browser(self.session, driver)
+        except Exception as e:
+            logger.warning(f"Could not read cookies from the browser session: {e}")
+            return 0
+        logger.info(f"Imported {count} cookies from the browser session.")
+        return count
+
+    def _ensure_cookies(self):
+        if not self._cookies_imported and os.environ.get("ARIA_HTTP_IMPORT_COOKIES", "true").lower() == "true":
+            self.import_browser_cookies()
+
+    def fetch(self, url: str) -> HttpPage:
+        """GETs a URL through the pooled session and the rate limiter; raises NavigationError on failure."""
+        self._ensure_cookies()
+        start_time = time.perf_counter()
+        try:
+            response = get_rate_limiter().fetch(url, session=self.session, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise NavigationError(f"Failed to fetch {url}: {e}")
+        record_metric("http_fetch", (time.perf_counter() - start_time) * 1000, status=response.status_code, bytes=len(response.content))
+        if response.status_code >= 400:
+            raise NavigationError(f"Failed to fetch {url}: HTTP {response.status_code}")
+        return HttpPage(response.url, response.status_code, response.headers.get("Content-Type", "").lower(), response.text)
+
+    def fetch_many(self, urls: List[str]) -> Dict[str, Any]:
+        """Fetches URLs concurrently over the shared pool; maps each URL to its HttpPage or the error raised."""
+        def fetch_one(url):
+            try:
+                return url, self.fetch(url)
+            except NavigationError as e:
+                return url, e
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        # Cookies are imported once, before the workers start
+        self._ensure_cookies()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.pool_size, len(urls)))) as executor:
+            return dict(executor.map(fetch_one, urls))
+
+    def start_session(self, browser_name="chrome", headless=False, force=False, profile=None, silence_audio=False, scrape_profile=None):
+        # Nothing to launch; the HTTP session is created on first use
+        return True
+
+    def connect_to_session(self, browser_name=None):
+        return None
+
+    def close_session(self, browser_name=None):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        self._cookies_imported = False
+        self.page = None
+
+    def navigate(self, url):
+        if self.plugin_manager:
+            self.plugin_manager.trigger_hook("pre_navigation", url=url)
+        try:
+            print(f"Fetching: {url}")
+            self.page = self.fetch(url)
+        except NavigationError:
+            if self.plugin_manager:
+                self.plugin_manager.trigger_hook("post_navigation", url=url, success=False)
+            raise
+        if self.plugin_manager:
+            self.plugin_manager.trigger_hook("post_navigation", url=url, success=True)
+        return True
+
+    def new_tab(self, url="about:blank"):
+        if not url.startswith(("http://", "https://")):
+            print("Error: The http navigator can only open http(s) URLs.")
+            return False
+        return self.navigate(url)
+
+    def navigate_with_prompt(self, prompt):
+        print("Error: Prompt-driven navigation needs a browser. Use '--navigator aria' or '--navigator auto'.")
+        return False
+
+    def goto_tab(self, identifier):
+        """Accepts a URL, 0/'current' for the last fetched page, or a tab of the live browser session."""
+        str_ident = str(identifier)
+        if str_ident.startswith(("http://", "https://")):
+            return self.navigate(str_ident)
+        if self.page and str_ident in ("0", "current"):
+            return True
+        url = self._browser_tab_url(identifier)
+        if url:
+            return self.navigate(url)
+        logger.info(f"Tab with identifier '{identifier}' not found.")
+        return False
+
+    def _browser_tab_url(self, identifier) -> Optional[str]:
+        browser = self.browser
+        if not (browser.driver or browser.connect_to_session()):
+            return None
+        handle = browser._resolve_tab_handle(identifier)
+        if not handle:
+            return None
+        browser.tab_index.refresh()
+        return browser.tab_index.tabs.get(handle, {}).get("url")
+
+    def list_tabs(self):
+        if not self.page:
+            return []
+        return [{"id": "current", "index": 0, "title": self.page.title, "url": self.page.url, "active": True, "tags": []}]
+
+    def list_active_browsers(self):
+        return []
+
+    def get_current_url(self):
+        return self.page.url if self.page else None
+
+    def get_page_content(self):
+        if not self.page:
+            raise SessionError("No page loaded. Pass a URL to fetch first.")
+        return self.page.text
+
+    def extract_links(self, limit=MAX_EXTRACTED_LINKS):
+        """Links of the current page in the same {id, text, url} form as AriaNavigator.extract_links."""
+        if not self.page or not self.page.is_html:
+            return []
+        links = []
+        for i, anchor in enumerate(self.page.soup.find_all("a", href=True)):
+            if len(links) >= limit:
+                break
+            href = anchor["href"].strip()
+            if not href or href.startswith(("javascript:", "#")) or anchor.find_parent(NON_CONTENT_TAGS):
+                continue
+            text = anchor.get_text(" ", strip=True) or anchor.get("aria-label", "")
+            links.append({"id": i, "text": text[:50], "url": urljoin(self.page.url, href)})
+        return links
+
+    def resolve_prompt(self, prompt: str):
+        """Fetches every URL in the prompt concurrently and returns (prompt, context) like AriaNavigator."""
+        urls = [url.rstrip(".,;)!?") for url in URL_PATTERN.findall(prompt)]
+        context_parts = []
+        for url, page in self.fetch_many(urls).items():
+            if isinstance(page, Exception):
+                logger.warning(f"Could not fetch {url}: {page}")
+                continue
+            context_parts.append(f"--- Content from {page.url} (Title: {page.title}) ---\n{page.text}\n")
+        return prompt, "\n".join(context_parts)
+
+class AutoNavigator(HttpNavigator):
+    """
+    Tries plain HTTP first and escalates to AriaNavigator for pages that fail to fetch or
+    look like a JavaScript-rendered shell. Browser-only commands (tabs, tags, prompts,
+    sessions) always go to the browser; once a page has escalated, its content and links
+    are read from the browser too.
+    """
+    def __init__(self, browser: AriaNavigator = None, **kwargs):
+        super().__init__(browser=browser, **kwargs)
+        self.escalated = False
+
+    def _escalate(self, url: str, reason: str):
+        logger.info(f"Opening {url} in the browser: {reason}", extra={"url": url})
+        record_metric("auto_navigator_escalation", 0.0, reason=reason)
+        browser = self.browser
+        browser.throttle_delay = self.throttle_delay
+        if not (browser.driver or browser.connect_to_session()):
+            # No browser is open: start a headless one rather than fail
+            if not browser.start_session(headless=True):
+                raise SessionError("Could not start a browser for a page that needs one.")
+        browser.navigate(url)
+        self.escalated = True
+        self.page = None
+
+    def navigate(self, url):
+        self.escalated = False
+        try:
+            super().navigate(url)
+        except NavigationError:
+            self._escalate(url, "fetch failed")
+            return True
+        if is_js_shell(self.page):
+            self._escalate(url, "javascript shell")
+        return True
+
+    def new_tab(self, url="about:blank"):
+        if url.startswith(("http://", "https://")):
+            return self.navigate(url)
+        self.escalated = True
+        return self.browser.new_tab(url)
+
+    def goto_tab(self, identifier):
+        if str(identifier).startswith(("http://", "https://")):
+            return self.navigate(str(identifier))
+        self.escalated = True
+        return self.browser.goto_tab(identifier)
+
+    def get_page_content(self):
+        if self.escalated or not self.page:
+            return self.browser.get_page_content()
+        return self.page.text
+
+    def extract_links(self, limit=MAX_EXTRACTED_LINKS):
+        if self.escalated or not self.page:
+            return self.browser.extract_links(limit)
+        return super().extract_links(limit)
+
+    def get_current_url(self):
+        if self.escalated or not self.page:
+            driver = self.browser.driver
+            return driver.current_url if driver else None
+        return self.page.url
+
+    def resolve_prompt(self, prompt: str):
+        """Tab and tag references are read from the browser; bare URLs over HTTP, escalating shells."""
+        _, tab_context = self.browser.resolve_prompt(prompt) if re.search(r"\b(tab|tag:)", prompt, re.IGNORECASE) else (prompt, "")
+        urls = [url.rstrip(".,;)!?") for url in URL_PATTERN.findall(prompt)]
+        context_parts = [tab_context] if tab_context else []
+        for url, page in self.fetch_many(urls).items():
+            if isinstance(page, Exception) or is_js_shell(page):
+                try:
+                    self._escalate(url, "fetch failed" if isinstance(page, Exception) else "javascript shell")
+                    driver = self.browser.driver
+                    context_parts.append(f"--- Content from {driver.current_url} (Title: {driver.title}) ---\n{self.browser.get_page_content()}\n")
+                except Exception as e:
+                    logger.warning(f"Could not read {url} in the browser: {e}")
+                continue
+            context_parts.append(f"--- Content from {page.url} (Title: {page.title}) ---\n{page.text}\n")
+        return prompt, "\n".join(context_parts)
+
+    def start_session(self, *args, **kwargs):
+        return self.browser.start_session(*args, **kwargs)
+
+    def connect_to_session(self, browser_name=None):
+        return self.browser.connect_to_session(browser_name)
+
+    def close_session(self, browser_name=None):
+        super().close_session(browser_name)
+        return self.browser.close_session(browser_name)
+
+    def navigate_with_prompt(self, prompt):
+        self.escalated = True
+        return self.browser.navigate_with_prompt(prompt)
+
+    def list_tabs(self):
+        return self.browser.list_tabs()
+
+    def tag_tab(self, identifier, tag):
+        return self.browser.tag_tab(identifier, tag)
+
+    def list_active_browsers(self):
+        return self.browser.list_active_browsers()
+
+class HttpNavigatorPlugin(BasePlugin):
+    """Registers the built-in 'http' and 'auto' navigators (see aria._create_runtime)."""
+    def get_navigators(self) -> Dict[str, Any]:
+        return {"http": HttpNavigator, "auto": AutoNavigator}
@@ -0,0 +1,126 @@
+import os
+import re
+import difflib
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote_plus
+
+DEFAULT_THRESHOLD = 0.85
+# A fuzzy match must beat the runner-up by this much, otherwise the prompt is ambiguous
+MIN_MARGIN = 0.05
+
+SEARCH_ENGINES = {
+    "google": "https://www.google.com/search?q={query}",
+    "duckduckgo": "https://duckduckgo.com/?q={query}",
+    "bing": "https://www.bing.com/search?q={query}",
+    "youtube": "https://www.youtube.com/results?search_query={query}",
+    "github": "https://github.com/search?q={query}",
+    "wikipedia": "https://en.wikipedia.org/w/index.php?search={query}",
+    "reddit": "https://www.reddit.com/search/?q={query}",
+    "stackoverflow": "https://stackoverflow.com/search?q={query}",
+    "amazon": "https://www.amazon.com/s?k={query}"
+}
+ENGINE_ALIASES = {"ddg": "duckduckgo", "yt": "youtube", "wiki": "wikipedia", "stack overflow": "stackoverflow", "so": "stackoverflow"}
+
+LEADING_VERBS = re.compile(r"^(please\s+)?(go\s+to|goto|navigate\s+to|open|visit|click(\s+on)?|follow|show\s+me)\s+(the\s+)?", re.IGNORECASE)
+URL_RE = re.compile(r"^(https?|file)://\S+$", re.IGNORECASE)
+DOMAIN_RE = re.compile(r"^(www\.)?([a-z0-9-]+\.)+[a-z]{2,24}(:\d+)?(/\S*)?$", re.IGNORECASE)
+# "index.html", "node.js" and "README.md" name files or projects, not hosts, even where the suffix is a TLD
+FILE_EXTENSIONS = {
+    "html", "htm", "js", "mjs", "cjs", "jsx", "ts", "tsx", "md", "markdown", "rst", "py", "ipynb", "json",
+    "txt", "css", "scss", "csv", "xml", "yml", "yaml", "toml", "ini", "cfg", "conf", "log", "lock",
+    "pdf", "png", "jpg", "jpeg", "gif", "svg", "webp", "java", "cpp", "hpp", "rb", "php", "exe"
+}
+ENGINE_NAMES = "|".join(sorted((re.escape(n) for n in list(SEARCH_ENGINES) + list(ENGINE_ALIASES)), key=len, reverse=True))
+SEARCH_PATTERNS = [
+    re.compile(rf"^search\s+(?P<engine>{ENGINE_NAMES})\s+for\s+(?P<query>.+)$", re.IGNORECASE),
+    re.compile(rf"^search\s+(for\s+)?(?P<query>.+?)\s+on\s+(?P<engine>{ENGINE_NAMES})$", re.IGNORECASE),
+    re.compile(rf"^(?P<engine>{ENGINE_NAMES})\s*:\s*(?P<query>.+)$", re.IGNORECASE),
+    re.compile(r"^search\s+(the\s+web\s+)?for\s+(?P<query>.+)$", re.IGNORECASE)
+]
+
+def get_threshold() -> float:
+    try:
+        return float(os.environ.get("ARIA_INTENT_THRESHOLD", DEFAULT_THRESHOLD))
+    except ValueError:
+        return DEFAULT_THRESHOLD
+
+def _clean(prompt: str) -> str:
+    text = LEADING_VERBS.sub("", (prompt or "").strip())
+    return text.strip().strip("'\"").strip()
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", (text or "").lower())).strip()
+
+def _search(prompt: str) -> Optional[Dict[str, Any]]:
+    for pattern in SEARCH_PATTERNS:
+        match = pattern.match(prompt)
+        if match:
+            groups = match.groupdict()
+            engine = (groups.get("engine") or "duckduckgo").lower()
+            engine = ENGINE_ALIASES.get(engine, engine)
+            url = SEARCH_ENGINES[engine].format(query=quote_plus(groups["query"].strip()))
+            return {"url": url, "confidence": 0.9, "path": "search_template", "engine": engine}
+    return None
+
+def _match_link(prompt: str, links: List[Dict[str, Any]], threshold: float) -> Optional[Dict[str, Any]]:
+    wanted = _normalize(prompt)
+    if not wanted:
+        return None
+
+    # Best score per target, so a link repeated in header and footer is not ambiguous with itself
+    best_by_url = {}
+    for link in links:
+        text = _normalize(link.get("text", ""))
+        if not text:
+            continue
+        if text == wanted:
+            return {"url": link["url"], "confidence": 1.0, "path": "link_exact"}
+        score = difflib.SequenceMatcher(None, wanted, text).ratio()
+        best_by_url[link["url"]] = max(score, best_by_url.get(link["url"], 0.0))
+
+    if not best_by_url:
+        return None
+    scored = sorted(((score, url) for url, score in best_by_url.items()), reverse=True)
+    best_score, best_url = scored[0]
+    runner_up = scored[1][0] if len(scored) > 1 else 0.0
+    if best_score >= threshold and best_score - runner_up >= MIN_MARGIN:
+        return {"url": best_url, "confidence": round(best_score, 3), "path": "link_fuzzy"}
+    return None
+
+def _is_domain(text: str) -> bool:
+    if " " in text or not DOMAIN_RE.match(text):
+        return False
+    if text.lower().startswith("www."):
+        return True
+    host = re.split(r"[:/]", text, maxsplit=1)[0]
+    return host.rsplit(".", 1)[-1].lower() not in FILE_EXTENSIONS
+
+def resolve_intent(prompt: str, links: List[Dict[str, Any]] = None, threshold: float = None) -> Optional[Dict[str, Any]]:
+    """
+    Resolves a navigation prompt locally when that is unambiguous.
+
+    Handles explicit URLs, search-engine phrasings ("search youtube for lofi",
+    "wiki: Alan Turing"), exact or close matches on link text when `links` from
+    extract_links() are given, and bare domains ("github.com"), which are tried
+    after the page's links. Returns {"url", "confidence", "path"} or None when
+    the AI should decide.
+    """
+    threshold = threshold if threshold is not None else get_threshold()
+    text = _clean(prompt)
+    if not text:
+        return None
+
+    if URL_RE.match(text):
+        return {"url": text, "confidence": 1.0, "path": "url"}
+
+    result = _search(text)
+    if result:
+        return result
+
+    if links:
+        result = _match_link(text, links, threshold)
+        if result:
+            return result
+    if _is_domain(text):
+        return {"url": f"https://{text}", "confidence": 0.95, "path": "domain"}
+    return None
@@ -116,11 +116,7 @@ def time_it(logger=None):
                 duration_ms = round(duration_ms, 2)
                 
                 # Store metric
-                _performance_metrics.append({
-                    "operation": func.__name__,
-                    "duration_ms": duration_ms,
-                    "timestamp": datetime.datetime.now().isoformat()
-                })
+                record_metric(func.__name__, duration_ms)
                 
                 log = logger or logging.getLogger(func.__module__)
                 log.info(
@@ -130,6 +126,17 @@ def time_it(logger=None):
         return wrapper
     return decorator
 
+def record_metric(operation, duration_ms=0.0, **fields):
+    """Records a performance metric, with optional extra fields (e.g. counters)."""
+    metric = {
+        "operation": operation,
+        "duration_ms": round(duration_ms, 2),
+        "timestamp": datetime.datetime.now().isoformat()
+    }
+    metric.update(fields)
+    _performance_metrics.append(metric)
+    return metric
+
 def get_performance_metrics():
     """Returns the collected performance metrics."""
     return list(_performance_metrics)
@@ -158,11 +165,14 @@ def setup_logging(level=logging.INFO, json_format=False):
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
-    root_logger.addFilter(RedactingFilter())
+    # Called once per command, which in the daemon means many times per process
+    if not any(isinstance(f, RedactingFilter) for f in root_logger.filters):
+        root_logger.addFilter(RedactingFilter())
     
     # Clear existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+        handler.close()
     
     # File handler
     file_handler = logging.FileHandler(log_file)
@@ -0,0 +1,275 @@
+import os
+import json
+import time
+import base64
+import shutil
+import hashlib
+import mimetypes
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from logger import get_logger, record_metric
+from rate_limiter import get_rate_limiter
+from http_navigator import create_http_session, seed_session_from_browser
+
+logger = get_logger("media_downloader")
+
+DEFAULT_WORKERS = 4
+CHUNK_SIZE = 64 * 1024
+# Raw bytes per WebDriver call when copying a blob out of the page (sent base64-encoded)
+BLOB_CHUNK_SIZE = 1024 * 1024
+SNIFF_BYTES = 64
+INDEX_FILE = "index.json"
+
+# Fetches a blob: URL inside the page, which is the only place it resolves, and keeps the bytes for chunked reads
+BLOB_READ_SCRIPT = """
+const url = arguments[0], done = arguments[arguments.length - 1];
+fetch(url).then(response => response.blob()).then(blob => blob.arrayBuffer().then(buffer => {
+    window.__ariaBlobs = window.__ariaBlobs || {};
+    const id = Math.random().toString(36).slice(2);
+    window.__ariaBlobs[id] = new Uint8Array(buffer);
+    done({id: id, size: buffer.byteLength, type: blob.type});
+})).catch(error => done({error: String(error)}));
+"""
+BLOB_CHUNK_SCRIPT = """
+const bytes = window.__ariaBlobs[arguments[0]].subarray(arguments[1], arguments[1] + arguments[2]);
+let binary = '';
+for (let i = 0; i < bytes.length; i += 0x8000) {
+    binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+}
+return btoa(binary);
+"""
+BLOB_RELEASE_SCRIPT = "if (window.__ariaBlobs) { delete window.__ariaBlobs[arguments[0]]; }"
+
+# (offset, signature, mime, extension); ISO-BMFF and RIFF containers are told apart by their brand below
+SIGNATURES = [
+    (0, b"\x89PNG\r\n\x1a\n", "image/png", ".png"),
+    (0, b"\xff\xd8\xff", "image/jpeg", ".jpg"),
+    (0, b"GIF87a", "image/gif", ".gif"),
+    (0, b"GIF89a", "image/gif", ".gif"),
+    (0, b"\x00\x00\x01\x00", "image/x-icon", ".ico"),
+    (0, b"\x1aE\xdf\xa3", "video/webm", ".webm"),
+    (0, b"OggS", "audio/ogg", ".ogg"),
+    (0, b"fLaC", "audio/flac", ".flac"),
+    (0, b"ID3", "audio/mpeg", ".mp3"),
+    (0, b"\xff\xfb", "audio/mpeg", ".mp3"),
+    (0, b"\xff\xf3", "audio/mpeg", ".mp3"),
+    (0, b"%PDF-", "application/pdf", ".pdf"),
+    (0, b"PK\x03\x04", "application/zip", ".zip"),
+]
+RIFF_TYPES = {b"WEBP": ("image/webp", ".webp"), b"WAVE": ("audio/wav", ".wav"), b"AVI ": ("video/x-msvideo", ".avi")}
+FTYP_BRANDS = {
+    b"heic": ("image/heic", ".heic"), b"heix": ("image/heic", ".heic"), b"mif1": ("image/heif", ".heif"),
+    b"avif": ("image/avif", ".avif"), b"M4A ": ("audio/mp4", ".m4a"), b"qt  ": ("video/quicktime", ".mov"),
+    b"3gp4": ("video/3gpp", ".3gp"), b"3gp5": ("video/3gpp", ".3gp"),
+}
+
+def sniff_mime(head: bytes, declared: str = None) -> Tuple[str, str]:
+    """
+    Returns (mime type, extension) from a file's first bytes, falling back to the declared
+    Content-Type and finally application/octet-stream.
+    """
+    for offset, signature, mime, extension in SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            if mime == "video/webm" and b"webm" not in head:
+                return "video/x-matroska", ".mkv"
+            return mime, extension
+    if head[:4] == b"RIFF" and head[8:12] in RIFF_TYPES:
+        return RIFF_TYPES[head[8:12]]
+    if head[4:8] == b"ftyp":
+        return FTYP_BRANDS.get(head[8:12], ("video/mp4", ".mp4"))
+    stripped = head.lstrip()
+    if stripped.startswith(b"<svg") or (stripped.startswith(b"<?xml") and b"<svg" in head):
+        return "image/svg+xml", ".svg"
+    declared = (declared or "").split(";")[0].strip().lower()
+    if declared and declared != "application/octet-stream":
+        extension = mimetypes.guess_extension(declared)
+        if extension:
+            return declared, extension
+    return "application/octet-stream", ".bin"
+
+class MediaDownloader:
+    """
+    Downloads scraped media for a site into its `media/` directory.
+
+    HTTP(S) files are fetched on a bounded thread pool through one keep-alive session that
+    carries the browser session's cookies, so media behind a login downloads like it does
+    in the page, and through the per-domain rate limiter. Bodies are streamed to disk in
+    chunks while being hashed, so large videos never sit in memory. `blob:` URLs only
+    resolve inside the page that created them; they are fetched there and copied out over
+    WebDriver in base64 chunks.
+
+    Files are stored once by SHA-256 in a shared store (ARIA_MEDIA_STORE, ~/.aria/media)
+    and hard-linked into each site's media directory as `<sha256><ext>`, the extension
+    coming from the file's own magic bytes. A URL index in the media directory lets
+    later refreshes skip URLs already downloaded. A `blob:` URL changes with every page
+    load, so it is indexed only under a stable key the caller passes for it (e.g. the
+    message it belongs to).
+    """
+    def __init__(self, media_dir: str, driver=None, store_dir: str = None, session=None, max_workers: int = None):
+        self.media_dir = media_dir
+        self.store_dir = store_dir or os.environ.get("ARIA_MEDIA_STORE") or os.path.join(os.path.expanduser("~"), ".aria", "media")
+        self.driver = driver
+        self.max_workers = max(1, max_workers or int(os.environ.get("ARIA_MEDIA_WORKERS", DEFAULT_WORKERS)))
+        self._session = session
+        self._lock = threading.Lock()
+        os.makedirs(self.media_dir, exist_ok=True)
+        os.makedirs(self.store_dir, exist_ok=True)
+        self._index_path = os.path.join(self.media_dir, INDEX_FILE)
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict[str, str]:
+        try:
+            with open(self._index_path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_index(self):
+        with self._lock:
+            index = dict(self._index)
+        temp_path = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(temp_path, self._index_path)
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = create_http_session(self.max_workers)
+                if self.driver is not None:
+                    try:
+                        seed_session_from_browser(self._session, self.driver)
+                    except Exception as e:
+                        logger.warning(f"Downloading media without browser cookies: {e}")
+            return self._session
+
+    def _relative(self, filename: str) -> str:
+        return f"{os.path.basename(os.path.normpath(self.media_dir))}/{filename}"
+
+    def _known(self, url: str) -> Optional[str]:
+        filename = self._index.get(url)
+        if filename and os.path.exists(os.path.join(self.media_dir, filename)):
+            return self._relative(filename)
+        return None
+
+    def _store(self, chunks: Iterable[bytes], declared_type: str = None) -> Tuple[str, int, bool]:
+        """Streams chunks into the content store; returns (file name, size, whether it was already stored)."""
+        digest = hashlib.sha256()
+        head = b""
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.store_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if len(head) < SNIFF_BYTES:
+                        head += chunk[:SNIFF_BYTES - len(head)]
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            sha256 = digest.hexdigest()
+            _, extension = sniff_mime(head, declared_type)
+            filename = f"{sha256}{extension}"
+            object_dir = os.path.join(self.store_dir, sha256[:2])
+            os.makedirs(object_dir, exist_ok=True)
+            object_path = os.path.join(object_dir, filename)
+            existed = os.path.exists(object_path)
+            if existed:
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, object_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        site_path = os.path.join(self.media_dir, filename)
+        if not os.path.exists(site_path):
+            try:
+                os.link(object_path, site_path)
+            except FileExistsError:
+                pass
+            except OSError:
+                # Store on another filesystem (or no hard links): fall back to a copy
+                shutil.copyfile(object_path, site_path)
+        return filename, size, existed
+
+    def _download_http(self, url: str) -> Tuple[str, int, bool]:
+        response = get_rate_limiter().fetch(url, session=self.session, stream=True, timeout=30)
+        with response:
+            if response.status_code != 200:
+                raise IOError(f"HTTP {response.status_code}")
+            return self._store(response.iter_content(CHUNK_SIZE), response.headers.get("Content-Type"))
+
+    def _download_blob(self, url: str) -> Tuple[str, int, bool]:
+        if self.driver is None:
+            raise IOError("blob: URLs need the browser page that created them")
+        info = self.driver.execute_async_script(BLOB_READ_SCRIPT, url)
+        if not isinstance(info, dict) or info.get("error"):
+            raise IOError((info or {}).get("error", "could not read blob"))
+
+        def chunks():
+            for offset in range(0, info["size"], BLOB_CHUNK_SIZE):
+                yield base64.b64decode(self.driver.execute_script(BLOB_CHUNK_SCRIPT, info["id"], offset, BLOB_CHUNK_SIZE))
+        try:
+            return self._store(chunks(), info.get("type"))
+        finally:
+            self.driver.execute_script(BLOB_RELEASE_SCRIPT, info["id"])
+
+    def _download(self, url: str, category: str = None, key: str = None) -> Optional[str]:
+        source = "blob" if url.startswith("blob:") else "http"
+        # Blob URLs die with their page, so only real URLs or the caller's stable keys are worth remembering
+        index_key = url if source == "http" else key
+        known = self._known(index_key) if index_key else None
+        if known:
+            return known
+        start_time = time.perf_counter()
+        try:
+            filename, size, deduplicated = self._download_blob(url) if source == "blob" else self._download_http(url)
+        except Exception as e:
+            logger.error(f"Failed to download media {url}: {e}")
+            return None
+        record_metric("media_download", (time.perf_counter() - start_time) * 1000, source=source, category=category, bytes=size, deduplicated=deduplicated)
+        if index_key:
+            with self._lock:
+                self._index[index_key] = filename
+        return self._relative(filename)
+
+    def download(self, url: str, category: str = None, key: str = None) -> Optional[str]:
+        """
+        Downloads one file; returns its path relative to the site directory (e.g. 'media/<sha256>.jpg') or None.
+        `key` is a stable name for a `blob:` URL, so a later refresh finds the file without reading the blob again.
+        """
+        if not url or url.startswith("data:"):
+            return None
+        path = self._download(url, category, key)
+        self._save_index()
+        return path
+
+    def download_many(self, urls: List[str], category: str = None, keys: Dict[str, str] = None) -> Dict[str, Optional[str]]:
+        """
+        Downloads URLs concurrently (blob: URLs one by one through the driver); maps each URL to its path or None.
+        `keys` maps blob: URLs to stable keys, as for download().
+        """
+        keys = keys or {}
+        urls = [url for url in dict.fromkeys(urls) if url and not url.startswith("data:")]
+        blobs = [url for url in urls if url.startswith("blob:")]
+        remote = [url for url in urls if not url.startswith("blob:")]
+        results = {}
+        if remote:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(remote))) as executor:
+                results.update(zip(remote, executor.map(lambda url: self._download(url, category), remote)))
+        for url in blobs:
+            results[url] = self._download(url, category, keys.get(url))
+        if urls:
+            self._save_index()
+        return results
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
@@ -0,0 +1,112 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import urldefrag
+from ai_cache import AIResponseCache, is_cache_enabled
+from logger import get_logger, record_metric
+
+logger = get_logger("navigation_cache")
+
+DEFAULT_TTL = 7 * 24 * 3600
+
+def normalize_prompt(prompt: str) -> str:
+    """Case, whitespace and trailing punctuation do not change the intent of a prompt."""
+    return re.sub(r"\s+", " ", (prompt or "").strip().lower()).rstrip(".!?")
+
+def page_fingerprint(page_url: str, links: List[Dict[str, Any]]) -> str:
+    """Hashes the page URL and its extracted link set (order-independent)."""
+    digest = hashlib.sha256(urldefrag(page_url or "")[0].encode("utf-8"))
+    for text, url in sorted((link.get("text", ""), link.get("url", "")) for link in links):
+        digest.update(b"\0")
+        digest.update(f"{text}\x1f{url}".encode("utf-8"))
+    return digest.hexdigest()
+
+class NavigationDecisionCache:
+    """
+    Remembers the AI's {"url": ...} / {"search": ...} decision for a prompt on a page.
+
+    Entries are stored per (normalized prompt, page URL, model) together with a fingerprint
+    of the page's link set. A lookup on a page whose links changed invalidates the entry,
+    so stable pages skip the AI round trip while changed pages are re-analyzed. Lookups are
+    recorded as `navigation_cache_hit`/`navigation_cache_miss` (an invalidated entry is a
+    miss), apart from the AI response cache's own metrics.
+    """
+    def __init__(self, cache: AIResponseCache = None):
+        if cache is None:
+            cache = AIResponseCache(
+                cache_dir=os.environ.get("ARIA_NAV_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".aria", "cache", "navigation")),
+                ttl=float(os.environ.get("ARIA_NAV_CACHE_TTL", DEFAULT_TTL)),
+                metric_prefix=None
+            )
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _key(self, prompt: str, page_url: str, model: str) -> str:
+        return AIResponseCache.make_key("navigation", model, "json", normalize_prompt(prompt), urldefrag(page_url or "")[0])
+
+    def _record(self, hit: bool, start: float):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            hits, misses = self.hits, self.misses
+        record_metric(
+            "navigation_cache_hit" if hit else "navigation_cache_miss",
+            (time.perf_counter() - start) * 1000,
+            cache_hits=hits,
+            cache_misses=misses
+        )
+
+    def get(self, prompt: str, page_url: str, links: List[Dict[str, Any]], model: str = "") -> Optional[Dict[str, Any]]:
+        """Returns the cached decision, or None if there is none or the page has changed."""
+        start = time.perf_counter()
+        decision = self._lookup(prompt, page_url, links, model)
+        self._record(decision is not None, start)
+        return decision
+
+    def _lookup(self, prompt: str, page_url: str, links: List[Dict[str, Any]], model: str) -> Optional[Dict[str, Any]]:
+        key = self._key(prompt, page_url, model)
+        raw = self.cache.get(key)
+        if raw is None:
+            return None
+        try:
+            entry = json.loads(raw)
+        except json.JSONDecodeError:
+            self.cache.delete(key)
+            return None
+
+        if entry.get("fingerprint") != page_fingerprint(page_url, links):
+            self.cache.delete(key)
+            record_metric("navigation_decision_invalidated", page_url=page_url)
+            logger.info("Page changed since the cached navigation decision; re-analyzing.")
+            return None
+        return entry.get("decision")
+
+    def set(self, prompt: str, page_url: str, links: List[Dict[str, Any]], decision: Dict[str, Any], model: str = ""):
+        if not ("url" in decision or "search" in decision):
+            return
+        entry = {"fingerprint": page_fingerprint(page_url, links), "decision": decision}
+        self.cache.set(self._key(prompt, page_url, model), json.dumps(entry))
+
+_default_cache = None
+_default_cache_settings = None
+_default_cache_lock = threading.Lock()
+
+def get_navigation_cache() -> Optional[NavigationDecisionCache]:
+    """Returns the process-wide decision cache, or None when caching is disabled; rebuilt when its settings change."""
+    global _default_cache, _default_cache_settings
+    if not is_cache_enabled():
+        return None
+    settings = tuple(os.environ.get(name) for name in ("ARIA_NAV_CACHE_DIR", "ARIA_NAV_CACHE_TTL", "ARIA_AI_CACHE_MAX_MB"))
+    with _default_cache_lock:
+        if _default_cache is None or settings != _default_cache_settings:
+            _default_cache = NavigationDecisionCache()
+            _default_cache_settings = settings
+        return _default_cache
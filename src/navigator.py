@@ -7,10 +7,6 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import WebDriverException, TimeoutException, StaleElementReferenceException
 
-# Webdriver managers
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-
 # Import undetected geckodriver for Firefox (enhanced version)
 import sys
 repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -24,7 +20,6 @@ try:
     UNDETECTED_GECKODRIVER_AVAILABLE = True
 except ImportError:
     # Fallback to regular geckodriver
-    from webdriver_manager.firefox import GeckoDriverManager
     from selenium.webdriver.firefox.service import Service as FirefoxService
     from selenium.webdriver.firefox.options import Options as FirefoxOptions
     UNDETECTED_GECKODRIVER_AVAILABLE = False
@@ -34,14 +29,129 @@ from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.edge.service import Service as EdgeService
 
 from selenium.webdriver.remote.webdriver import WebDriver
-from logger import get_logger, time_it
+from logger import get_logger, time_it, record_metric
 from exceptions import BrowserError, SessionError, NavigationError
 from utils import retry
+from navigation_cache import get_navigation_cache
+from intent_resolver import resolve_intent
+from tab_index import TabIndex, debugger_address_from_capabilities
+from tab_content import TabContentReader
+from rate_limiter import get_rate_limiter
+from session_store import SessionStore, get_session_namespace
+from aria_daemon import raise_if_cancelled
+from driver_registry import get_driver_registry, wait_for_port
+from readiness import DOM_STABLE_SCRIPT, NETWORK_IDLE_SCRIPT, SELECTOR_STABLE_SCRIPT, DEFAULT_QUIET_MS, DEFAULT_TIMEOUT as DEFAULT_READINESS_TIMEOUT
 import time
+import configparser
 from selenium.common.exceptions import WebDriverException
 
 logger = get_logger("navigator")
 
+MAX_EXTRACTED_LINKS = 100 # Limit to save context
+
+def get_binary_path(browser_type):
+    """Returns the first installed binary for a browser on POSIX systems, or None."""
+    if browser_type == "chrome":
+        paths = [
+            "/usr/bin/google-chrome",
+            "/usr/bin/google-chrome-stable",
+            "/usr/bin/chromium",
+            "/usr/bin/chromium-browser",
+            "/snap/bin/chromium",
+            "/snap/bin/chromium-browser"
+        ]
+    elif browser_type == "firefox":
+        paths = [
+            "/usr/bin/firefox",
+            "/usr/bin/firefox-esr",
+            "/snap/bin/firefox",
+            "/usr/local/bin/firefox"
+        ]
+    else:
+        return None
+
+    for path in paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+def get_firefox_profile_path(profile_name_or_path):
+    """Resolves a Firefox profile name (from profiles.ini) or path to a directory, or None."""
+    if not profile_name_or_path:
+        return None
+
+    # If it looks like a path, use it
+    if os.path.isabs(profile_name_or_path) or os.path.exists(profile_name_or_path):
+        return profile_name_or_path
+
+    # Check profiles.ini
+    profiles_ini_path = os.path.join(os.path.expanduser("~"), ".mozilla", "firefox", "profiles.ini")
+    if os.path.exists(profiles_ini_path):
+        try:
+            config = configparser.ConfigParser()
+            config.read(profiles_ini_path)
+            for section in config.sections():
+                if section.startswith("Profile"):
+                    name = config.get(section, "Name", fallback="")
+                    if name == profile_name_or_path:
+                        path = config.get(section, "Path", fallback="")
+                        is_relative = config.getint(section, "IsRelative", fallback=1)
+                        if is_relative:
+                            return os.path.join(os.path.dirname(profiles_ini_path), path)
+                        return path
+        except Exception as e:
+            logger.error(f"Error parsing profiles.ini: {e}")
+
+    return None
+
+def get_default_firefox_profile_path():
+    """Returns the directory of the default Firefox profile from profiles.ini, or None."""
+    profiles_ini_path = os.path.join(os.path.expanduser("~"), ".mozilla", "firefox", "profiles.ini")
+    if not os.path.exists(profiles_ini_path):
+        return None
+    try:
+        config = configparser.ConfigParser()
+        config.read(profiles_ini_path)
+        sections = [section for section in config.sections() if section.startswith("Profile")]
+        # Prefer the profile marked Default=1, otherwise the first one listed
+        sections.sort(key=lambda section: config.getint(section, "Default", fallback=0), reverse=True)
+        for section in sections:
+            path = config.get(section, "Path", fallback="")
+            if path:
+                if config.getint(section, "IsRelative", fallback=1):
+                    return os.path.join(os.path.dirname(profiles_ini_path), path)
+                return path
+    except Exception as e:
+        logger.error(f"Error parsing profiles.ini: {e}")
+    return None
+
+# Runs inside the page: visibility, text, aria-label and absolute href for every anchor,
+# returned as one compact array instead of several WebDriver calls per element.
+EXTRACT_LINKS_SCRIPT = """
+const limit = arguments[0];
+const anchors = document.getElementsByTagName('a');
+const links = [];
+for (let i = 0; i < anchors.length && links.length < limit; i++) {
+    const el = anchors[i];
+    const href = typeof el.href === 'string' ? el.href : (el.href && el.href.baseVal) || '';
+    if (!href) continue;
+    let visible;
+    if (typeof el.checkVisibility === 'function') {
+        visible = el.checkVisibility({checkOpacity: true, checkVisibilityCSS: true});
+    } else {
+        const style = window.getComputedStyle(el);
+        visible = el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.opacity !== '0';
+    }
+    if (!visible) continue;
+    const text = (el.innerText || el.textContent || '').trim() || el.getAttribute('aria-label') || '';
+    links.push({id: i, text: text.substring(0, 50), url: href});
+}
+return links;
+"""
+
+# Chromium 109+ and Firefox 121+ expose the document's HTTP status; older browsers return null
+NAVIGATION_STATUS_SCRIPT = "const entry = performance.getEntriesByType('navigation')[0]; return entry && entry.responseStatus || null;"
+
 class BaseNavigator:
     """Abstract base class for all navigators."""
     def __init__(self):
@@ -91,12 +201,45 @@ class AriaNavigator(BaseNavigator):
     def __init__(self):
         super().__init__()
         self.driver: WebDriver | None = None
-        self.throttle_delay = float(os.environ.get("ARIA_THROTTLE_DELAY", 0.0))
+        # --slow-mo pause before every action; politeness towards sites is the rate limiter's job
+        self.throttle_delay = 0.0
         self.randomize_delay = os.environ.get("ARIA_RANDOMIZE_DELAY", "true").lower() == "true"
         self.plugin_manager = None
-
-    def throttle(self):
-        """Introduces a delay based on throttle settings."""
+        self.debugger_address = None
+        self._tab_index = None
+        self._tab_content = None
+        self._script_timeout = (None, 0.0)
+        self.scrape_profile = None
+        self.scrape_browser = None
+        # Set by the daemon when warm standby browsers are enabled (see warm_standby)
+        self.standby_pool = None
+        self._session_store = None
+        self.reset_readiness_stats()
+
+    @property
+    def tab_index(self):
+        """The TabIndex for the current driver, recreated whenever the driver changes."""
+        if self._tab_index is None or self._tab_index.driver is not self.driver:
+            self._tab_index = TabIndex(self.driver, debugger_address=self.debugger_address)
+        return self._tab_index
+
+    @property
+    def tab_content(self):
+        """The TabContentReader (and its per-tab text cache) for the current driver."""
+        if self._tab_content is None or self._tab_content.driver is not self.driver:
+            self._tab_content = TabContentReader(self.driver, debugger_address=self.debugger_address)
+        return self._tab_content
+
+    @property
+    def rate_limiter(self):
+        return get_rate_limiter()
+
+    def throttle(self, url=None):
+        """Waits until `url`'s domain may be requested again, then applies any --slow-mo delay."""
+        # A daemon command whose client hung up stops before its next page load
+        raise_if_cancelled()
+        if url:
+            self.rate_limiter.acquire(url)
         if self.throttle_delay > 0:
             import time
             import random
@@ -123,21 +266,110 @@ class AriaNavigator(BaseNavigator):
             logger.error(f"Timed out waiting for element: {selector}")
             raise BrowserError(f"Timed out waiting for element: {selector}")
 
+    def apply_scrape_profile(self, scrape_profile, browser_name=None):
+        """
+        Blocks the profile's resource URLs in the running browser, replacing earlier rules.
+        Launch-time preferences cannot change here: a per-site profile can add URL rules
+        but not lift what the session was started with. Returns the mechanism used, if any.
+        """
+        if scrape_profile is None or not self.driver:
+            return None
+        self.scrape_profile = scrape_profile
+        self.scrape_browser = browser_name or self.scrape_browser or self.driver.capabilities.get("browserName", "").replace("MicrosoftEdge", "edge").lower()
+        mechanism = scrape_profile.apply_to_driver(self.driver, self.scrape_browser)
+        logger.info(f"Resource blocking for {self.scrape_browser}: {mechanism or 'preferences only'}",
+                    extra={"browser": self.scrape_browser, **scrape_profile.to_dict()})
+        return mechanism
+
+    def reset_readiness_stats(self):
+        """Starts a new tally of readiness waits (e.g. at the start of a site refresh)."""
+        self.readiness_stats = {"waits": 0, "waited_ms": 0.0, "budget_ms": 0.0, "saved_ms": 0.0}
+
+    def _record_readiness(self, kind, start_time, budget, ready, **fields):
+        """Records one wait; `budget` is the fixed sleep (seconds) the wait replaces, so savings can be reported."""
+        raise_if_cancelled()
+        waited_ms = (time.perf_counter() - start_time) * 1000
+        budget_ms = (budget or 0) * 1000
+        saved_ms = budget_ms - waited_ms if budget else 0.0
+        stats = self.readiness_stats
+        stats["waits"] += 1
+        stats["waited_ms"] += waited_ms
+        stats["budget_ms"] += budget_ms
+        stats["saved_ms"] += saved_ms
+        record_metric("readiness_wait", waited_ms, kind=kind, ready=ready, budget_ms=budget_ms, saved_ms=round(saved_ms, 2), **fields)
+        return ready
+
+    def _run_readiness_script(self, kind, script, args, timeout, budget):
+        if not self.driver:
+            self.driver = self.connect_to_session()
+        if not self.driver:
+            raise SessionError("No active session.")
+
+        start_time = time.perf_counter()
+        result = None
+        try:
+            # The script settles itself at `timeout`; the driver limit only needs headroom above it
+            driver, current = self._script_timeout
+            if driver is not self.driver or current < timeout + 5:
+                self.driver.set_script_timeout(timeout + 5)
+                self._script_timeout = (self.driver, timeout + 5)
+            result = self.driver.execute_async_script(script, *args)
+        except WebDriverException as e:
+            # A navigation during the wait unloads the script; carry on as a sleep would have
+            logger.debug(f"Readiness check '{kind}' interrupted: {e}")
+        result = result if isinstance(result, dict) else {}
+        extra = {k: v for k, v in result.items() if k in ("mutations", "requests", "count")}
+        return self._record_readiness(kind, start_time, budget, bool(result.get("ready")), **extra)
+
+    @staticmethod
+    def _readiness_timeout(timeout, budget):
+        # A wait that replaces a fixed sleep never takes longer than that sleep did
+        return min(timeout, budget) if budget else timeout
+
+    def wait_for_dom_stable(self, quiet_ms=DEFAULT_QUIET_MS, timeout=DEFAULT_READINESS_TIMEOUT, root_selector=None, budget=None):
+        """Waits until no nodes or text change under `root_selector` (default: the whole page) for `quiet_ms`."""
+        timeout = self._readiness_timeout(timeout, budget)
+        return self._run_readiness_script("dom_stable", DOM_STABLE_SCRIPT, [quiet_ms, int(timeout * 1000), root_selector], timeout, budget)
+
+    def wait_for_network_idle(self, idle_ms=DEFAULT_QUIET_MS, timeout=DEFAULT_READINESS_TIMEOUT, budget=None):
+        """Waits until the page has loaded and no resource request has completed for `idle_ms`."""
+        timeout = self._readiness_timeout(timeout, budget)
+        return self._run_readiness_script("network_idle", NETWORK_IDLE_SCRIPT, [idle_ms, int(timeout * 1000)], timeout, budget)
+
+    def wait_for_selector_stable(self, selector, min_count=1, stable_ms=DEFAULT_QUIET_MS, timeout=DEFAULT_READINESS_TIMEOUT, budget=None):
+        """Waits until at least `min_count` elements match `selector` and their number stops changing for `stable_ms`."""
+        timeout = self._readiness_timeout(timeout, budget)
+        return self._run_readiness_script("selector_stable", SELECTOR_STABLE_SCRIPT, [selector, min_count, stable_ms, int(timeout * 1000)], timeout, budget)
+
+    def wait_until(self, condition, timeout=DEFAULT_READINESS_TIMEOUT, poll=0.2, budget=None):
+        """Polls `condition(driver)` until it returns something truthy; returns that value, or None on timeout."""
+        if not self.driver:
+            self.driver = self.connect_to_session()
+        if not self.driver:
+            raise SessionError("No active session.")
+
+        start_time = time.perf_counter()
+        try:
+            value = WebDriverWait(self.driver, timeout, poll_frequency=poll).until(condition)
+        except TimeoutException:
+            value = None
+        self._record_readiness("condition", start_time, budget, bool(value))
+        return value
+
+    @property
+    def session_store(self):
+        """The SessionStore for the current ARIA_SESSION_NAMESPACE (the daemon serves several)."""
+        namespace = get_session_namespace()
+        if self._session_store is None or self._session_store.namespace != namespace:
+            self._session_store = SessionStore(namespace=namespace)
+        return self._session_store
+
     def get_session_file_path(self, browser_name=None):
-        temp_dir = os.path.join(os.path.expanduser("~"), ".aria")
-        if not os.path.exists(temp_dir):
-            os.makedirs(temp_dir)
-        if browser_name:
-            return os.path.join(temp_dir, f"aria_session_{browser_name}.json")
-        return os.path.join(temp_dir, "aria_session_current.json")
+        return self.session_store.path(browser_name)
 
     def _save_session(self, browser_name, session_data):
-        # Save browser-specific session
-        with open(self.get_session_file_path(browser_name), "w") as f:
-            json.dump(session_data, f)
-        # Set as current session
-        with open(self.get_session_file_path(), "w") as f:
-            json.dump({"browser": browser_name}, f)
+        # Saves the browser-specific session and makes it the current one
+        self.session_store.write(browser_name, session_data)
 
     def tag_tab(self, identifier, tag):
         """Adds a tag to a tab."""
@@ -149,17 +381,20 @@ class AriaNavigator(BaseNavigator):
         if self.goto_tab(identifier):
             handle = self.driver.current_window_handle
             browser_name = self._get_current_browser()
-            session_data = self._load_session_data(browser_name)
-            if session_data:
-                tags = session_data.get("tags", {})
-                if handle not in tags:
-                    tags[handle] = []
-                if tag not in tags[handle]:
-                    tags[handle].append(tag)
-                session_data["tags"] = tags
-                self._save_session(browser_name, session_data)
-                print(f"Tagged tab '{identifier}' with '{tag}'.")
-                return True
+
+            # Read-modify-write under the store's lock so a concurrent command's tags are not lost
+            with self.session_store.lock():
+                session_data = self._load_session_data(browser_name)
+                if session_data:
+                    tags = session_data.get("tags", {})
+                    if handle not in tags:
+                        tags[handle] = []
+                    if tag not in tags[handle]:
+                        tags[handle].append(tag)
+                    session_data["tags"] = tags
+                    self._save_session(browser_name, session_data)
+                    print(f"Tagged tab '{identifier}' with '{tag}'.")
+                    return True
         return False
 
     def get_tabs_by_tag(self, tag):
@@ -185,58 +420,51 @@ class AriaNavigator(BaseNavigator):
         if not self.driver:
             return []
 
-        tabs = []
+        # One metadata read for all tabs instead of switching through each of them
+        tabs = self.tab_index.refresh(force=True)
         current_handle = self.driver.current_window_handle
-        for i, handle in enumerate(self.driver.window_handles):
-            self.driver.switch_to.window(handle)
-            tabs.append({
-                "index": i,
-                "handle": handle,
-                "title": self.driver.title,
-                "url": self.driver.current_url,
-                "active": handle == current_handle
-            })
-        
-        # Switch back to the original handle
-        self.driver.switch_to.window(current_handle)
+        session_data = self._load_session_data(self._get_current_browser()) or {}
+        all_tags = session_data.get("tags", {})
+        for tab in tabs:
+            # `page list` shows the handle as the tab's id, alongside its tags
+            tab["id"] = tab["handle"]
+            tab["tags"] = all_tags.get(tab["handle"], [])
+            tab["active"] = tab["handle"] == current_handle
         return tabs
 
     def find_tab_by_url(self, url_pattern):
         """Finds a tab that matches a URL pattern and switches to it."""
-        tabs = self.list_tabs()
-        for tab in tabs:
-            if url_pattern in tab["url"]:
-                logger.info(f"Found existing tab matching '{url_pattern}' at index {tab['index']}")
-                self.goto_tab(tab["index"])
-                return True
+        if not self.driver:
+            self.driver = self.connect_to_session()
+        if not self.driver:
+            return False
+
+        self.tab_index.refresh()
+        handle = self.tab_index.find(lambda tab: url_pattern in tab["url"])
+        if handle:
+            logger.info(f"Found existing tab matching '{url_pattern}' at index {self.tab_index.handles.index(handle)}")
+            self.driver.switch_to.window(handle)
+            return True
         return False
 
     def _get_current_browser(self):
-        current_file = self.get_session_file_path()
-        if os.path.exists(current_file):
-            try:
-                with open(current_file, "r") as f:
-                    return json.load(f).get("browser")
-            except:
-                pass
-        return None
+        return self.session_store.current()
 
     def _load_session_data(self, browser_name):
-        session_file = self.get_session_file_path(browser_name)
-        if os.path.exists(session_file):
-            with open(session_file, "r") as f:
-                return json.load(f)
-        return None
+        return self.session_store.read(browser_name)
 
     @time_it(logger)
-    def start_session(self, browser_name="chrome", headless=False, force=False, profile=None, silence_audio=False):
+    def start_session(self, browser_name="chrome", headless=False, force=False, profile=None, silence_audio=False, scrape_profile=None):
+        """
+        Starts a browser session and saves it for other processes to reconnect to.
+        `scrape_profile` (a resource_blocking.ScrapeProfile) stops the browser downloading
+        resources scrapers never read; leave it unset for sessions a person will use.
+        """
         logger.info(
             f"Starting browser session: {browser_name}",
             extra={"browser": browser_name, "headless": headless, "force": force, "profile": profile, "silence_audio": silence_audio}
         )
-        session_file = self.get_session_file_path(browser_name)
-        
-        if os.path.exists(session_file):
+        if self._load_session_data(browser_name) is not None:
             if self.connect_to_session(browser_name):
                 if force:
                     print(f"Closing active {browser_name} session to start a new one...")
@@ -244,173 +472,37 @@ class AriaNavigator(BaseNavigator):
                 else:
                     print(f"An Aria session for {browser_name} is already active.")
                     # Still set it as current
-                    self._save_session(browser_name, self._load_session_data(browser_name))
+                    self.session_store.set_current(browser_name)
                     return self.driver
             else:
-                if os.path.exists(session_file):
-                    os.remove(session_file)
-
-        try:
-            import subprocess
-            import time
-            import socket
-            import configparser
-
-            def find_free_port():
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.bind(('', 0))
-                    return s.getsockname()[1]
-
-            port = find_free_port()
-            
-            driver_path = None
-            options = None
-            
-            def get_binary_path(browser_type):
-                if browser_type == "chrome":
-                    paths = [
-                        "/usr/bin/google-chrome",
-                        "/usr/bin/google-chrome-stable",
-                        "/usr/bin/chromium",
-                        "/usr/bin/chromium-browser",
-                        "/snap/bin/chromium",
-                        "/snap/bin/chromium-browser"
-                    ]
-                elif browser_type == "firefox":
-                    paths = [
-                        "/usr/bin/firefox",
-                        "/usr/bin/firefox-esr",
-                        "/snap/bin/firefox",
-                        "/usr/local/bin/firefox"
-                    ]
-                else:
-                    return None
-                    
-                for path in paths:
-                    if os.path.exists(path):
-                        return path
-                return None
-
-            def get_firefox_profile_path(profile_name_or_path):
-                if not profile_name_or_path:
-                    return None
-                
-                # If it looks like a path, use it
-                if os.path.isabs(profile_name_or_path) or os.path.exists(profile_name_or_path):
-                    return profile_name_or_path
-                
-                # Check profiles.ini
-                profiles_ini_path = os.path.join(os.path.expanduser("~"), ".mozilla", "firefox", "profiles.ini")
-                if os.path.exists(profiles_ini_path):
-                    try:
-                        config = configparser.ConfigParser()
-                        config.read(profiles_ini_path)
-                        for section in config.sections():
-                            if section.startswith("Profile"):
-                                name = config.get(section, "Name", fallback="")
-                                if name == profile_name_or_path:
-                                    path = config.get(section, "Path", fallback="")
-                                    is_relative = config.getint(section, "IsRelative", fallback=1)
-                                    if is_relative:
-                                        return os.path.join(os.path.dirname(profiles_ini_path), path)
-                                    return path
-                    except Exception as e:
-                        logger.error(f"Error parsing profiles.ini: {e}")
-                
-                return None
-
-            if browser_name == "chrome":
-                driver_path = ChromeDriverManager().install()
-                options = ChromeOptions()
-                if os.name == 'posix':
-                    bin_path = get_binary_path("chrome")
-                    if bin_path:
-                        logger.info(f"Found Chrome/Chromium binary at: {bin_path}")
-                        options.binary_location = bin_path
-            elif browser_name == "firefox":
-                if UNDETECTED_GECKODRIVER_AVAILABLE:
-                    # Use enhanced undetected geckodriver
-                    options = FirefoxOptions()
-                    if os.name == 'posix':
-                        bin_path = get_binary_path("firefox")
-                        if bin_path:
-                            logger.info(f"Found Firefox binary at: {bin_path}")
-                            options.binary_location = bin_path
-
-                    # Use default profile by default for better undetection
-                    self.driver = UndetectedFirefox(options=options, use_default_profile=True, silence_audio=silence_audio)
-
-                    # Save session info for undetected geckodriver
-                    session_data = {
-                        "session_id": self.driver.session_id,
-                        "url": "undetected_geckodriver",  # Placeholder for undetected geckodriver
-                        "browser": browser_name,
-                        "driver_type": "undetected",  # Mark this as an undetected geckodriver session
-                        "driver_pid": None  # undetected_geckodriver manages its own process
-                    }
-
-                    self._save_session(browser_name, session_data)
-                    logger.info(
-                        f"Aria session started for {browser_name} using enhanced undetected geckodriver",
-                        extra={"session_id": self.driver.session_id, "browser": browser_name}
-                    )
+                self._remove_session_file(browser_name)
 
-                    print(f"Aria session started for {browser_name} using enhanced undetected geckodriver")
-                    return self.driver
-                else:
-                    # Fallback to regular geckodriver
-                    driver_path = GeckoDriverManager().install()
-                    options = FirefoxOptions()
-                    if os.name == 'posix':
-                        bin_path = get_binary_path("firefox")
-                        if bin_path:
-                            logger.info(f"Found Firefox binary at: {bin_path}")
-                            options.binary_location = bin_path
-
-                    if profile:
-                        profile_path = get_firefox_profile_path(profile)
-                        if profile_path:
-                            print(f"Using Firefox profile (Direct): {profile_path}")
-                            # Use the profile directly (requires Firefox to be closed)
-                            options.add_argument("-profile")
-                            options.add_argument(profile_path)
-                        else:
-                            print(f"Warning: Could not find Firefox profile '{profile}'. Using default.")
+        if browser_name not in ("chrome", "firefox", "edge"):
+            print(f"Browser '{browser_name}' is not supported.")
+            return None
 
-            elif browser_name == "edge":
-                driver_path = EdgeChromiumDriverManager().install()
-                options = EdgeOptions()
+        try:
+            spare = None
+            # Launch-time options (resource blocking, audio) are not part of a standby's identity
+            if self.standby_pool and not scrape_profile and not silence_audio:
+                spare = self.standby_pool.take(browser_name, headless=headless, profile=profile)
+            if spare:
+                driver, session_data, label = spare.driver, dict(spare.session_data), " from a warm standby"
             else:
-                print(f"Browser '{browser_name}' is not supported.")
-                return None
-
-            creation_flags = 0
-            if os.name == 'nt':
-                creation_flags = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
-
-            proc = subprocess.Popen([driver_path, f"--port={port}"], creationflags=creation_flags)
-            time.sleep(2)
-
-            if headless:
-                options.add_argument("--headless")
-
-            remote_url = f"http://localhost:{port}"
-            self.driver = webdriver.Remote(command_executor=remote_url, options=options)
-
-            session_data = {
-                "session_id": self.driver.session_id,
-                "url": remote_url,
-                "browser": browser_name,
-                "driver_pid": proc.pid
-            }
+                driver, session_data, label = self.launch_browser(browser_name, headless=headless, profile=profile,
+                                                                  silence_audio=silence_audio, scrape_profile=scrape_profile)
+            self.driver = driver
+            self.debugger_address = session_data.get("debugger_address")
+            self.apply_scrape_profile(scrape_profile, browser_name)
+            session_data["scrape_profile"] = scrape_profile.to_dict() if scrape_profile else None
 
             self._save_session(browser_name, session_data)
             logger.info(
-                f"Aria session started for {browser_name}",
-                extra={"session_id": self.driver.session_id, "driver_pid": proc.pid, "browser": browser_name}
+                f"Aria session started for {browser_name}{label}",
+                extra={"session_id": self.driver.session_id, "driver_pid": session_data.get("driver_pid"), "browser": browser_name}
             )
             
-            print(f"Aria session started for {browser_name}")
+            print(f"Aria session started for {browser_name}{label}")
             return self.driver
         except Exception as e:
             import traceback
@@ -418,6 +510,132 @@ class AriaNavigator(BaseNavigator):
             print(f"Error starting {browser_name} session: {e}")
             return None
 
+    def launch_browser(self, browser_name, headless=False, profile=None, silence_audio=False, scrape_profile=None, verbose=True):
+        """
+        Starts a new driver and browser without saving or adopting the session.
+        Returns (driver, session_data, label); the warm standby pool uses this directly.
+        """
+        import subprocess
+        import socket
+
+        def find_free_port():
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                s.bind(('', 0))
+                return s.getsockname()[1]
+
+        port = find_free_port()
+        
+        driver_path = None
+        options = None
+        start_time = time.perf_counter()
+        
+        if browser_name == "chrome":
+            driver_path = get_driver_registry().resolve("chrome")
+            options = ChromeOptions()
+            if os.name == 'posix':
+                bin_path = get_binary_path("chrome")
+                if bin_path:
+                    logger.info(f"Found Chrome/Chromium binary at: {bin_path}")
+                    options.binary_location = bin_path
+        elif browser_name == "firefox":
+            if UNDETECTED_GECKODRIVER_AVAILABLE:
+                # Use enhanced undetected geckodriver
+                options = FirefoxOptions()
+                if os.name == 'posix':
+                    bin_path = get_binary_path("firefox")
+                    if bin_path:
+                        logger.info(f"Found Firefox binary at: {bin_path}")
+                        options.binary_location = bin_path
+                if scrape_profile:
+                    scrape_profile.apply_to_options(browser_name, options)
+
+                # Use default profile by default for better undetection
+                driver = UndetectedFirefox(options=options, use_default_profile=True, silence_audio=silence_audio)
+                record_metric("session_start_phase", (time.perf_counter() - start_time) * 1000, phase="total", browser=browser_name)
+
+                # Save session info for undetected geckodriver
+                session_data = {
+                    "session_id": driver.session_id,
+                    "url": "undetected_geckodriver",  # Placeholder for undetected geckodriver
+                    "browser": browser_name,
+                    "driver_type": "undetected",  # Mark this as an undetected geckodriver session
+                    "driver_pid": None  # undetected_geckodriver manages its own process
+                }
+                return driver, session_data, " using enhanced undetected geckodriver"
+            else:
+                # Fallback to regular geckodriver
+                driver_path = get_driver_registry().resolve("firefox")
+                options = FirefoxOptions()
+                if os.name == 'posix':
+                    bin_path = get_binary_path("firefox")
+                    if bin_path:
+                        logger.info(f"Found Firefox binary at: {bin_path}")
+                        options.binary_location = bin_path
+
+                if profile:
+                    profile_path = get_firefox_profile_path(profile)
+                    if profile_path:
+                        if verbose:
+                            print(f"Using Firefox profile (Direct): {profile_path}")
+                        # Use the profile directly (requires Firefox to be closed)
+                        options.add_argument("-profile")
+                        options.add_argument(profile_path)
+                    elif verbose:
+                        print(f"Warning: Could not find Firefox profile '{profile}'. Using default.")
+
+        elif browser_name == "edge":
+            driver_path = get_driver_registry().resolve("edge")
+            options = EdgeOptions()
+        else:
+            raise BrowserError(f"Browser '{browser_name}' is not supported.")
+
+        creation_flags = 0
+        if os.name == 'nt':
+            creation_flags = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+
+        resolved_time = time.perf_counter()
+        # os.environ is the client's under the daemon; the process environment is the daemon's
+        proc = subprocess.Popen([driver_path, f"--port={port}"], creationflags=creation_flags, env=dict(os.environ))
+        if not wait_for_port(port, process=proc):
+            proc.kill()
+            # A driver that cannot start is likely stale (e.g. after a browser upgrade); resolve afresh next time
+            get_driver_registry().invalidate(browser_name)
+            raise BrowserError(f"{os.path.basename(driver_path)} did not start listening on port {port}.")
+        ready_time = time.perf_counter()
+
+        if headless:
+            options.add_argument("--headless")
+        if scrape_profile:
+            scrape_profile.apply_to_options(browser_name, options)
+
+        remote_url = f"http://localhost:{port}"
+        try:
+            driver = webdriver.Remote(command_executor=remote_url, options=options)
+        except WebDriverException:
+            proc.kill()
+            get_driver_registry().invalidate(browser_name)
+            raise
+        session_time = time.perf_counter()
+
+        phases = {
+            "resolve_driver": resolved_time - start_time,
+            "driver_ready": ready_time - resolved_time,
+            "browser_session": session_time - ready_time,
+            "total": session_time - start_time
+        }
+        for phase, seconds in phases.items():
+            record_metric("session_start_phase", seconds * 1000, phase=phase, browser=browser_name)
+
+        session_data = {
+            "session_id": driver.session_id,
+            "url": remote_url,
+            "browser": browser_name,
+            "driver_pid": proc.pid,
+            # Lets reconnecting processes read tab metadata from DevTools without switching tabs
+            "debugger_address": debugger_address_from_capabilities(driver.capabilities)
+        }
+        return driver, session_data, ""
+
     def _is_process_running(self, pid):
         """Checks if a process with the given PID is still running."""
         if not pid:
@@ -501,13 +719,13 @@ class AriaNavigator(BaseNavigator):
                 _ = driver.current_url
 
                 self.driver = driver
+                self.debugger_address = session_data.get("debugger_address")
                 logger.info(
                     f"Successfully reconnected to {browser_name} session.",
                     extra={"browser": browser_name, "session_id": session_data["session_id"]}
                 )
                 # Update current browser
-                with open(self.get_session_file_path(), "w") as f:
-                    json.dump({"browser": browser_name}, f)
+                self.session_store.set_current(browser_name)
                 return self.driver
             else:
                 # For undetected geckodriver, we can't reconnect to existing sessions
@@ -523,13 +741,7 @@ class AriaNavigator(BaseNavigator):
             return None
 
     def _remove_session_file(self, browser_name):
-        session_file = self.get_session_file_path(browser_name)
-        if os.path.exists(session_file):
-            os.remove(session_file)
-        if self._get_current_browser() == browser_name:
-            current_file = self.get_session_file_path()
-            if os.path.exists(current_file):
-                os.remove(current_file)
+        self.session_store.remove(browser_name)
 
     def cleanup_orphaned_sessions(self):
         """Identifies and cleans up stale session files and orphaned driver processes."""
@@ -574,14 +786,7 @@ class AriaNavigator(BaseNavigator):
         return cleaned_count
 
     def list_active_browsers(self):
-        temp_dir = os.path.join(os.path.expanduser("~"), ".aria")
-        browsers = []
-        if os.path.exists(temp_dir):
-            for f in os.listdir(temp_dir):
-                if f.startswith("aria_session_") and f.endswith(".json") and f != "aria_session_current.json":
-                    browser_name = f[len("aria_session_"):-len(".json")]
-                    browsers.append(browser_name)
-        return browsers
+        return self.session_store.list_browsers()
 
     def close_session(self, browser_name=None):
         if not browser_name:
@@ -592,7 +797,6 @@ class AriaNavigator(BaseNavigator):
             return
 
         logger.info(f"Closing {browser_name} session.")
-        session_file = self.get_session_file_path(browser_name)
         session_data = self._load_session_data(browser_name)
         
         if session_data:
@@ -623,6 +827,10 @@ class AriaNavigator(BaseNavigator):
                     # We need to handle this differently - for now, we just remove the session file
                     # The actual browser instance would need to be tracked differently
                     logger.info(f"Closing undetected geckodriver session for {browser_name}.")
+                    # Only the process that started it (e.g. the daemon) still holds the driver
+                    if self.driver is not None and getattr(self.driver, "session_id", None) == session_data.get("session_id"):
+                        self.driver.quit()
+                        self.driver = None
             except:
                 pass
 
@@ -637,21 +845,18 @@ class AriaNavigator(BaseNavigator):
                 except:
                     pass
 
-        if os.path.exists(session_file):
-            os.remove(session_file)
-        
-        # If we closed the current browser, clear current_session.json
-        if self._get_current_browser() == browser_name:
-            current_file = self.get_session_file_path()
-            if os.path.exists(current_file):
-                os.remove(current_file)
+        # Also clears the current-session pointer if it named this browser
+        self._remove_session_file(browser_name)
         
         print(f"Aria session for {browser_name} closed.")
+        if self.standby_pool:
+            # Profiles the closed browser held can be prewarmed again
+            self.standby_pool.refill()
 
     @time_it(logger)
     @retry((WebDriverException, BrowserError), tries=3, delay=1)
     def navigate(self, url):
-        self.throttle()
+        self.throttle(url)
         if self.plugin_manager:
             self.plugin_manager.trigger_hook("pre_navigation", url=url)
 
@@ -667,6 +872,9 @@ class AriaNavigator(BaseNavigator):
             print(f"Navigating to: {url}")
             logger.info(f"Navigating to URL: {url}", extra={"url": url})
             self.driver.get(url)
+            self.tab_index.invalidate()
+            # A 429/503 page still loads; feeding its status back pauses further requests to the site
+            self.rate_limiter.report(url, self._navigation_status())
             if self.plugin_manager:
                 self.plugin_manager.trigger_hook("post_navigation", url=url, success=True)
         except WebDriverException as e:
@@ -680,11 +888,29 @@ class AriaNavigator(BaseNavigator):
             logger.error(f"Unexpected error during navigation to {url}: {e}", extra={"url": url, "error": str(e)})
             raise BrowserError(f"An unexpected error occurred during navigation: {e}")
 
-    def extract_links(self):
-        """Extracts visible links from the current page."""
+    def _navigation_status(self):
+        """HTTP status of the current document (Navigation Timing responseStatus), or None where unsupported."""
+        try:
+            status = self.driver.execute_script(NAVIGATION_STATUS_SCRIPT)
+        except WebDriverException:
+            return None
+        return status if isinstance(status, int) and status > 0 else None
+
+    def extract_links(self, limit=MAX_EXTRACTED_LINKS):
+        """Extracts visible links from the current page in a single WebDriver round trip."""
         if not self.driver:
             return []
-        
+
+        try:
+            links = self.driver.execute_script(EXTRACT_LINKS_SCRIPT, limit)
+            if isinstance(links, list):
+                return links
+        except WebDriverException as e:
+            logger.warning(f"Scripted link extraction failed, falling back to element queries: {e}")
+        return self._extract_links_by_element(limit)
+
+    def _extract_links_by_element(self, limit=MAX_EXTRACTED_LINKS):
+        """Per-element extraction (several round trips per anchor); only used if scripts are blocked."""
         elements = self.driver.find_elements(By.TAG_NAME, "a")
         links = []
         for i, el in enumerate(elements):
@@ -696,7 +922,7 @@ class AriaNavigator(BaseNavigator):
                         links.append({"id": i, "text": text[:50], "url": href})
             except:
                 pass
-        return links[:100] # Limit to 100 links to save context
+        return links[:limit] # Limit to save context
 
     def navigate_with_prompt(self, prompt):
         """Uses AI to determine where to navigate based on a prompt."""
@@ -709,24 +935,55 @@ class AriaNavigator(BaseNavigator):
             print("No active session. Use 'aria open' to start a session.")
             return
 
+        start_time = time.perf_counter()
+
+        # 0. URLs, domains and search phrasings need neither the page nor the AI
+        resolution = resolve_intent(prompt)
+        if resolution:
+            self._navigate_resolved(resolution, start_time)
+            return
+
         # 1. Get current context (links)
         links = self.extract_links()
+
+        # Exact or confident fuzzy match on link text
+        resolution = resolve_intent(prompt, links)
+        if resolution:
+            self._navigate_resolved(resolution, start_time)
+            return
         
         # 2. Get AI Provider
         provider = None
         if self.plugin_manager:
-            # Try to get default 'gemini' or any available
-            provider = self.plugin_manager.get_ai_provider("gemini")
+            # Try the configured default (e.g. 'router'), then 'gemini', then any available
+            provider = self.plugin_manager.get_ai_provider(os.environ.get("ARIA_DEFAULT_AI_PROVIDER", "gemini"))
+            if not provider:
+                provider = self.plugin_manager.get_ai_provider("gemini")
             if not provider:
                 providers = self.plugin_manager.list_ai_providers()
                 if providers:
                     provider = self.plugin_manager.get_ai_provider(providers[0])
         
         url_to_navigate = None
+        path = "fallback_search"
         
-        if provider and links:
-            import json
+        decision_cache = get_navigation_cache() if provider and links else None
+        page_url = self.driver.current_url if decision_cache else None
+        model = getattr(provider, "model", "")
+        data = decision_cache.get(prompt, page_url, links, model=model) if decision_cache else None
+        if data:
+            path = "cache"
+            logger.info("Using cached navigation decision.", extra={"page_url": page_url})
+            if "url" in data:
+                url_to_navigate = data["url"]
+                print(f"Cached decision: {url_to_navigate}")
+            elif "search" in data:
+                print(f"Cached decision: search for {data['search']}")
+                prompt = data["search"]
+        elif provider and links:
+            path = "ai"
             context_str = json.dumps(links, indent=2)
+            original_prompt = prompt
             
             ai_prompt = (
                 f"User request: '{prompt}'\n\n"
@@ -745,6 +1002,8 @@ class AriaNavigator(BaseNavigator):
                     response = response.split("\n", 1)[1].rsplit("\n", 1)[0]
                 
                 data = json.loads(response)
+                if decision_cache:
+                    decision_cache.set(original_prompt, page_url, links, data, model=model)
                 if "url" in data:
                     url_to_navigate = data["url"]
                     print(f"AI identified target: {url_to_navigate}")
@@ -755,6 +1014,8 @@ class AriaNavigator(BaseNavigator):
                 logger.error(f"AI analysis failed: {e}")
                 print(f"AI analysis failed: {e}")
 
+        record_metric("navigate_with_prompt", (time.perf_counter() - start_time) * 1000, path=path)
+
         if url_to_navigate:
             self.navigate(url_to_navigate)
             return
@@ -765,6 +1026,18 @@ class AriaNavigator(BaseNavigator):
         self.navigate(search_url)
         print(f"Searching for '{prompt}' on DuckDuckGo.")
 
+    def _navigate_resolved(self, resolution, start_time):
+        """Navigates to a target found by the local intent resolver, without an AI call."""
+        record_metric(
+            "navigate_with_prompt",
+            (time.perf_counter() - start_time) * 1000,
+            path=resolution["path"],
+            confidence=resolution["confidence"]
+        )
+        logger.info(f"Resolved prompt locally ({resolution['path']}).", extra={"confidence": resolution["confidence"]})
+        print(f"Resolved locally: {resolution['url']}")
+        self.navigate(resolution["url"])
+
     @time_it(logger)
     def goto_tab(self, identifier):
         if not self.driver:
@@ -775,61 +1048,56 @@ class AriaNavigator(BaseNavigator):
             return False
 
         try:
-            handles = self.driver.window_handles
-            
-            # Normalize identifier
-            str_ident = str(identifier)
-
-            # 1. Try by handle (exact match)
-            if str_ident in handles:
-                self.driver.switch_to.window(str_ident)
-                return True
-
-            # 2. Try by index (0-based)
-            try:
-                idx = int(identifier)
-                if 0 <= idx < len(handles):
-                    self.driver.switch_to.window(handles[idx])
-                    return True
-            except (ValueError, TypeError):
-                pass
-            
-            # Store original handle to revert if no match is found
-            original_handle = self.driver.current_window_handle
-
-            # 3. Try by partial handle match (if it looks like a handle or is reasonably long)
-            if len(str_ident) >= 5:
-                for handle in handles:
-                    if str_ident in handle:
-                        self.driver.switch_to.window(handle)
-                        return True
-
-            # 4. Try by title (exact match, case-sensitive)
-            for handle in handles:
-                self.driver.switch_to.window(handle)
-                if self.driver.title == str_ident:
-                    return True
-
-            # 5. Try by title (partial, case-insensitive)
-            for handle in handles:
+            handle = self._resolve_tab_handle(identifier)
+            if handle:
                 self.driver.switch_to.window(handle)
-                if str_ident.lower() in self.driver.title.lower():
-                    return True
-            
-            # 6. Try by URL (partial)
-            for handle in handles:
-                self.driver.switch_to.window(handle)
-                if str_ident in self.driver.current_url:
-                    return True
+                return True
 
-            # If not found, switch back to original window
-            self.driver.switch_to.window(original_handle)
             logger.info(f"Tab with identifier '{identifier}' not found.")
             return False
         except WebDriverException as e:
             logger.error(f"Error going to tab: {e}")
             return False
 
+    def _resolve_tab_handle(self, identifier):
+        """Finds the window handle for a tab index, handle (or part of one), title or URL, without switching."""
+        handles = self.driver.window_handles
+        
+        # Normalize identifier
+        str_ident = str(identifier)
+
+        # 1. Try by handle (exact match)
+        if str_ident in handles:
+            return str_ident
+
+        # 2. Try by index (0-based)
+        try:
+            idx = int(identifier)
+            if 0 <= idx < len(handles):
+                return handles[idx]
+        except (ValueError, TypeError):
+            pass
+        
+        # 3. Try by partial handle match (if it looks like a handle or is reasonably long)
+        if len(str_ident) >= 5:
+            for handle in handles:
+                if str_ident in handle:
+                    return handle
+
+        # 4-6. Title (exact, then partial case-insensitive) and URL (partial) are lookups
+        # in the tab index, so no window switch is needed
+        self.tab_index.refresh()
+        lowered = str_ident.lower()
+        for predicate in (
+            lambda tab: tab["title"] == str_ident,
+            lambda tab: lowered in (tab["title"] or "").lower(),
+            lambda tab: str_ident in (tab["url"] or "")
+        ):
+            handle = self.tab_index.find(predicate)
+            if handle:
+                return handle
+        return None
+
     @time_it(logger)
     @retry((WebDriverException, BrowserError, StaleElementReferenceException), tries=3, delay=1)
     def get_page_content(self):
@@ -851,6 +1119,7 @@ class AriaNavigator(BaseNavigator):
         """Retrieves content from multiple tabs.
         identifiers: list of tab indices, IDs, or titles.
         Returns a list of dicts: {'identifier': ..., 'content': ..., 'title': ..., 'url': ...}
+        Tabs are read concurrently, without switching windows, and unchanged tabs come from cache.
         """
         if not self.driver:
             self.driver = self.connect_to_session()
@@ -859,27 +1128,29 @@ class AriaNavigator(BaseNavigator):
             print("No active session. Use 'aria open' to start a session.")
             return []
 
-        original_window = self.driver.current_window_handle
-        results = []
-        
+        resolved = []
         for identifier in identifiers:
-            if self.goto_tab(identifier):
-                content = self.get_page_content()
-                results.append({
-                    "identifier": identifier,
-                    "title": self.driver.title,
-                    "url": self.driver.current_url,
-                    "content": content
-                })
+            try:
+                handle = self._resolve_tab_handle(identifier)
+            except WebDriverException as e:
+                logger.error(f"Error finding tab '{identifier}': {e}")
+                handle = None
+            if handle:
+                resolved.append((identifier, handle))
             else:
-                logger.warning(f"Could not switch to tab '{identifier}' to get content.")
-        
-        # Switch back to the original window
-        self.driver.switch_to.window(original_window)
+                logger.warning(f"Could not find tab '{identifier}' to get content.")
+
+        contents = self.tab_content.read([handle for _, handle in resolved])
+        results = []
+        for identifier, handle in resolved:
+            if handle in contents:
+                results.append(dict(contents[handle], identifier=identifier))
+            else:
+                logger.warning(f"Could not read content of tab '{identifier}'.")
         return results
 
     def new_tab(self, url="about:blank"):
-        self.throttle()
+        self.throttle(url)
         if not self.driver:
             self.driver = self.connect_to_session()
         
@@ -889,8 +1160,12 @@ class AriaNavigator(BaseNavigator):
 
         try:
             self.driver.execute_script(f"window.open('{url}', '_blank');")
+            self.tab_index.invalidate()
             # Switch to the new window
             self.driver.switch_to.window(self.driver.window_handles[-1])
+            if self.scrape_profile and self.scrape_browser in ("chrome", "edge"):
+                # CDP blocking is installed per target, so each new tab needs its own rules
+                self.scrape_profile.apply_to_driver(self.driver, self.scrape_browser)
             logger.info(f"Opened new tab with URL: {url}")
             return True
         except WebDriverException as e:
@@ -1,8 +1,9 @@
 import os
+import asyncio
 import importlib.util
 import sys
 import logging
-from typing import List, Dict, Any, Callable
+from typing import List, Dict, Any, Callable, Iterator
 
 logger = logging.getLogger("aria.plugin_manager")
 
@@ -42,6 +43,20 @@ class BaseAIProvider:
         """Generates a response from the AI."""
         raise NotImplementedError("AI providers must implement the generate method.")
 
+    def generate_stream(self, prompt: str, context: str = "", output_format: str = "text") -> Iterator[str]:
+        """
+        Yields the response in chunks as it is produced.
+        Providers without native streaming yield the full generate() result once.
+        """
+        yield self.generate(prompt, context, output_format)
+
+    async def agenerate(self, prompt: str, context: str = "", output_format: str = "text") -> str:
+        """
+        Coroutine version of generate().
+        The default runs generate() in a worker thread so synchronous providers can be fanned out concurrently.
+        """
+        return await asyncio.to_thread(self.generate, prompt, context, output_format)
+
 class PluginManager:
     """Manages discovery, loading, and registration of Aria plugins."""
     def __init__(self, plugins_dir: str = None, context: Dict[str, Any] = None):
@@ -0,0 +1,191 @@
+import os
+import time
+import threading
+import email.utils
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from logger import get_logger, record_metric
+
+logger = get_logger("rate_limiter")
+
+# Requests per second and burst size for domains without a rule of their own
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 4
+# Backoff after a 429/503 without a usable Retry-After, doubled per consecutive refusal
+BASE_BACKOFF = 5.0
+MAX_BACKOFF = 300.0
+THROTTLED_STATUSES = (429, 503)
+
+def parse_retry_after(value) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+def parse_rate_limits(value: Optional[str]) -> List[Tuple[str, float, int]]:
+    """
+    Parses ARIA_RATE_LIMITS, e.g. 'discord.com=0.5/2;threads.net=1;*=4/8':
+    requests per second, then an optional burst size (default 1). '*' sets the default.
+    """
+    rules = []
+    for entry in (value or "").split(";"):
+        if "=" not in entry:
+            continue
+        domain, spec = entry.split("=", 1)
+        rate, _, burst = spec.partition("/")
+        try:
+            rules.append((domain.strip().lower().lstrip("."), float(rate), int(burst) if burst.strip() else 1))
+        except ValueError:
+            logger.warning(f"Ignoring invalid rate limit '{entry.strip()}'")
+    return rules
+
+class TokenBucket:
+    """Allows `burst` requests at once, refilled at `rate` per second."""
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.refusals = 0
+
+    def reserve(self, now: float) -> float:
+        """Takes a token, possibly one not yet refilled, and returns how long to wait for it."""
+        if self.rate <= 0:
+            return max(0.0, self.blocked_until - now)
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        # Requests queued behind a pause are still spaced out at `rate` once it ends
+        return wait + max(0.0, self.blocked_until - now)
+
+class DomainRateLimiter:
+    """
+    Politeness per domain instead of one global delay between all requests.
+
+    Each domain gets a token bucket, so requests to different sites never wait on each
+    other while bursts against one site are spread out. A rule for 'discord.com' also
+    covers its subdomains and shares one bucket with them. Callers reserve a slot under
+    the lock and sleep outside it, so threads (e.g. pooled site refreshes) queue fairly.
+    A 429/503 blocks the domain for its Retry-After, or an exponential backoff.
+    """
+    def __init__(self, rules: List[Tuple[str, float, int]] = None, default: Tuple[float, int] = (DEFAULT_RATE, DEFAULT_BURST)):
+        self.rules = {}
+        self.default = default
+        for domain, rate, burst in rules or []:
+            if domain == "*":
+                self.default = (rate, burst)
+            else:
+                self.rules[domain] = (rate, burst)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "DomainRateLimiter":
+        default = (DEFAULT_RATE, DEFAULT_BURST)
+        try:
+            # The old global delay becomes the interval between requests to the same domain
+            delay = float(os.environ.get("ARIA_THROTTLE_DELAY", 0.0))
+        except ValueError:
+            delay = 0.0
+        if delay > 0:
+            default = (1.0 / delay, 1)
+        return cls(parse_rate_limits(os.environ.get("ARIA_RATE_LIMITS")), default=default)
+
+    def domain_for(self, url: str) -> Optional[str]:
+        """The bucket key for a URL: the matching rule's domain, else the host; None if not rate limited."""
+        parsed = urlparse(url or "")
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            return None
+        host = parsed.hostname.lower()
+        if host in ("localhost", "127.0.0.1", "::1"):
+            return None
+        for domain in sorted(self.rules, key=len, reverse=True):
+            if host == domain or host.endswith("." + domain):
+                return domain
+        return host[4:] if host.startswith("www.") else host
+
+    def _bucket(self, domain: str) -> TokenBucket:
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            rate, burst = self.rules.get(domain, self.default)
+            bucket = self._buckets[domain] = TokenBucket(rate, burst)
+        return bucket
+
+    def acquire(self, url: str) -> float:
+        """Blocks until the URL's domain allows another request; returns the seconds waited."""
+        domain = self.domain_for(url)
+        if domain is None:
+            return 0.0
+        with self._lock:
+            wait = self._bucket(domain).reserve(time.monotonic())
+        if wait > 0:
+            logger.info(f"Rate limiting {domain}: waiting {wait:.2f}s", extra={"domain": domain, "delay": wait})
+            time.sleep(wait)
+            record_metric("rate_limit_wait", wait * 1000, domain=domain)
+        return wait
+
+    def report(self, url: str, status: Optional[int], retry_after=None):
+        """Feeds a response back: 429/503 pause the domain, anything else resets its backoff."""
+        domain = self.domain_for(url)
+        if domain is None or status is None:
+            return
+        with self._lock:
+            bucket = self._bucket(domain)
+            if status not in THROTTLED_STATUSES:
+                bucket.refusals = 0
+                return
+            bucket.refusals += 1
+            delay = parse_retry_after(retry_after)
+            if delay is None:
+                delay = min(MAX_BACKOFF, BASE_BACKOFF * 2 ** (bucket.refusals - 1))
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + delay)
+            bucket.tokens = min(bucket.tokens, 0.0)
+        logger.warning(f"{domain} answered {status}; pausing requests to it for {delay:.1f}s", extra={"domain": domain, "status": status})
+        record_metric("rate_limit_refused", delay * 1000, domain=domain, status=status)
+
+    def fetch(self, url: str, session=None, max_retries: int = 2, **kwargs):
+        """
+        GET through `requests` with this limiter: waits for the domain, honours 429/503 and
+        Retry-After, and retries up to `max_retries` times. Returns the last response.
+        """
+        if session is None:
+            import requests
+            session = requests
+        kwargs.setdefault("timeout", 10)
+        for attempt in range(max_retries + 1):
+            self.acquire(url)
+            response = session.get(url, **kwargs)
+            self.report(url, response.status_code, response.headers.get("Retry-After"))
+            if response.status_code not in THROTTLED_STATUSES or attempt == max_retries:
+                return response
+        return response
+
+_default_limiter = None
+_default_limiter_settings = None
+_default_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> DomainRateLimiter:
+    """
+    The process-wide limiter shared by navigation, scrapers and HTTP fetches. It is rebuilt
+    when ARIA_RATE_LIMITS or ARIA_THROTTLE_DELAY change, e.g. between daemon clients.
+    """
+    global _default_limiter, _default_limiter_settings
+    settings = (os.environ.get("ARIA_RATE_LIMITS"), os.environ.get("ARIA_THROTTLE_DELAY"))
+    with _default_limiter_lock:
+        if _default_limiter is None or settings != _default_limiter_settings:
+            _default_limiter = DomainRateLimiter.from_env()
+            _default_limiter_settings = settings
+        return _default_limiter
@@ -0,0 +1,79 @@
+"""
+In-page readiness checks run with execute_async_script.
+
+Each script receives its parameters followed by the WebDriver callback, settles itself
+before `timeoutMs` and reports {"ready": bool, "waited": ms, ...}, so the driver's script
+timeout only has to exceed the wait itself. Nothing is patched into the page (no fetch or
+XHR wrappers), which keeps the checks invisible to the sites being scraped.
+"""
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_QUIET_MS = 500
+
+# Resolves once no nodes or text have changed under `root` for `quietMs`.
+# Attribute changes are ignored: spinners and relative timestamps mutate them forever.
+DOM_STABLE_SCRIPT = """
+const [quietMs, timeoutMs, rootSelector, done] = arguments;
+const root = (rootSelector && document.querySelector(rootSelector)) || document.documentElement;
+const start = performance.now();
+let quiet = null, deadline = null, finished = false, mutations = 0;
+const finish = (ready) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quiet);
+    clearTimeout(deadline);
+    done({ready: ready, waited: performance.now() - start, mutations: mutations});
+};
+const observer = new MutationObserver((records) => {
+    mutations += records.length;
+    clearTimeout(quiet);
+    quiet = setTimeout(() => finish(true), quietMs);
+});
+observer.observe(root, {childList: true, subtree: true, characterData: true});
+quiet = setTimeout(() => finish(true), quietMs);
+deadline = setTimeout(() => finish(false), timeoutMs);
+"""
+
+# Resolves once the document has loaded and no resource (fetch, XHR, image, script)
+# has finished loading for `idleMs`, judged from PerformanceObserver entries.
+NETWORK_IDLE_SCRIPT = """
+const [idleMs, timeoutMs, done] = arguments;
+const start = performance.now();
+let last = start, requests = 0;
+const observer = new PerformanceObserver((list) => {
+    requests += list.getEntries().length;
+    last = performance.now();
+});
+observer.observe({type: 'resource', buffered: false});
+const timer = setInterval(() => {
+    const now = performance.now();
+    const ready = document.readyState === 'complete' && now - last >= idleMs;
+    if (ready || now - start >= timeoutMs) {
+        clearInterval(timer);
+        observer.disconnect();
+        done({ready: ready, waited: now - start, requests: requests});
+    }
+}, 50);
+"""
+
+# Resolves once at least `minCount` elements match `selector` and the count has not
+# changed for `stableMs` (lists that render in batches settle this way).
+SELECTOR_STABLE_SCRIPT = """
+const [selector, minCount, stableMs, timeoutMs, done] = arguments;
+const start = performance.now();
+let count = -1, changedAt = start;
+const timer = setInterval(() => {
+    const now = performance.now();
+    const current = document.querySelectorAll(selector).length;
+    if (current !== count) {
+        count = current;
+        changedAt = now;
+    }
+    const ready = count >= minCount && now - changedAt >= stableMs;
+    if (ready || now - start >= timeoutMs) {
+        clearInterval(timer);
+        done({ready: ready, waited: now - start, count: count});
+    }
+}, 50);
+"""
@@ -0,0 +1,153 @@
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set
+from logger import get_logger, record_metric
+
+logger = get_logger("resource_blocking")
+
+# URL wildcards per resource type, in the CDP Network.setBlockedURLs syntax ('*' matches anything).
+# A trailing '*' also catches query strings such as 'avatar.png?size=80'.
+RESOURCE_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.ico*", "*.bmp*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.m4s*", "*.mp3*", "*.ogg*", "*.wav*", "*.m4a*"],
+    "stylesheet": ["*.css*"]
+}
+DEFAULT_BLOCKED_TYPES = ["image", "font", "media"]
+
+# Resource types each site's scraper actually needs loaded
+SITE_ALLOWLISTS = {
+    # Message media is saved from the rendered attachments
+    "google-messages": ["image", "media"]
+}
+
+# Firefox cannot block by URL without BiDi, but these preferences stop whole resource types
+FIREFOX_PREFERENCES = {
+    "image": {"permissions.default.image": 2},
+    "font": {"gfx.downloadable_fonts.enabled": False, "browser.display.use_document_fonts": 0},
+    "media": {"media.autoplay.default": 5, "media.preload.default": 0, "media.preload.auto": 0}
+}
+CHROME_PREFERENCES = {
+    "image": {"profile.managed_default_content_settings.images": 2}
+}
+
+def _split(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+def _env_allowlists() -> Dict[str, List[str]]:
+    """Parses ARIA_BLOCK_ALLOW, e.g. 'whatsapp=image;discord=image,font'."""
+    allowlists = {}
+    for entry in os.environ.get("ARIA_BLOCK_ALLOW", "").split(";"):
+        if "=" in entry:
+            site, types = entry.split("=", 1)
+            allowlists[site.strip()] = _split(types)
+    return allowlists
+
+class ScrapeProfile:
+    """
+    Which resources a scrape-only browser session skips downloading.
+
+    Extractors only read text and attributes, so images, fonts and media are blocked by
+    default; sites listed in SITE_ALLOWLISTS (or ARIA_BLOCK_ALLOW) keep what they need.
+    Chromium sessions block through CDP Network.setBlockedURLs plus a content setting
+    for images; Firefox uses preferences for whole types and BiDi network interception
+    for URL patterns when the session was started with BiDi enabled.
+    """
+    def __init__(self, block_types: Iterable[str] = None, block_urls: Iterable[str] = None, allow_types: Iterable[str] = None):
+        blocked = set(block_types if block_types is not None else DEFAULT_BLOCKED_TYPES) - set(allow_types or [])
+        unknown = blocked - set(RESOURCE_PATTERNS)
+        if unknown:
+            logger.warning(f"Ignoring unknown resource types to block: {', '.join(sorted(unknown))}")
+        self.block_types: Set[str] = blocked & set(RESOURCE_PATTERNS)
+        self.block_urls: List[str] = list(block_urls or [])
+
+    @classmethod
+    def from_env(cls, site_name: str = None) -> Optional["ScrapeProfile"]:
+        """Profile from ARIA_BLOCK_RESOURCES / ARIA_BLOCK_URLS for a site; None when blocking is turned off."""
+        types_setting = os.environ.get("ARIA_BLOCK_RESOURCES")
+        if types_setting is not None and types_setting.strip().lower() in ("", "none", "false"):
+            return None
+        block_types = _split(types_setting) if types_setting is not None else None
+        allow_types = []
+        if site_name:
+            allow_types = _env_allowlists().get(site_name, SITE_ALLOWLISTS.get(site_name, []))
+        return cls(block_types, _split(os.environ.get("ARIA_BLOCK_URLS")), allow_types)
+
+    @classmethod
+    def common(cls, profiles: Iterable[Optional["ScrapeProfile"]]) -> Optional["ScrapeProfile"]:
+        """What every profile blocks; for browsers shared by several sites, whose preferences cannot change later."""
+        profiles = list(profiles)
+        if not profiles or any(p is None for p in profiles):
+            return None
+        block_types = set.intersection(*(p.block_types for p in profiles))
+        block_urls = [url for url in profiles[0].block_urls if all(url in p.block_urls for p in profiles)]
+        return cls(block_types, block_urls)
+
+    def is_empty(self) -> bool:
+        return not self.block_types and not self.block_urls
+
+    def url_patterns(self) -> List[str]:
+        patterns = []
+        for resource_type in sorted(self.block_types):
+            patterns.extend(RESOURCE_PATTERNS[resource_type])
+        return patterns + self.block_urls
+
+    def preferences(self, browser_name: str) -> Dict[str, Any]:
+        table = FIREFOX_PREFERENCES if browser_name == "firefox" else CHROME_PREFERENCES
+        prefs = {}
+        for resource_type in self.block_types:
+            prefs.update(table.get(resource_type, {}))
+        return prefs
+
+    def apply_to_options(self, browser_name: str, options):
+        """Sets launch-time preferences; must run before the browser starts."""
+        prefs = self.preferences(browser_name)
+        if not prefs:
+            return
+        if browser_name == "firefox":
+            for name, value in prefs.items():
+                options.set_preference(name, value)
+        else:
+            existing = options.experimental_options.get("prefs", {})
+            options.add_experimental_option("prefs", {**existing, **prefs})
+
+    def apply_to_driver(self, driver, browser_name: str) -> Optional[str]:
+        """
+        Installs URL blocking on a running session (and replaces any earlier rules).
+        Returns the mechanism used ("cdp", "bidi") or None if only preferences apply.
+        """
+        patterns = self.url_patterns()
+        if browser_name in ("chrome", "edge"):
+            try:
+                _execute_cdp(driver, "Network.enable", {})
+                _execute_cdp(driver, "Network.setBlockedURLs", {"urls": patterns})
+            except Exception as e:
+                logger.warning(f"Could not install CDP request blocking: {e}")
+                return None
+            record_metric("resource_blocking", 0.0, mechanism="cdp", patterns=len(patterns))
+            return "cdp"
+
+        if browser_name == "firefox" and isinstance(getattr(driver, "capabilities", {}).get("webSocketUrl"), str):
+            try:
+                network = driver.network
+                for handler_id in getattr(driver, "_aria_block_handlers", []):
+                    network.remove_request_handler(handler_id)
+                driver._aria_block_handlers = []
+                if patterns:
+                    # BiDi globs: '**' matches across path segments like the CDP '*'
+                    globs = [pattern.replace("*", "**") for pattern in patterns]
+                    driver._aria_block_handlers.append(network.add_request_handler(globs, lambda request: request.fail()))
+            except Exception as e:
+                logger.warning(f"Could not install BiDi request blocking: {e}")
+                return None
+            record_metric("resource_blocking", 0.0, mechanism="bidi", patterns=len(patterns))
+            return "bidi"
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"block_types": sorted(self.block_types), "block_urls": list(self.block_urls)}
+
+def _execute_cdp(driver, cmd: str, params: Dict[str, Any]):
+    # Local Chromium drivers expose execute_cdp_cmd; sessions reattached through Remote only the raw command
+    if hasattr(driver, "execute_cdp_cmd"):
+        return driver.execute_cdp_cmd(cmd, params)
+    return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params})["value"]
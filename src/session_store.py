@@ -0,0 +1,154 @@
+import os
+import re
+import copy
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from logger import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes stay atomic, but concurrent updates are not serialized
+    fcntl = None
+
+logger = get_logger("session_store")
+
+CURRENT_SESSION_FILE = "aria_session_current.json"
+LOCK_FILE = "aria_sessions.lock"
+
+# {path: ((mtime_ns, size, inode), data)} shared by every store in the process
+_cache: Dict[str, Any] = {}
+_cache_lock = threading.Lock()
+_thread_state = threading.local()
+
+def get_session_namespace() -> Optional[str]:
+    """ARIA_SESSION_NAMESPACE, reduced to characters safe in a directory name; None for the default."""
+    namespace = re.sub(r"[^A-Za-z0-9_.-]", "_", os.environ.get("ARIA_SESSION_NAMESPACE", "").strip())
+    return namespace.strip(".") or None
+
+def _stamp(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+class SessionStore:
+    """
+    The browser session files in ~/.aria, shared by every aria process.
+
+    Reads are served from a process-wide cache until the file's mtime, size or inode
+    changes, so repeated lookups within a command cost one stat. Writes go to a temp
+    file that is renamed into place, so readers never see half a file, and every
+    read-modify-write holds an advisory fcntl lock on the directory's lock file, so
+    parallel commands cannot clobber each other's session or current-session pointer.
+
+    A namespace (ARIA_SESSION_NAMESPACE) keeps its sessions in ~/.aria/sessions/<name>,
+    letting several CI jobs on one host drive separate browsers.
+    """
+    def __init__(self, base_dir: str = None, namespace: str = None):
+        base_dir = base_dir or os.path.join(os.path.expanduser("~"), ".aria")
+        self.namespace = namespace
+        self.directory = os.path.join(base_dir, "sessions", namespace) if namespace else base_dir
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, browser_name: str = None) -> str:
+        if browser_name:
+            return os.path.join(self.directory, f"aria_session_{browser_name}.json")
+        return os.path.join(self.directory, CURRENT_SESSION_FILE)
+
+    @contextmanager
+    def lock(self):
+        """Exclusive advisory lock over this store's files; re-entrant within a thread."""
+        held = getattr(_thread_state, "held", None)
+        if held is None:
+            held = _thread_state.held = {}
+        if held.get(self.directory):
+            held[self.directory] += 1
+            try:
+                yield
+            finally:
+                held[self.directory] -= 1
+            return
+
+        lock_file = open(os.path.join(self.directory, LOCK_FILE), "a")
+        try:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            held[self.directory] = 1
+            try:
+                yield
+            finally:
+                held[self.directory] = 0
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        finally:
+            lock_file.close()
+
+    def _read_file(self, path: str) -> Optional[Dict[str, Any]]:
+        stamp = _stamp(path)
+        if stamp is None:
+            with _cache_lock:
+                _cache.pop(path, None)
+            return None
+        with _cache_lock:
+            cached = _cache.get(path)
+        if cached and cached[0] == stamp:
+            return copy.deepcopy(cached[1])
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read session file {path}: {e}")
+            return None
+        with _cache_lock:
+            _cache[path] = (stamp, data)
+        return copy.deepcopy(data)
+
+    def _write_file(self, path: str, data: Dict[str, Any]):
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+        with _cache_lock:
+            _cache[path] = (_stamp(path), copy.deepcopy(data))
+
+    def _remove_file(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        with _cache_lock:
+            _cache.pop(path, None)
+
+    def read(self, browser_name: str) -> Optional[Dict[str, Any]]:
+        return self._read_file(self.path(browser_name)) if browser_name else None
+
+    def current(self) -> Optional[str]:
+        data = self._read_file(self.path())
+        return data.get("browser") if data else None
+
+    def set_current(self, browser_name: str):
+        with self.lock():
+            self._write_file(self.path(), {"browser": browser_name})
+
+    def write(self, browser_name: str, session_data: Dict[str, Any], make_current: bool = True):
+        with self.lock():
+            self._write_file(self.path(browser_name), session_data)
+            if make_current:
+                self._write_file(self.path(), {"browser": browser_name})
+
+    def remove(self, browser_name: str):
+        """Deletes a browser's session and clears the current pointer if it named that browser."""
+        with self.lock():
+            self._remove_file(self.path(browser_name))
+            if self.current() == browser_name:
+                self._remove_file(self.path())
+
+    def list_browsers(self) -> List[str]:
+        browsers = []
+        for name in sorted(os.listdir(self.directory)):
+            if name.startswith("aria_session_") and name.endswith(".json") and name != CURRENT_SESSION_FILE:
+                browsers.append(name[len("aria_session_"):-len(".json")])
+        return browsers
@@ -1,12 +1,79 @@
 import os
 import json
 import logging
+import sqlite3
 import time
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 
 logger = logging.getLogger("aria.site_manager")
 
+# Files that hold a site's sync state rather than scraped data; cleanup never removes them
+STATE_FILES = {"registry.json", "metadata.json", "cursors.json", "conversations.json"}
+
+def _item_time(item: Any) -> Optional[float]:
+    """The epoch time of a log item's `timestamp` (ISO 8601 or epoch seconds), or None if it has none."""
+    value = item.get("timestamp") if isinstance(item, dict) else None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+class SiteIndex:
+    """
+    Key -> entry index kept on disk (SQLite) for sites with more items than are worth holding
+    in memory, such as every chat of a messaging account. Entries are JSON objects with a
+    "name"; they are read and written one key at a time and iterated without loading them all.
+    Writes become durable on commit() or close().
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, name TEXT, entry TEXT NOT NULL)")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self._db.execute("SELECT entry FROM entries WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        self._db.execute("INSERT OR REPLACE INTO entries (key, name, entry) VALUES (?, ?, ?)",
+                         (key, entry.get("name"), json.dumps(entry, ensure_ascii=False)))
+
+    def setdefault(self, key: str, entry: Dict[str, Any]):
+        """Adds the entry unless the key already has one."""
+        self._db.execute("INSERT OR IGNORE INTO entries (key, name, entry) VALUES (?, ?, ?)",
+                         (key, entry.get("name"), json.dumps(entry, ensure_ascii=False)))
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def names(self) -> Iterator[str]:
+        """Streams the distinct entry names in sorted order."""
+        for (name,) in self._db.execute("SELECT DISTINCT name FROM entries WHERE name IS NOT NULL ORDER BY name"):
+            yield name
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        for (entry,) in self._db.execute("SELECT entry FROM entries"):
+            yield json.loads(entry)
+
+    def commit(self):
+        self._db.commit()
+
+    def close(self):
+        self._db.commit()
+        self._db.close()
+
+    def __enter__(self) -> "SiteIndex":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 class SiteManager:
     """Manages site-specific data storage and retrieval."""
     def __init__(self, base_dir: str = None):
@@ -52,6 +119,44 @@ class SiteManager:
             logger.error(f"Failed to load data from {file_path}: {e}")
             return None
 
+    def append_items(self, site_name: str, filename: str, items: List[Any]) -> int:
+        """Appends items to a JSON Lines log in a site's directory, one object per line; returns how many."""
+        if not items:
+            return 0
+        file_path = os.path.join(self.get_site_dir(site_name), filename)
+        try:
+            with open(file_path, 'a', encoding='utf-8') as f:
+                f.write("".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items))
+            logger.info(f"Appended {len(items)} items to {file_path}")
+            return len(items)
+        except Exception as e:
+            logger.error(f"Failed to append data to {file_path}: {e}")
+            return 0
+
+    def load_items(self, site_name: str, filename: str, limit: int = None) -> List[Any]:
+        """Loads a JSON Lines log written by append_items; only the last `limit` items if given."""
+        file_path = os.path.join(self.get_site_dir(site_name), filename)
+        if not os.path.exists(file_path):
+            return []
+        items = deque(maxlen=limit)
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        try:
+                            items.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            # A line cut short by an interrupted append
+                            continue
+        except Exception as e:
+            logger.error(f"Failed to load data from {file_path}: {e}")
+        return list(items)
+
+    def open_index(self, site_name: str, filename: str) -> SiteIndex:
+        """Opens (creating if needed) an on-disk SiteIndex in a site's directory."""
+        return SiteIndex(os.path.join(self.get_site_dir(site_name), filename))
+
     def get_recent_items(self, site_name: str, filename: str, key: str = "items", limit: int = 5) -> List[Dict[str, Any]]:
         """Retrieves the most recent items from a JSON data file."""
         data = self.load_data(site_name, filename)
@@ -89,8 +194,11 @@ class SiteManager:
         reg = self.load_data(site_name, "registry.json")
         return reg if reg else {"next_id": 1, "mappings": {}}
 
-    def update_registry(self, site_name: str, item_names: List[str]):
-        """Updates the registry with new items, maintaining persistent IDs."""
+    def update_registry(self, site_name: str, item_names: Iterable[str], sort: bool = True):
+        """
+        Updates the registry with new items, maintaining persistent IDs. New items get IDs in
+        sorted order; pass an already sorted stream (e.g. SiteIndex.names()) with sort=False.
+        """
         reg = self.get_registry(site_name)
         mappings = reg.get("mappings", {})
         next_id = reg.get("next_id", 1)
@@ -99,9 +207,10 @@ class SiteManager:
         name_to_id = {v: k for k, v in mappings.items()}
         
         updated = False
-        for name in sorted(item_names):
+        for name in (sorted(item_names) if sort else item_names):
             if name not in name_to_id:
                 mappings[str(next_id)] = name
+                name_to_id[name] = str(next_id)
                 next_id += 1
                 updated = True
         
@@ -113,23 +222,61 @@ class SiteManager:
         return mappings
 
     def cleanup_old_data(self, site_name: str, days: int = 30) -> int:
-        """Removes data files older than the specified number of days."""
+        """
+        Removes data files older than the specified number of days, and the items older than
+        that from JSON Lines logs that are still being appended to. Sync state (STATE_FILES)
+        is kept. Returns how many files were removed or trimmed.
+        """
         site_dir = self.get_site_dir(site_name)
         count = 0
         now = time.time()
         cutoff = now - (days * 86400)
         
         for f in os.listdir(site_dir):
-            if f.endswith(".json") and f != "registry.json" and f != "metadata.json":
-                file_path = os.path.join(site_dir, f)
-                if os.path.getmtime(file_path) < cutoff:
-                    try:
-                        os.remove(file_path)
-                        count += 1
-                    except Exception as e:
-                        logger.error(f"Failed to remove {file_path}: {e}")
+            if not f.endswith((".json", ".jsonl")) or f in STATE_FILES:
+                continue
+            file_path = os.path.join(site_dir, f)
+            if os.path.getmtime(file_path) < cutoff:
+                try:
+                    os.remove(file_path)
+                    count += 1
+                except Exception as e:
+                    logger.error(f"Failed to remove {file_path}: {e}")
+            elif f.endswith(".jsonl") and self.prune_items(site_name, f, cutoff):
+                count += 1
         return count
 
+    def prune_items(self, site_name: str, filename: str, cutoff: float) -> int:
+        """
+        Drops the items of a JSON Lines log whose timestamp is before `cutoff` (epoch seconds),
+        streaming the log into a replacement file; items without a timestamp are kept.
+        Returns how many items were dropped.
+        """
+        file_path = os.path.join(self.get_site_dir(site_name), filename)
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
+        dropped = 0
+        try:
+            with open(file_path, 'r', encoding='utf-8') as source, open(temp_path, 'w', encoding='utf-8') as target:
+                for line in source:
+                    try:
+                        item_time = _item_time(json.loads(line))
+                    except json.JSONDecodeError:
+                        item_time = None
+                    if item_time is not None and item_time < cutoff:
+                        dropped += 1
+                    elif line.strip():
+                        target.write(line if line.endswith("\n") else line + "\n")
+            if dropped:
+                os.replace(temp_path, file_path)
+                logger.info(f"Dropped {dropped} items older than the cutoff from {file_path}")
+        except Exception as e:
+            logger.error(f"Failed to prune {file_path}: {e}")
+            dropped = 0
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return dropped
+
     def archive_site(self, site_name: str, output_path: str = None) -> str:
         """Creates a ZIP archive of all data for a specific site."""
         import shutil
@@ -36,7 +36,7 @@ class CalendarScraper:
             print("Waiting for Google Calendar to load...")
             # Look for the calendar grid or main container
             self.navigator.wait_for_element('div[role="main"], div[role="grid"], [aria-label*="Kalenteri"]', by=By.CSS_SELECTOR, timeout=45)
-            time.sleep(5)
+            self.navigator.wait_for_dom_stable(budget=5)
             
             # Check for login redirection
             if "accounts.google.com" in self.navigator.driver.current_url:
@@ -9,14 +9,63 @@ from navigator import AriaNavigator
 
 logger = logging.getLogger("aria.sites.discord")
 
+CURSORS_FILE = "cursors.json"
+DEFAULT_BACKFILL_PAGES = 20
+# Stored messages compared against when a channel has no cursor, beyond the extracted batch itself
+DEDUP_TAIL = 500
+
+# Returns only the messages after the cursor (by snowflake id) as outerHTML, plus the oldest id
+# loaded, so refresh cost follows new traffic rather than how much history the DOM holds
+NEW_MESSAGES_SCRIPT = """
+const after = arguments[0];
+const newer = id => !after || id.length > after.length || (id.length === after.length && id > after);
+const root = document.querySelector('main') || document.querySelector('div[class*="chatContent"]');
+if (!root) return null;
+const items = [];
+let oldest = null;
+for (const li of root.querySelectorAll('li[id^="chat-messages-"]')) {
+    const id = li.id.split('-').pop();
+    if (oldest === null) oldest = id;
+    if (newer(id)) items.push([id, li.outerHTML]);
+}
+return {oldest: oldest, items: items};
+"""
+
+# Scrolls the message list up by one screen; false once it is already at the top
+SCROLL_UP_SCRIPT = """
+const list = document.querySelector('ol[data-list-id="chat-messages"]');
+const scroller = list && (list.closest('[class*="scroller"]') || list.parentElement);
+if (!scroller || scroller.scrollTop <= 0) return false;
+scroller.scrollTop = Math.max(0, scroller.scrollTop - scroller.clientHeight);
+return true;
+"""
+
+def snowflake_after(message_id, cursor_id):
+    """True if Discord message id `message_id` is newer than `cursor_id` (None means no cursor)."""
+    if not cursor_id:
+        return True
+    try:
+        return int(message_id) > int(cursor_id)
+    except (TypeError, ValueError):
+        return False
+
 class DiscordScraper:
-    """Scraper for Discord Web using structure-based discovery."""
+    """
+    Scraper for Discord Web using structure-based discovery.
+
+    Each channel's messages are appended to `chat_<server>_<channel>.jsonl`, and
+    `cursors.json` keeps the id and timestamp of the last message stored per channel, so
+    a refresh only extracts and writes messages newer than the cursor.
+    """
     URL = "https://discord.com/app"
+    SUPPORTS_BACKFILL = True
 
     def __init__(self, navigator: AriaNavigator, site_manager):
         self.navigator = navigator
         self.sm = site_manager
         self.site_name = "discord"
+        self.backfill = 0
+        self._cursors = None
 
     def navigate(self):
         """Navigates to Discord and waits for full load."""
@@ -30,7 +79,7 @@ class DiscordScraper:
             print("Waiting for Discord to fully load...")
             # Wait for any of these indicators: app mount, guilds rail, or home button
             self.navigator.wait_for_element("div[id='app-mount'], ul[data-list-id='guildsnav'], [aria-label*='Home']", by=By.CSS_SELECTOR, timeout=45)
-            time.sleep(5)
+            self.navigator.wait_for_dom_stable(budget=5)
             print("Discord loaded successfully.")
             return True
         except Exception as e:
@@ -43,8 +92,13 @@ class DiscordScraper:
             print("Error: Discord did not load. Please ensure you are logged in.")
             return False
 
-    def refresh(self, deep=False):
-        """Orchestrates the Discord data refresh with unread-only logic by default."""
+    def refresh(self, deep=False, backfill=0):
+        """
+        Orchestrates the Discord data refresh with unread-only logic by default.
+        backfill: pages to scroll up in each refreshed channel to recover messages that
+        arrived since its cursor but are no longer rendered (0 disables).
+        """
+        self.backfill = backfill
         if not self.navigate():
             return False
         
@@ -73,8 +127,8 @@ class DiscordScraper:
 
     def discover_servers(self):
         """Finds all available servers in the left sidebar guild rail."""
-        # Give extra time for guild icons to render
-        time.sleep(5)
+        # Wait until the guild rail has finished rendering its icons
+        self.navigator.wait_for_selector_stable('a[href^="/channels/"]', stable_ms=750, budget=5)
         script = """
         // Find all links that look like channels/servers
         const links = Array.from(document.querySelectorAll('a[href^="/channels/"]'));
@@ -129,7 +183,7 @@ class DiscordScraper:
         if server.get('is_home'):
             if "/channels/@me" not in self.navigator.driver.current_url:
                 self.navigator.navigate("https://discord.com/channels/@me")
-                time.sleep(5)
+                self.navigator.wait_for_dom_stable(budget=5)
         else:
             # Click server via synthetic mouse events
             click_script = """
@@ -149,7 +203,7 @@ class DiscordScraper:
             if not success:
                 print(f"  Warning: Could not click server {server['name']}")
                 return
-            time.sleep(5)
+            self.navigator.wait_for_dom_stable(budget=5)
         
         # Discover channels
         channels = self.discover_channels(server.get('is_home', False))
@@ -209,7 +263,7 @@ class DiscordScraper:
         return self.navigator.driver.execute_script(script)
 
     def scrape_channel(self, server, channel):
-        """Clicks a channel and extracts messages."""
+        """Clicks a channel and appends the messages newer than its cursor; returns how many."""
         print(f"    Scraping channel: {channel['name']}")
         
         click_script = """
@@ -226,7 +280,7 @@ class DiscordScraper:
         return false;
         """
         self.navigator.driver.execute_script(click_script, channel['id'])
-        time.sleep(3) 
+        self.navigator.wait_for_dom_stable(budget=3)
 
         # Handle Overlays
         handle_overlay_script = """
@@ -243,59 +297,160 @@ class DiscordScraper:
         """
         if self.navigator.driver.execute_script(handle_overlay_script):
             print("      Bypassed overlay.")
-            time.sleep(3)
-        
-        messages = self.extract_messages()
+            self.navigator.wait_for_dom_stable(budget=3)
         
-        filename = f"chat_{self.safe_fn(server['name'])}_{self.safe_fn(channel['name'])}.json"
-        self.sm.save_data(self.site_name, filename, {
+        key = self.channel_key(server, channel)
+        cursor = self.cursors.get(key)
+        after_id = cursor["message_id"] if cursor else None
+        last_user = cursor.get("user") if cursor else None
+        if self.backfill:
+            messages = self.backfill_messages(after_id, self.backfill, last_user=last_user)
+        else:
+            messages = self.extract_messages(after_id=after_id, last_user=last_user)
+        messages = self._drop_stored_messages(server, channel, key, messages)
+
+        if not messages:
+            print("      No new messages.")
+            return 0
+
+        self.sm.append_items(self.site_name, f"{key}.jsonl", messages)
+        self._advance_cursor(server, channel, messages[-1])
+        print(f"      Stored {len(messages)} new messages.")
+        return len(messages)
+
+    @property
+    def cursors(self):
+        """{channel key: cursor} of the last stored message per channel, loaded once per scraper."""
+        if self._cursors is None:
+            self._cursors = self.sm.load_data(self.site_name, CURSORS_FILE) or {}
+        return self._cursors
+
+    def save_cursors(self):
+        self.sm.save_data(self.site_name, CURSORS_FILE, self.cursors)
+
+    def _advance_cursor(self, server, channel, last_message):
+        self.cursors[self.channel_key(server, channel)] = {
             "server": server['name'],
             "channel": channel['name'],
-            "scraped_at": time.ctime(),
-            "messages": messages
-        })
+            "message_id": last_message["id"],
+            "timestamp": last_message["timestamp"],
+            "user": last_message["user"],
+            "updated_at": time.ctime()
+        }
+        self.save_cursors()
+
+    def channel_key(self, server, channel):
+        return f"chat_{self.safe_fn(server['name'])}_{self.safe_fn(channel['name'])}"
 
-    def extract_messages(self):
-        """Extracts messages from the active chat window using BeautifulSoup."""
-        from bs4 import BeautifulSoup
+    def _read_new_messages(self, after_id):
+        """Runs NEW_MESSAGES_SCRIPT: {'oldest': id, 'items': [[id, outerHTML], ...]} or None."""
         try:
-            main_html = self.navigator.driver.execute_script("""
-                const m = document.querySelector('main') || document.querySelector('div[class*="chatContent"]');
-                return m ? m.innerHTML : null;
-            """)
-            if not main_html: return []
-            
-            soup = BeautifulSoup(main_html, 'html.parser')
-            msg_elements = soup.select('li[id^="chat-messages-"]')
-            messages = []
-            
-            for el in msg_elements:
-                try:
-                    user_el = el.select_one('span[class*="username"]') or el.select_one('div[class*="username"]')
-                    user = user_el.get_text(strip=True) if user_el else "Continuation"
-                    
-                    content_el = el.select_one('div[id^="message-content-"]') or el.select_one('div[class*="messageContent"]')
-                    text = content_el.get_text(strip=True) if content_el else ""
-                    
-                    ts_el = el.select_one('time')
-                    ts = ts_el.get('datetime') if ts_el else "Unknown"
-                    
-                    if text or ts != "Unknown":
-                        messages.append({
-                            "user": user,
-                            "text": text,
-                            "timestamp": ts
-                        })
-                except:
-                    continue
-            return messages
+            return self.navigator.driver.execute_script(NEW_MESSAGES_SCRIPT, after_id)
         except Exception as e:
-            logger.error(f"Error extracting Discord messages: {e}")
+            logger.error(f"Error reading Discord messages: {e}")
+            return None
+
+    def extract_messages(self, after_id=None, last_user=None):
+        """Extracts the rendered messages newer than `after_id` (all when None), oldest first."""
+        batch = self._read_new_messages(after_id)
+        if not batch:
             return []
+        oldest = batch.get("oldest")
+        if after_id and oldest and snowflake_after(oldest, after_id):
+            # The cursor message is no longer rendered, so anything between it and `oldest` is missed
+            print("      Some messages since the last refresh are not loaded; use --backfill to fetch them.")
+        return self.parse_messages(batch["items"], last_user=last_user)
+
+    def backfill_messages(self, after_id, max_pages=DEFAULT_BACKFILL_PAGES, last_user=None):
+        """
+        Scrolls up page by page, collecting messages newer than `after_id`, until the cursor
+        message (or the top of the channel) is loaded, nothing older appears, or `max_pages`
+        pages were scrolled. Discord unloads messages that scroll out of view, so each page is
+        collected as it is rendered.
+        """
+        collected = {}
+        for page in range(max_pages + 1):
+            batch = self._read_new_messages(after_id)
+            if not batch:
+                break
+            before = len(collected)
+            for message_id, html in batch["items"]:
+                collected.setdefault(message_id, html)
+            oldest = batch.get("oldest")
+            if after_id and oldest and not snowflake_after(oldest, after_id):
+                break
+            if page == max_pages or (page and len(collected) == before):
+                break
+            if not self.navigator.driver.execute_script(SCROLL_UP_SCRIPT):
+                break
+            self.navigator.wait_for_dom_stable(budget=3)
+        print(f"      Backfilled {len(collected)} messages over {page} page(s).")
+        items = sorted(collected.items(), key=lambda item: int(item[0]))
+        return self.parse_messages(items, last_user=last_user)
+
+    def parse_messages(self, items, last_user=None):
+        """Parses [id, outerHTML] message items; grouped follow-ups take the previous author."""
+        messages = []
+        for message_id, html in items:
+            try:
+                el = BeautifulSoup(html, 'html.parser')
+                user_el = el.select_one('span[class*="username"]') or el.select_one('div[class*="username"]')
+                user = user_el.get_text(strip=True) if user_el else (last_user or "Continuation")
+                
+                content_el = el.select_one('div[id^="message-content-"]') or el.select_one('div[class*="messageContent"]')
+                text = content_el.get_text(strip=True) if content_el else ""
+                
+                ts_el = el.select_one('time')
+                ts = ts_el.get('datetime') if ts_el else "Unknown"
+                
+                if text or ts != "Unknown":
+                    messages.append({
+                        "id": message_id,
+                        "user": user,
+                        "text": text,
+                        "timestamp": ts
+                    })
+                    last_user = user
+            except Exception:
+                continue
+        return messages
+
+    def _drop_stored_messages(self, server, channel, key, messages):
+        """
+        A channel without a cursor may still have history: an old `chat_*.json` snapshot,
+        which is moved into the message log here, or a log whose cursor was lost. Extracted
+        messages already stored there are dropped so nothing is appended twice. Only the
+        log's tail is read, and messages are matched by id; old snapshot entries, which have
+        none, by timestamp and text.
+        """
+        if key in self.cursors:
+            return messages
+        stored = self.sm.load_items(self.site_name, f"{key}.jsonl", limit=len(messages) + DEDUP_TAIL)
+        legacy_file = f"{key}.json"
+        legacy = self.sm.load_data(self.site_name, legacy_file)
+        if legacy:
+            old_messages = legacy.get("messages", [])
+            self.sm.append_items(self.site_name, f"{key}.jsonl", old_messages)
+            os.remove(os.path.join(self.sm.get_site_dir(self.site_name), legacy_file))
+            logger.info(f"Moved {len(old_messages)} messages of {legacy_file} to {key}.jsonl")
+            stored.extend(old_messages)
+        if not stored:
+            return messages
+        stored_ids = {m["id"] for m in stored if m.get("id")}
+        # Repeated messages like "ok" in the same minute are told apart by id where there is one
+        seen = {(m.get("timestamp"), m.get("text")) for m in stored if not m.get("id")}
+        fresh = [m for m in messages if m["id"] not in stored_ids and (m["timestamp"], m["text"]) not in seen]
+        if not fresh and messages:
+            # Nothing new, but the cursor still has to start from the newest message
+            self._advance_cursor(server, channel, messages[-1])
+        return fresh
 
     def is_history_empty(self, server, channel):
-        filename = f"chat_{self.safe_fn(server['name'])}_{self.safe_fn(channel['name'])}.json"
-        return self.sm.load_data(self.site_name, filename) is None
+        key = self.channel_key(server, channel)
+        if key in self.cursors:
+            return False
+        site_dir = self.sm.get_site_dir(self.site_name)
+        return not (os.path.exists(os.path.join(site_dir, f"{key}.json")) or os.path.exists(os.path.join(site_dir, f"{key}.jsonl")))
 
     def safe_fn(self, name):
         return "".join([c if c.isalnum() else "_" for c in name])
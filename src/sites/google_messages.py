@@ -1,9 +1,14 @@
+import os
+import json
 import time
+import hashlib
 import logging
+from collections import Counter
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from navigator import AriaNavigator
+from media_downloader import MediaDownloader
 
 logger = logging.getLogger("aria.sites.google_messages")
 
@@ -15,6 +20,7 @@ class GoogleMessagesScraper:
         self.navigator = navigator
         self.sm = site_manager
         self.site_name = "google-messages"
+        self._media = None
 
     def navigate(self):
         """Navigates to the Google Messages web interface."""
@@ -62,10 +68,12 @@ class GoogleMessagesScraper:
                 # Click the internal 'a' link via JS to ensure thread loads
                 link = item.find_element(By.TAG_NAME, "a")
                 self.navigator.driver.execute_script("arguments[0].click();", link)
-                time.sleep(3) # Wait for messages to load
+                # Wait for the thread to finish rendering its messages
+                self.navigator.wait_for_dom_stable(budget=3)
                 
                 # Extract messages
                 messages = self.extract_visible_messages()
+                self.download_message_media(messages, conversation=name)
                 
                 convo_data = {
                     "name": name,
@@ -133,12 +141,16 @@ class GoogleMessagesScraper:
                                 timestamp = ts_el.get_text(strip=True)
                     
                     if text or media_info:
-                        messages.append({
+                        message = {
                             "text": text,
                             "timestamp": timestamp,
                             "type": "sent" if is_outgoing else "received",
                             "media": media_info
-                        })
+                        }
+                        # The thread's own message id, where the wrapper carries one
+                        if wrapper.get("msg-id"):
+                            message["id"] = wrapper["msg-id"]
+                        messages.append(message)
                 except Exception as e:
                     continue
         except Exception as e:
@@ -146,19 +158,53 @@ class GoogleMessagesScraper:
             
         return messages
 
+    @property
+    def media(self) -> MediaDownloader:
+        """The site's media downloader, sharing the browser session's cookies."""
+        if self._media is None or self._media.driver is not self.navigator.driver:
+            media_dir = os.path.join(self.sm.get_site_dir(self.site_name), "media")
+            self._media = MediaDownloader(media_dir, driver=self.navigator.driver)
+        return self._media
+
+    def media_keys(self, messages, conversation=""):
+        """
+        Maps each blob: attachment URL to a key that survives a reload: conversation, message
+        and position in the message. Messages without an id are named by their content, with a
+        running count to keep identical messages apart.
+        """
+        keys = {}
+        repeats = Counter()
+        for message in messages:
+            message_id = message.get("id")
+            if not message_id:
+                content = json.dumps([message.get("type"), message.get("timestamp"), message.get("text")])
+                message_id = hashlib.sha256(content.encode()).hexdigest()[:16]
+                repeats[message_id] += 1
+                message_id = f"{message_id}-{repeats[message_id]}"
+            for n, item in enumerate(message.get("media", [])):
+                if item.get("url", "").startswith("blob:"):
+                    keys[item["url"]] = f"{self.site_name}/{conversation}/{message_id}/{n}"
+        return keys
+
+    def download_message_media(self, messages, conversation=""):
+        """
+        Downloads every attachment of a thread at once and records each local path on its media entry.
+        Blob attachments already downloaded on an earlier refresh are found by their key, not read again.
+        """
+        items = [item for message in messages for item in message.get("media", [])]
+        paths = self.media.download_many([item["url"] for item in items], keys=self.media_keys(messages, conversation))
+        for item in items:
+            if paths.get(item["url"]):
+                item["path"] = paths[item["url"]]
+
     def extract_media(self, msg_el):
         """Detects and downloads media from a message element."""
-        media_list = []
+        found = []
         
         # Check for images
         try:
             images = msg_el.find_elements(By.CSS_SELECTOR, "img.content")
-            for img in images:
-                src = img.get_attribute("src")
-                if src:
-                    local_path = self.download_file(src, "image")
-                    if local_path:
-                        media_list.append({"type": "image", "path": local_path, "url": src})
+            found.extend(("image", img.get_attribute("src")) for img in images)
         except:
             pass
 
@@ -166,51 +212,18 @@ class GoogleMessagesScraper:
         try:
             # Google Messages often uses <video> or <a> with specific classes for attachments
             videos = msg_el.find_elements(By.CSS_SELECTOR, "video")
-            for video in videos:
-                src = video.get_attribute("src")
-                if src:
-                    local_path = self.download_file(src, "video")
-                    if local_path:
-                        media_list.append({"type": "video", "path": local_path, "url": src})
+            found.extend(("video", video.get_attribute("src")) for video in videos)
         except:
             pass
 
+        # All of a message's attachments download together
+        paths = self.media.download_many([src for _, src in found if src])
+        media_list = []
+        for media_type, src in found:
+            if src and paths.get(src):
+                media_list.append({"type": media_type, "path": paths[src], "url": src})
         return media_list
 
     def download_file(self, url, category):
-        """Downloads a file to the local media directory."""
-        if not url or url.startswith("blob:"):
-            # blob URLs require different handling (e.g., executing JS to get base64)
-            # For now, we skip blobs or handle them as placeholders
-            return None
-
-        import requests
-        import hashlib
-        
-        try:
-            # Create a unique filename based on URL hash
-            ext = ".bin"
-            if "image" in category: ext = ".png"
-            elif "video" in category: ext = ".mp4"
-            
-            name_hash = hashlib.md5(url.encode()).hexdigest()
-            filename = f"{category}_{name_hash}{ext}"
-            
-            site_dir = self.sm.get_site_dir(self.site_name)
-            local_path = os.path.join(site_dir, "media", filename)
-            
-            if os.path.exists(local_path):
-                return f"media/{filename}"
-
-            # We use requests if possible, but for authenticated sessions, 
-            # we might need to use the browser's cookies.
-            # Simplified approach:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                with open(local_path, "wb") as f:
-                    f.write(response.content)
-                return f"media/{filename}"
-        except Exception as e:
-            logger.error(f"Failed to download media {url}: {e}")
-        
-        return None
+        """Downloads a file (including blob: URLs) to the local media directory; returns its relative path or None."""
+        return self.media.download(url, category)
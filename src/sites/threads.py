@@ -35,7 +35,7 @@ class ThreadsScraper:
             print("Waiting for Threads to fully load...")
             # Wait for either the Threads logo or the navigation bar
             self.navigator.wait_for_element("svg[aria-label='Threads'], nav, a[href='/']", by=By.CSS_SELECTOR, timeout=45)
-            time.sleep(5)
+            self.navigator.wait_for_dom_stable(budget=5)
             print("Threads loaded successfully.")
             return True
         except Exception as e:
@@ -88,7 +88,7 @@ class ThreadsScraper:
         """Scrapes the user's own posts and replies."""
         print(f"  Scraping personal profile: {profile_url}")
         self.navigator.navigate(profile_url)
-        time.sleep(5)
+        self.navigator.wait_for_selector_stable('a[href*="/post/"]', stable_ms=750, budget=5)
         
         # 1. Get thread links from "Threads" tab
         post_links = self.discover_thread_links()
@@ -96,7 +96,7 @@ class ThreadsScraper:
         
         # 2. Switch to "Replies" tab
         self.switch_to_replies_tab()
-        time.sleep(4)
+        self.navigator.wait_for_dom_stable(budget=4)
         reply_links = self.discover_thread_links()
         print(f"    Found {len(reply_links)} threads with replies.")
         
@@ -147,13 +147,14 @@ class ThreadsScraper:
         post_id_part = parts[1].split('?')[0].split('/')[0]
         
         self.navigator.navigate(thread_url)
-        time.sleep(5)
+        self.navigator.wait_for_dom_stable(budget=5)
         
         # Scroll to load all replies
         last_height = self.navigator.driver.execute_script("return document.body.scrollHeight")
         for _ in range(5): # Limit scrolling to avoid infinite loops
             self.navigator.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+            # Infinite scroll fetches the next batch; wait for it rather than a fixed 2s
+            self.navigator.wait_for_network_idle(budget=2)
             new_height = self.navigator.driver.execute_script("return document.body.scrollHeight")
             if new_height == last_height:
                 break
@@ -3,20 +3,96 @@ import logging
 import re
 import os
 import json
+from collections import deque
 from selenium.webdriver.common.by import By
 from bs4 import BeautifulSoup
 from navigator import AriaNavigator
 
 logger = logging.getLogger("aria.sites.whatsapp")
 
+CHAT_INDEX_FILE = "conversations.db"
+# The index used to be one JSON list; it is moved into CHAT_INDEX_FILE on the next refresh
+LEGACY_CHAT_INDEX_FILE = "conversations.json"
+DEFAULT_MAX_PAGES = 200
+# Chat list rows remembered for de-duplication; consecutive screens overlap by far fewer rows
+SEEN_WINDOW = 500
+# In the changed-only mode, this many unchanged unpinned rows in a row mean the rest of the list is older
+DEFAULT_UNCHANGED_STOP = 20
+CLOCK_TIME = re.compile(r"^\d{1,2}[.:]\d{2}$")
+
+# Returns the chat rows the virtualized list currently renders, with the fields the filters need
+CHAT_ROWS_SCRIPT = """
+const pane = document.querySelector('#pane-side') ||
+             document.querySelector('div[aria-label="Keskustelulista"]') ||
+             document.querySelector('div[aria-label="Chat list"]');
+if (!pane) return null;
+const timePattern = /^(\\d{1,2}[.:]\\d{2}|\\d{1,2}[./]\\d{1,2}[./]\\d{2,4}|yesterday|eilen)$/i;
+return Array.from(pane.querySelectorAll('div[role="row"]')).map(row => {
+    const titles = Array.from(row.querySelectorAll('span[title]')).map(s => s.getAttribute('title'));
+    const idEl = row.matches('[data-id]') ? row : row.querySelector('[data-id]');
+    let time = '';
+    for (const el of row.querySelectorAll('div, span')) {
+        const text = el.childElementCount === 0 ? el.textContent.trim() : '';
+        if (timePattern.test(text)) { time = text; break; }
+    }
+    return {
+        id: idEl ? idEl.getAttribute('data-id') : null,
+        name: titles[0] || null,
+        preview: titles.length > 1 ? titles[titles.length - 1] : '',
+        time: time,
+        unread: !!row.querySelector('span[aria-label*="unread" i], span[aria-label*="lukemat" i]'),
+        pinned: !!row.querySelector('span[data-icon^="pinned"]')
+    };
+}).filter(row => row.name);
+"""
+
+# Scrolls the chat list down by most of a screen (or back to the top); false once it can't move
+SCROLL_CHAT_LIST_SCRIPT = """
+const pane = document.querySelector('#pane-side');
+if (!pane) return false;
+if (arguments[0]) { pane.scrollTop = 0; return true; }
+const before = pane.scrollTop;
+pane.scrollTop = before + Math.max(1, Math.floor(pane.clientHeight * 0.8));
+return pane.scrollTop > before;
+"""
+
+def chat_key(chat):
+    """Identifies a chat list row or index entry: its data-id, or its title when it has none."""
+    return chat.get("id") or f"title:{chat['name']}"
+
+def row_changed(row, previous):
+    """True if a chat list row shows activity since `previous`, its index entry from the last refresh."""
+    if not previous or "preview" not in previous:
+        return True
+    if row["unread"] or row["preview"] != previous["preview"]:
+        return True
+    # Labels age from "12.30" to "yesterday" to a date on their own; only two clock times compare
+    old_time, new_time = previous.get("time") or "", row["time"] or ""
+    return bool(CLOCK_TIME.match(old_time) and CLOCK_TIME.match(new_time) and old_time != new_time)
+
 class WhatsAppScraper:
-    """Scraper for WhatsApp Web."""
+    """
+    Scraper for WhatsApp Web.
+
+    The chat list is virtualized: only the rows on screen exist in the DOM. The crawler
+    scrolls it a screen at a time and opens each newly rendered chat before moving on, so
+    every chat is reachable. Rows are de-duplicated against a bounded window of recent
+    keys, and the chat index (`conversations.db`) stays on disk and is looked up one chat
+    at a time, so memory stays bounded however many chats the account has.
+    The index keeps each chat's last-message preview and time from the last refresh; a
+    regular refresh only opens chats whose row changed since, and stops after
+    ARIA_WHATSAPP_UNCHANGED_STOP unchanged rows below the pinned chats.
+    """
     URL = "https://web.whatsapp.com/"
+    SUPPORTS_UNREAD_ONLY = True
 
     def __init__(self, navigator: AriaNavigator, site_manager):
         self.navigator = navigator
         self.sm = site_manager
         self.site_name = "whatsapp"
+        self.max_pages = int(os.environ.get("ARIA_WHATSAPP_MAX_PAGES", DEFAULT_MAX_PAGES))
+        # 0 turns the early stop off, for accounts whose list order does not follow activity
+        self.unchanged_stop = int(os.environ.get("ARIA_WHATSAPP_UNCHANGED_STOP", DEFAULT_UNCHANGED_STOP))
 
     def navigate(self):
         """Navigates to WhatsApp Web."""
@@ -34,121 +110,185 @@ class WhatsAppScraper:
             print("Error: WhatsApp did not load. Please ensure QR code is scanned.")
             return False
 
-    def refresh(self, deep=False):
-        """Orchestrates the WhatsApp data refresh."""
+    def refresh(self, deep=False, unread_only=False):
+        """
+        Orchestrates the WhatsApp data refresh.
+        By default only chats whose list row changed since the last refresh are opened;
+        deep opens every chat, unread_only only those with an unread badge.
+        """
         # Navigation is handled by aria.py but we verify
         if "web.whatsapp.com" not in self.navigator.driver.current_url:
             if not self.navigate():
                 return False
         
         print("Starting data refresh for WhatsApp...")
-        conversations = self.scrape_all_conversations()
+        conversation_count = self.scrape_all_conversations(deep=deep, unread_only=unread_only)
         
-        # Update persistent registry
-        self.sm.update_registry(self.site_name, [c["name"] for c in conversations])
+        # Update persistent registry, streaming the names from the on-disk index
+        with self.open_chat_index() as index:
+            self.sm.update_registry(self.site_name, index.names(), sort=False)
         
         self.sm.save_data(self.site_name, "metadata.json", {
             "last_refresh": time.ctime(),
-            "conversation_count": len(conversations)
+            "conversation_count": conversation_count
         })
         return True
 
-    def scrape_all_conversations(self):
-        """Iterates through WhatsApp conversations and scrapes them."""
-        # 1. Get initial list of chat rows from the sidebar
-        script_rows = """
-        const sidebar = document.querySelector('div[aria-label="Keskustelulista"]') || 
-                        document.querySelector('div[aria-label="Chat list"]') ||
-                        document.querySelector('#pane-side');
-        if (!sidebar) return [];
-        return Array.from(sidebar.querySelectorAll('div[role="row"]'))
-            .map((r, i) => {
-                const titleEl = r.querySelector('span[title]');
-                return {
-                    index: i,
-                    title: titleEl ? titleEl.getAttribute('title') : "Unknown"
-                };
-            })
-            .filter(info => info.title !== "Unknown");
+    def open_chat_index(self):
+        """Opens the on-disk chat index, moving a legacy conversations.json into it first."""
+        index = self.sm.open_index(self.site_name, CHAT_INDEX_FILE)
+        legacy = self.sm.load_data(self.site_name, LEGACY_CHAT_INDEX_FILE)
+        if legacy is not None:
+            for entry in legacy:
+                if isinstance(entry, dict) and entry.get("name"):
+                    index.setdefault(chat_key(entry), entry)
+            index.commit()
+            os.remove(os.path.join(self.sm.get_site_dir(self.site_name), LEGACY_CHAT_INDEX_FILE))
+        return index
+
+    def iter_chat_rows(self, max_pages=None):
         """
-        chat_info = self.navigator.driver.execute_script(script_rows)
-        print(f"Found {len(chat_info)} conversation threads in sidebar.")
-        
-        all_data = []
-        
-        for info in chat_info[:15]: # Limit to first 15
-            name = info["title"]
-            print(f"Scraping conversation: {name}")
-            
-            try:
-                # Click via synthetic events to trigger WhatsApp state change
-                click_script = """
-                const name = arguments[0];
-                const xpath = `//span[@title=${JSON.stringify(name)}]`;
-                let el;
-                try {
-                    el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-                } catch(e) {
-                    el = Array.from(document.querySelectorAll('span[title]')).find(s => s.getAttribute('title') === name);
-                }
-
-                if (el) {
-                    const events = ['mousedown', 'mouseup', 'click'];
-                    events.forEach(type => {
-                        const ev = new MouseEvent(type, {
-                            view: window,
-                            bubbles: true,
-                            cancelable: true
-                        });
-                        el.dispatchEvent(ev);
-                    });
-                    return "CLICKED";
-                }
-                return "NOT_FOUND";
-                """
-                status = self.navigator.driver.execute_script(click_script, name)
-                if (status == "NOT_FOUND"):
-                    print(f"Warning: Could not find clickable element for {name}")
+        Yields each chat list row once, top to bottom, as the list is scrolled into view.
+        Rows are de-duplicated by data-id (or title) against a bounded window of recent rows,
+        which covers the overlap between screens however long the list is.
+        """
+        max_pages = self.max_pages if max_pages is None else max_pages
+        seen, recent = set(), deque()
+        self.navigator.driver.execute_script(SCROLL_CHAT_LIST_SCRIPT, True)
+        for page in range(max_pages + 1):
+            rows = self.navigator.driver.execute_script(CHAT_ROWS_SCRIPT)
+            if rows is None:
+                print("Warning: WhatsApp chat list not found.")
+                return
+            for row in rows:
+                key = chat_key(row)
+                if key in seen:
                     continue
-                
-                # Wait and verify that the chat header updated
-                header_verified = False
-                header_name = "None"
-                for _ in range(12): # 12 seconds max
-                    time.sleep(1)
-                    header_name = self.navigator.driver.execute_script("""
-                        const main = document.querySelector('div#main');
-                        if (!main) return "MAIN_NOT_FOUND";
-                        const titleSpan = main.querySelector('header span._ao3e');
-                        return titleSpan ? titleSpan.innerText.trim() : "TITLE_NOT_FOUND";
-                    """)
-                    if (header_name == name):
-                        header_verified = True
+                seen.add(key)
+                recent.append(key)
+                if len(recent) > SEEN_WINDOW:
+                    seen.discard(recent.popleft())
+                yield row
+            if page == max_pages or not self.navigator.driver.execute_script(SCROLL_CHAT_LIST_SCRIPT, False):
+                return
+            self.navigator.wait_for_dom_stable(root_selector="#pane-side", budget=1)
+
+    def scrape_all_conversations(self, deep=False, unread_only=False):
+        """
+        Crawls the chat list and scrapes the chats the mode selects as they come into view;
+        returns how many chats the index holds.
+        """
+        index = self.open_chat_index()
+        scraped = skipped = unchanged_run = 0
+        try:
+            for row in self.iter_chat_rows():
+                key = chat_key(row)
+                if unread_only:
+                    wanted = row["unread"]
+                else:
+                    changed = row_changed(row, index.get(key))
+                    wanted = deep or changed
+                    # Pinned chats sit on top whatever their activity, so they say nothing about the rows below
+                    if not row.get("pinned"):
+                        unchanged_run = 0 if changed else unchanged_run + 1
+
+                if not wanted:
+                    skipped += 1
+                    index.setdefault(key, {"name": row["name"], "id": row["id"]})
+                    if not deep and not unread_only and self.unchanged_stop and unchanged_run >= self.unchanged_stop:
+                        # Rows are ordered by last activity, so everything below is older still
                         break
-                
-                if not header_verified:
-                    print(f"Warning: Could not verify chat header for {name}. Got '{header_name}'. Data might be misattributed.")
-
-                # Extract messages
-                messages = self.extract_active_chat_messages()
-                
-                convo_data = {
+                    continue
+
+                name = row["name"]
+                print(f"Scraping conversation: {name}")
+                try:
+                    message_count = self.scrape_conversation(name)
+                except Exception as e:
+                    logger.error(f"Error scraping WhatsApp conversation {name}: {e}")
+                    continue
+                if message_count is None:
+                    continue
+                scraped += 1
+                index.put(key, {
                     "name": name,
-                    "scraped_at": time.ctime(),
-                    "messages": messages
-                }
-                
-                # Save individual conversation file
-                file_safe_name = "".join([c if c.isalnum() else "_" for c in name])
-                self.sm.save_data(self.site_name, f"convo_{file_safe_name}.json", convo_data)
-                
-                all_data.append({"name": name, "message_count": len(messages)})
-            except Exception as e:
-                logger.error(f"Error scraping WhatsApp conversation {name}: {e}")
+                    "id": row["id"],
+                    "preview": row["preview"],
+                    "time": row["time"],
+                    "message_count": message_count,
+                    "scraped_at": time.ctime()
+                })
+                # Committed per chat, so an interrupted crawl resumes from what was scraped
+                index.commit()
+            conversation_count = len(index)
+        finally:
+            index.close()
+        print(f"Scraped {scraped} conversations, skipped {skipped} {'without unread messages' if unread_only else 'unchanged'}.")
+        return conversation_count
+
+    def scrape_conversation(self, name):
+        """Opens a chat by its title and saves its messages; returns how many, or None if it could not be opened."""
+        # Click via synthetic events to trigger WhatsApp state change
+        click_script = """
+        const name = arguments[0];
+        const xpath = `//span[@title=${JSON.stringify(name)}]`;
+        let el;
+        try {
+            el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        } catch(e) {
+            el = Array.from(document.querySelectorAll('span[title]')).find(s => s.getAttribute('title') === name);
+        }
+
+        if (el) {
+            const events = ['mousedown', 'mouseup', 'click'];
+            events.forEach(type => {
+                const ev = new MouseEvent(type, {
+                    view: window,
+                    bubbles: true,
+                    cancelable: true
+                });
+                el.dispatchEvent(ev);
+            });
+            return "CLICKED";
+        }
+        return "NOT_FOUND";
+        """
+        status = self.navigator.driver.execute_script(click_script, name)
+        if (status == "NOT_FOUND"):
+            print(f"Warning: Could not find clickable element for {name}")
+            return None
+        
+        # Wait and verify that the chat header updated (12 seconds max)
+        seen = {"header": "None"}
+        def header_matches(driver):
+            seen["header"] = driver.execute_script("""
+                const main = document.querySelector('div#main');
+                if (!main) return "MAIN_NOT_FOUND";
+                const titleSpan = main.querySelector('header span._ao3e');
+                return titleSpan ? titleSpan.innerText.trim() : "TITLE_NOT_FOUND";
+            """)
+            return seen["header"] == name
+        # The old loop slept a full second before the first check
+        header_verified = bool(self.navigator.wait_until(header_matches, timeout=12, poll=0.2, budget=1))
+        header_name = seen["header"]
+        
+        if not header_verified:
+            print(f"Warning: Could not verify chat header for {name}. Got '{header_name}'. Data might be misattributed.")
+
+        # Extract messages
+        messages = self.extract_active_chat_messages()
+        
+        convo_data = {
+            "name": name,
+            "scraped_at": time.ctime(),
+            "messages": messages
+        }
+        
+        # Save individual conversation file
+        file_safe_name = "".join([c if c.isalnum() else "_" for c in name])
+        self.sm.save_data(self.site_name, f"convo_{file_safe_name}.json", convo_data)
         
-        # Save the master list
-        self.sm.save_data(self.site_name, "conversations.json", all_data)
-        return all_data
+        return len(messages)
 
     def extract_active_chat_messages(self):
         """Extracts messages from the currently open WhatsApp chat area."""
@@ -31,7 +31,7 @@ class YouTubeStudioScraper:
             print("Waiting for YouTube Studio to load...")
             # Wait for dashboard content
             self.navigator.wait_for_element('ytcp-app', by=By.TAG_NAME, timeout=45)
-            time.sleep(5)
+            self.navigator.wait_for_dom_stable(budget=5)
             print("YouTube Studio loaded successfully.")
             return True
         except Exception as e:
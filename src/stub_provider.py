@@ -0,0 +1,171 @@
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import quote_plus
+from plugin_manager import BaseAIProvider
+from logger import get_logger
+
+logger = get_logger("stub_provider")
+
+DISTRIBUTIONS = ["fixed", "uniform", "normal", "lognormal", "exponential"]
+STOP_WORDS = {"the", "a", "an", "to", "of", "for", "and", "or", "in", "on", "at", "is", "me", "my", "go", "open", "find", "show", "first", "relevant", "result", "page"}
+
+def _words(text: str) -> set:
+    return {w for w in re.findall(r"[a-z0-9]+", (text or "").lower()) if w not in STOP_WORDS}
+
+def _json_lists(text: str) -> List[Any]:
+    """Finds every JSON array embedded in free text (e.g. the link lists Aria puts in prompts)."""
+    decoder = json.JSONDecoder()
+    found = []
+    index = text.find("[")
+    while index != -1:
+        try:
+            value, end = decoder.raw_decode(text, index)
+            if isinstance(value, list):
+                found.append(value)
+                index = text.find("[", end)
+                continue
+        except ValueError:
+            pass
+        index = text.find("[", index + 1)
+    return found
+
+class StubProvider(BaseAIProvider):
+    """
+    Offline, deterministic AI provider for benchmarks and CI.
+
+    Responses come from scripted rules (regex -> response, from ARIA_STUB_SCRIPT or `rules`)
+    and otherwise from simple heuristics over the prompt: link-choice prompts get a link
+    from the context whose text best matches the request, search planning gets a search URL
+    and everything else gets a canned extractive summary. Artificial latency is drawn from
+    a seeded distribution so model time can be simulated separately from Aria's overhead.
+    """
+    model = "stub-1"
+
+    def __init__(self, context: Dict[str, Any], rules: List[Dict[str, str]] = None, latency_ms: float = None,
+                 jitter_ms: float = None, distribution: str = None, seed: int = None, routable: bool = False):
+        super().__init__(context)
+        self.rules = rules if rules is not None else self._load_rules(os.environ.get("ARIA_STUB_SCRIPT"))
+        self.latency_ms = latency_ms if latency_ms is not None else float(os.environ.get("ARIA_STUB_LATENCY_MS", 0))
+        self.jitter_ms = jitter_ms if jitter_ms is not None else float(os.environ.get("ARIA_STUB_JITTER_MS", 0))
+        self.distribution = distribution or os.environ.get("ARIA_STUB_DISTRIBUTION", "fixed")
+        if self.distribution not in DISTRIBUTIONS:
+            logger.warning(f"Unknown stub latency distribution '{self.distribution}', using 'fixed'.")
+            self.distribution = "fixed"
+        if seed is None:
+            seed = int(os.environ.get("ARIA_STUB_SEED", 0))
+        # The latency router would always prefer an instant stub, so it is opted out by default
+        self.routable = routable
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _load_rules(self, path: Optional[str]) -> List[Dict[str, str]]:
+        if not path:
+            return []
+        try:
+            with open(os.path.expanduser(path), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load stub script {path}: {e}")
+            return []
+
+    def sample_latency(self) -> float:
+        """Draws one artificial latency in seconds from the configured distribution."""
+        mean, jitter = self.latency_ms, self.jitter_ms
+        with self._lock:
+            if self.distribution == "uniform":
+                value = self._rng.uniform(mean - jitter, mean + jitter)
+            elif self.distribution == "normal":
+                value = self._rng.gauss(mean, jitter)
+            elif self.distribution == "lognormal":
+                # `latency_ms` is the median; `jitter_ms` widens the long tail
+                sigma = jitter / mean if mean > 0 else 0.0
+                value = mean * self._rng.lognormvariate(0.0, sigma) if mean > 0 else 0.0
+            elif self.distribution == "exponential":
+                value = self._rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+            else:
+                value = mean
+        return max(0.0, value) / 1000.0
+
+    def respond(self, prompt: str, context: str = "", output_format: str = "text") -> str:
+        """Returns the scripted or rule-based response without any latency."""
+        self.calls += 1
+        text = f"{prompt}\n{context}"
+        for rule in self.rules:
+            if re.search(rule.get("match", ""), text, re.IGNORECASE | re.DOTALL):
+                return rule.get("response", "")
+
+        request = self._quoted_request(prompt)
+        if "search results page" in prompt and '"url"' in prompt:
+            return json.dumps({"url": f"https://www.google.com/search?q={quote_plus(request or prompt)}", "engine": "Google"})
+        if '{"url"' in prompt:
+            return self._choose_link(prompt, text, request)
+        if "Return ONLY the URL" in prompt:
+            link = self._best_link(text, request)
+            return link["url"] if link else "NONE"
+        return self._summary(context or prompt, output_format)
+
+    def _quoted_request(self, prompt: str) -> str:
+        match = re.search(r"'([^']+)'", prompt)
+        return match.group(1) if match else ""
+
+    def _links(self, text: str) -> List[Dict[str, Any]]:
+        links = []
+        for items in _json_lists(text):
+            links.extend(item for item in items if isinstance(item, dict) and item.get("url"))
+        return links
+
+    def _best_link(self, text: str, request: str) -> Optional[Dict[str, Any]]:
+        links = self._links(text)
+        wanted = _words(request)
+        best, best_score = None, 0
+        for link in links:
+            score = len(wanted & _words(f"{link.get('text', '')} {link.get('title', '')} {link['url']}"))
+            if score > best_score:
+                best, best_score = link, score
+        if best is None and links and not wanted:
+            return links[0]
+        return best
+
+    def _choose_link(self, prompt: str, text: str, request: str) -> str:
+        link = self._best_link(text, request)
+        if link:
+            return json.dumps({"url": link["url"]})
+        if "next_page_url" in prompt:
+            for candidate in self._links(text):
+                if _words(candidate.get("text", "")) & {"next", "more"}:
+                    return json.dumps({"next_page_url": candidate["url"]})
+        if '"search"' in prompt:
+            return json.dumps({"search": request})
+        return json.dumps({"error": "Not found"})
+
+    def _summary(self, text: str, output_format: str) -> str:
+        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text.strip()) if s.strip()]
+        summary = " ".join(sentences[:3])[:300] or "Nothing to summarize."
+        if output_format == "json":
+            return json.dumps({"summary": summary, "key_points": sentences[:3], "overall_sentiment": "neutral"})
+        return f"Summary: {summary}"
+
+    def generate(self, prompt: str, context: str = "", output_format: str = "text") -> str:
+        time.sleep(self.sample_latency())
+        return self.respond(prompt, context, output_format)
+
+    async def agenerate(self, prompt: str, context: str = "", output_format: str = "text") -> str:
+        await asyncio.sleep(self.sample_latency())
+        return self.respond(prompt, context, output_format)
+
+    def generate_stream(self, prompt: str, context: str = "", output_format: str = "text") -> Iterator[str]:
+        # Latency is spent before the first chunk, like time-to-first-token on a real model
+        time.sleep(self.sample_latency())
+        text = self.respond(prompt, context, output_format)
+        if output_format == "json":
+            yield text
+            return
+        for word in re.findall(r"\S+\s*", text):
+            yield word
@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from logger import get_logger, record_metric
+from tab_index import SOURCE_RETRY_AFTER, _bidi_string
+
+logger = get_logger("tab_content")
+
+DEFAULT_WORKERS = 8
+EVALUATE_TIMEOUT = 10
+
+# One round trip per tab: returns the tab's fingerprint (URL, lastModified, DOM node count)
+# and its text, leaving the text out when the fingerprint matches the one the caller knows
+CONTENT_EXPRESSION = """(function(known) {
+    var fingerprint = JSON.stringify([location.href, document.lastModified, document.getElementsByTagName('*').length]);
+    return JSON.stringify({
+        fingerprint: fingerprint,
+        title: document.title,
+        url: location.href,
+        content: fingerprint === known ? null : (document.body ? document.body.innerText : '')
+    });
+})(%s)"""
+
+Evaluator = Callable[[str, str], str]
+
+class TabContentReader:
+    """
+    Reads the text of several tabs at once, without switching the driver between them.
+
+    Chromium tabs are evaluated over their own DevTools websocket (found through the
+    `/json/list` target list) and BiDi sessions through `script.evaluate` in each
+    browsing context, both on a thread pool. Tabs neither can reach are read the old
+    way, by switching to them one at a time. Each tab's text is cached by handle with a
+    fingerprint of its URL, `document.lastModified` and DOM node count, so a tab that has
+    not changed since the last prompt costs one small evaluation instead of a full text pull.
+    Like the tab index, a source that fails is retried after `ARIA_TAB_SOURCE_RETRY` seconds.
+    """
+    def __init__(self, driver, debugger_address: str = None, max_workers: int = None):
+        self.driver = driver
+        self.debugger_address = debugger_address
+        self.max_workers = max_workers or int(os.environ.get("ARIA_TAB_CONTENT_WORKERS", DEFAULT_WORKERS))
+        self.source: Optional[str] = None
+        self._cache: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        self.retry_after = float(os.environ.get("ARIA_TAB_SOURCE_RETRY", SOURCE_RETRY_AFTER))
+        self._failed_sources: Dict[str, float] = {}
+
+    def invalidate(self, handle: str = None):
+        if handle is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(handle, None)
+
+    def _devtools_evaluator(self) -> Optional[Evaluator]:
+        if not self.debugger_address:
+            return None
+        import websocket
+        with urllib.request.urlopen(f"http://{self.debugger_address}/json/list", timeout=2) as response:
+            sockets = {t["id"]: t["webSocketDebuggerUrl"] for t in json.load(response) if t.get("type") == "page" and t.get("webSocketDebuggerUrl")}
+
+        def evaluate(handle: str, expression: str) -> str:
+            # Chromedriver window handles are the CDP target ids; suppress_origin keeps
+            # Chrome from rejecting the connection without --remote-allow-origins
+            ws = websocket.create_connection(sockets[handle], timeout=EVALUATE_TIMEOUT, suppress_origin=True)
+            try:
+                ws.send(json.dumps({"id": 1, "method": "Runtime.evaluate", "params": {"expression": expression, "returnByValue": True}}))
+                while True:
+                    message = json.loads(ws.recv())
+                    if message.get("id") == 1:
+                        break
+            finally:
+                ws.close()
+            result = message.get("result", {})
+            if "exceptionDetails" in result or "error" in message:
+                raise RuntimeError(message.get("error") or result["exceptionDetails"].get("text"))
+            return result["result"]["value"]
+        return evaluate
+
+    def _bidi_evaluator(self) -> Optional[Evaluator]:
+        # Only sessions created with BiDi enabled expose a webSocketUrl; handles are the context ids
+        if not isinstance(self.driver.capabilities.get("webSocketUrl"), str):
+            return None
+
+        def evaluate(handle: str, expression: str) -> str:
+            return _bidi_string(self.driver.script.evaluate(expression, {"context": handle}, False))
+        return evaluate
+
+    def _evaluator(self) -> Optional[Evaluator]:
+        for source, factory in (("devtools", self._devtools_evaluator), ("bidi", self._bidi_evaluator)):
+            if time.monotonic() - self._failed_sources.get(source, float("-inf")) < self.retry_after:
+                continue
+            try:
+                evaluator = factory()
+            except Exception as e:
+                logger.debug(f"Tab content source '{source}' unavailable: {e}")
+                evaluator = None
+            if evaluator is not None:
+                self._failed_sources.pop(source, None)
+                self.source = source
+                return evaluator
+            self._failed_sources[source] = time.monotonic()
+        self.source = "switch"
+        return None
+
+    def _expression(self, handle: str) -> str:
+        cached = self._cache.get(handle)
+        return CONTENT_EXPRESSION % json.dumps(cached[0] if cached else None)
+
+    def _store(self, handle: str, raw: str) -> Tuple[Dict[str, str], bool]:
+        """Parses an evaluation result into {title, url, content}; the flag says whether it came from cache."""
+        data = json.loads(raw)
+        cached = self._cache.get(handle)
+        if data["content"] is None and cached:
+            return dict(cached[1], title=data["title"], url=data["url"]), True
+        entry = {"title": data["title"], "url": data["url"], "content": data["content"] or ""}
+        self._cache[handle] = (data["fingerprint"], entry)
+        return dict(entry), False
+
+    def _read_by_switching(self, handles: List[str]) -> Dict[str, str]:
+        """Legacy path: switch to each tab to evaluate it, then switch back."""
+        raw = {}
+        original = self.driver.current_window_handle
+        try:
+            for handle in handles:
+                try:
+                    self.driver.switch_to.window(handle)
+                    raw[handle] = self.driver.execute_script("return " + self._expression(handle))
+                except Exception as e:
+                    logger.warning(f"Could not read content of tab '{handle}': {e}")
+        finally:
+            self.driver.switch_to.window(original)
+        return raw
+
+    def read(self, handles: List[str]) -> Dict[str, Dict[str, str]]:
+        """Returns {handle: {title, url, content}} for the handles that could be read."""
+        start_time = time.perf_counter()
+        handles = list(dict.fromkeys(handles))
+        if self._cache:
+            # Forget tabs that have been closed
+            open_handles = set(self.driver.window_handles)
+            for handle in [h for h in self._cache if h not in open_handles]:
+                del self._cache[handle]
+
+        raw: Dict[str, str] = {}
+        evaluator = self._evaluator() if handles else None
+        if evaluator:
+            def read_one(handle):
+                try:
+                    return handle, evaluator(handle, self._expression(handle))
+                except Exception as e:
+                    logger.debug(f"Concurrent read of tab '{handle}' failed: {e}")
+                    return handle, None
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(handles)))) as executor:
+                raw = {handle: value for handle, value in executor.map(read_one, handles) if value is not None}
+        missing = [h for h in handles if h not in raw]
+        if missing:
+            raw.update(self._read_by_switching(missing))
+
+        results, cached = {}, 0
+        for handle in handles:
+            if handle in raw:
+                results[handle], hit = self._store(handle, raw[handle])
+                cached += hit
+        record_metric("tab_content_read", (time.perf_counter() - start_time) * 1000, source=self.source, tabs=len(results), cached=cached, switched=len(missing))
+        return results
@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+from logger import get_logger, record_metric
+
+logger = get_logger("tab_index")
+
+DEFAULT_MAX_AGE = 2.0
+SOURCES = ["devtools", "cdp", "bidi", "switch"]
+# A source that failed (the DevTools port restarting, a BiDi hiccup) is tried again after this many seconds
+SOURCE_RETRY_AFTER = 30.0
+
+class TabIndex:
+    """
+    In-memory handle -> {title, url} index of the browser's tabs.
+
+    Metadata for all tabs is read in one call, without switching windows, from the first
+    source that works: the DevTools HTTP target list (`/json/list`), the CDP
+    `Target.getTargets` command sent through the driver, or WebDriver BiDi
+    `browsingContext.getTree`. Tabs none of these can describe are read by switching to
+    them, which is what Aria always did. Entries are reused for `max_age` seconds or until
+    invalidate() is called after navigation. A source that fails is skipped for
+    `ARIA_TAB_SOURCE_RETRY` seconds rather than for the life of the driver.
+    """
+    def __init__(self, driver, debugger_address: str = None, max_age: float = None):
+        self.driver = driver
+        self.debugger_address = debugger_address or self._capability_debugger_address()
+        self.max_age = max_age if max_age is not None else float(os.environ.get("ARIA_TAB_INDEX_TTL", DEFAULT_MAX_AGE))
+        self.tabs: Dict[str, Dict[str, str]] = {}
+        self.handles: List[str] = []
+        self.source: Optional[str] = None
+        self.refreshed_at = 0.0
+        self.retry_after = float(os.environ.get("ARIA_TAB_SOURCE_RETRY", SOURCE_RETRY_AFTER))
+        self._failed_sources: Dict[str, float] = {}
+
+    def _capability_debugger_address(self) -> Optional[str]:
+        try:
+            return debugger_address_from_capabilities(self.driver.capabilities)
+        except Exception:
+            return None
+
+    def invalidate(self):
+        self.refreshed_at = 0.0
+
+    def is_fresh(self) -> bool:
+        return bool(self.refreshed_at) and time.monotonic() - self.refreshed_at < self.max_age
+
+    def _from_devtools(self) -> Optional[Dict[str, Dict[str, str]]]:
+        if not self.debugger_address:
+            return None
+        with urllib.request.urlopen(f"http://{self.debugger_address}/json/list", timeout=2) as response:
+            targets = json.load(response)
+        return {t["id"]: {"title": t.get("title", ""), "url": t.get("url", "")} for t in targets if t.get("type") == "page"}
+
+    def _from_cdp(self) -> Optional[Dict[str, Dict[str, str]]]:
+        # Chromedriver window handles are the CDP target ids
+        result = self.driver.execute("executeCdpCommand", {"cmd": "Target.getTargets", "params": {}})["value"]
+        if not isinstance(result, dict) or not isinstance(result.get("targetInfos"), list):
+            return None
+        return {t["targetId"]: {"title": t.get("title", ""), "url": t.get("url", "")} for t in result["targetInfos"] if t.get("type") == "page"}
+
+    def _from_bidi(self) -> Optional[Dict[str, Dict[str, str]]]:
+        # Only sessions created with BiDi enabled expose a webSocketUrl; handles are the context ids
+        if not isinstance(self.driver.capabilities.get("webSocketUrl"), str):
+            return None
+        targets = {}
+        for info in self.driver.browsing_context.get_tree(max_depth=0):
+            context = getattr(info, "context", None) or info.get("context")
+            url = getattr(info, "url", None) or info.get("url", "")
+            result = self.driver.script.evaluate("document.title", {"context": context}, False)
+            targets[context] = {"title": _bidi_string(result), "url": url}
+        return targets
+
+    def _read_targets(self) -> Dict[str, Dict[str, str]]:
+        readers = {"devtools": self._from_devtools, "cdp": self._from_cdp, "bidi": self._from_bidi}
+        for source, reader in readers.items():
+            if time.monotonic() - self._failed_sources.get(source, float("-inf")) < self.retry_after:
+                continue
+            try:
+                targets = reader()
+            except Exception as e:
+                logger.debug(f"Tab metadata source '{source}' unavailable: {e}")
+                targets = None
+            if targets is not None:
+                self._failed_sources.pop(source, None)
+                self.source = source
+                return targets
+            self._failed_sources[source] = time.monotonic()
+        self.source = "switch"
+        return {}
+
+    def _read_by_switching(self, handles: List[str]) -> Dict[str, Dict[str, str]]:
+        """Legacy path: switch to each tab to read its title and URL, then switch back."""
+        targets = {}
+        original = self.driver.current_window_handle
+        for handle in handles:
+            self.driver.switch_to.window(handle)
+            targets[handle] = {"title": self.driver.title, "url": self.driver.current_url}
+        self.driver.switch_to.window(original)
+        return targets
+
+    def refresh(self, force: bool = False) -> List[Dict[str, Any]]:
+        """Re-reads tab metadata unless the index is still fresh."""
+        if force or not self.is_fresh():
+            start_time = time.perf_counter()
+            handles = list(self.driver.window_handles)
+            targets = self._read_targets()
+            missing = [h for h in handles if h not in targets]
+            if missing:
+                targets.update(self._read_by_switching(missing))
+                if len(missing) == len(handles):
+                    self.source = "switch"
+            self.handles = handles
+            self.tabs = {h: targets[h] for h in handles}
+            self.refreshed_at = time.monotonic()
+            record_metric("tab_index_refresh", (time.perf_counter() - start_time) * 1000, source=self.source, tabs=len(handles))
+        return self.list()
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [{"index": i, "handle": h, "title": self.tabs[h]["title"], "url": self.tabs[h]["url"]} for i, h in enumerate(self.handles)]
+
+    def find(self, predicate) -> Optional[str]:
+        """Returns the first handle (in tab order) whose {title, url} satisfies the predicate."""
+        for handle in self.handles:
+            if predicate(self.tabs[handle]):
+                return handle
+        return None
+
+def debugger_address_from_capabilities(capabilities) -> Optional[str]:
+    """Returns the Chromium DevTools host:port a session reports, if any."""
+    for key in ("goog:chromeOptions", "ms:edgeOptions"):
+        options = capabilities.get(key) if isinstance(capabilities, dict) else None
+        address = options.get("debuggerAddress") if isinstance(options, dict) else None
+        if isinstance(address, str):
+            return address
+    return None
+
+def _bidi_string(result) -> str:
+    """Pulls the string value out of a BiDi script.evaluate result (dict or object form)."""
+    if isinstance(result, dict):
+        value = result.get("result", {})
+        return value.get("value", "") if isinstance(value, dict) else ""
+    value = getattr(result, "result", None)
+    if isinstance(value, dict):
+        return value.get("value", "")
+    return getattr(value, "value", "") or ""
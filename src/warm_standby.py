@@ -0,0 +1,214 @@
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from logger import get_logger, record_metric
+
+logger = get_logger("warm_standby")
+
+DEFAULT_SIZE = 1
+DEFAULT_MAX_TOTAL = 2
+DEFAULT_IDLE_TIMEOUT = 600.0
+REAP_INTERVAL = 30.0
+
+StandbyKey = Tuple[str, bool, Optional[str]]
+
+def parse_standby_specs(value: Optional[str], headless: bool = False) -> List[StandbyKey]:
+    """Parses ARIA_STANDBY / --prewarm values such as 'chrome,firefox@work' into pool keys."""
+    keys = []
+    for spec in (value or "").split(","):
+        spec = spec.strip()
+        if not spec:
+            continue
+        browser, _, profile = spec.partition("@")
+        keys.append((browser.strip().lower(), headless, profile.strip() or None))
+    return keys
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+class StandbyBrowser:
+    """A started driver+browser pair waiting to be handed to start_session."""
+    def __init__(self, key: StandbyKey, driver, session_data: Dict[str, Any]):
+        self.key = key
+        self.driver = driver
+        self.session_data = session_data
+        self.created_at = time.monotonic()
+
+    def is_alive(self) -> bool:
+        try:
+            _ = self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting standby browser: {e}")
+
+class WarmStandbyPool:
+    """
+    Keeps spare, already-started browsers so `start_session` can skip the launch.
+
+    Spares are grouped by (browser, headless, profile). Taking one starts its replacement
+    on a background thread; a key nobody has taken from for `idle_timeout` seconds has
+    its spares quit and is no longer refilled until it is asked for again. At most
+    `max_total` spares exist across all keys, which bounds the memory they hold.
+
+    The pool lives in a long-running process (the aria daemon): a one-shot CLI process
+    would exit, and take its spares with it, before they could be used. A profile can
+    only be open in one browser at a time, so profile keys are refilled when their
+    session closes rather than right after a take.
+    """
+    def __init__(self, launcher: Callable[..., Tuple[Any, Dict[str, Any], str]], size: int = None,
+                 max_total: int = None, idle_timeout: float = None):
+        self.launcher = launcher
+        self.size = max(1, int(size if size is not None else _env_number("ARIA_STANDBY_SIZE", DEFAULT_SIZE)))
+        self.max_total = max(1, int(max_total if max_total is not None else _env_number("ARIA_STANDBY_MAX", DEFAULT_MAX_TOTAL)))
+        self.idle_timeout = idle_timeout if idle_timeout is not None else _env_number("ARIA_STANDBY_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT)
+        self._spares: Dict[StandbyKey, List[StandbyBrowser]] = {}
+        self._starting: Dict[StandbyKey, int] = {}
+        # When each key was last asked for; keys missing here are not refilled
+        self._wanted: Dict[StandbyKey, float] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._reaper = None
+
+    def _count(self, key: StandbyKey = None) -> int:
+        if key is not None:
+            return len(self._spares.get(key, [])) + self._starting.get(key, 0)
+        return sum(len(spares) for spares in self._spares.values()) + sum(self._starting.values())
+
+    def prewarm(self, browser_name: str, headless: bool = False, profile: str = None):
+        """Marks a key as wanted and starts its spares in the background."""
+        key = (browser_name, headless, profile)
+        with self._lock:
+            self._wanted[key] = time.monotonic()
+        self._ensure_reaper()
+        self.replenish(key)
+
+    def take(self, browser_name: str, headless: bool = False, profile: str = None) -> Optional[StandbyBrowser]:
+        """Hands out a live spare for the key (or None) and schedules its replacement."""
+        key = (browser_name, headless, profile)
+        spare = None
+        with self._lock:
+            self._wanted[key] = time.monotonic()
+            spares = self._spares.get(key, [])
+            while spares and spare is None:
+                candidate = spares.pop(0)
+                if candidate.is_alive():
+                    spare = candidate
+                else:
+                    threading.Thread(target=candidate.quit, daemon=True).start()
+        record_metric("standby_take", 0.0, browser=browser_name, hit=spare is not None)
+        self._ensure_reaper()
+        if profile is None:
+            self.replenish(key)
+        return spare
+
+    def refill(self):
+        """Starts spares for every wanted key, e.g. once a session has released its profile."""
+        with self._lock:
+            keys = list(self._wanted)
+        for key in keys:
+            self.replenish(key)
+
+    def replenish(self, key: StandbyKey):
+        """Starts as many spares for `key` as it is short of, within the global limit."""
+        with self._lock:
+            if self._closed.is_set() or key not in self._wanted:
+                return
+            missing = min(self.size - self._count(key), self.max_total - self._count())
+            for _ in range(max(0, missing)):
+                self._starting[key] = self._starting.get(key, 0) + 1
+                threading.Thread(target=self._start_spare, args=(key,), name="aria-standby-start", daemon=True).start()
+
+    def _start_spare(self, key: StandbyKey):
+        browser_name, headless, profile = key
+        start_time = time.perf_counter()
+        spare = None
+        try:
+            driver, session_data, _ = self.launcher(browser_name, headless=headless, profile=profile, verbose=False)
+            spare = StandbyBrowser(key, driver, session_data)
+            record_metric("standby_start", (time.perf_counter() - start_time) * 1000, browser=browser_name)
+        except Exception as e:
+            logger.warning(f"Could not start a standby {browser_name} browser: {e}")
+        with self._lock:
+            self._starting[key] -= 1
+            if not self._starting[key]:
+                del self._starting[key]
+            if spare and not self._closed.is_set() and key in self._wanted:
+                self._spares.setdefault(key, []).append(spare)
+                spare = None
+        if spare:
+            # The pool closed or the key went idle while the browser was starting
+            spare.quit()
+
+    def reap_idle(self) -> int:
+        """Quits the spares of keys not asked for within the idle timeout; returns how many."""
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for key, last_wanted in list(self._wanted.items()):
+                if now - last_wanted >= self.idle_timeout:
+                    del self._wanted[key]
+                    expired.extend(self._spares.pop(key, []))
+        for spare in expired:
+            spare.quit()
+        if expired:
+            logger.info(f"Closed {len(expired)} idle standby browser(s).")
+        return len(expired)
+
+    def _ensure_reaper(self):
+        with self._lock:
+            if self._reaper is not None or self._closed.is_set():
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, name="aria-standby-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        while not self._closed.wait(min(REAP_INTERVAL, max(1.0, self.idle_timeout))):
+            self.reap_idle()
+
+    def status(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            keys = set(self._spares) | set(self._starting) | set(self._wanted)
+            return {
+                f"{browser}{'@' + profile if profile else ''}{' (headless)' if headless else ''}": {
+                    "ready": len(self._spares.get((browser, headless, profile), [])),
+                    "starting": self._starting.get((browser, headless, profile), 0)
+                }
+                for browser, headless, profile in keys
+            }
+
+    def close(self):
+        """Quits every spare; browsers already handed out are left running."""
+        self._closed.set()
+        with self._lock:
+            spares = [spare for key_spares in self._spares.values() for spare in key_spares]
+            self._spares.clear()
+            self._wanted.clear()
+        for spare in spares:
+            spare.quit()
+
+def create_standby_pool(specs: Optional[str] = None, launcher: Callable = None) -> Optional[WarmStandbyPool]:
+    """
+    Builds a pool from --prewarm specs or ARIA_STANDBY and starts the spares;
+    None when no browsers are configured.
+    """
+    headless = os.environ.get("ARIA_STANDBY_HEADLESS", "false").lower() == "true"
+    keys = parse_standby_specs(specs if specs is not None else os.environ.get("ARIA_STANDBY"), headless=headless)
+    if not keys:
+        return None
+    if launcher is None:
+        from navigator import AriaNavigator
+        launcher = AriaNavigator().launch_browser
+    pool = WarmStandbyPool(launcher)
+    for browser_name, headless, profile in keys:
+        pool.prewarm(browser_name, headless=headless, profile=profile)
+    return pool
@@ -0,0 +1,127 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import time
+import os
+
+from ai_cache import AIResponseCache, get_ai_cache
+from plugin_manager import PluginManager, BasePlugin, BaseAIProvider
+from logger import get_performance_metrics, clear_performance_metrics
+import aria
+from aria import generate_ai_response
+
+class CountingProvider(BaseAIProvider):
+    model = "counting-1"
+    calls = 0
+
+    def generate(self, prompt, context="", output_format="text"):
+        CountingProvider.calls += 1
+        if prompt == "fail":
+            return "Error: simulated failure"
+        return f"answer {CountingProvider.calls}"
+
+class CountingPlugin(BasePlugin):
+    def get_ai_providers(self):
+        return {"counting": CountingProvider}
+
+class TestAIResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = AIResponseCache(cache_dir=self.tmpdir.name, ttl=60, max_bytes=10 * 1024 * 1024)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_key_depends_on_all_inputs(self):
+        base = AIResponseCache.make_key("gemini", "m", "text", "p", "c")
+        self.assertEqual(base, AIResponseCache.make_key("gemini", "m", "text", "p", "c"))
+        self.assertNotEqual(base, AIResponseCache.make_key("gemini", "m", "json", "p", "c"))
+        self.assertNotEqual(base, AIResponseCache.make_key("gemini", "m2", "text", "p", "c"))
+        self.assertNotEqual(base, AIResponseCache.make_key("other", "m", "text", "p", "c"))
+        self.assertNotEqual(base, AIResponseCache.make_key("gemini", "m", "text", "pc", ""))
+
+    def test_set_and_get(self):
+        key = AIResponseCache.make_key("gemini", "m", "text", "p", "")
+        self.assertIsNone(self.cache.get(key))
+        self.cache.set(key, "hello")
+        self.assertEqual(self.cache.get(key), "hello")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_expired_entry_is_a_miss(self):
+        key = AIResponseCache.make_key("gemini", "m", "text", "p", "")
+        self.cache.set(key, "old", ttl=-1)
+        self.assertIsNone(self.cache.get(key))
+        self.assertFalse(os.path.exists(self.cache._path(key)))
+
+    def test_lru_eviction_respects_size_budget(self):
+        cache = AIResponseCache(cache_dir=self.tmpdir.name, ttl=60, max_bytes=900)
+        keys = [AIResponseCache.make_key("p", "m", "text", str(i), "") for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.set(key, "x" * 200)
+            # Spread mtimes so the LRU order is deterministic
+            os.utime(cache._path(key), (time.time() - 100 + i, time.time() - 100 + i))
+        cache.get(keys[0])  # Most recently used now
+        cache.set(AIResponseCache.make_key("p", "m", "text", "new", ""), "x" * 200)
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+
+    def test_writes_do_not_scan_the_cache(self):
+        cache = AIResponseCache(cache_dir=self.tmpdir.name, ttl=60, max_bytes=2000)
+        with patch("ai_cache.os.walk", wraps=os.walk) as walk:
+            for i in range(5):
+                cache.set(AIResponseCache.make_key("p", "m", "text", str(i), ""), "x" * 100)
+            # Only the first write, which has no size estimate yet, scans the directory
+            self.assertEqual(walk.call_count, 1)
+            for i in range(5, 12):
+                cache.set(AIResponseCache.make_key("p", "m", "text", str(i), ""), "x" * 100)
+        # Passing the budget triggers the scan that evicts
+        self.assertGreater(walk.call_count, 1)
+        total = sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(self.tmpdir.name)
+                    for name in files if name.endswith(".json"))
+        self.assertLessEqual(total, 2000)
+
+    def test_shared_cache_follows_its_settings(self):
+        other = os.path.join(self.tmpdir.name, "other")
+        with patch.dict(os.environ, {"ARIA_AI_CACHE_DIR": self.tmpdir.name}):
+            first = get_ai_cache()
+            self.assertIs(get_ai_cache(), first)
+        # A daemon command from a client with another cache directory gets its own cache
+        with patch.dict(os.environ, {"ARIA_AI_CACHE_DIR": other}):
+            self.assertEqual(get_ai_cache().cache_dir, other)
+
+    def test_generate_ai_response_uses_cache(self):
+        pm = PluginManager(context={})
+        pm.register_plugin(CountingPlugin(context={}))
+        clear_performance_metrics()
+        with patch("aria.get_ai_cache", return_value=self.cache), patch.dict(os.environ, {"ARIA_NO_CACHE": "false"}):
+            first = generate_ai_response("q", plugin_manager=pm, provider_name="counting")
+            second = generate_ai_response("q", plugin_manager=pm, provider_name="counting")
+            self.assertEqual(first, second)
+
+            bypass = generate_ai_response("q", plugin_manager=pm, provider_name="counting", use_cache=False)
+            self.assertNotEqual(bypass, first)
+
+        operations = [m["operation"] for m in get_performance_metrics()]
+        self.assertIn("ai_cache_hit", operations)
+        self.assertIn("ai_cache_miss", operations)
+
+    def test_errors_are_not_cached(self):
+        pm = PluginManager(context={})
+        pm.register_plugin(CountingPlugin(context={}))
+        with patch("aria.get_ai_cache", return_value=self.cache), patch.dict(os.environ, {"ARIA_NO_CACHE": "false"}):
+            generate_ai_response("fail", plugin_manager=pm, provider_name="counting")
+            calls = CountingProvider.calls
+            generate_ai_response("fail", plugin_manager=pm, provider_name="counting")
+            self.assertEqual(CountingProvider.calls, calls + 1)
+
+    def test_no_cache_env_bypasses(self):
+        pm = PluginManager(context={})
+        pm.register_plugin(CountingPlugin(context={}))
+        with patch("aria.get_ai_cache", return_value=self.cache), patch.dict(os.environ, {"ARIA_NO_CACHE": "true"}):
+            calls = CountingProvider.calls
+            generate_ai_response("nc", plugin_manager=pm, provider_name="counting")
+            generate_ai_response("nc", plugin_manager=pm, provider_name="counting")
+            self.assertEqual(CountingProvider.calls, calls + 2)
+
+if __name__ == "__main__":
+    unittest.main()
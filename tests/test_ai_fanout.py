@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import tempfile
+import time
+import os
+
+from ai_cache import AIResponseCache
+from ai_fanout import fan_out, run_fan_out
+from plugin_manager import PluginManager, BasePlugin, BaseAIProvider
+from logger import get_performance_metrics, clear_performance_metrics
+from aria import generate_ai_responses, _summarize_sites
+
+class SlowProvider(BaseAIProvider):
+    """Blocking provider that relies on the thread-offloading agenerate() default."""
+    model = "slow-1"
+
+    def generate(self, prompt, context="", output_format="text"):
+        time.sleep(0.2)
+        return f"answer to {prompt}"
+
+class AsyncProvider(BaseAIProvider):
+    model = "async-1"
+    in_flight = 0
+    peak = 0
+
+    def generate(self, prompt, context="", output_format="text"):
+        return asyncio.run(self.agenerate(prompt, context, output_format))
+
+    async def agenerate(self, prompt, context="", output_format="text"):
+        AsyncProvider.in_flight += 1
+        AsyncProvider.peak = max(AsyncProvider.peak, AsyncProvider.in_flight)
+        await asyncio.sleep(0.05)
+        AsyncProvider.in_flight -= 1
+        if prompt == "boom":
+            raise RuntimeError("boom")
+        return prompt.upper()
+
+class FanOutPlugin(BasePlugin):
+    def get_ai_providers(self):
+        return {"slow": SlowProvider, "async": AsyncProvider}
+
+class TestAIFanOut(unittest.TestCase):
+    def test_default_agenerate_offloads_to_thread(self):
+        provider = SlowProvider(context={})
+        start = time.perf_counter()
+        results = run_fan_out(provider, [{"prompt": str(i)} for i in range(4)], concurrency=4)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(results, [f"answer to {i}" for i in range(4)])
+        # Four 200ms calls run side by side rather than back to back
+        self.assertLess(elapsed, 0.6)
+
+    def test_concurrency_limit_and_order(self):
+        AsyncProvider.peak = 0
+        seen = []
+        results = run_fan_out(AsyncProvider(context={}), [{"prompt": c} for c in "abcdef"], concurrency=2,
+                              on_result=lambda i, text: seen.append(i))
+        self.assertEqual(results, list("ABCDEF"))
+        self.assertEqual(AsyncProvider.peak, 2)
+        self.assertEqual(sorted(seen), list(range(6)))
+
+    def test_failure_does_not_cancel_siblings(self):
+        clear_performance_metrics()
+        results = asyncio.run(fan_out(AsyncProvider(context={}), [{"prompt": "ok"}, {"prompt": "boom"}]))
+        self.assertEqual(results[0], "OK")
+        self.assertTrue(results[1].startswith("Error"))
+        self.assertIn("ai_fan_out", [m["operation"] for m in get_performance_metrics()])
+
+    def test_generate_ai_responses_uses_cache(self):
+        pm = PluginManager(context={})
+        pm.register_plugin(FanOutPlugin(context={}))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = AIResponseCache(cache_dir=tmpdir, ttl=60)
+            with patch("aria.get_ai_cache", return_value=cache), patch.dict(os.environ, {"ARIA_NO_CACHE": "false"}):
+                first = generate_ai_responses([{"prompt": "x"}, {"prompt": "y"}], plugin_manager=pm, provider_name="async")
+                with patch.object(AsyncProvider, "agenerate", side_effect=AssertionError("should be cached")):
+                    second = generate_ai_responses([{"prompt": "x"}, {"prompt": "y"}], plugin_manager=pm, provider_name="async")
+        self.assertEqual(first, ["X", "Y"])
+        self.assertEqual(second, first)
+
+    def test_failed_site_summary_keeps_raw_data(self):
+        site_context = {"calendar": ["Event: Launch"], "discord": ["Thread/Convo general:", "  [t] a: hi"]}
+        replies = ["Launch on Friday.", "Error: quota exceeded"]
+        with patch("aria.generate_ai_responses", return_value=replies), patch("builtins.print"):
+            condensed = _summarize_sites(site_context)
+        self.assertEqual(condensed, {"calendar": ["Launch on Friday."], "discord": site_context["discord"]})
+
+    def test_unknown_provider(self):
+        results = generate_ai_responses([{"prompt": "x"}], plugin_manager=PluginManager(context={}), provider_name="missing")
+        self.assertTrue(results[0].startswith("Error: AI provider 'missing' not found"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+import tempfile
 import sys
+import os
 
 from plugin_manager import PluginManager, BasePlugin, BaseAIProvider
 from aria import generate_ai_response
@@ -14,6 +16,14 @@ class MockAIPlugin(BasePlugin):
         return {"mock": MockAIProvider}
 
 class TestAIPlugins(unittest.TestCase):
+    def setUp(self):
+        # generate_ai_response caches by default; keep these tests off the real ~/.aria/cache
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        env = patch.dict(os.environ, {"ARIA_NO_CACHE": "true", "ARIA_AI_CACHE_DIR": self.tmpdir.name})
+        env.start()
+        self.addCleanup(env.stop)
+
     def test_provider_registration(self):
         pm = PluginManager(context={})
         plugin = MockAIPlugin(context={})
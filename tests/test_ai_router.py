@@ -0,0 +1,141 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from ai_router import RoutingProvider, ProviderStats
+from plugin_manager import BaseAIProvider
+
+class FixedProvider(BaseAIProvider):
+    def __init__(self, context, name, delay=0.0, fail=False):
+        super().__init__(context)
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def generate(self, prompt, context="", output_format="text"):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            return f"Error: {self.name} is down"
+        return f"{self.name}: {prompt}"
+
+def warm_up(router, name, latency, ok=True, count=10):
+    for _ in range(count):
+        router._stats_for(name).record(latency, ok)
+
+class TestProviderStats(unittest.TestCase):
+    def test_percentiles_and_error_rate(self):
+        stats = ProviderStats(window=10)
+        for i in range(1, 11):
+            stats.record(i / 10.0, True)
+        self.assertAlmostEqual(stats.p50, 0.6)
+        self.assertAlmostEqual(stats.p95, 1.0)
+        stats.record(0.0, False)
+        self.assertAlmostEqual(stats.error_rate, 0.1)
+
+    def test_window_rolls(self):
+        stats = ProviderStats(window=3)
+        for _ in range(5):
+            stats.record(0.1, False)
+        for _ in range(3):
+            stats.record(0.1, True)
+        self.assertEqual(stats.error_rate, 0.0)
+
+class TestRoutingProvider(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.stats_path = os.path.join(self.tmp, "router_stats.json")
+        env = mock.patch.dict(os.environ, {"ARIA_ROUTER_STATS_FILE": self.stats_path})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_routes_to_fastest_healthy(self):
+        slow, fast = FixedProvider({}, "slow"), FixedProvider({}, "fast")
+        router = RoutingProvider({}, providers={"slow": slow, "fast": fast}, hedge=False)
+        warm_up(router, "slow", 1.0)
+        warm_up(router, "fast", 0.1)
+        self.assertEqual(router.generate("hi"), "fast: hi")
+        self.assertEqual(slow.calls, 0)
+
+    def test_skips_unhealthy_and_fails_over(self):
+        fast_broken, slow = FixedProvider({}, "broken", fail=True), FixedProvider({}, "slow")
+        router = RoutingProvider({}, providers={"broken": fast_broken, "slow": slow}, hedge=False, cooldown=60)
+        warm_up(router, "broken", 0.01, ok=False)
+        warm_up(router, "slow", 0.5)
+        self.assertEqual([n for n, _ in router.candidates()], ["slow", "broken"])
+
+        # A fresh provider that fails is tried first, then the next one answers
+        fresh_broken = FixedProvider({}, "fresh", fail=True)
+        router.providers["fresh"] = fresh_broken
+        self.assertEqual(router.generate("q"), "slow: q")
+        self.assertEqual(fresh_broken.calls, 1)
+        self.assertGreater(router.get_stats()["fresh"]["error_rate"], 0)
+
+    def test_hedges_when_primary_exceeds_p95(self):
+        degraded = FixedProvider({}, "degraded", delay=1.0)
+        backup = FixedProvider({}, "backup", delay=0.05)
+        router = RoutingProvider({}, providers={"degraded": degraded, "backup": backup}, hedge=True)
+        warm_up(router, "degraded", 0.05)  # Historically fast, so it is chosen first
+        warm_up(router, "backup", 0.2)
+
+        start = time.perf_counter()
+        self.assertEqual(router.generate("q"), "backup: q")
+        self.assertLess(time.perf_counter() - start, 0.6)
+        self.assertEqual(degraded.calls, 1)
+        self.assertEqual(backup.calls, 1)
+
+    def test_no_hedge_when_primary_is_fast(self):
+        primary = FixedProvider({}, "primary", delay=0.01)
+        backup = FixedProvider({}, "backup")
+        router = RoutingProvider({}, providers={"primary": primary, "backup": backup}, hedge=True)
+        warm_up(router, "primary", 0.5)
+        warm_up(router, "backup", 1.0)
+        self.assertEqual(router.generate("q"), "primary: q")
+        self.assertEqual(backup.calls, 0)
+
+    def test_ignores_itself_in_shared_registry(self):
+        registry = {"only": FixedProvider({}, "only")}
+        router = RoutingProvider({}, providers=registry, hedge=False)
+        registry["router"] = router
+        self.assertEqual(router.generate("q"), "only: q")
+        self.assertEqual([n for n, _ in router.candidates()], ["only"])
+
+    def test_no_providers(self):
+        router = RoutingProvider({}, providers={}, hedge=False)
+        self.assertTrue(router.generate("q").startswith("Error"))
+        self.assertTrue("".join(router.generate_stream("q")).startswith("Error"))
+
+    def test_stats_carry_over_to_the_next_process(self):
+        slow, fast = FixedProvider({}, "slow", delay=0.05), FixedProvider({}, "fast")
+        first = RoutingProvider({}, providers={"slow": slow, "fast": fast}, hedge=False)
+        for _ in range(5):
+            first._call("slow", slow, "q", "", "text")
+            first._call("fast", fast, "q", "", "text")
+
+        # A new router, as in the next one-shot run, starts from the saved measurements
+        second = RoutingProvider({}, providers={"slow": slow, "fast": fast}, hedge=False)
+        self.assertEqual(second.get_stats(), {})
+        self.assertEqual([n for n, _ in second.candidates()], ["fast", "slow"])
+        self.assertEqual(second.get_stats()["slow"]["samples"], 5)
+
+        in_memory = RoutingProvider({}, providers={"slow": slow, "fast": fast}, hedge=False, stats_path="")
+        in_memory.candidates()
+        self.assertEqual(in_memory.get_stats()["slow"]["samples"], 0)
+
+    def test_close_stops_the_hedge_executor(self):
+        primary, backup = FixedProvider({}, "primary"), FixedProvider({}, "backup")
+        router = RoutingProvider({}, providers={"primary": primary, "backup": backup}, hedge=True)
+        self.assertIn(router.generate("q"), ("primary: q", "backup: q"))
+        executor = router._executor
+        router.close()
+        self.assertIsNone(router._executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(time.sleep, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import aria_daemon
+from aria_daemon import DaemonServer
+
+@unittest.skipUnless(aria_daemon.is_supported(), "Unix domain sockets not available")
+class TestAriaDaemon(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.temp_dir, "daemon.sock")
+        self.calls = []
+        self.outcomes = []
+        self.server = DaemonServer(self.handler, socket_path=self.socket_path)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.assertIsNotNone(aria_daemon.wait_until_ready(self.socket_path, timeout=5))
+
+    def tearDown(self):
+        self.server.stop()
+        self.thread.join(timeout=5)
+        shutil.rmtree(self.temp_dir)
+
+    def handler(self, argv):
+        self.calls.append(argv)
+        command = argv[0]
+        if command == "echo":
+            print(" ".join(argv[1:]))
+        elif command == "ask":
+            answer = input("Name? ")
+            print(f"Hello {answer}")
+        elif command == "env":
+            print(os.environ.get("ARIA_DAEMON_TEST", "unset"), os.getcwd())
+            os.environ["ARIA_DAEMON_LEAK"] = "true"
+        elif command == "fail":
+            raise SystemExit(3)
+        elif command == "crash":
+            raise RuntimeError("boom")
+        elif command == "background":
+            # A thread the command did not start in its own context, like a standby launch
+            os.environ["ARIA_DAEMON_TEST"] = "command"
+            seen = []
+            worker = threading.Thread(target=lambda: (print("from background"), seen.append(os.environ.get("ARIA_DAEMON_TEST"))))
+            worker.start()
+            worker.join()
+            print(f"background saw {seen[0]}")
+        elif command in ("chatty", "silent"):
+            try:
+                for _ in range(400):
+                    if command == "chatty":
+                        print("tick")
+                    else:
+                        aria_daemon.raise_if_cancelled()
+                    time.sleep(0.025)
+                self.outcomes.append("finished")
+            except KeyboardInterrupt:
+                self.outcomes.append("interrupted")
+                raise
+
+    def run_command(self, argv, stdin=""):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        code = aria_daemon.run_command(argv, self.socket_path, stdin=io.StringIO(stdin), stdout=stdout, stderr=stderr)
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_relays_output_and_exit_code(self):
+        self.assertEqual(self.run_command(["echo", "page", "list"]), (0, "page list\n", ""))
+        self.assertEqual(self.run_command(["fail"])[0], 3)
+
+        code, stdout, _ = self.run_command(["crash"])
+        self.assertEqual(code, 1)
+        self.assertIn("boom", stdout)
+
+    def test_relays_prompts(self):
+        code, stdout, _ = self.run_command(["ask"], stdin="Ada\n")
+        self.assertEqual(code, 0)
+        self.assertEqual(stdout, "Name? Hello Ada\n")
+
+    def test_prompt_without_input_is_eof(self):
+        code, stdout, _ = self.run_command(["ask"])
+        self.assertEqual(code, 1)
+        self.assertIn("No input available", stdout)
+
+    def test_uses_client_environment_and_restores_it(self):
+        os.environ["ARIA_DAEMON_TEST"] = "client"
+        try:
+            _, stdout, _ = self.run_command(["env"])
+        finally:
+            del os.environ["ARIA_DAEMON_TEST"]
+        self.assertEqual(stdout.split()[0], "client")
+        self.assertEqual(stdout.split()[1], os.getcwd())
+        self.assertNotIn("ARIA_DAEMON_LEAK", os.environ)
+
+    def test_background_threads_keep_daemon_output_and_environment(self):
+        _, stdout, _ = self.run_command(["background"])
+        self.assertEqual(stdout, "background saw None\n")
+        self.assertNotIn("ARIA_DAEMON_TEST", os.environ)
+
+    def _hang_up_during(self, argv):
+        sock = aria_daemon._connect(self.socket_path)
+        aria_daemon._send(sock, {"type": "run", "argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)})
+        time.sleep(0.2)
+        sock.close()
+        deadline = time.monotonic() + 5
+        while not self.outcomes and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.outcomes, ["interrupted"])
+        # The command lock was released, so the next command runs straight away
+        self.assertEqual(self.run_command(["echo", "next"])[1], "next\n")
+
+    def test_client_hang_up_stops_command(self):
+        self._hang_up_during(["chatty"])
+
+    def test_client_hang_up_stops_silent_command(self):
+        self._hang_up_during(["silent"])
+
+    def test_status_and_shutdown(self):
+        self.run_command(["echo", "hi"])
+        status = aria_daemon.ping(self.socket_path)
+        self.assertEqual(status["pid"], os.getpid())
+        self.assertEqual(status["commands"], 1)
+
+        self.assertEqual(aria_daemon.request({"type": "shutdown"}, self.socket_path)["type"], "bye")
+        self.thread.join(timeout=5)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+class TestForwardCommand(unittest.TestCase):
+    def test_no_daemon_runs_locally(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            socket_path = os.path.join(temp_dir, "missing.sock")
+            self.assertIsNone(aria_daemon.run_command(["version"], socket_path))
+            # A stale socket file left by a crashed daemon
+            open(socket_path, "w").close()
+            self.assertIsNone(aria_daemon.run_command(["version"], socket_path))
+
+    def test_daemon_commands_and_opt_out_are_not_forwarded(self):
+        self.assertIsNone(aria_daemon.forward_command(["daemon", "status"]))
+        os.environ["ARIA_NO_DAEMON"] = "true"
+        try:
+            self.assertIsNone(aria_daemon.forward_command(["version"]))
+        finally:
+            del os.environ["ARIA_NO_DAEMON"]
+
+class TestDaemonRuntime(unittest.TestCase):
+    def test_commands_share_runtime_and_navigator(self):
+        from aria import main, _create_runtime
+        runtime = _create_runtime()
+        with patch("sys.stdout", new=io.StringIO()) as fake_out:
+            main(["version"], runtime)
+            main(["--slow-mo", "2", "version"], runtime)
+        self.assertEqual(fake_out.getvalue().count("aria CLI version"), 2)
+        self.assertEqual(len(runtime["navigators"]), 1)
+
+        navigator = next(iter(runtime["navigators"].values()))
+        self.assertEqual(navigator.throttle_delay, 2.0)
+        with patch("sys.stdout", new=io.StringIO()):
+            main(["version"], runtime)
+        self.assertIs(next(iter(runtime["navigators"].values())), navigator)
+        self.assertEqual(navigator.throttle_delay, 0.0)
+
+    def test_stale_driver_is_dropped(self):
+        from aria import _drop_stale_driver
+        from navigator import AriaNavigator
+        navigator = AriaNavigator()
+        navigator.driver = MagicMock(session_id="old")
+        with patch.object(navigator, "_get_current_browser", return_value="chrome"), \
+             patch.object(navigator, "_load_session_data", return_value={"session_id": "old"}):
+            _drop_stale_driver(navigator)
+        self.assertIsNotNone(navigator.driver)
+
+        with patch.object(navigator, "_get_current_browser", return_value="chrome"), \
+             patch.object(navigator, "_load_session_data", return_value={"session_id": "new"}):
+            _drop_stale_driver(navigator)
+        self.assertIsNone(navigator.driver)
+
+if __name__ == "__main__":
+    unittest.main()
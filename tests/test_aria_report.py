@@ -11,10 +11,10 @@ from aria import main
 class TestAriaReport(unittest.TestCase):
     @patch('aria.AriaNavigator')
     @patch('aria.ReportManager')
-    @patch('aria.generate_ai_response')
+    @patch('aria.generate_ai_response_stream')
     def test_report_generate_command(self, mock_ai, mock_report_manager, mock_nav):
         # Mocking
-        mock_ai.return_value = "AI generated report content."
+        mock_ai.return_value = iter(["AI generated ", "report content."])
         mock_rm_inst = mock_report_manager.return_value
         mock_rm_inst.generate_markdown_report.return_value = "/path/to/report.md"
         mock_rm_inst.reports_dir = "/tmp/reports"
@@ -28,6 +28,8 @@ class TestAriaReport(unittest.TestCase):
                 main()
                 output = fake_out.getvalue()
                 self.assertIn("Report generated: /path/to/report.md", output)
+                # Content is streamed to the terminal as it is generated
+                self.assertIn("AI generated report content.", output)
                 mock_rm_inst.generate_markdown_report.assert_called_once()
                 args, kwargs = mock_rm_inst.generate_markdown_report.call_args
                 self.assertEqual(args[0], "My Title")
@@ -76,10 +78,10 @@ class TestAriaReport(unittest.TestCase):
 
     @patch('aria.AriaNavigator')
     @patch('aria.ReportManager')
-    @patch('aria.generate_ai_response')
+    @patch('aria.generate_ai_response_stream')
     def test_report_generate_html_command(self, mock_ai, mock_report_manager, mock_nav):
         # Mocking
-        mock_ai.return_value = "AI generated HTML content."
+        mock_ai.return_value = iter(["AI generated HTML content."])
         mock_rm_inst = mock_report_manager.return_value
         mock_rm_inst.generate_html_report.return_value = "/path/to/report.html"
         
@@ -0,0 +1,154 @@
+import os
+import io
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from functools import partial
+from unittest.mock import MagicMock, patch
+
+from browser_pool import BrowserPool, copy_profile
+
+class FakeDriverFactory:
+    def __init__(self):
+        self.drivers = []
+        self.lock = threading.Lock()
+
+    def __call__(self, browser_name, headless, profile_dir, scrape_profile=None):
+        driver = MagicMock()
+        driver.profile_dir = profile_dir
+        driver.scrape_profile = scrape_profile
+        with self.lock:
+            self.drivers.append(driver)
+        return driver
+
+class TestBrowserPool(unittest.TestCase):
+    def setUp(self):
+        self.factory = FakeDriverFactory()
+        # Never copy the real Firefox profile of whoever runs the tests
+        patcher = patch("browser_pool.get_default_firefox_profile_path", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_runs_tasks_concurrently_within_limit(self):
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def task(navigator):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.2)
+            with lock:
+                active[0] -= 1
+            return True
+
+        with BrowserPool(size=3, driver_factory=self.factory) as pool:
+            start = time.perf_counter()
+            results = pool.run({f"site{i}": task for i in range(6)})
+            elapsed = time.perf_counter() - start
+
+        self.assertTrue(all(r["ok"] for r in results.values()))
+        self.assertEqual(peak[0], 3)
+        self.assertLessEqual(len(self.factory.drivers), 3)
+        # Two waves of 0.2s rather than six
+        self.assertLess(elapsed, 0.9)
+
+    def test_each_task_gets_its_own_navigator(self):
+        seen = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(2)
+
+        def task(navigator):
+            barrier.wait(timeout=5)
+            with lock:
+                seen.append(navigator.driver)
+            return True
+
+        with BrowserPool(size=2, driver_factory=self.factory) as pool:
+            pool.run({"a": task, "b": task})
+        self.assertIsNot(seen[0], seen[1])
+
+    def test_failing_task_is_isolated_and_its_session_discarded(self):
+        def fail(navigator):
+            raise RuntimeError("page crashed")
+
+        with BrowserPool(size=1, driver_factory=self.factory) as pool:
+            results = pool.run({"broken": fail, "fine": lambda navigator: True})
+            self.assertFalse(results["broken"]["ok"])
+            self.assertIn("page crashed", results["broken"]["error"])
+            self.assertTrue(results["fine"]["ok"])
+
+        broken_driver = self.factory.drivers[0]
+        broken_driver.quit.assert_called()
+        self.assertEqual(len(self.factory.drivers), 2)
+
+    def test_idle_sessions_are_reused_and_closed(self):
+        with BrowserPool(size=1, driver_factory=self.factory) as pool:
+            pool.run({"a": lambda navigator: True})
+            pool.run({"b": lambda navigator: True})
+            profile_dir = self.factory.drivers[0].profile_dir
+            self.assertTrue(os.path.isdir(profile_dir))
+        self.assertEqual(len(self.factory.drivers), 1)
+        self.factory.drivers[0].quit.assert_called_once()
+        self.assertFalse(os.path.exists(profile_dir))
+
+    def test_profile_copy_skips_locks_and_caches(self):
+        source = tempfile.mkdtemp()
+        try:
+            open(os.path.join(source, "cookies.sqlite"), "w").close()
+            open(os.path.join(source, "parent.lock"), "w").close()
+            os.makedirs(os.path.join(source, "cache2", "entries"))
+            copy = copy_profile(source)
+            self.assertEqual(os.listdir(copy), ["cookies.sqlite"])
+            shutil.rmtree(copy)
+        finally:
+            shutil.rmtree(source)
+
+class TestParallelSiteRefresh(unittest.TestCase):
+    def test_refresh_sites_in_pool(self):
+        from aria import _refresh_sites_in_pool
+        factory = FakeDriverFactory()
+        scraper = MagicMock()
+        scraper.return_value.refresh.side_effect = [True, False]
+        args = MagicMock(deep=False, browser="firefox", profile=None)
+        site_urls = {"discord": "https://discord.com/app", "threads": "https://www.threads.net/"}
+
+        with patch("aria.BrowserPool", partial(BrowserPool, driver_factory=factory)), \
+             patch("browser_pool.get_default_firefox_profile_path", return_value=None), \
+             patch("sys.stdout", new=io.StringIO()) as fake_out:
+            results = _refresh_sites_in_pool(list(site_urls), site_urls, {"discord": scraper, "threads": scraper}, MagicMock(), args, 4)
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(sorted(r["ok"] for r in results.values()), [False, True])
+        self.assertIn("Refreshed 1/2 sites", fake_out.getvalue())
+        # Pooled scrape browsers skip the resources both sites can do without
+        self.assertIn("font", factory.drivers[0].scrape_profile.block_types)
+
+    def test_sequential_refresh_applies_each_sites_profile_to_reused_tabs(self):
+        from aria import main, _create_runtime, AriaNavigator
+        navigator = MagicMock()
+        navigator.find_tab_by_url.return_value = True
+        runtime = _create_runtime()
+        runtime["navigators"][AriaNavigator] = navigator
+
+        with patch("aria._run_site_scraper", return_value=True), patch("aria.SiteManager"), \
+             patch.dict(os.environ, {"ARIA_BLOCK_RESOURCES": "image,font"}), patch("sys.stdout", new=io.StringIO()):
+            main(["site", "refresh", "all"], runtime)
+        applied = [call.args[0].block_types for call in navigator.apply_scrape_profile.call_args_list]
+        self.assertEqual(len(applied), 6)
+        # Google Messages needs its images, the other sites do not
+        self.assertEqual(applied[0], {"font"})
+        self.assertEqual(applied[1], {"image", "font"})
+        navigator.start_session.assert_not_called()
+
+        navigator.apply_scrape_profile.reset_mock()
+        with patch("aria._run_site_scraper", return_value=True), patch("aria.SiteManager"), \
+             patch.dict(os.environ, {"ARIA_BLOCK_RESOURCES": "none"}), patch("sys.stdout", new=io.StringIO()):
+            main(["site", "refresh", "discord"], runtime)
+        # Blocking switched off clears the rules the previous refresh left in the tab
+        self.assertEqual(navigator.apply_scrape_profile.call_args.args[0].block_types, set())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+from unittest.mock import patch
+import os
+
+from chunking import estimate_tokens, split_text, group_texts, needs_chunking
+from plugin_manager import PluginManager, BasePlugin, BaseAIProvider
+from logger import get_performance_metrics, clear_performance_metrics
+from aria import condense_text, summarize_text
+
+class RecordingProvider(BaseAIProvider):
+    """Returns a short fixed summary and records every prompt it sees."""
+    model = "recording-1"
+    prompts = []
+
+    def generate(self, prompt, context="", output_format="text"):
+        RecordingProvider.prompts.append((prompt, context))
+        if prompt.startswith("Summarize the following text"):
+            return "final summary"
+        if "FAILME" in context:
+            return "Error: simulated chunk failure"
+        return "partial " + "s" * 150
+
+class RecordingPlugin(BasePlugin):
+    def get_ai_providers(self):
+        return {"recording": RecordingProvider}
+
+class TestSplitText(unittest.TestCase):
+    def test_small_text_is_one_chunk(self):
+        self.assertEqual(split_text("hello world", max_tokens=100), ["hello world"])
+
+    def test_prefers_paragraph_boundaries(self):
+        paragraphs = ["a" * 100, "b" * 100, "c" * 100]
+        chunks = split_text("\n\n".join(paragraphs), max_tokens=60)  # 240 chars
+        self.assertEqual(chunks, ["a" * 100 + "\n\n" + "b" * 100, "c" * 100])
+
+    def test_falls_back_to_smaller_boundaries(self):
+        text = "\n".join(["word " * 30] * 4)
+        chunks = split_text(text, max_tokens=20)
+        for chunk in chunks:
+            self.assertLessEqual(estimate_tokens(chunk), 20)
+        self.assertEqual("".join(chunks).replace(" ", "").replace("\n", ""), text.replace(" ", "").replace("\n", ""))
+
+    def test_hard_split_without_boundaries(self):
+        chunks = split_text("x" * 1000, max_tokens=50)
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual("".join(chunks), "x" * 1000)
+
+    def test_group_texts(self):
+        groups = group_texts(["a" * 100] * 5, max_tokens=60)
+        self.assertEqual([len(g) for g in groups], [2, 3])
+
+    def test_threshold_env(self):
+        with patch.dict(os.environ, {"ARIA_SUMMARY_THRESHOLD_TOKENS": "10"}):
+            self.assertTrue(needs_chunking("x" * 100))
+            self.assertFalse(needs_chunking("x" * 40))
+
+class TestMapReduce(unittest.TestCase):
+    def setUp(self):
+        RecordingProvider.prompts = []
+        self.pm = PluginManager(context={})
+        self.pm.register_plugin(RecordingPlugin(context={}))
+        self.env = patch.dict(os.environ, {"ARIA_NO_CACHE": "true"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+
+    def test_condense_maps_and_reduces(self):
+        clear_performance_metrics()
+        text = "\n\n".join(f"section {i} " + "z" * 380 for i in range(8))
+        result = condense_text(text, "release dates", plugin_manager=self.pm, provider_name="recording", chunk_tokens=110)
+
+        map_calls = [p for p in RecordingProvider.prompts if p[0].startswith("The following is part")]
+        merge_calls = [p for p in RecordingProvider.prompts if p[0].startswith("The following are summaries")]
+        self.assertEqual(len(map_calls), 8)
+        self.assertTrue(merge_calls)
+        self.assertIn("release dates", map_calls[0][0])
+        self.assertTrue(result.startswith("partial"))
+
+        metric = [m for m in get_performance_metrics() if m["operation"] == "condense_text"][0]
+        self.assertEqual(metric["chunks"], 8)
+        self.assertGreaterEqual(metric["reduce_levels"], 1)
+
+    def test_failed_chunk_summary_falls_back_to_source_excerpt(self):
+        text = "\n\n".join(["intro " + "a" * 380, "FAILME launch moved to May " + "b" * 380, "outro " + "c" * 380])
+        with patch("builtins.print"):
+            result = condense_text(text, plugin_manager=self.pm, provider_name="recording", chunk_tokens=110)
+        self.assertIn("[Summary unavailable; excerpt of the original text]\nFAILME launch moved to May", result)
+        self.assertEqual(result.count("partial"), 2)
+
+    def test_summarize_text_chunks_above_threshold(self):
+        with patch.dict(os.environ, {"ARIA_SUMMARY_THRESHOLD_TOKENS": "100", "ARIA_SUMMARY_CHUNK_TOKENS": "100"}):
+            result = summarize_text("p " * 1000, plugin_manager=self.pm, provider_name="recording", prompt="Key points?")
+        self.assertEqual(result, "final summary")
+        final_prompt, final_context = RecordingProvider.prompts[-1]
+        self.assertTrue(final_context.startswith("Key points?"))
+        self.assertGreater(len(RecordingProvider.prompts), 2)
+
+    def test_summarize_text_small_is_single_call(self):
+        summarize_text("short text", plugin_manager=self.pm, provider_name="recording", prompt="Key points?")
+        self.assertEqual(RecordingProvider.prompts, [("Summarize the following text:", "Key points?\n\nshort text")])
+
+if __name__ == "__main__":
+    unittest.main()
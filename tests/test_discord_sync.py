@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from site_manager import SiteManager
+from sites.discord import DiscordScraper, NEW_MESSAGES_SCRIPT, SCROLL_UP_SCRIPT, snowflake_after
+
+SERVER = {"id": "guildsnav___1", "name": "Team"}
+CHANNEL = {"id": "channels___2", "name": "general", "type": "text", "has_unread": True}
+KEY = "chat_Team_general"
+
+def message_html(message_id, user=None, text=None, second=None):
+    author = f'<span class="username_a1">{user}</span>' if user else ""
+    second = message_id % 60 if second is None else second
+    return (f'<li id="chat-messages-2-{message_id}">{author}<time datetime="2024-01-01T00:00:{second:02d}Z"></time>'
+            f'<div id="message-content-{message_id}">{text or f"message {message_id}"}</div></li>')
+
+class FakeDiscordDriver:
+    """Renders a window of `page` messages over a channel's history, like Discord's virtualized list."""
+    def __init__(self, ids, page=5, texts=None):
+        self.ids = ids
+        self.page = page
+        # {id: text} for messages that all share one timestamp, like a burst of "ok"s
+        self.texts = texts or {}
+        self.end = len(ids)
+        self.calls = []
+
+    def rendered(self):
+        return self.ids[max(0, self.end - self.page):self.end]
+
+    def execute_script(self, script, *args):
+        self.calls.append(script)
+        if script == NEW_MESSAGES_SCRIPT:
+            after = args[0]
+            rendered = self.rendered()
+            items = [[str(i), message_html(i, user="alice" if i % 2 else None, text=self.texts.get(i), second=0 if i in self.texts else None)]
+                     for i in rendered if snowflake_after(str(i), after)]
+            return {"oldest": str(rendered[0]) if rendered else None, "items": items}
+        if script == SCROLL_UP_SCRIPT:
+            if self.end - self.page <= 0:
+                return False
+            self.end -= self.page
+            return True
+        # Channel click succeeds, there is no overlay to bypass
+        return "click" in script and "continueBtn" not in script
+
+class TestDiscordSync(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.sm = SiteManager(base_dir=self.root)
+        patcher = patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _scraper(self, driver, backfill=0):
+        scraper = DiscordScraper(MagicMock(driver=driver), self.sm)
+        scraper.backfill = backfill
+        return scraper
+
+    def _log(self):
+        return self.sm.load_items("discord", f"{KEY}.jsonl")
+
+    def test_first_sync_stores_rendered_messages_and_cursor(self):
+        driver = FakeDiscordDriver([1, 2, 3, 4, 5, 6, 7], page=5)
+        self.assertEqual(self._scraper(driver).scrape_channel(SERVER, CHANNEL), 5)
+
+        self.assertEqual([m["id"] for m in self._log()], ["3", "4", "5", "6", "7"])
+        cursor = self.sm.load_data("discord", "cursors.json")[KEY]
+        self.assertEqual((cursor["message_id"], cursor["channel"]), ("7", "general"))
+        # Message 4 is a grouped follow-up and takes the author of message 3
+        self.assertEqual(self._log()[1]["user"], "alice")
+
+    def test_incremental_sync_appends_only_new_messages(self):
+        driver = FakeDiscordDriver([1, 2, 3], page=5)
+        self._scraper(driver).scrape_channel(SERVER, CHANNEL)
+        driver.ids += [4, 5]
+        driver.end = len(driver.ids)
+
+        self.assertEqual(self._scraper(driver).scrape_channel(SERVER, CHANNEL), 2)
+        self.assertEqual([m["id"] for m in self._log()], ["1", "2", "3", "4", "5"])
+
+    def test_unchanged_channel_writes_nothing(self):
+        driver = FakeDiscordDriver([1, 2, 3], page=5)
+        self._scraper(driver).scrape_channel(SERVER, CHANNEL)
+        site_dir = self.sm.get_site_dir("discord")
+        before = {f: os.path.getmtime(os.path.join(site_dir, f)) for f in os.listdir(site_dir) if f != "media"}
+
+        with patch.object(self.sm, "save_data") as save_data, patch.object(self.sm, "append_items") as append_items:
+            self.assertEqual(self._scraper(driver).scrape_channel(SERVER, CHANNEL), 0)
+        save_data.assert_not_called()
+        append_items.assert_not_called()
+        self.assertEqual(before, {f: os.path.getmtime(os.path.join(site_dir, f)) for f in before})
+
+    def test_backfill_scrolls_up_to_the_cursor(self):
+        self.sm.save_data("discord", "cursors.json", {KEY: {"message_id": "8", "user": "bob"}})
+        driver = FakeDiscordDriver(list(range(1, 21)), page=5)
+
+        self.assertEqual(self._scraper(driver, backfill=10).scrape_channel(SERVER, CHANNEL), 12)
+        self.assertEqual([m["id"] for m in self._log()], [str(i) for i in range(9, 21)])
+        self.assertEqual(driver.calls.count(SCROLL_UP_SCRIPT), 2)
+
+    def test_backfill_stops_at_page_limit(self):
+        self.sm.save_data("discord", "cursors.json", {KEY: {"message_id": "1"}})
+        driver = FakeDiscordDriver(list(range(1, 41)), page=5)
+
+        self.assertEqual(self._scraper(driver, backfill=2).scrape_channel(SERVER, CHANNEL), 15)
+        self.assertEqual(driver.calls.count(SCROLL_UP_SCRIPT), 2)
+
+    def test_gap_without_backfill_is_reported(self):
+        self.sm.save_data("discord", "cursors.json", {KEY: {"message_id": "2"}})
+        driver = FakeDiscordDriver(list(range(1, 11)), page=5)
+        with patch("builtins.print") as printed:
+            self._scraper(driver).scrape_channel(SERVER, CHANNEL)
+        self.assertTrue(any("--backfill" in str(c) for c in printed.call_args_list))
+
+    def test_legacy_snapshot_is_migrated_without_duplicates(self):
+        legacy = [{"user": "alice", "text": f"message {i}", "timestamp": f"2024-01-01T00:00:{i:02d}Z"} for i in (1, 2, 3)]
+        self.sm.save_data("discord", f"{KEY}.json", {"channel": "general", "messages": legacy})
+        driver = FakeDiscordDriver([2, 3, 4], page=5)
+
+        self.assertEqual(self._scraper(driver).scrape_channel(SERVER, CHANNEL), 1)
+        self.assertEqual([m["text"] for m in self._log()], ["message 1", "message 2", "message 3", "message 4"])
+        self.assertFalse(os.path.exists(os.path.join(self.sm.get_site_dir("discord"), f"{KEY}.json")))
+        self.assertEqual(self.sm.load_data("discord", "cursors.json")[KEY]["message_id"], "4")
+
+    def test_lost_cursor_dedups_by_id_and_keeps_repeated_messages(self):
+        driver = FakeDiscordDriver([1, 2, 3], page=5, texts={1: "ok", 2: "ok", 3: "ok"})
+        self._scraper(driver).scrape_channel(SERVER, CHANNEL)
+        os.remove(os.path.join(self.sm.get_site_dir("discord"), "cursors.json"))
+        driver.ids.append(4)
+        driver.texts[4] = "ok"
+        driver.end = len(driver.ids)
+
+        # The fourth "ok" has the same timestamp and text as the stored ones, but a new id
+        self.assertEqual(self._scraper(driver).scrape_channel(SERVER, CHANNEL), 1)
+        self.assertEqual([m["id"] for m in self._log()], ["1", "2", "3", "4"])
+
+class TestSiteManagerItems(unittest.TestCase):
+    def test_append_and_tail(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        sm = SiteManager(base_dir=root)
+        sm.append_items("site", "log.jsonl", [{"n": 1}, {"n": 2}])
+        sm.append_items("site", "log.jsonl", [{"n": 3}])
+        with open(os.path.join(sm.get_site_dir("site"), "log.jsonl"), "a") as f:
+            f.write('{"n": 4')
+
+        self.assertEqual(sm.load_items("site", "log.jsonl"), [{"n": 1}, {"n": 2}, {"n": 3}])
+        self.assertEqual(sm.load_items("site", "log.jsonl", limit=2), [{"n": 2}, {"n": 3}])
+        self.assertEqual(sm.load_items("site", "missing.jsonl"), [])
+
+    def test_cleanup_keeps_state_and_trims_logs(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        sm = SiteManager(base_dir=root)
+        site_dir = sm.get_site_dir("site")
+        old = time.time() - 40 * 86400
+        sm.save_data("site", "cursors.json", {"chat_a": {"message_id": "9"}})
+        sm.save_data("site", "snapshot.json", {"items": []})
+        sm.append_items("site", "stale.jsonl", [{"id": "1", "timestamp": "2024-01-01T00:00:00Z"}])
+        for name in ("cursors.json", "snapshot.json", "stale.jsonl"):
+            os.utime(os.path.join(site_dir, name), (old, old))
+        recent = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        sm.append_items("site", "active.jsonl", [{"id": "1", "timestamp": "2024-01-01T00:00:00Z"}, {"id": "2", "timestamp": recent}, {"id": "3"}])
+
+        self.assertEqual(sm.cleanup_old_data("site", days=30), 3)
+        self.assertEqual(sorted(f for f in os.listdir(site_dir) if f != "media"), ["active.jsonl", "cursors.json"])
+        self.assertEqual([m["id"] for m in sm.load_items("site", "active.jsonl")], ["2", "3"])
+
+if __name__ == "__main__":
+    unittest.main()
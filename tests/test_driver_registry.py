@@ -0,0 +1,114 @@
+import os
+import sys
+import socket
+import shutil
+import tempfile
+import threading
+import subprocess
+import time
+import unittest
+from unittest.mock import patch
+
+from driver_registry import DriverRegistry, wait_for_port
+
+class TestDriverRegistry(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.driver_path = self.make_driver("chromedriver", "ChromeDriver 120.0.6099.109 (abc)")
+        self.downloads = []
+        self.registry = DriverRegistry(path=os.path.join(self.temp_dir, "drivers.json"), downloader=self.download)
+        for patcher in (patch("driver_registry._browser_stamp", return_value=None),
+                        patch("driver_registry.shutil.which", return_value=None),
+                        patch.dict(os.environ, {}, clear=False)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        os.environ.pop("ARIA_CHROMEDRIVER", None)
+
+    def make_driver(self, name, version_output):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "w") as f:
+            f.write(f"#!/bin/sh\necho '{version_output}'\n")
+        os.chmod(path, 0o755)
+        return path
+
+    def download(self, browser_name):
+        self.downloads.append(browser_name)
+        return self.driver_path
+
+    def test_downloads_once_then_reuses_offline(self):
+        self.assertEqual(self.registry.resolve("chrome"), self.driver_path)
+        entry = self.registry.load()["chrome"]
+        self.assertEqual(entry["version"], "120.0.6099.109")
+        self.assertEqual(entry["source"], "download")
+
+        self.registry.downloader = lambda browser_name: self.fail("should not download again")
+        self.assertEqual(self.registry.resolve("chrome"), self.driver_path)
+        self.assertEqual(self.downloads, ["chrome"])
+
+    def test_prefers_driver_on_path_over_download(self):
+        with patch("driver_registry.shutil.which", return_value=self.driver_path):
+            self.assertEqual(self.registry.resolve("chrome"), self.driver_path)
+        self.assertEqual(self.downloads, [])
+        self.assertEqual(self.registry.load()["chrome"]["source"], "path")
+
+    def test_env_override_skips_everything(self):
+        with patch.dict(os.environ, {"ARIA_CHROMEDRIVER": "/opt/drivers/chromedriver"}):
+            self.assertEqual(self.registry.resolve("chrome"), "/opt/drivers/chromedriver")
+        self.assertEqual(self.downloads, [])
+
+    def test_browser_upgrade_triggers_new_resolution(self):
+        with patch("driver_registry._browser_stamp", return_value=100.0):
+            self.registry.resolve("chrome")
+        with patch("driver_registry._browser_stamp", return_value=200.0):
+            self.registry.resolve("chrome")
+        self.assertEqual(self.downloads, ["chrome", "chrome"])
+
+    def test_stale_driver_is_replaced_but_kept_as_offline_fallback(self):
+        self.registry.resolve("chrome")
+        self.registry.invalidate("chrome")
+        self.assertTrue(self.registry.load()["chrome"]["stale"])
+
+        def offline(browser_name):
+            raise ConnectionError("no network")
+        self.registry.downloader = offline
+        self.assertEqual(self.registry.resolve("chrome"), self.driver_path)
+
+        self.registry.downloader = self.download
+        self.registry.resolve("chrome")
+        self.assertNotIn("stale", self.registry.load()["chrome"])
+
+    def test_missing_driver_without_network_raises(self):
+        def offline(browser_name):
+            raise ConnectionError("no network")
+        self.registry.downloader = offline
+        with self.assertRaises(ConnectionError):
+            self.registry.resolve("chrome")
+
+class TestWaitForPort(unittest.TestCase):
+    def test_returns_once_port_accepts(self):
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        port = server.getsockname()[1]
+        # Start listening shortly after the probe begins
+        timer = threading.Timer(0.2, server.listen)
+        timer.start()
+        try:
+            start = time.perf_counter()
+            self.assertTrue(wait_for_port(port, timeout=5))
+            self.assertLess(time.perf_counter() - start, 2)
+        finally:
+            timer.join()
+            server.close()
+
+    def test_gives_up_early_when_process_exits(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        start = time.perf_counter()
+        self.assertFalse(wait_for_port(port, timeout=10, process=process))
+        self.assertLess(time.perf_counter() - start, 5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from unittest.mock import MagicMock
+from selenium.common.exceptions import WebDriverException
+
+from navigator import AriaNavigator, EXTRACT_LINKS_SCRIPT
+
+class TestExtractLinks(unittest.TestCase):
+    def setUp(self):
+        self.navigator = AriaNavigator()
+        self.driver = MagicMock()
+        self.navigator.driver = self.driver
+
+    def test_single_script_round_trip(self):
+        links = [{"id": 3, "text": "Docs", "url": "https://example.com/docs"}]
+        self.driver.execute_script.return_value = links
+        self.assertEqual(self.navigator.extract_links(), links)
+        self.driver.execute_script.assert_called_once_with(EXTRACT_LINKS_SCRIPT, 100)
+        self.driver.find_elements.assert_not_called()
+
+    def test_falls_back_to_element_queries(self):
+        self.driver.execute_script.side_effect = WebDriverException("scripts disabled")
+        visible, hidden = MagicMock(), MagicMock()
+        visible.is_displayed.return_value = True
+        visible.text = " Docs "
+        visible.get_attribute.side_effect = lambda name: "https://example.com/docs" if name == "href" else None
+        hidden.is_displayed.return_value = False
+        self.driver.find_elements.return_value = [hidden, visible]
+
+        self.assertEqual(self.navigator.extract_links(), [{"id": 1, "text": "Docs", "url": "https://example.com/docs"}])
+
+    def test_no_driver(self):
+        self.navigator.driver = None
+        self.assertEqual(self.navigator.extract_links(), [])
+
+if __name__ == "__main__":
+    unittest.main()
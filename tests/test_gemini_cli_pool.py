@@ -0,0 +1,148 @@
+import unittest
+import unittest.mock
+import threading
+import tempfile
+import time
+import sys
+import os
+
+from gemini_cli_pool import GeminiCliPool, get_pool, keep_warm, shutdown_pools
+from exceptions import AIServiceError
+
+FAKE_CLI = """
+import sys, json, time
+time.sleep(float(sys.argv[1]) if len(sys.argv) > 1 else 0)
+prompt = sys.stdin.read()
+print(json.dumps({"type": "message", "role": "assistant", "content": "echo:" + prompt}))
+"""
+
+ENV_CLI = """
+import os, sys
+sys.stdin.read()
+print(os.environ.get("ARIA_POOL_TEST", "unset"))
+"""
+
+class TestGeminiCliPool(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.script = os.path.join(self.tmpdir.name, "fake_gemini.py")
+        with open(self.script, "w") as f:
+            f.write(FAKE_CLI)
+        self.pools = []
+
+    def tearDown(self):
+        for pool in self.pools:
+            pool.shutdown()
+        self.tmpdir.cleanup()
+
+    def make_pool(self, delay="0", **kwargs):
+        kwargs.setdefault("prewarm", True)
+        pool = GeminiCliPool([sys.executable, self.script, delay], **kwargs)
+        self.pools.append(pool)
+        return pool
+
+    def test_workers_are_prespawned(self):
+        pool = self.make_pool(size=2)
+        self.assertEqual(pool.stats["spawned"], 2)
+
+    def test_run_uses_warm_worker_and_replenishes(self):
+        pool = self.make_pool(size=1)
+        stdout = pool.run("hello")
+        self.assertIn("echo:hello", stdout)
+        self.assertEqual(pool.stats["warm_hits"], 1)
+        # A replacement was spawned while the request was in flight
+        self.assertEqual(pool.stats["spawned"], 2)
+        self.assertEqual(len(pool._idle), 1)
+
+    def test_one_shot_pool_spawns_only_what_it_serves(self):
+        pool = self.make_pool(size=2, prewarm=False)
+        self.assertEqual(pool.stats["spawned"], 0)
+        self.assertIn("echo:once", pool.run("once"))
+        # No replacement is left behind for atexit to kill
+        self.assertEqual((pool.stats["spawned"], pool.stats["cold_starts"], len(pool._idle)), (1, 1, 0))
+
+    def test_get_pool_prewarms_only_when_kept_warm(self):
+        command = [sys.executable, self.script]
+        try:
+            self.assertEqual(get_pool(command).stats["spawned"], 0)
+            shutdown_pools()
+            keep_warm()
+            self.assertEqual(get_pool(command).stats["spawned"], 1)
+        finally:
+            keep_warm(False)
+            shutdown_pools()
+
+    def test_stale_worker_is_recycled(self):
+        pool = self.make_pool(size=1, max_idle=0.0)
+        stdout = pool.run("stale")
+        self.assertIn("echo:stale", stdout)
+        self.assertEqual(pool.stats["recycled"], 1)
+        self.assertEqual(pool.stats["cold_starts"], 1)
+
+    def test_dead_worker_fails_health_check(self):
+        pool = self.make_pool(size=1)
+        pool._idle[0].kill()
+        self.assertIn("echo:after crash", pool.run("after crash"))
+        self.assertEqual(pool.stats["recycled"], 1)
+
+    def test_requests_queue_when_saturated(self):
+        pool = self.make_pool(delay="0.5", size=1)
+        results = []
+        threads = [threading.Thread(target=lambda i=i: results.append(pool.run(f"q{i}"))) for i in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(results), 2)
+        self.assertEqual(pool.stats["queued"], 1)
+
+    def test_acquire_timeout_raises(self):
+        pool = self.make_pool(delay="1", size=1, acquire_timeout=0.1)
+        t = threading.Thread(target=pool.run, args=("slow",))
+        t.start()
+        time.sleep(0.05)
+        with self.assertRaises(AIServiceError):
+            pool.run("blocked")
+        t.join()
+
+    def test_hung_stream_is_killed_after_request_timeout(self):
+        pool = self.make_pool(size=1, request_timeout=0.3)
+        # The fake CLI sleeps before reading its prompt, so a 5s delay outlives the deadline
+        pool.command = [sys.executable, self.script, "5"]
+        pool._idle[0].kill()
+        start = time.monotonic()
+        with self.assertRaises(AIServiceError) as raised:
+            list(pool.stream("hung"))
+        self.assertLess(time.monotonic() - start, 3)
+        self.assertIn("did not respond", str(raised.exception))
+        # The hung worker's slot was given back
+        self.assertTrue(pool._slots.acquire(blocking=False))
+        pool._slots.release()
+
+    def test_pool_follows_the_callers_environment(self):
+        script = os.path.join(self.tmpdir.name, "env_cli.py")
+        with open(script, "w") as f:
+            f.write(ENV_CLI)
+        command = [sys.executable, script]
+        try:
+            with unittest.mock.patch.dict(os.environ, {"ARIA_POOL_TEST": "first"}):
+                pool = get_pool(command)
+                self.assertIs(get_pool(command), pool)
+            # Under the daemon os.environ is the client's, which workers must inherit
+            with unittest.mock.patch.dict(os.environ, {"ARIA_POOL_TEST": "second"}):
+                rebuilt = get_pool(command)
+                self.assertIsNot(rebuilt, pool)
+                self.assertEqual(rebuilt.run("").strip(), "second")
+        finally:
+            shutdown_pools()
+
+    def test_pool_size_zero_disables_pooling(self):
+        os.environ["ARIA_GEMINI_POOL_SIZE"] = "0"
+        try:
+            self.assertIsNone(get_pool([sys.executable, self.script]))
+        finally:
+            del os.environ["ARIA_GEMINI_POOL_SIZE"]
+            shutdown_pools()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import threading
+import os
+
+from genai_clients import get_client, warm_client, reset_clients, get_timeout
+from aria import generate_ai_response
+
+class TestGenaiClients(unittest.TestCase):
+    def setUp(self):
+        reset_clients()
+
+    def tearDown(self):
+        reset_clients()
+
+    @patch('genai_clients.genai.Client')
+    def test_client_is_reused_per_key_and_model(self, mock_client_class):
+        mock_client_class.side_effect = lambda **kwargs: MagicMock()
+        first = get_client("m1", api_key="k1")
+        self.assertIs(get_client("m1", api_key="k1"), first)
+        self.assertIsNot(get_client("m2", api_key="k1"), first)
+        self.assertIsNot(get_client("m1", api_key="k2"), first)
+        self.assertEqual(mock_client_class.call_count, 3)
+
+    @patch('genai_clients.genai.Client')
+    def test_concurrent_first_use_creates_one_client(self, mock_client_class):
+        mock_client_class.side_effect = lambda **kwargs: MagicMock()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(get_client("m", api_key="k"))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(mock_client_class.call_count, 1)
+        self.assertEqual(len({id(c) for c in results}), 1)
+
+    @patch('genai_clients.genai.Client')
+    @patch.dict(os.environ, {'ARIA_AI_TIMEOUT': '7.5'})
+    def test_timeout_is_applied(self, mock_client_class):
+        self.assertEqual(get_timeout(), 7.5)
+        get_client("m", api_key="k")
+        _, kwargs = mock_client_class.call_args
+        self.assertEqual(kwargs['http_options'].timeout, 7500)
+
+    @patch('genai_clients.genai.Client')
+    def test_warm_client(self, mock_client_class):
+        self.assertTrue(warm_client("m", api_key="k"))
+        mock_client_class.return_value.models.get.assert_called_once_with(model="m")
+        mock_client_class.return_value.models.get.side_effect = RuntimeError("offline")
+        self.assertFalse(warm_client("m", api_key="k"))
+
+    @patch('aria.genai.Client')
+    @patch.dict(os.environ, {'GEMINI_API_KEY': 'dummy_key', 'ARIA_NO_CACHE': 'true', 'ARIA_GEMINI_CLI': '/nonexistent/gemini'})
+    def test_generate_reuses_client(self, mock_client_class):
+        mock_client_class.return_value.models.generate_content.return_value.text = "ok"
+        for _ in range(3):
+            self.assertEqual(generate_ai_response("q"), "ok")
+        self.assertEqual(mock_client_class.call_count, 1)
+        self.assertEqual(mock_client_class.return_value.models.generate_content.call_count, 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+from exceptions import NavigationError
+from http_navigator import HttpNavigator, AutoNavigator, HttpNavigatorPlugin, HttpPage, is_js_shell, browser_cookies
+from plugin_manager import PluginManager
+
+ARTICLE = """<!doctype html><html><head><title>Release notes</title><style>.x{color:red}</style></head>
+<body><h1>Release notes</h1><p>%s</p><script>var tracking = "do not read";</script>
+<nav><a href="/docs">Docs</a> <a href="https://example.com/blog" aria-label="Blog"></a> <a href="#top">Top</a></nav></body></html>""" % ("Version 2 is out. " * 40)
+SHELL = """<!doctype html><html><head><title>App</title></head><body><div id="root"></div>
+<noscript>You need to enable JavaScript to run this app.</noscript><script src="/bundle.js"></script></body></html>"""
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    pages = {"/article": ARTICLE, "/shell": SHELL}
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("Cookie"), self.client_address[1]))
+        body = self.pages.get(self.path)
+        status = 200 if body is not None else 404
+        body = (body or "missing").encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestHttpNavigator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.server.requests = []
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests.clear()
+        patcher = patch.dict(os.environ, {"ARIA_HTTP_IMPORT_COOKIES": "false"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.navigator = HttpNavigator()
+        self.addCleanup(self.navigator.close_session)
+
+    def test_navigate_reads_text_and_links(self):
+        with patch("builtins.print"):
+            self.navigator.navigate(f"{self.base}/article")
+        content = self.navigator.get_page_content()
+
+        self.assertTrue(content.startswith("Release notes\nVersion 2 is out."))
+        self.assertNotIn("do not read", content)
+        self.assertNotIn("color:red", content)
+        self.assertEqual(self.navigator.extract_links(), [
+            {"id": 0, "text": "Docs", "url": f"{self.base}/docs"},
+            {"id": 1, "text": "Blog", "url": "https://example.com/blog"}
+        ])
+        self.assertEqual(self.navigator.list_tabs()[0]["title"], "Release notes")
+
+    def test_connections_are_kept_alive(self):
+        with patch("builtins.print"):
+            for _ in range(5):
+                self.navigator.navigate(f"{self.base}/article")
+        self.assertEqual(len({port for _, _, port in self.server.requests}), 1)
+
+    def test_http_errors_raise_navigation_error(self):
+        with patch("builtins.print"), self.assertRaises(NavigationError):
+            self.navigator.navigate(f"{self.base}/nope")
+
+    def test_resolve_prompt_fetches_urls_concurrently(self):
+        prompt = f"Compare {self.base}/article and {self.base}/shell."
+        _, context = self.navigator.resolve_prompt(prompt)
+        self.assertIn(f"--- Content from {self.base}/article (Title: Release notes) ---", context)
+        self.assertIn(f"{self.base}/shell (Title: App)", context)
+        self.assertEqual(sorted(path for path, _, _ in self.server.requests), ["/article", "/shell"])
+
+    def test_goto_tab_fetches_url_of_browser_tab(self):
+        browser = MagicMock()
+        browser._resolve_tab_handle.return_value = "B"
+        browser.tab_index.tabs = {"B": {"title": "Notes", "url": f"{self.base}/article"}}
+        navigator = HttpNavigator(browser=browser)
+        with patch("builtins.print"):
+            self.assertTrue(navigator.goto_tab(1))
+        self.assertEqual(navigator.get_current_url(), f"{self.base}/article")
+
+    def test_browser_cookies_are_sent(self):
+        driver = MagicMock()
+        driver.execute.return_value = {"value": {"cookies": [
+            {"name": "sid", "value": "abc", "domain": "127.0.0.1", "path": "/", "expires": -1, "secure": False, "httpOnly": True}
+        ]}}
+        driver.execute_script.return_value = "TestBrowser/1.0"
+        browser = MagicMock(driver=driver)
+        navigator = HttpNavigator(browser=browser)
+        with patch.dict(os.environ, {"ARIA_HTTP_IMPORT_COOKIES": "true"}), patch("builtins.print"):
+            navigator.navigate(f"{self.base}/article")
+        self.assertEqual(self.server.requests[-1][1], "sid=abc")
+        self.assertEqual(navigator.session.headers["User-Agent"], "TestBrowser/1.0")
+
+    def test_auto_escalates_js_shell_to_browser(self):
+        browser = MagicMock()
+        browser.get_page_content.return_value = "Rendered app"
+        navigator = AutoNavigator(browser=browser)
+        with patch("builtins.print"):
+            navigator.navigate(f"{self.base}/shell")
+        browser.navigate.assert_called_once_with(f"{self.base}/shell")
+        self.assertEqual(navigator.get_page_content(), "Rendered app")
+
+        with patch("builtins.print"):
+            navigator.navigate(f"{self.base}/article")
+        self.assertEqual(browser.navigate.call_count, 1)
+        self.assertIn("Version 2 is out.", navigator.get_page_content())
+
+class TestShellDetection(unittest.TestCase):
+    def test_is_js_shell(self):
+        self.assertTrue(is_js_shell(HttpPage("u", 200, "text/html", SHELL)))
+        self.assertFalse(is_js_shell(HttpPage("u", 200, "text/html", ARTICLE)))
+        self.assertFalse(is_js_shell(HttpPage("u", 200, "text/plain", "short")))
+
+    def test_browser_cookies_falls_back_to_webdriver(self):
+        driver = MagicMock()
+        driver.execute.side_effect = Exception("not chromium")
+        driver.get_cookies.return_value = [{"name": "a", "value": "1"}]
+        self.assertEqual(browser_cookies(driver), [{"name": "a", "value": "1"}])
+
+class TestHttpNavigatorPlugin(unittest.TestCase):
+    def test_registers_http_and_auto(self):
+        pm = PluginManager(context={})
+        pm.register_plugin(HttpNavigatorPlugin(context={}))
+        self.assertIs(pm.get_navigator("http"), HttpNavigator)
+        self.assertIs(pm.get_navigator("auto"), AutoNavigator)
+
+if __name__ == "__main__":
+    unittest.main()
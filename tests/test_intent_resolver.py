@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from intent_resolver import resolve_intent
+from navigator import AriaNavigator
+from logger import get_performance_metrics, clear_performance_metrics
+
+LINKS = [
+    {"id": 0, "text": "Pricing", "url": "https://example.com/pricing"},
+    {"id": 1, "text": "Documentation", "url": "https://example.com/docs"},
+    {"id": 2, "text": "Documentation", "url": "https://example.com/docs"},
+    {"id": 3, "text": "Blog", "url": "https://example.com/blog"},
+    {"id": 4, "text": "Sign in", "url": "https://example.com/login"}
+]
+
+class TestResolveIntent(unittest.TestCase):
+    def test_urls_and_domains(self):
+        self.assertEqual(resolve_intent("https://example.com/a?b=1")["path"], "url")
+        result = resolve_intent("go to github.com")
+        self.assertEqual((result["url"], result["path"]), ("https://github.com", "domain"))
+        self.assertEqual(resolve_intent("docs.python.org/3/library")["url"], "https://docs.python.org/3/library")
+        self.assertIsNone(resolve_intent("find the cheapest flight"))
+
+    def test_search_templates(self):
+        self.assertEqual(resolve_intent("search youtube for lofi beats")["url"], "https://www.youtube.com/results?search_query=lofi+beats")
+        self.assertEqual(resolve_intent("search for selenium waits on stack overflow")["engine"], "stackoverflow")
+        self.assertEqual(resolve_intent("wiki: Alan Turing")["url"], "https://en.wikipedia.org/w/index.php?search=Alan+Turing")
+        self.assertEqual(resolve_intent("search for rust books")["engine"], "duckduckgo")
+
+    def test_link_matching(self):
+        exact = resolve_intent("click on Sign In", LINKS)
+        self.assertEqual((exact["url"], exact["path"], exact["confidence"]), ("https://example.com/login", "link_exact", 1.0))
+
+        fuzzy = resolve_intent("documentaton", LINKS)
+        self.assertEqual((fuzzy["url"], fuzzy["path"]), ("https://example.com/docs", "link_fuzzy"))
+        self.assertGreaterEqual(fuzzy["confidence"], 0.85)
+
+        self.assertIsNone(resolve_intent("the article about our funding round", LINKS))
+
+    def test_file_names_are_not_domains(self):
+        for prompt in ("open index.html", "go to node.js", "open README.md", "open setup.py", "package.json"):
+            self.assertIsNone(resolve_intent(prompt), prompt)
+        self.assertEqual(resolve_intent("www.example.md")["path"], "domain")
+
+    def test_links_are_matched_before_domains(self):
+        links = [{"text": "index.html", "url": "https://example.com/files/index.html"},
+                 {"text": "example.org", "url": "https://example.com/out?to=example.org"}]
+        self.assertEqual(resolve_intent("open index.html", links)["url"], "https://example.com/files/index.html")
+        self.assertEqual(resolve_intent("example.org", links)["path"], "link_exact")
+        self.assertEqual(resolve_intent("github.com", links)["url"], "https://github.com")
+
+    def test_ambiguous_fuzzy_match_defers_to_ai(self):
+        links = [{"text": "Report 2023", "url": "https://e.com/2023"}, {"text": "Report 2024", "url": "https://e.com/2024"}]
+        self.assertIsNone(resolve_intent("report 202", links))
+
+class TestNavigateFastPath(unittest.TestCase):
+    def setUp(self):
+        self.navigator = AriaNavigator()
+        self.navigator.driver = MagicMock()
+        self.provider = MagicMock()
+        self.navigator.plugin_manager = MagicMock()
+        self.navigator.plugin_manager.get_ai_provider.return_value = self.provider
+        clear_performance_metrics()
+
+    def _paths(self):
+        return [m.get("path") for m in get_performance_metrics() if m["operation"] == "navigate_with_prompt"]
+
+    def test_domain_skips_links_and_ai(self):
+        with patch.object(AriaNavigator, "extract_links") as mock_links, \
+             patch.object(AriaNavigator, "navigate") as mock_navigate, patch("builtins.print"):
+            self.navigator.navigate_with_prompt("github.com")
+        mock_navigate.assert_called_once_with("https://github.com")
+        mock_links.assert_not_called()
+        self.provider.generate.assert_not_called()
+        self.assertEqual(self._paths(), ["domain"])
+
+    def test_link_text_skips_ai(self):
+        with patch.object(AriaNavigator, "extract_links", return_value=LINKS), \
+             patch.object(AriaNavigator, "navigate") as mock_navigate, patch("builtins.print"):
+            self.navigator.navigate_with_prompt("Pricing")
+        mock_navigate.assert_called_once_with("https://example.com/pricing")
+        self.provider.generate.assert_not_called()
+        self.assertEqual(self._paths(), ["link_exact"])
+
+    @patch("navigator.get_navigation_cache", return_value=None)
+    def test_low_confidence_uses_ai(self, _):
+        self.provider.generate.return_value = '{"url": "https://example.com/blog"}'
+        with patch.object(AriaNavigator, "extract_links", return_value=LINKS), \
+             patch.object(AriaNavigator, "navigate") as mock_navigate, patch("builtins.print"):
+            self.navigator.navigate_with_prompt("latest company news")
+        mock_navigate.assert_called_once_with("https://example.com/blog")
+        self.assertEqual(self._paths(), ["ai"])
+
+if __name__ == "__main__":
+    unittest.main()
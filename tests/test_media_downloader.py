@@ -0,0 +1,185 @@
+import os
+import time
+import base64
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+from media_downloader import MediaDownloader, sniff_mime, BLOB_CHUNK_SCRIPT, BLOB_RELEASE_SCRIPT
+from sites.google_messages import GoogleMessagesScraper
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 200
+MP4 = b"\x00\x00\x00\x18ftypmp42" + b"\x01" * 300_000
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    files = {"/a.png": PNG, "/copy-of-a": PNG, "/clip": MP4, "/slow.png": PNG}
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("Cookie")))
+        if self.path == "/slow.png":
+            time.sleep(0.2)
+        body = self.files.get(self.path.split("?")[0])
+        self.send_response(200 if body is not None else 404)
+        body = body or b"missing"
+        # Content-Type is deliberately unhelpful: the extension must come from the bytes
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestSniffMime(unittest.TestCase):
+    def test_magic_bytes(self):
+        self.assertEqual(sniff_mime(PNG), ("image/png", ".png"))
+        self.assertEqual(sniff_mime(b"\xff\xd8\xff\xe0\x00\x10JFIF"), ("image/jpeg", ".jpg"))
+        self.assertEqual(sniff_mime(MP4[:64]), ("video/mp4", ".mp4"))
+        self.assertEqual(sniff_mime(b"\x00\x00\x00\x18ftypheic"), ("image/heic", ".heic"))
+        self.assertEqual(sniff_mime(b"RIFF\x00\x00\x00\x00WEBPVP8 "), ("image/webp", ".webp"))
+        self.assertEqual(sniff_mime(b"OggS\x00\x02"), ("audio/ogg", ".ogg"))
+
+    def test_declared_type_then_binary(self):
+        self.assertEqual(sniff_mime(b"plain words", "text/plain; charset=utf-8"), ("text/plain", ".txt"))
+        self.assertEqual(sniff_mime(b"\x00\x01\x02"), ("application/octet-stream", ".bin"))
+
+class TestMediaDownloader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.server.requests = []
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests.clear()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.media_dir = os.path.join(self.root, "sites", "google-messages", "media")
+        self.store_dir = os.path.join(self.root, "store")
+
+    def _downloader(self, **kwargs):
+        downloader = MediaDownloader(self.media_dir, store_dir=self.store_dir, **kwargs)
+        self.addCleanup(downloader.close)
+        return downloader
+
+    def test_content_addressed_and_hard_linked(self):
+        downloader = self._downloader()
+        path = downloader.download(f"{self.base}/clip", "video")
+
+        self.assertTrue(path.startswith("media/") and path.endswith(".mp4"))
+        site_file = os.path.join(self.media_dir, os.path.basename(path))
+        with open(site_file, "rb") as f:
+            self.assertEqual(f.read(), MP4)
+        sha256 = os.path.basename(path)[:-4]
+        self.assertTrue(os.path.samefile(site_file, os.path.join(self.store_dir, sha256[:2], os.path.basename(path))))
+
+    def test_identical_content_is_stored_once(self):
+        other_site = os.path.join(self.root, "sites", "whatsapp", "media")
+        first = self._downloader().download(f"{self.base}/a.png")
+        second = MediaDownloader(other_site, store_dir=self.store_dir).download(f"{self.base}/copy-of-a")
+
+        self.assertEqual(first, second)
+        self.assertTrue(os.path.samefile(os.path.join(self.media_dir, first[6:]), os.path.join(other_site, second[6:])))
+        objects = [name for _, _, files in os.walk(self.store_dir) for name in files]
+        self.assertEqual(objects, [first[6:]])
+
+    def test_known_urls_are_not_downloaded_again(self):
+        self._downloader().download(f"{self.base}/a.png")
+        path = self._downloader().download(f"{self.base}/a.png")
+        self.assertTrue(path.endswith(".png"))
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_download_many_is_concurrent_and_reports_failures(self):
+        urls = [f"{self.base}/slow.png?{i}" for i in range(4)] + [f"{self.base}/missing"]
+        start = time.perf_counter()
+        with patch("media_downloader.logger"):
+            paths = self._downloader(max_workers=4).download_many(urls)
+        self.assertLess(time.perf_counter() - start, 0.7)
+        self.assertIsNone(paths[f"{self.base}/missing"])
+        self.assertEqual(len({paths[url] for url in urls[:4]}), 1)
+
+    def test_browser_cookies_are_sent(self):
+        driver = MagicMock()
+        driver.execute.return_value = {"value": {"cookies": [{"name": "SID", "value": "s3cret", "domain": "127.0.0.1", "path": "/"}]}}
+        driver.execute_script.return_value = "TestBrowser/1.0"
+        self._downloader(driver=driver).download(f"{self.base}/a.png")
+        self.assertEqual(self.server.requests[-1][1], "SID=s3cret")
+
+    def test_blob_urls_are_copied_out_of_the_page_in_chunks(self):
+        payload = PNG * 10
+        driver = MagicMock()
+        driver.execute_async_script.return_value = {"id": "b1", "size": len(payload), "type": "image/png"}
+
+        def execute_script(script, *args):
+            if script == BLOB_CHUNK_SCRIPT:
+                blob_id, offset, size = args
+                return base64.b64encode(payload[offset:offset + size]).decode()
+            return None
+        driver.execute_script.side_effect = execute_script
+
+        with patch("media_downloader.BLOB_CHUNK_SIZE", 500):
+            path = self._downloader(driver=driver, session=MagicMock()).download("blob:https://messages.google.com/1234")
+
+        with open(os.path.join(self.media_dir, path[6:]), "rb") as f:
+            self.assertEqual(f.read(), payload)
+        chunk_calls = [c for c in driver.execute_script.call_args_list if c[0][0] == BLOB_CHUNK_SCRIPT]
+        self.assertEqual(len(chunk_calls), 5)
+        driver.execute_script.assert_called_with(BLOB_RELEASE_SCRIPT, "b1")
+
+    def test_keyed_blobs_are_not_read_again(self):
+        driver = MagicMock()
+        driver.execute_async_script.return_value = {"id": "b1", "size": len(PNG), "type": "image/png"}
+        driver.execute_script.side_effect = lambda script, *args: base64.b64encode(PNG).decode() if script == BLOB_CHUNK_SCRIPT else None
+
+        first = self._downloader(driver=driver, session=MagicMock()).download_many(["blob:https://x/1"], keys={"blob:https://x/1": "chat/m1/0"})
+        # After a reload the same attachment has a new blob: URL
+        second = self._downloader(driver=driver, session=MagicMock()).download_many(["blob:https://x/2"], keys={"blob:https://x/2": "chat/m1/0"})
+        self.assertEqual(first["blob:https://x/1"], second["blob:https://x/2"])
+        self.assertEqual(driver.execute_async_script.call_count, 1)
+
+        # Without a key a blob cannot be recognised and is read again
+        self._downloader(driver=driver, session=MagicMock()).download("blob:https://x/3")
+        self.assertEqual(driver.execute_async_script.call_count, 2)
+
+class TestGoogleMessagesMedia(unittest.TestCase):
+    def test_message_media_gets_local_paths(self):
+        navigator = MagicMock()
+        scraper = GoogleMessagesScraper(navigator, MagicMock())
+        scraper._media = MagicMock(driver=navigator.driver)
+        scraper._media.download_many.return_value = {"https://x/1.jpg": "media/abc.jpg", "blob:https://x/2": None}
+        messages = [{"text": "hi", "media": [{"type": "image", "url": "https://x/1.jpg"}, {"type": "image", "url": "blob:https://x/2"}]}]
+
+        scraper.download_message_media(messages)
+
+        self.assertEqual(messages[0]["media"][0]["path"], "media/abc.jpg")
+        self.assertNotIn("path", messages[0]["media"][1])
+
+    def test_blob_keys_survive_reload(self):
+        scraper = GoogleMessagesScraper(MagicMock(), MagicMock())
+
+        def thread(suffix):
+            photo = {"text": "", "timestamp": "16.33", "type": "received"}
+            return [dict(photo, media=[{"type": "image", "url": f"blob:https://x/a{suffix}"}]),
+                    dict(photo, media=[{"type": "image", "url": f"blob:https://x/b{suffix}"}]),
+                    {"id": "m7", "text": "", "media": [{"type": "image", "url": "https://x/1.jpg"}, {"type": "image", "url": f"blob:https://x/c{suffix}"}]}]
+        before = scraper.media_keys(thread(1), "Mom")
+        after = scraper.media_keys(thread(2), "Mom")
+
+        self.assertEqual(list(before.values()), list(after.values()))
+        # Identical messages get different keys, and a message id is used where there is one
+        self.assertEqual(len(set(before.values())), 3)
+        self.assertEqual(before["blob:https://x/c1"], "google-messages/Mom/m7/1")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import tempfile
+import os
+
+from ai_cache import AIResponseCache
+from navigation_cache import NavigationDecisionCache, normalize_prompt, page_fingerprint
+from navigator import AriaNavigator
+from logger import get_performance_metrics, clear_performance_metrics
+
+LINKS = [{"id": 0, "text": "Docs", "url": "https://example.com/docs"}, {"id": 1, "text": "Blog", "url": "https://example.com/blog"}]
+
+class TestNavigationDecisionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = NavigationDecisionCache(AIResponseCache(cache_dir=self.tmpdir.name, ttl=60, metric_prefix=None))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_normalization_and_fingerprint(self):
+        self.assertEqual(normalize_prompt("  Open   the DOCS. "), "open the docs")
+        self.assertEqual(page_fingerprint("https://e.com/#top", LINKS), page_fingerprint("https://e.com/", list(reversed(LINKS))))
+        self.assertNotEqual(page_fingerprint("https://e.com/", LINKS), page_fingerprint("https://e.com/", LINKS[:1]))
+
+    def test_hit_and_invalidation(self):
+        self.cache.set("Open the docs", "https://example.com/", LINKS, {"url": "https://example.com/docs"})
+        self.assertEqual(self.cache.get("open the docs!", "https://example.com/", LINKS), {"url": "https://example.com/docs"})
+
+        changed = LINKS + [{"id": 2, "text": "New", "url": "https://example.com/new"}]
+        self.assertIsNone(self.cache.get("open the docs", "https://example.com/", changed))
+        # The stale entry is gone even if the page reverts
+        self.assertIsNone(self.cache.get("open the docs", "https://example.com/", LINKS))
+
+    def test_lookups_have_their_own_metrics(self):
+        clear_performance_metrics()
+        self.cache.set("open the docs", "https://example.com/", LINKS, {"url": "https://example.com/docs"})
+        self.cache.get("open the docs", "https://example.com/", LINKS)
+        self.cache.get("open the blog", "https://example.com/", LINKS)
+        self.cache.get("open the docs", "https://example.com/", LINKS[:1])
+        operations = [m["operation"] for m in get_performance_metrics()]
+        self.assertEqual(operations, ["navigation_cache_hit", "navigation_cache_miss", "navigation_decision_invalidated", "navigation_cache_miss"])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_only_decisions_are_cached(self):
+        self.cache.set("x", "https://example.com/", LINKS, {"error": "nope"})
+        self.assertIsNone(self.cache.get("x", "https://example.com/", LINKS))
+
+class TestNavigateWithPromptCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = NavigationDecisionCache(AIResponseCache(cache_dir=self.tmpdir.name, ttl=60))
+        self.navigator = AriaNavigator()
+        self.navigator.driver = MagicMock()
+        self.navigator.driver.current_url = "https://example.com/"
+        self.provider = MagicMock()
+        self.provider.model = "m"
+        self.provider.generate.return_value = '{"url": "https://example.com/docs"}'
+        self.navigator.plugin_manager = MagicMock()
+        self.navigator.plugin_manager.get_ai_provider.return_value = self.provider
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @patch("navigator.get_navigation_cache")
+    def test_second_run_skips_ai(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        with patch.object(AriaNavigator, "extract_links", return_value=LINKS), \
+             patch.object(AriaNavigator, "navigate") as mock_navigate, \
+             patch("builtins.print"):
+            self.navigator.navigate_with_prompt("Where is the API reference?")
+            self.navigator.navigate_with_prompt("where is the API reference")
+        self.assertEqual(self.provider.generate.call_count, 1)
+        self.assertEqual(mock_navigate.call_count, 2)
+        mock_navigate.assert_called_with("https://example.com/docs")
+
+    @patch("navigator.get_navigation_cache", return_value=None)
+    def test_disabled_cache_always_asks(self, _):
+        with patch.object(AriaNavigator, "extract_links", return_value=LINKS), \
+             patch.object(AriaNavigator, "navigate"), \
+             patch("builtins.print"):
+            self.navigator.navigate_with_prompt("Where is the API reference?")
+            self.navigator.navigate_with_prompt("Where is the API reference?")
+        self.assertEqual(self.provider.generate.call_count, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import time
+import threading
+import unittest
+from email.utils import formatdate
+from unittest.mock import MagicMock, patch
+
+from navigator import AriaNavigator
+from rate_limiter import DomainRateLimiter, get_rate_limiter, parse_rate_limits, parse_retry_after
+
+class TestDomainRateLimiter(unittest.TestCase):
+    def setUp(self):
+        # Sleeping is replaced by advancing a fake clock
+        self.now = [1000.0]
+        self.sleeps = []
+
+        def sleep(seconds):
+            self.sleeps.append(seconds)
+            self.now[0] += seconds
+
+        for patcher in (patch("rate_limiter.time.monotonic", side_effect=lambda: self.now[0]),
+                        patch("rate_limiter.time.sleep", side_effect=sleep)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_burst_then_steady_rate(self):
+        limiter = DomainRateLimiter([("example.com", 2.0, 3)])
+        waits = [limiter.acquire("https://example.com/page") for _ in range(5)]
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 0.5)
+        self.assertAlmostEqual(waits[4], 0.5)
+
+    def test_domains_do_not_wait_on_each_other(self):
+        limiter = DomainRateLimiter(default=(1.0, 1))
+        for host in ("a.example", "b.example", "c.example"):
+            self.assertEqual(limiter.acquire(f"https://{host}/"), 0.0)
+        self.assertEqual(self.sleeps, [])
+
+    def test_rule_covers_subdomains_and_www_is_ignored(self):
+        limiter = DomainRateLimiter([("discord.com", 1.0, 1)], default=(100.0, 100))
+        self.assertEqual(limiter.domain_for("https://cdn.discord.com/x.png"), "discord.com")
+        self.assertEqual(limiter.domain_for("https://www.threads.net/"), "threads.net")
+        self.assertIsNone(limiter.domain_for("about:blank"))
+        self.assertIsNone(limiter.domain_for("http://localhost:9222/json"))
+        limiter.acquire("https://discord.com/app")
+        self.assertAlmostEqual(limiter.acquire("https://media.discord.com/a"), 1.0)
+
+    def test_429_pauses_domain_for_retry_after(self):
+        limiter = DomainRateLimiter(default=(10.0, 5))
+        limiter.acquire("https://example.com/")
+        limiter.report("https://example.com/", 429, "30")
+        self.assertGreaterEqual(limiter.acquire("https://example.com/next"), 30.0)
+        self.assertEqual(limiter.acquire("https://other.example/"), 0.0)
+
+    def test_backoff_doubles_without_retry_after_and_resets(self):
+        limiter = DomainRateLimiter(default=(1000.0, 1000))
+        limiter.report("https://example.com/", 503)
+        first = limiter.acquire("https://example.com/")
+        limiter.report("https://example.com/", 503)
+        second = limiter.acquire("https://example.com/")
+        self.assertAlmostEqual(first, 5.0, places=1)
+        self.assertAlmostEqual(second, 10.0, places=1)
+        limiter.report("https://example.com/", 200)
+        limiter.report("https://example.com/", 429)
+        self.assertAlmostEqual(limiter.acquire("https://example.com/"), 5.0, places=1)
+
+    def test_fetch_retries_after_429(self):
+        limiter = DomainRateLimiter(default=(1000.0, 1000))
+        session = MagicMock()
+        session.get.side_effect = [MagicMock(status_code=429, headers={"Retry-After": "2"}), MagicMock(status_code=200, headers={})]
+        response = limiter.fetch("https://example.com/file.png", session=session)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session.get.call_count, 2)
+        self.assertGreaterEqual(sum(self.sleeps), 2.0)
+
+    def test_throttle_delay_env_sets_per_domain_interval(self):
+        with patch.dict(os.environ, {"ARIA_THROTTLE_DELAY": "2", "ARIA_RATE_LIMITS": ""}):
+            limiter = DomainRateLimiter.from_env()
+        limiter.acquire("https://example.com/")
+        self.assertAlmostEqual(limiter.acquire("https://example.com/"), 2.0)
+        self.assertEqual(limiter.acquire("https://example.org/"), 0.0)
+
+    def test_shared_limiter_follows_its_settings(self):
+        with patch.dict(os.environ, {"ARIA_RATE_LIMITS": "example.com=1/1"}):
+            limiter = get_rate_limiter()
+            self.assertIs(get_rate_limiter(), limiter)
+        with patch.dict(os.environ, {"ARIA_RATE_LIMITS": "example.com=5/5"}):
+            self.assertEqual(get_rate_limiter().rules["example.com"], (5.0, 5))
+
+class TestParsing(unittest.TestCase):
+    def test_parse_rate_limits(self):
+        self.assertEqual(parse_rate_limits("discord.com=0.5/2; threads.net=1;*=4/8;bad=x"),
+                         [("discord.com", 0.5, 2), ("threads.net", 1.0, 1), ("*", 4.0, 8)])
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        self.assertAlmostEqual(parse_retry_after(formatdate(time.time() + 60, usegmt=True)), 60, delta=2)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+class TestConcurrentAcquire(unittest.TestCase):
+    def test_threads_share_a_domain_budget(self):
+        limiter = DomainRateLimiter([("example.com", 20.0, 1)])
+        start = time.perf_counter()
+        threads = [threading.Thread(target=limiter.acquire, args=("https://example.com/",)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Four of the five requests wait 50ms behind each other
+        self.assertGreaterEqual(time.perf_counter() - start, 0.18)
+
+class TestNavigatorRateLimiting(unittest.TestCase):
+    def test_navigate_waits_for_domain_and_reports_status(self):
+        navigator = AriaNavigator()
+        navigator.driver = MagicMock()
+        navigator.driver.execute_script.return_value = 429
+        limiter = MagicMock()
+        with patch("navigator.get_rate_limiter", return_value=limiter), patch("builtins.print"):
+            navigator.navigate("https://discord.com/app")
+        limiter.acquire.assert_called_once_with("https://discord.com/app")
+        limiter.report.assert_called_once_with("https://discord.com/app", 429)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import json
+import shutil
+import subprocess
+import unittest
+from unittest.mock import MagicMock, patch
+
+from selenium.common.exceptions import WebDriverException
+from navigator import AriaNavigator
+from readiness import DOM_STABLE_SCRIPT, SELECTOR_STABLE_SCRIPT
+
+class TestReadinessWaits(unittest.TestCase):
+    def setUp(self):
+        self.navigator = AriaNavigator()
+        self.driver = MagicMock()
+        self.navigator.driver = self.driver
+
+    def test_dom_stable_records_savings_against_budget(self):
+        self.driver.execute_async_script.return_value = {"ready": True, "waited": 600, "mutations": 4}
+        with patch("navigator.record_metric") as record_metric:
+            self.assertTrue(self.navigator.wait_for_dom_stable(budget=5))
+
+        args = self.driver.execute_async_script.call_args[0]
+        self.assertIs(args[0], DOM_STABLE_SCRIPT)
+        self.assertEqual(args[1:], (500, 5000, None))
+        stats = self.navigator.readiness_stats
+        self.assertEqual(stats["waits"], 1)
+        self.assertEqual(stats["budget_ms"], 5000)
+        self.assertGreater(stats["saved_ms"], 4000)
+        self.assertEqual(record_metric.call_args[0][0], "readiness_wait")
+        self.assertEqual(record_metric.call_args[1]["kind"], "dom_stable")
+        self.assertEqual(record_metric.call_args[1]["mutations"], 4)
+
+    def test_budget_caps_the_wait(self):
+        # A page that never settles must not hold the scrape longer than the sleep the wait replaced
+        self.driver.execute_async_script.return_value = {"ready": False}
+        self.assertFalse(self.navigator.wait_for_dom_stable(budget=3))
+        self.assertEqual(self.driver.execute_async_script.call_args[0][2], 3000)
+        self.navigator.wait_for_selector_stable("a.item", budget=2)
+        self.assertEqual(self.driver.execute_async_script.call_args[0][4], 2000)
+        self.navigator.wait_for_network_idle(timeout=1)
+        self.assertEqual(self.driver.execute_async_script.call_args[0][2], 1000)
+
+    def test_script_timeout_is_raised_once_per_driver(self):
+        self.driver.execute_async_script.return_value = {"ready": True}
+        self.navigator.wait_for_selector_stable("a.item")
+        self.navigator.wait_for_network_idle()
+        self.driver.set_script_timeout.assert_called_once_with(15)
+
+        self.navigator.driver = MagicMock()
+        self.navigator.wait_for_network_idle()
+        self.navigator.driver.set_script_timeout.assert_called_once_with(15)
+
+    def test_interrupted_wait_is_not_ready(self):
+        self.driver.execute_async_script.side_effect = WebDriverException("document unloaded while waiting for result")
+        self.assertFalse(self.navigator.wait_for_dom_stable())
+        self.assertEqual(self.navigator.readiness_stats["waits"], 1)
+
+    def test_wait_until_returns_condition_value(self):
+        values = iter([None, "", "Alice"])
+        self.assertEqual(self.navigator.wait_until(lambda driver: next(values), timeout=2, poll=0.01, budget=1), "Alice")
+        self.assertIsNone(self.navigator.wait_until(lambda driver: False, timeout=0.05, poll=0.01))
+        self.assertEqual(self.navigator.readiness_stats["waits"], 2)
+
+    def test_reset_readiness_stats(self):
+        self.driver.execute_async_script.return_value = {"ready": True}
+        self.navigator.wait_for_dom_stable(budget=1)
+        self.navigator.reset_readiness_stats()
+        self.assertEqual(self.navigator.readiness_stats["waits"], 0)
+
+# Minimal browser globals, enough to run the readiness scripts under Node
+NODE_HARNESS = """
+let count = 0;
+let observerCallback = null;
+global.document = {
+    documentElement: {},
+    querySelector: () => null,
+    querySelectorAll: () => ({length: count})
+};
+global.MutationObserver = class {
+    constructor(callback) { observerCallback = callback; }
+    observe() {}
+    disconnect() {}
+};
+const started = Date.now();
+setTimeout(() => { count = 3; if (observerCallback) observerCallback([{}, {}]); }, 100);
+setTimeout(() => { count = 5; if (observerCallback) observerCallback([{}]); }, 200);
+const args = JSON.parse(process.argv[1]);
+const done = (result) => { result.elapsed = Date.now() - started; console.log(JSON.stringify(result)); };
+new Function(process.argv[2])(...args, done);
+"""
+
+@unittest.skipUnless(shutil.which("node"), "Node.js not available")
+class TestReadinessScripts(unittest.TestCase):
+    def run_script(self, script, args):
+        output = subprocess.run(["node", "-e", NODE_HARNESS, json.dumps(args), script], capture_output=True, text=True, timeout=10, check=True).stdout
+        return json.loads(output)
+
+    def test_dom_stable_waits_for_quiet_period(self):
+        result = self.run_script(DOM_STABLE_SCRIPT, [150, 2000, None])
+        self.assertTrue(result["ready"])
+        self.assertEqual(result["mutations"], 3)
+        # Last mutation at ~200ms plus 150ms of quiet
+        self.assertGreaterEqual(result["elapsed"], 330)
+        self.assertLess(result["elapsed"], 1000)
+
+    def test_dom_stable_times_out(self):
+        result = self.run_script(DOM_STABLE_SCRIPT, [500, 250, None])
+        self.assertFalse(result["ready"])
+
+    def test_selector_stable_waits_for_count_to_settle(self):
+        result = self.run_script(SELECTOR_STABLE_SCRIPT, ["a", 1, 150, 2000])
+        self.assertTrue(result["ready"])
+        self.assertEqual(result["count"], 5)
+        self.assertGreaterEqual(result["elapsed"], 330)
+
+    def test_selector_stable_needs_min_count(self):
+        result = self.run_script(SELECTOR_STABLE_SCRIPT, ["a", 10, 100, 400])
+        self.assertFalse(result["ready"])
+        self.assertEqual(result["count"], 5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from navigator import AriaNavigator
+from resource_blocking import ScrapeProfile, RESOURCE_PATTERNS
+
+class TestScrapeProfile(unittest.TestCase):
+    def test_defaults_block_images_fonts_and_media(self):
+        with patch.dict(os.environ, {}, clear=True):
+            profile = ScrapeProfile.from_env("discord")
+        self.assertEqual(profile.block_types, {"image", "font", "media"})
+        self.assertIn("*.woff2*", profile.url_patterns())
+        self.assertNotIn("*.css*", profile.url_patterns())
+
+    def test_site_allowlists(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(ScrapeProfile.from_env("google-messages").block_types, {"font"})
+        with patch.dict(os.environ, {"ARIA_BLOCK_ALLOW": "discord=image; threads=image,media"}, clear=True):
+            self.assertEqual(ScrapeProfile.from_env("discord").block_types, {"font", "media"})
+            self.assertEqual(ScrapeProfile.from_env("threads").block_types, {"font"})
+
+    def test_env_configuration(self):
+        with patch.dict(os.environ, {"ARIA_BLOCK_RESOURCES": "stylesheet,image,bogus", "ARIA_BLOCK_URLS": "*ads.example*, *tracker*"}, clear=True):
+            profile = ScrapeProfile.from_env("calendar")
+        self.assertEqual(profile.block_types, {"stylesheet", "image"})
+        self.assertEqual(profile.url_patterns()[-2:], ["*ads.example*", "*tracker*"])
+        with patch.dict(os.environ, {"ARIA_BLOCK_RESOURCES": "none"}, clear=True):
+            self.assertIsNone(ScrapeProfile.from_env("calendar"))
+
+    def test_common_profile_blocks_only_what_every_site_blocks(self):
+        common = ScrapeProfile.common([ScrapeProfile(), ScrapeProfile(allow_types=["image"]), ScrapeProfile(allow_types=["media"])])
+        self.assertEqual(common.block_types, {"font"})
+        self.assertIsNone(ScrapeProfile.common([ScrapeProfile(), None]))
+
+    def test_launch_preferences(self):
+        profile = ScrapeProfile()
+        firefox = FirefoxOptions()
+        profile.apply_to_options("firefox", firefox)
+        self.assertEqual(firefox.preferences["permissions.default.image"], 2)
+        self.assertFalse(firefox.preferences["gfx.downloadable_fonts.enabled"])
+
+        chrome = ChromeOptions()
+        chrome.add_experimental_option("prefs", {"intl.accept_languages": "en"})
+        profile.apply_to_options("chrome", chrome)
+        prefs = chrome.experimental_options["prefs"]
+        self.assertEqual(prefs["profile.managed_default_content_settings.images"], 2)
+        self.assertEqual(prefs["intl.accept_languages"], "en")
+
+    def test_chromium_blocks_through_cdp(self):
+        driver = MagicMock()
+        profile = ScrapeProfile(block_types=["font"], block_urls=["*ads*"])
+        self.assertEqual(profile.apply_to_driver(driver, "chrome"), "cdp")
+        driver.execute_cdp_cmd.assert_any_call("Network.enable", {})
+        driver.execute_cdp_cmd.assert_called_with("Network.setBlockedURLs", {"urls": RESOURCE_PATTERNS["font"] + ["*ads*"]})
+
+    def test_firefox_blocks_through_bidi_when_enabled(self):
+        driver = MagicMock()
+        driver.capabilities = {"browserName": "firefox", "webSocketUrl": "ws://127.0.0.1:9222/session/1"}
+        driver.network.add_request_handler.side_effect = ["first", "second"]
+        profile = ScrapeProfile(block_types=["image"])
+
+        self.assertEqual(profile.apply_to_driver(driver, "firefox"), "bidi")
+        globs = driver.network.add_request_handler.call_args[0][0]
+        self.assertIn("**.png**", globs)
+        # Re-applying replaces the earlier handler instead of stacking another
+        profile.apply_to_driver(driver, "firefox")
+        driver.network.remove_request_handler.assert_called_once_with("first")
+
+    def test_firefox_without_bidi_uses_preferences_only(self):
+        driver = MagicMock()
+        driver.capabilities = {"browserName": "firefox"}
+        self.assertIsNone(ScrapeProfile().apply_to_driver(driver, "firefox"))
+        driver.network.add_request_handler.assert_not_called()
+
+class TestNavigatorScrapeProfile(unittest.TestCase):
+    def test_new_tabs_get_cdp_rules_again(self):
+        navigator = AriaNavigator()
+        navigator.driver = MagicMock()
+        navigator.driver.window_handles = ["a", "b"]
+        navigator.apply_scrape_profile(ScrapeProfile(), "chrome")
+        navigator.driver.execute_cdp_cmd.reset_mock()
+
+        self.assertTrue(navigator.new_tab("https://discord.com/app"))
+        navigator.driver.execute_cdp_cmd.assert_any_call("Network.enable", {})
+
+    def test_no_profile_leaves_session_untouched(self):
+        navigator = AriaNavigator()
+        navigator.driver = MagicMock()
+        self.assertIsNone(navigator.apply_scrape_profile(None, "chrome"))
+        navigator.driver.execute_cdp_cmd.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import subprocess
+from unittest.mock import patch
+
+from navigator import AriaNavigator
+from session_store import SessionStore, get_session_namespace
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Appends to a shared session under the store lock, many times, from a separate process
+APPEND_WORKER = """
+import sys
+from session_store import SessionStore
+store = SessionStore(base_dir=sys.argv[1])
+for i in range(int(sys.argv[3])):
+    with store.lock():
+        data = store.read("chrome")
+        data["items"].append(f"{sys.argv[2]}-{i}")
+        store.write("chrome", data, make_current=False)
+"""
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base_dir)
+        self.store = SessionStore(base_dir=self.base_dir)
+
+    def test_write_read_and_current_pointer(self):
+        self.store.write("chrome", {"session_id": "a"})
+        self.assertEqual(self.store.read("chrome"), {"session_id": "a"})
+        self.assertEqual(self.store.current(), "chrome")
+        self.assertEqual(self.store.list_browsers(), ["chrome"])
+        # No temp files are left next to the session files
+        self.assertEqual(sorted(f for f in os.listdir(self.base_dir) if f.endswith(".json")),
+                         ["aria_session_chrome.json", "aria_session_current.json"])
+
+    def test_reads_are_cached_until_file_changes(self):
+        self.store.write("chrome", {"session_id": "a"})
+        with patch("builtins.open", side_effect=AssertionError("should be served from cache")):
+            self.assertEqual(self.store.read("chrome")["session_id"], "a")
+            self.assertEqual(self.store.current(), "chrome")
+
+        # Another process rewrites the file
+        with open(self.store.path("chrome"), "w") as f:
+            json.dump({"session_id": "b", "tags": {}}, f)
+        self.assertEqual(self.store.read("chrome")["session_id"], "b")
+
+    def test_cached_data_is_not_shared_with_callers(self):
+        self.store.write("chrome", {"tags": {}})
+        self.store.read("chrome")["tags"]["h1"] = ["news"]
+        self.assertEqual(self.store.read("chrome"), {"tags": {}})
+
+    def test_remove_clears_current_pointer_only_for_that_browser(self):
+        self.store.write("firefox", {"session_id": "f"})
+        self.store.write("chrome", {"session_id": "c"})
+        self.store.remove("firefox")
+        self.assertEqual(self.store.current(), "chrome")
+        self.store.remove("chrome")
+        self.assertIsNone(self.store.current())
+        self.assertIsNone(self.store.read("chrome"))
+        self.assertEqual(self.store.list_browsers(), [])
+
+    def test_corrupt_file_reads_as_missing(self):
+        with open(self.store.path("edge"), "w") as f:
+            f.write("{not json")
+        self.assertIsNone(self.store.read("edge"))
+
+    def test_namespaces_are_separate(self):
+        ci_store = SessionStore(base_dir=self.base_dir, namespace="job-1")
+        ci_store.write("chrome", {"session_id": "ci"})
+        self.store.write("chrome", {"session_id": "local"})
+        self.assertEqual(ci_store.read("chrome")["session_id"], "ci")
+        self.assertEqual(self.store.read("chrome")["session_id"], "local")
+        with patch.dict(os.environ, {"ARIA_SESSION_NAMESPACE": "../job 2"}):
+            self.assertEqual(get_session_namespace(), "_job_2")
+
+    def test_locked_updates_from_parallel_processes_are_not_lost(self):
+        self.store.write("chrome", {"items": []})
+        env = dict(os.environ, PYTHONPATH=SRC)
+        workers = [subprocess.Popen([sys.executable, "-c", APPEND_WORKER, self.base_dir, str(n), "25"], env=env) for n in range(4)]
+        for worker in workers:
+            self.assertEqual(worker.wait(timeout=60), 0)
+        self.assertEqual(len(self.store.read("chrome")["items"]), 100)
+
+class TestNavigatorSessionNamespace(unittest.TestCase):
+    def test_navigator_follows_namespace(self):
+        base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base_dir)
+        navigator = AriaNavigator()
+        with patch("os.path.expanduser", return_value=base_dir):
+            with patch.dict(os.environ, {"ARIA_SESSION_NAMESPACE": "ci-job"}):
+                navigator._save_session("chrome", {"session_id": "ci"})
+                self.assertEqual(navigator.list_active_browsers(), ["chrome"])
+                self.assertIn(os.path.join("sessions", "ci-job"), navigator.get_session_file_path("chrome"))
+            with patch.dict(os.environ, {"ARIA_SESSION_NAMESPACE": ""}):
+                self.assertEqual(navigator.list_active_browsers(), [])
+                self.assertIsNone(navigator._get_current_browser())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import stat
+import sys
+import os
+import io
+import time
+
+from plugin_manager import PluginManager, BasePlugin, BaseAIProvider
+from aria import GeminiProvider, generate_ai_response, generate_ai_response_stream, print_stream
+from ai_cache import AIResponseCache
+from gemini_cli_pool import get_pool, shutdown_pools
+from ai_fanout import run_fan_out
+
+FAKE_CLI = """#!{python}
+import sys, json, time
+prompt = sys.stdin.read()
+if "HANG" in prompt:
+    time.sleep(30)
+if "FAIL" in prompt:
+    sys.stderr.write("quota exceeded")
+    sys.exit(1)
+print(json.dumps({{"type": "init"}}), flush=True)
+if "PARTIAL" in prompt:
+    print(json.dumps({{"type": "message", "role": "assistant", "content": "Partial ans", "delta": True}}), flush=True)
+    sys.stderr.write("quota exceeded")
+    sys.exit(1)
+for word in ["Hello", " streaming", " world"]:
+    print(json.dumps({{"type": "message", "role": "assistant", "content": word, "delta": True}}), flush=True)
+print(json.dumps({{"type": "result", "status": "success"}}), flush=True)
+"""
+
+class PlainProvider(BaseAIProvider):
+    def generate(self, prompt, context="", output_format="text"):
+        return "whole response"
+
+class ChunkedProvider(BaseAIProvider):
+    def generate(self, prompt, context="", output_format="text"):
+        return "".join(self.generate_stream(prompt, context, output_format))
+
+    def generate_stream(self, prompt, context="", output_format="text"):
+        yield "one "
+        yield "two"
+
+class StreamPlugin(BasePlugin):
+    def get_ai_providers(self):
+        return {"plain": PlainProvider, "chunked": ChunkedProvider, "gemini-test": GeminiProvider}
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cli = os.path.join(self.tmpdir.name, "gemini")
+        with open(self.cli, "w") as f:
+            f.write(FAKE_CLI.format(python=sys.executable))
+        os.chmod(self.cli, os.stat(self.cli).st_mode | stat.S_IEXEC)
+        self.pm = PluginManager(context={})
+        self.pm.register_plugin(StreamPlugin(context={}))
+
+    def tearDown(self):
+        shutdown_pools()
+        self.tmpdir.cleanup()
+
+    def test_default_generate_stream_yields_full_response(self):
+        self.assertEqual(list(PlainProvider({}).generate_stream("hi")), ["whole response"])
+
+    def test_gemini_cli_streams_ndjson_chunks(self):
+        for pool_size in ("0", "1"):
+            with patch.dict(os.environ, {"ARIA_GEMINI_CLI": self.cli, "ARIA_GEMINI_POOL_SIZE": pool_size}):
+                chunks = list(GeminiProvider({}).generate_stream("hi"))
+                self.assertEqual(chunks, ["Hello", " streaming", " world"])
+                self.assertEqual(GeminiProvider({}).generate("hi"), "Hello streaming world")
+
+    def test_gemini_cli_stream_reports_errors(self):
+        with patch.dict(os.environ, {"ARIA_GEMINI_CLI": self.cli, "ARIA_GEMINI_POOL_SIZE": "0"}):
+            chunks = list(GeminiProvider({}).generate_stream("FAIL"))
+            self.assertEqual(len(chunks), 1)
+            self.assertIn("quota exceeded", chunks[0])
+            self.assertTrue(GeminiProvider({}).generate("FAIL").startswith("Error from Gemini CLI"))
+
+    @patch.dict(os.environ, {"ARIA_NO_CACHE": "true"})
+    def test_generate_ai_response_stream(self):
+        hooks = []
+        self.pm.hooks["post_ai_generation"] = [lambda prompt, response: hooks.append(response)]
+        chunks = list(generate_ai_response_stream("q", plugin_manager=self.pm, provider_name="chunked"))
+        self.assertEqual(chunks, ["one ", "two"])
+        self.assertEqual(hooks, ["one two"])
+
+    def test_failed_partial_stream_is_not_cached(self):
+        cache_dir = os.path.join(self.tmpdir.name, "cache")
+        env = {"ARIA_GEMINI_CLI": self.cli, "ARIA_GEMINI_POOL_SIZE": "0", "ARIA_NO_CACHE": "false", "ARIA_AI_CACHE_DIR": cache_dir}
+        with patch.dict(os.environ, env), patch("aria.get_ai_cache", return_value=AIResponseCache(cache_dir=cache_dir)):
+            chunks = list(generate_ai_response_stream("PARTIAL", plugin_manager=self.pm, provider_name="gemini-test"))
+            self.assertEqual(chunks[0], "Partial ans")
+            self.assertIn("quota exceeded", chunks[-1])
+            self.assertTrue(generate_ai_response("PARTIAL", plugin_manager=self.pm, provider_name="gemini-test").startswith("Error"))
+
+    def test_agenerate_uses_pool_and_times_out(self):
+        env = {"ARIA_GEMINI_CLI": self.cli, "ARIA_GEMINI_POOL_SIZE": "1", "ARIA_GEMINI_TIMEOUT": "0.5"}
+        with patch.dict(os.environ, env):
+            requests = [{"prompt": "hi"}, {"prompt": "hi"}, {"prompt": "HANG"}]
+            start = time.monotonic()
+            results = run_fan_out(GeminiProvider({}), requests, concurrency=3)
+            self.assertLess(time.monotonic() - start, 10)
+            self.assertEqual(results[:2], ["Hello streaming world"] * 2)
+            self.assertIn("did not respond", results[2])
+            # At least one request was served by a pooled worker
+            self.assertGreaterEqual(get_pool(GeminiProvider({})._cli_command(self.cli)).stats["served"], 1)
+
+    def test_unknown_provider_yields_error(self):
+        chunks = list(generate_ai_response_stream("q", plugin_manager=self.pm, provider_name="missing"))
+        self.assertIn("not found", chunks[0])
+
+    def test_print_stream_returns_full_text(self):
+        with patch("sys.stdout", new=io.StringIO()) as out:
+            text = print_stream(iter(["a", "b", "c"]))
+        self.assertEqual(text, "abc")
+        self.assertEqual(out.getvalue(), "abc\n")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import tempfile
+import time
+
+from stub_provider import StubProvider
+from ai_router import RoutingProvider
+from aria import generate_ai_response
+
+LINKS = [
+    {"id": 0, "text": "Home", "url": "https://example.com/"},
+    {"id": 1, "text": "Pricing plans", "url": "https://example.com/pricing"},
+    {"id": 2, "text": "Next", "url": "https://example.com/?page=2"}
+]
+
+class TestStubProvider(unittest.TestCase):
+    def test_picks_matching_link(self):
+        stub = StubProvider({})
+        prompt = (f"User request: 'show me the pricing'\n\nCurrent Page Links:\n{json.dumps(LINKS, indent=2)}\n\n"
+                  "If the user wants to click a specific link, return ONLY a JSON object: {\"url\": \"THE_URL\"}.\n"
+                  "Otherwise return ONLY: {\"search\": \"SEARCH_QUERY\"}.")
+        self.assertEqual(json.loads(stub.generate(prompt, output_format="json")), {"url": "https://example.com/pricing"})
+
+    def test_next_page_and_search_fallbacks(self):
+        stub = StubProvider({})
+        eval_prompt = (f"The user is looking for: 'kangaroo'.\n\nCurrent Page Links:\n{json.dumps(LINKS)}\n\n"
+                       "1. return: {\"url\": \"THE_LINK_URL\"}.\n2. return: {\"next_page_url\": \"THE_NEXT_PAGE_URL\"}.")
+        self.assertEqual(json.loads(stub.generate(eval_prompt)), {"next_page_url": "https://example.com/?page=2"})
+
+        nav_prompt = "User request: 'kangaroo facts'\n\nCurrent Page Links:\n[]\n\nreturn {\"url\": \"X\"} or {\"search\": \"Q\"}"
+        self.assertEqual(json.loads(stub.generate(nav_prompt)), {"search": "kangaroo facts"})
+
+    def test_search_planning_and_summary(self):
+        stub = StubProvider({})
+        plan = json.loads(stub.generate("The user wants to search for: 'rust async'.\nConstruct the full URL for the search results page.\nReturn ONLY a JSON object: {\"url\": \"...\", \"engine\": \"...\"}"))
+        self.assertIn("q=rust+async", plan["url"])
+
+        self.assertEqual(stub.generate("Summarize:", "One. Two. Three. Four."), "Summary: One. Two. Three.")
+        data = json.loads(stub.generate("Summarize:", "One. Two.", output_format="json"))
+        self.assertEqual(data["key_points"], ["One.", "Two."])
+
+    def test_scripted_rules_from_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump([{"match": "weather", "response": "Sunny"}], f)
+        try:
+            with patch.dict(os.environ, {"ARIA_STUB_SCRIPT": f.name}):
+                stub = StubProvider({})
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(stub.generate("What is the WEATHER like?"), "Sunny")
+
+    def test_latency_distributions_are_seeded(self):
+        for distribution in ["uniform", "normal", "lognormal", "exponential"]:
+            a = StubProvider({}, latency_ms=50, jitter_ms=20, distribution=distribution, seed=7)
+            b = StubProvider({}, latency_ms=50, jitter_ms=20, distribution=distribution, seed=7)
+            samples = [a.sample_latency() for _ in range(200)]
+            self.assertEqual(samples, [b.sample_latency() for _ in range(200)])
+            self.assertTrue(all(s >= 0 for s in samples))
+            self.assertAlmostEqual(sum(samples) / len(samples), 0.05, delta=0.015)
+
+    def test_fixed_latency_applies(self):
+        stub = StubProvider({}, latency_ms=100)
+        start = time.perf_counter()
+        stub.generate("x")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+        self.assertEqual("".join(stub.generate_stream("Summarize:", "Hello there.")), "Summary: Hello there.")
+
+    def test_not_routable_by_default(self):
+        router = RoutingProvider({}, providers={"stub": StubProvider({}), "bench": StubProvider({}, routable=True)}, hedge=False, stats_path="")
+        self.assertEqual([n for n, _ in router.candidates()], ["bench"])
+
+    @patch.dict(os.environ, {"ARIA_NO_CACHE": "true"})
+    def test_resolves_without_plugin_manager(self):
+        self.assertEqual(generate_ai_response("Summarize:", "Offline works.", provider_name="stub"), "Summary: Offline works.")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,10 +7,15 @@ import os
 
 from aria import generate_ai_response, summarize_text
 from navigator import AriaNavigator
+from genai_clients import reset_clients
 
 class TestSynthesis(unittest.TestCase):
+    def setUp(self):
+        # Clients are shared process-wide; make each test build its own mocked one
+        reset_clients()
+
     @patch('aria.genai.Client')
-    @patch.dict(os.environ, {'GEMINI_API_KEY': 'dummy_key'})
+    @patch.dict(os.environ, {'GEMINI_API_KEY': 'dummy_key', 'ARIA_NO_CACHE': 'true'})
     def test_generate_ai_response_json(self, mock_client_class):
         mock_client = MagicMock()
         mock_client_class.return_value = mock_client
@@ -26,7 +31,7 @@ class TestSynthesis(unittest.TestCase):
         self.assertIn("ONLY valid JSON", kwargs['contents'])
 
     @patch('aria.genai.Client')
-    @patch.dict(os.environ, {'GEMINI_API_KEY': 'dummy_key'})
+    @patch.dict(os.environ, {'GEMINI_API_KEY': 'dummy_key', 'ARIA_NO_CACHE': 'true'})
     def test_summarize_text_json(self, mock_client_class):
         mock_client = MagicMock()
         mock_client_class.return_value = mock_client
@@ -0,0 +1,157 @@
+import io
+import json
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tab_content import TabContentReader
+from navigator import AriaNavigator
+
+class FakePage:
+    """Stands in for a tab: answers CONTENT_EXPRESSION the way the browser would."""
+    def __init__(self, url, title, text, nodes=10, last_modified="01/01/2026 00:00:00"):
+        self.url, self.title, self.text, self.nodes, self.last_modified = url, title, text, nodes, last_modified
+        self.text_reads = 0
+
+    def evaluate(self, expression):
+        known = json.loads(expression[expression.rindex("})(") + 3:-1])
+        fingerprint = json.dumps([self.url, self.last_modified, self.nodes], separators=(",", ":"))
+        content = None
+        if fingerprint != known:
+            content = self.text
+            self.text_reads += 1
+        return json.dumps({"fingerprint": fingerprint, "title": self.title, "url": self.url, "content": content})
+
+class FakeSocket:
+    def __init__(self, page, delay=0.0):
+        self.page, self.delay, self.sent = page, delay, None
+
+    def send(self, message):
+        self.sent = json.loads(message)
+
+    def recv(self):
+        time.sleep(self.delay)
+        value = self.page.evaluate(self.sent["params"]["expression"])
+        return json.dumps({"id": self.sent["id"], "result": {"result": {"type": "string", "value": value}}})
+
+    def close(self):
+        pass
+
+class TestTabContentReader(unittest.TestCase):
+    def setUp(self):
+        self.pages = {
+            "A": FakePage("https://docs.example.com", "Docs", "Docs text"),
+            "B": FakePage("https://mail.example.com", "Mail", "Mail text"),
+            "C": FakePage("https://news.example.com", "News", "News text"),
+            "D": FakePage("https://wiki.example.com", "Wiki", "Wiki text")
+        }
+        self.driver = MagicMock()
+        self.driver.window_handles = list(self.pages)
+        self.driver.current_window_handle = "A"
+        self.driver.capabilities = {}
+
+    def _devtools(self, delay=0.0):
+        targets = [{"id": h, "type": "page", "webSocketDebuggerUrl": f"ws://localhost:9222/devtools/page/{h}"} for h in self.pages]
+        urlopen = patch("tab_content.urllib.request.urlopen", side_effect=lambda *a, **k: io.BytesIO(json.dumps(targets).encode()))
+        connect = patch("websocket.create_connection", side_effect=lambda url, **k: FakeSocket(self.pages[url.rsplit("/", 1)[1]], delay))
+        return urlopen, connect
+
+    def test_devtools_reads_tabs_concurrently_without_switching(self):
+        urlopen, connect = self._devtools(delay=0.2)
+        reader = TabContentReader(self.driver, debugger_address="localhost:9222")
+        with urlopen, connect:
+            start = time.perf_counter()
+            contents = reader.read(["A", "B", "C", "D"])
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual(reader.source, "devtools")
+        self.assertEqual(contents["C"], {"title": "News", "url": "https://news.example.com", "content": "News text"})
+        self.assertLess(elapsed, 0.6)
+        self.driver.switch_to.window.assert_not_called()
+
+    def test_unchanged_tabs_come_from_cache(self):
+        urlopen, connect = self._devtools()
+        reader = TabContentReader(self.driver, debugger_address="localhost:9222")
+        with urlopen, connect:
+            reader.read(["A", "B"])
+            self.pages["B"].nodes += 5
+            self.pages["B"].text = "New mail"
+            contents = reader.read(["A", "B"])
+
+        self.assertEqual(contents["A"]["content"], "Docs text")
+        self.assertEqual(contents["B"]["content"], "New mail")
+        self.assertEqual(self.pages["A"].text_reads, 1)
+        self.assertEqual(self.pages["B"].text_reads, 2)
+
+    def test_closed_tabs_are_dropped_from_cache(self):
+        urlopen, connect = self._devtools()
+        reader = TabContentReader(self.driver, debugger_address="localhost:9222")
+        with urlopen, connect:
+            reader.read(["A", "B"])
+            self.driver.window_handles = ["A"]
+            reader.read(["A"])
+        self.assertEqual(list(reader._cache), ["A"])
+
+    def test_bidi_contexts(self):
+        self.driver.capabilities = {"webSocketUrl": "ws://localhost:4444/session/1"}
+        self.driver.script.evaluate.side_effect = lambda expression, target, await_promise: {
+            "result": {"type": "string", "value": self.pages[target["context"]].evaluate(expression)}}
+        reader = TabContentReader(self.driver)
+        contents = reader.read(["B", "D"])
+
+        self.assertEqual(reader.source, "bidi")
+        self.assertEqual([c["content"] for c in contents.values()], ["Mail text", "Wiki text"])
+        self.driver.switch_to.window.assert_not_called()
+
+    def test_falls_back_to_switching_and_restores_window(self):
+        current = {"handle": "A"}
+        self.driver.switch_to.window.side_effect = lambda handle: current.update(handle=handle)
+        self.driver.execute_script.side_effect = lambda script: self.pages[current["handle"]].evaluate(script[len("return "):])
+        reader = TabContentReader(self.driver)
+        contents = reader.read(["C", "B"])
+
+        self.assertEqual(reader.source, "switch")
+        self.assertEqual(contents["C"]["content"], "News text")
+        self.driver.switch_to.window.assert_called_with("A")
+
+    def test_failed_source_is_retried_after_cooldown(self):
+        self.driver.capabilities = {"webSocketUrl": "ws://localhost:4444/session/1"}
+        self.driver.script.evaluate.side_effect = lambda expression, target, await_promise: {
+            "result": {"type": "string", "value": self.pages[target["context"]].evaluate(expression)}}
+        current = {"handle": "A"}
+        self.driver.switch_to.window.side_effect = lambda handle: current.update(handle=handle)
+        self.driver.execute_script.side_effect = lambda script: self.pages[current["handle"]].evaluate(script[len("return "):])
+        reader = TabContentReader(self.driver)
+        with patch("tab_content.time.monotonic", return_value=100.0):
+            with patch.object(reader, "_bidi_evaluator", side_effect=Exception("session busy")):
+                reader.read(["A"])
+            self.assertEqual(reader.source, "switch")
+            reader.read(["A"])
+            self.assertEqual(reader.source, "switch")
+
+        with patch("tab_content.time.monotonic", return_value=100.0 + reader.retry_after):
+            contents = reader.read(["B"])
+        self.assertEqual(reader.source, "bidi")
+        self.assertEqual(contents["B"]["content"], "Mail text")
+
+class TestNavigatorTabsContent(unittest.TestCase):
+    def test_get_tabs_content_resolves_identifiers_without_switching(self):
+        driver = MagicMock()
+        driver.window_handles = ["A", "B"]
+        driver.current_window_handle = "A"
+        driver.execute.return_value = {"value": {"targetInfos": [
+            {"targetId": "A", "type": "page", "title": "Docs", "url": "u1"},
+            {"targetId": "B", "type": "page", "title": "Mail", "url": "u2"}
+        ]}}
+        navigator = AriaNavigator()
+        navigator.driver = driver
+        navigator.tab_content.read = MagicMock(return_value={"B": {"title": "Mail", "url": "u2", "content": "Mail text"}})
+
+        results = navigator.get_tabs_content(["1", "missing-tab"])
+
+        self.assertEqual(results, [{"title": "Mail", "url": "u2", "content": "Mail text", "identifier": "1"}])
+        navigator.tab_content.read.assert_called_once_with(["B"])
+        driver.switch_to.window.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
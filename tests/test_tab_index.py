@@ -0,0 +1,120 @@
+import io
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tab_index import TabIndex, debugger_address_from_capabilities
+from navigator import AriaNavigator
+
+class TestTabIndex(unittest.TestCase):
+    def setUp(self):
+        self.driver = MagicMock()
+        self.driver.window_handles = ["A", "B"]
+        self.driver.current_window_handle = "A"
+        self.driver.capabilities = {}
+
+    def test_devtools_list_avoids_switching(self):
+        targets = [
+            {"id": "A", "type": "page", "title": "Docs", "url": "https://docs.example.com"},
+            {"id": "B", "type": "page", "title": "Mail", "url": "https://mail.example.com"},
+            {"id": "W", "type": "service_worker", "title": "", "url": "https://sw.example.com"}
+        ]
+        with patch("tab_index.urllib.request.urlopen", return_value=io.BytesIO(json.dumps(targets).encode())) as urlopen:
+            tabs = TabIndex(self.driver, debugger_address="localhost:9222").refresh()
+
+        urlopen.assert_called_once()
+        self.assertIn("localhost:9222/json/list", urlopen.call_args[0][0])
+        self.assertEqual([t["title"] for t in tabs], ["Docs", "Mail"])
+        self.driver.switch_to.window.assert_not_called()
+
+    def test_cdp_target_list(self):
+        self.driver.execute.return_value = {"value": {"targetInfos": [
+            {"targetId": "A", "type": "page", "title": "Docs", "url": "https://docs.example.com"},
+            {"targetId": "B", "type": "page", "title": "Mail", "url": "https://mail.example.com"}
+        ]}}
+        index = TabIndex(self.driver)
+        index.refresh()
+
+        self.assertEqual(index.source, "cdp")
+        self.assertEqual(index.find(lambda tab: "mail" in tab["url"]), "B")
+        self.driver.switch_to.window.assert_not_called()
+
+    def test_falls_back_to_switching_and_restores_window(self):
+        self.driver.execute.side_effect = Exception("unknown command")
+        titles = iter(["Docs", "Mail"])
+        type(self.driver).title = property(lambda _: next(titles))
+        self.driver.current_url = "https://example.com"
+
+        index = TabIndex(self.driver)
+        tabs = index.refresh()
+
+        self.assertEqual(index.source, "switch")
+        self.assertEqual([t["title"] for t in tabs], ["Docs", "Mail"])
+        self.driver.switch_to.window.assert_called_with("A")
+
+    def test_fresh_index_is_reused_until_invalidated(self):
+        self.driver.execute.return_value = {"value": {"targetInfos": [
+            {"targetId": "A", "type": "page", "title": "Docs", "url": "u1"},
+            {"targetId": "B", "type": "page", "title": "Mail", "url": "u2"}
+        ]}}
+        index = TabIndex(self.driver, max_age=60)
+        index.refresh()
+        index.refresh()
+        self.assertEqual(self.driver.execute.call_count, 1)
+
+        index.invalidate()
+        index.refresh()
+        self.assertEqual(self.driver.execute.call_count, 2)
+
+    def test_failed_source_is_retried_after_cooldown(self):
+        targets = {"value": {"targetInfos": [
+            {"targetId": "A", "type": "page", "title": "Docs", "url": "u1"},
+            {"targetId": "B", "type": "page", "title": "Mail", "url": "u2"}
+        ]}}
+        self.driver.execute.side_effect = [Exception("target closed"), targets]
+        self.driver.title = "Docs"
+        index = TabIndex(self.driver, max_age=0)
+        with patch("tab_index.time.monotonic", return_value=100.0):
+            index.refresh()
+            self.assertEqual(index.source, "switch")
+            index.refresh()
+        self.assertEqual(self.driver.execute.call_count, 1)
+
+        with patch("tab_index.time.monotonic", return_value=100.0 + index.retry_after):
+            index.refresh()
+        self.assertEqual(index.source, "cdp")
+
+    def test_debugger_address_from_capabilities(self):
+        self.assertEqual(debugger_address_from_capabilities({"goog:chromeOptions": {"debuggerAddress": "localhost:1234"}}), "localhost:1234")
+        self.assertEqual(debugger_address_from_capabilities({"ms:edgeOptions": {"debuggerAddress": "localhost:5678"}}), "localhost:5678")
+        self.assertIsNone(debugger_address_from_capabilities({"browserName": "firefox"}))
+
+    def test_navigator_goto_by_title_switches_once(self):
+        self.driver.execute.return_value = {"value": {"targetInfos": [
+            {"targetId": "A", "type": "page", "title": "Docs", "url": "u1"},
+            {"targetId": "B", "type": "page", "title": "Mail", "url": "u2"}
+        ]}}
+        navigator = AriaNavigator()
+        navigator.driver = self.driver
+
+        self.assertTrue(navigator.goto_tab("Mail"))
+        self.driver.switch_to.window.assert_called_once_with("B")
+
+    def test_navigator_list_tabs_has_ids_and_tags(self):
+        self.driver.execute.return_value = {"value": {"targetInfos": [
+            {"targetId": "A", "type": "page", "title": "Docs", "url": "u1"},
+            {"targetId": "B", "type": "page", "title": "Mail", "url": "u2"}
+        ]}}
+        navigator = AriaNavigator()
+        navigator.driver = self.driver
+
+        with patch.object(navigator, "_get_current_browser", return_value="chrome"), \
+             patch.object(navigator, "_load_session_data", return_value={"tags": {"B": ["work"]}}):
+            tabs = navigator.list_tabs()
+
+        self.assertEqual([t["id"] for t in tabs], ["A", "B"])
+        self.assertEqual(tabs[1]["tags"], ["work"])
+        self.assertTrue(tabs[0]["active"])
+
+if __name__ == "__main__":
+    unittest.main()
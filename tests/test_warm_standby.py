@@ -0,0 +1,122 @@
+import io
+import time
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from navigator import AriaNavigator
+from warm_standby import WarmStandbyPool, create_standby_pool, parse_standby_specs
+
+class FakeLauncher:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, browser_name, headless=False, profile=None, verbose=True):
+        time.sleep(self.delay)
+        driver = MagicMock()
+        with self.lock:
+            self.calls.append((browser_name, headless, profile))
+            driver.session_id = f"session-{len(self.calls)}"
+        return driver, {"session_id": driver.session_id, "url": "http://localhost:1", "browser": browser_name, "driver_pid": None}, ""
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+class TestWarmStandbyPool(unittest.TestCase):
+    def setUp(self):
+        self.launcher = FakeLauncher()
+        self.pool = WarmStandbyPool(self.launcher, size=1, max_total=2, idle_timeout=60)
+        self.addCleanup(self.pool.close)
+
+    def ready(self, key):
+        return self.pool.status().get(key, {}).get("ready", 0)
+
+    def test_take_hands_out_spare_and_starts_replacement(self):
+        self.pool.prewarm("chrome")
+        wait_for(lambda: self.ready("chrome") == 1)
+
+        spare = self.pool.take("chrome")
+        self.assertEqual(spare.session_data["session_id"], "session-1")
+        wait_for(lambda: self.ready("chrome") == 1)
+        self.assertEqual(len(self.launcher.calls), 2)
+
+    def test_miss_marks_key_wanted(self):
+        self.assertIsNone(self.pool.take("edge", headless=True))
+        wait_for(lambda: self.ready("edge (headless)") == 1)
+        self.assertIsNotNone(self.pool.take("edge", headless=True))
+        self.assertIsNone(self.pool.take("edge"))
+
+    def test_total_spares_are_bounded(self):
+        for browser in ("chrome", "firefox", "edge"):
+            self.pool.prewarm(browser)
+        wait_for(lambda: sum(s["ready"] for s in self.pool.status().values()) == 2)
+        time.sleep(0.05)
+        self.assertEqual(len(self.launcher.calls), 2)
+
+    def test_dead_spare_is_skipped(self):
+        self.pool.prewarm("chrome")
+        wait_for(lambda: self.ready("chrome") == 1)
+        type(self.pool._spares[("chrome", False, None)][0].driver).current_url = property(lambda d: (_ for _ in ()).throw(RuntimeError("gone")))
+        self.assertIsNone(self.pool.take("chrome"))
+
+    def test_profile_spares_refill_only_after_close(self):
+        self.pool.prewarm("firefox", profile="work")
+        wait_for(lambda: self.ready("firefox@work") == 1)
+        self.assertIsNotNone(self.pool.take("firefox", profile="work"))
+        time.sleep(0.05)
+        self.assertEqual(len(self.launcher.calls), 1)
+
+        self.pool.refill()
+        wait_for(lambda: self.ready("firefox@work") == 1)
+
+    def test_idle_keys_are_reaped(self):
+        self.pool.prewarm("chrome")
+        wait_for(lambda: self.ready("chrome") == 1)
+        self.pool.idle_timeout = 0
+        spare_driver = self.pool._spares[("chrome", False, None)][0].driver
+        self.assertEqual(self.pool.reap_idle(), 1)
+        spare_driver.quit.assert_called_once()
+        self.pool.refill()
+        self.assertEqual(self.pool.status(), {})
+
+    def test_close_quits_spares_including_ones_still_starting(self):
+        slow = FakeLauncher(delay=0.2)
+        pool = WarmStandbyPool(slow, size=1, max_total=1, idle_timeout=60)
+        pool.prewarm("chrome")
+        pool.close()
+        time.sleep(0.4)
+        self.assertEqual(pool.status(), {})
+
+    def test_parse_specs_and_env(self):
+        self.assertEqual(parse_standby_specs("chrome, firefox@work"), [("chrome", False, None), ("firefox", False, "work")])
+        self.assertIsNone(create_standby_pool("", launcher=self.launcher))
+
+class TestStartSessionUsesStandby(unittest.TestCase):
+    def test_start_session_adopts_spare(self):
+        launcher = FakeLauncher()
+        pool = WarmStandbyPool(launcher, size=1, max_total=1, idle_timeout=60)
+        self.addCleanup(pool.close)
+        pool.prewarm("chrome", headless=True)
+        wait_for(lambda: pool.status()["chrome (headless)"]["ready"] == 1)
+
+        navigator = AriaNavigator()
+        navigator.standby_pool = pool
+        with patch.object(navigator, "get_session_file_path", return_value="/nonexistent/aria-session.json"), \
+             patch.object(navigator, "_save_session") as save_session, \
+             patch.object(navigator, "launch_browser") as launch_browser, \
+             patch("sys.stdout", new=io.StringIO()) as fake_out:
+            driver = navigator.start_session("chrome", headless=True)
+
+        launch_browser.assert_not_called()
+        self.assertEqual(driver.session_id, "session-1")
+        self.assertEqual(save_session.call_args[0][1]["session_id"], "session-1")
+        self.assertIn("from a warm standby", fake_out.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
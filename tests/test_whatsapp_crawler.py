@@ -0,0 +1,149 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from site_manager import SiteManager
+from sites.whatsapp import WhatsAppScraper, CHAT_INDEX_FILE, CHAT_ROWS_SCRIPT, SCROLL_CHAT_LIST_SCRIPT, row_changed
+
+class FakeChatList:
+    """Renders `window` rows of the chat list at a time and scrolls by most of a window, like WhatsApp Web."""
+    def __init__(self, chats, window=10, step=8):
+        self.chats = chats
+        self.window = window
+        self.step = step
+        self.top = 0
+        self.scrolls = 0
+
+    def execute_script(self, script, *args):
+        if script == CHAT_ROWS_SCRIPT:
+            return [dict(chat) for chat in self.chats[self.top:self.top + self.window]]
+        if script == SCROLL_CHAT_LIST_SCRIPT:
+            if args[0]:
+                self.top = 0
+                return True
+            if self.top + self.window >= len(self.chats):
+                return False
+            self.scrolls += 1
+            self.top = min(self.top + self.step, len(self.chats) - self.window)
+            return True
+        raise AssertionError("unexpected script")
+
+def make_chats(count):
+    return [{"id": f"{n}@c.us", "name": f"Chat {n}", "preview": f"hello {n}", "time": "12.00", "unread": False} for n in range(count)]
+
+class TestWhatsAppCrawler(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.sm = SiteManager(base_dir=self.root)
+        patcher = patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _crawl(self, chat_list, **kwargs):
+        scraper = WhatsAppScraper(MagicMock(driver=chat_list), self.sm)
+        opened = []
+        with patch.object(scraper, "scrape_conversation", side_effect=lambda name: opened.append(name) or 1):
+            scraper.scrape_all_conversations(**kwargs)
+        return opened
+
+    def test_every_chat_is_scraped_once_past_the_first_screen(self):
+        chats = make_chats(63)
+        opened = self._crawl(FakeChatList(chats))
+        self.assertEqual(opened, [chat["name"] for chat in chats])
+        with self.sm.open_index("whatsapp", CHAT_INDEX_FILE) as index:
+            self.assertEqual(len(index), 63)
+            self.assertEqual(index.get("62@c.us")["preview"], "hello 62")
+
+    def test_duplicate_titles_are_kept_apart_by_data_id(self):
+        chats = make_chats(12)
+        chats[11]["name"] = "Chat 0"
+        self.assertEqual(self._crawl(FakeChatList(chats)).count("Chat 0"), 2)
+
+    def test_seen_rows_are_bounded(self):
+        chats = make_chats(100)
+        with patch("sites.whatsapp.SEEN_WINDOW", 4):
+            scraper = WhatsAppScraper(MagicMock(driver=FakeChatList(chats, window=3, step=2)), self.sm)
+            names = [row["name"] for row in scraper.iter_chat_rows()]
+        self.assertEqual(names, [chat["name"] for chat in chats])
+
+    def test_refresh_only_opens_changed_chats_and_stops_early(self):
+        chats = make_chats(200)
+        self._crawl(FakeChatList(chats))
+        chats[2]["preview"] = "new message"
+        chats[5]["unread"] = True
+
+        chat_list = FakeChatList(chats)
+        self.assertEqual(self._crawl(chat_list), ["Chat 2", "Chat 5"])
+        # The crawl stops after a run of unchanged rows instead of scrolling all 200
+        self.assertLess(chat_list.scrolls, 5)
+
+        self.assertEqual(self._crawl(FakeChatList(chats), deep=True), [chat["name"] for chat in chats])
+
+    def test_pinned_chats_do_not_end_the_crawl(self):
+        chats = make_chats(60)
+        for chat in chats[:25]:
+            chat["pinned"] = True
+        self._crawl(FakeChatList(chats))
+        chats[30]["preview"] = "new message"
+        self.assertEqual(self._crawl(FakeChatList(chats)), ["Chat 30"])
+
+    def test_unchanged_stop_is_configurable(self):
+        chats = make_chats(60)
+        self._crawl(FakeChatList(chats))
+        chats[40]["preview"] = "new message"
+        # Out-of-order activity (e.g. a chat brought back from the archive) is cut off by the default
+        self.assertEqual(self._crawl(FakeChatList(chats)), [])
+        with patch.dict(os.environ, {"ARIA_WHATSAPP_UNCHANGED_STOP": "0"}):
+            self.assertEqual(self._crawl(FakeChatList(chats)), ["Chat 40"])
+
+    def test_refresh_streams_names_into_the_registry(self):
+        chats = make_chats(5)
+        scraper = WhatsAppScraper(MagicMock(driver=FakeChatList(chats)), self.sm)
+        scraper.navigator.driver.current_url = "https://web.whatsapp.com/"
+        with patch.object(scraper, "scrape_conversation", return_value=1):
+            self.assertTrue(scraper.refresh())
+        self.assertEqual(sorted(self.sm.get_registry("whatsapp")["mappings"].values()), [chat["name"] for chat in chats])
+        self.assertEqual(self.sm.load_data("whatsapp", "metadata.json")["conversation_count"], 5)
+
+    def test_legacy_json_index_is_moved_to_disk_index(self):
+        self.sm.save_data("whatsapp", "conversations.json", [{"name": "Chat 0", "id": "0@c.us", "preview": "hello 0", "time": "12.00"}])
+        self.assertEqual(self._crawl(FakeChatList(make_chats(2))), ["Chat 1"])
+        self.assertIsNone(self.sm.load_data("whatsapp", "conversations.json"))
+
+    def test_unread_only(self):
+        chats = make_chats(30)
+        for n in (4, 25):
+            chats[n]["unread"] = True
+        self.assertEqual(self._crawl(FakeChatList(chats), unread_only=True), ["Chat 4", "Chat 25"])
+        # Skipped chats are indexed without a preview, so a regular refresh still opens them
+        self.assertEqual(len(self._crawl(FakeChatList(chats))), 30)
+
+    def test_index_is_saved_when_interrupted(self):
+        chats = make_chats(5)
+        scraper = WhatsAppScraper(MagicMock(driver=FakeChatList(chats)), self.sm)
+        calls = []
+
+        def scrape(name):
+            calls.append(name)
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return 1
+        with patch.object(scraper, "scrape_conversation", side_effect=scrape), self.assertRaises(KeyboardInterrupt):
+            scraper.scrape_all_conversations()
+        self.assertEqual(self._crawl(FakeChatList(chats)), ["Chat 2", "Chat 3", "Chat 4"])
+
+class TestRowChanged(unittest.TestCase):
+    def test_row_changed(self):
+        row = {"preview": "ok", "time": "12.30", "unread": False}
+        self.assertTrue(row_changed(row, None))
+        self.assertFalse(row_changed(row, {"preview": "ok", "time": "12.30"}))
+        self.assertTrue(row_changed(row, {"preview": "ok", "time": "11.05"}))
+        self.assertTrue(row_changed(dict(row, unread=True), {"preview": "ok", "time": "12.30"}))
+        # A label that aged from a clock time to a day is not activity
+        self.assertFalse(row_changed(dict(row, time="Eilen"), {"preview": "ok", "time": "12.30"}))
+
+if __name__ == "__main__":
+    unittest.main()